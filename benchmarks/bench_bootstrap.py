@@ -0,0 +1,50 @@
+# bench_bootstrap.py
+# Bootstrap confidence intervals of the test metrics: a loop of scikit-learn metric calls
+# versus the vectorized resampling of src/evaluate_model.py.
+
+import click
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.evaluate_model import bootstrap_metrics
+
+CLASSES = np.array(["Adult", "Senior"], dtype=object)
+
+
+def _looped(y, proba, n_resamples, seed):
+    from sklearn.metrics import classification_report, roc_auc_score
+    rng = np.random.default_rng(seed)
+    for _ in range(n_resamples):
+        rows = rng.integers(0, len(y), len(y))
+        classification_report(y[rows], CLASSES[proba[rows].argmax(axis=1)], output_dict=True, zero_division=0)
+        roc_auc_score(y[rows] == "Senior", proba[rows, 1])
+
+
+@click.command()
+@click.option('--n-rows', type=int, default=570, show_default=True, help="Size of the test set")
+@click.option('--n-resamples', type=int, default=1000, show_default=True, help="Bootstrap resamples")
+@click.option('--n-looped', type=int, default=50, show_default=True,
+              help="Resamples timed for the scikit-learn loop, scaled up to --n-resamples")
+@click.option('--n-jobs', type=int, default=None, help="Worker processes of the vectorized bootstrap")
+def main(n_rows, n_resamples, n_looped, n_jobs):
+    """Report the time of --n-resamples bootstrap resamples with both approaches."""
+    rng = np.random.default_rng(0)
+    y = np.where(rng.random(n_rows) < 0.16, "Senior", "Adult").astype(object)
+    senior = np.clip(0.3 * (y == "Senior") + 0.7 * rng.random(n_rows), 0, 1)
+    proba = np.column_stack([1 - senior, senior])
+
+    start = time.perf_counter()
+    _looped(y, proba, n_looped, 123)
+    looped = (time.perf_counter() - start) * n_resamples / n_looped
+    start = time.perf_counter()
+    bootstrap_metrics(y, proba, CLASSES, n_resamples=n_resamples, n_jobs=n_jobs)
+    vectorized = time.perf_counter() - start
+
+    print(f"{n_resamples} resamples of {n_rows} rows")
+    print(f"{'scikit-learn loop':>18}: {looped:8.2f} s (from {n_looped} resamples)")
+    print(f"{'vectorized':>18}: {vectorized:8.2f} s ({looped / vectorized:.0f}x)")
+
+if __name__ == '__main__':
+    main()
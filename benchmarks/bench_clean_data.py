@@ -0,0 +1,76 @@
+# bench_clean_data.py
+# Time and peak memory of reading and cleaning the raw file: decoding with Series.replace
+# after a default read_csv versus decoding categorical codes after a typed, column-pruned read.
+
+import click
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import write_raw_nhanes_csv
+
+
+def _reset_peak_rss():
+    # Spawned children inherit the parent's high-water mark; "5" resets it (Linux only)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def _replace(input_path):
+    # The cleaning code of 02_clean_validate_save_data.py before the categorical decoding
+    import pandas as pd
+    from src.clean_data import RAW_COLUMNS
+    raw = pd.read_csv(input_path, names=RAW_COLUMNS, skiprows=1)
+    data = raw.drop(columns=["id", "age"])
+    data["gender"] = data["gender"].replace({1: "Male", 2: "Female"})
+    data["weekly_physical_activity"] = data["weekly_physical_activity"].replace({1: "Yes", 2: "No"})
+    data["diabetic"] = data["diabetic"].replace({1: "Yes", 2: "No", 3: "Borderline"})
+    return data[data["weekly_physical_activity"] != 7.0]
+
+
+def _codes(input_path):
+    from src.clean_data import clean_data, read_raw
+    return clean_data(read_raw(input_path))
+
+
+def _clean(method, input_path):
+    import pandas as pd  # noqa: F401 (imports are not part of the cleaning time)
+    import src.clean_data  # noqa: F401
+    _reset_peak_rss()
+    start = time.perf_counter()
+    data = (_replace if method == "replace" else _codes)(input_path)
+    seconds = time.perf_counter() - start
+    return seconds, _peak_rss_mb(), data.memory_usage(deep=True).sum() / 2**20, len(data)
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that peak RSS is not shared between methods
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="1000000,10000000", show_default=True,
+              help="Comma-separated numbers of synthetic raw rows")
+def main(n_rows):
+    """Report seconds, peak RSS and the size of the cleaned DataFrame for each method and size."""
+    print(f"{'rows':>10} {'method':>8} {'clean s':>8} {'peak MB':>8} {'frame MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [int(n) for n in n_rows.split(",")]:
+            input_path = _run_isolated(write_raw_nhanes_csv, os.path.join(tmp, f"raw_{size}.csv"), size)
+            for method in ["replace", "codes"]:
+                seconds, peak_mb, frame_mb, _ = _run_isolated(_clean, method, input_path)
+                print(f"{size:>10} {method:>8} {seconds:>8.2f} {peak_mb:>8.0f} {frame_mb:>9.0f}")
+            os.remove(input_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# bench_clean_validate.py
+# Time and peak memory of 02_clean_validate_save_data.py loading the raw file at once versus streaming it.
+
+import click
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from synthetic_data import write_raw_nhanes_csv
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'scripts', '02_clean_validate_save_data.py')
+
+
+def _run(input_path, output_path, options):
+    # wait4 reports the peak RSS of this child alone (Linux/macOS)
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, SCRIPT, f"--input_path={input_path}",
+                                f"--output_path={output_path}", *options], stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    if status != 0:
+        raise RuntimeError(f"{' '.join(options) or 'whole file'} run failed")
+    return time.perf_counter() - start, usage.ru_maxrss / 1024
+
+
+@click.command()
+@click.option('--n-rows', type=int, default=2_000_000, show_default=True, help="Number of synthetic raw rows")
+@click.option('--chunksize', type=int, default=100_000, show_default=True, help="Rows per chunk for the streaming runs")
+@click.option('--output-ext', type=click.Choice([".csv", ".parquet"]), default=".csv", show_default=True,
+              help="Format of the cleaned output")
+def main(n_rows, chunksize, output_ext):
+    """Compare the whole-file and streaming (exact hash and Bloom filter) modes of the cleaning script."""
+    runs = {
+        "whole file": [],
+        f"streaming, hash set ({chunksize} rows/chunk)": [f"--chunksize={chunksize}"],
+        f"streaming, Bloom ({chunksize} rows/chunk)": [f"--chunksize={chunksize}", "--duplicates=bloom"],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generated in another process: a child started from here would report this process's peak RSS
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            input_path = pool.apply(write_raw_nhanes_csv, (os.path.join(tmp, "raw.csv"), n_rows))
+        print(f"Raw file: {os.path.getsize(input_path) / 1e6:.0f} MB")
+        for name, options in runs.items():
+            seconds, peak_rss = _run(input_path, os.path.join(tmp, f"cleaned{output_ext}"), options)
+            print(f"{name:>40}: {seconds:8.2f} s  peak RSS {peak_rss:8.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# bench_cli_startup.py
+# Startup time of `age_predict.py COMMAND --help`, from `python -X importtime`.
+# Exits with an error when a command imports a heavy library or exceeds the
+# import-time budget, so it can guard against import regressions in CI.
+
+import click
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'age_predict.py')
+COMMANDS = ["", "download", "clean", "split", "eda", "visualize", "features", "fit", "evaluate", "explain", "report", "predict", "serve", "pipeline", "metrics"]
+# Libraries that no `--help` should need
+HEAVY_MODULES = ("pandas", "numpy", "sklearn", "scipy", "pandera", "deepchecks", "altair",
+                 "altair_ally", "matplotlib", "joblib", "requests", "pyarrow")
+
+
+def parse_importtime(stderr: str):
+    """Return {module: (self_us, cumulative_us)} from the output of `python -X importtime`."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def _measure(command):
+    argv = [sys.executable, "-X", "importtime", SCRIPT] + ([command] if command else []) + ["--help"]
+    start = time.perf_counter()
+    result = subprocess.run(argv, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"'{' '.join(argv)}' failed:\n{result.stderr[-2000:]}")
+    modules = parse_importtime(result.stderr)
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY_MODULES))
+    return seconds, sum(self_us for self_us, _ in modules.values()) / 1000, len(modules), heavy
+
+
+@click.command()
+@click.option('--repeats', type=int, default=5, show_default=True,
+              help="Runs per command; the fastest is reported")
+@click.option('--max-import-ms', type=float, default=250.0, show_default=True,
+              help="Fail if any command spends longer than this importing modules")
+def main(repeats, max_import_ms):
+    """Report wall seconds, import milliseconds and modules imported by each command's --help."""
+    print(f"{'command':>10} {'seconds':>8} {'import ms':>10} {'modules':>8}  heavy imports")
+    failures = []
+    for command in COMMANDS:
+        runs = [_measure(command) for _ in range(repeats)]
+        seconds = min(run[0] for run in runs)
+        import_ms = min(run[1] for run in runs)
+        _, _, n_modules, heavy = runs[-1]
+        name = command or "(group)"
+        print(f"{name:>10} {seconds:>8.3f} {import_ms:>10.1f} {n_modules:>8}  {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{name} imports {', '.join(heavy)}")
+        if import_ms > max_import_ms:
+            failures.append(f"{name} spends {import_ms:.0f} ms importing (budget {max_import_ms:.0f} ms)")
+    if failures:
+        raise click.ClickException("; ".join(failures))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# bench_compiled_scorer.py
+# Single-record latency of the compiled NumPy scorer versus the sklearn pipeline.
+
+import click
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+from src.compiled_scorer import compile_pipeline
+from src.predict import load_model
+
+
+def _latencies_us(func, records):
+    timings = np.empty(len(records))
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        func(record)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+@click.command()
+@click.option('--model-path', type=str, default="results/models/age_prediction_model",
+              show_default=True, help="Path to the saved pipeline")
+@click.option('--n-records', type=int, default=5_000, show_default=True, help="Number of single-record calls")
+def main(model_path, n_records):
+    """Report p50/p99 latency of one-record `predict_proba` calls for both scoring paths."""
+    pipe = load_model(model_path)
+    scorer = compile_pipeline(pipe)
+
+    data = make_nhanes_frame(n_records).drop(columns=["age_group"])
+    max_error = np.abs(scorer.predict_proba(data) - pipe.predict_proba(data)).max()
+    print(f"Max absolute difference in predict_proba over {n_records} rows: {max_error:.2e}")
+
+    records = data.to_dict(orient="records")
+    results = {
+        "sklearn pipeline": _latencies_us(lambda r: pipe.predict_proba(pd.DataFrame([r])), records),
+        "compiled scorer": _latencies_us(scorer.predict_proba, records),
+    }
+    for name, timings in results.items():
+        p50, p99 = np.percentile(timings, [50, 99])
+        print(f"{name:>18}: p50 {p50:9.1f} us  p99 {p99:9.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# bench_feature_store.py
+# Seconds of the fit (10-fold grid search over C) and evaluate stages, preprocessing
+# DataFrames for every fit versus reading matrices materialised once per fold.
+
+import click
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+
+
+def _pipeline_stages(data_train, data_test, n_jobs, features_dir):
+    # 06_model_fitting.py and 07_model_evaluation.py without --features
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from src.make_preprocessor import make_preprocessor, TARGET
+    from src.tune_model import tune_model
+    start = time.perf_counter()
+    pipe = make_pipeline(make_preprocessor(),
+                         LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'))
+    search = tune_model(pipe, {'logisticregression__C': 10.0 ** np.arange(-6, 6)},
+                        data_train.drop(columns=[TARGET]), data_train[TARGET], cv=10, n_jobs=n_jobs)
+    fitted = time.perf_counter()
+    search.best_estimator_.predict(data_test.drop(columns=[TARGET]))
+    return 0.0, fitted - start, time.perf_counter() - fitted
+
+
+def _feature_stages(data_train, data_test, n_jobs, features_dir, materialize=True):
+    # materialize_features.py, then 06 and 07 with --features
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from src.feature_store import materialize_features, FeatureStore
+    from src.tune_model import tune_on_features
+    start = time.perf_counter()
+    if materialize:
+        materialize_features(data_train, data_test, features_dir, folds=10)
+    materialized = time.perf_counter()
+    store = FeatureStore(features_dir)
+    search = tune_on_features(LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'),
+                              {'C': 10.0 ** np.arange(-6, 6)}, store, n_jobs=n_jobs)
+    model = make_pipeline(store.preprocessor(), search.best_estimator_)
+    fitted = time.perf_counter()
+    store.check_preprocessor(model[:-1], data_test)
+    model[-1].predict(store.test()[0])
+    return materialized - start, fitted - materialized, time.perf_counter() - fitted
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="2277,50000", show_default=True,
+              help="Comma-separated numbers of synthetic training rows")
+@click.option('--n-jobs', type=int, default=None, help="Worker processes for the grid search")
+def main(n_rows, n_jobs):
+    """Report materialise, fit and evaluate seconds of each path; "reuse" starts from existing matrices."""
+    import src.feature_store  # noqa: F401 (imports are not part of the stage times)
+    import src.tune_model  # noqa: F401
+    print(f"{'rows':>8} {'path':>10} {'materialise s':>14} {'fit s':>7} {'evaluate s':>11} {'total s':>8}")
+    for size in [int(n) for n in n_rows.split(",")]:
+        data_train, data_test = make_nhanes_frame(size, seed=1), make_nhanes_frame(size // 3, seed=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            features_dir = os.path.join(tmp, "features")
+            runs = [("pipeline", lambda: _pipeline_stages(data_train, data_test, n_jobs, features_dir)),
+                    ("features", lambda: _feature_stages(data_train, data_test, n_jobs, features_dir)),
+                    ("reuse", lambda: _feature_stages(data_train, data_test, n_jobs, features_dir, materialize=False))]
+            for name, run in runs:
+                times = run()
+                print(f"{size:>8} {name:>10} {times[0]:>14.2f} {times[1]:>7.2f} {times[2]:>11.3f} {sum(times):>8.2f}")
+
+if __name__ == '__main__':
+    main()
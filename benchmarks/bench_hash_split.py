@@ -0,0 +1,70 @@
+# bench_hash_split.py
+# Wall time and peak memory of the streaming hash split versus train_test_split on the loaded file.
+
+import click
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import write_nhanes_csv
+
+
+def _reset_peak_rss():
+    # Spawned children inherit the parent's high-water mark; "5" resets it (Linux only)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def _sklearn(input_path, output_dir, n_folds, chunksize):
+    # The code 03_split_preprocess_data.py runs with --engine sklearn
+    from sklearn.model_selection import train_test_split
+    from src.table_io import read_table, write_table
+    _reset_peak_rss()
+    start = time.perf_counter()
+    data = read_table(input_path)
+    data_train, data_test = train_test_split(data, train_size=0.75, stratify=data["age_group"], random_state=42)
+    write_table(data_train, output_dir, "data_train.csv")
+    write_table(data_test, output_dir, "data_test.csv")
+    return time.perf_counter() - start, _peak_rss_mb()
+
+
+def _hash(input_path, output_dir, n_folds, chunksize):
+    from src.hash_split import hash_split
+    _reset_peak_rss()
+    start = time.perf_counter()
+    hash_split(input_path, output_dir, n_folds=n_folds, chunksize=chunksize)
+    return time.perf_counter() - start, _peak_rss_mb()
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that peak RSS is not shared between engines
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="1000000,5000000", show_default=True,
+              help="Comma-separated numbers of synthetic rows to split")
+@click.option('--n-folds', type=int, default=10, show_default=True, help="Folds written by the hash split")
+@click.option('--chunksize', type=int, default=100_000, show_default=True, help="Rows per chunk for the hash split")
+def main(n_rows, n_folds, chunksize):
+    """Report split seconds, rows/sec and peak RSS of each engine."""
+    print(f"{'rows':>10} {'engine':>8} {'seconds':>8} {'rows/s':>10} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [int(n) for n in n_rows.split(",")]:
+            input_path = write_nhanes_csv(os.path.join(tmp, "cleaned.csv"), size)
+            for engine, func in [("sklearn", _sklearn), ("hash", _hash)]:
+                seconds, peak_mb = _run_isolated(func, input_path, tmp, n_folds, chunksize)
+                print(f"{size:>10} {engine:>8} {seconds:>8.2f} {size / seconds:>10.0f} {peak_mb:>8.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# bench_incremental_training.py
+# Accuracy, wall time and peak memory of incremental (chunked SGD) training
+# versus fitting the batch logistic regression on the whole file.
+
+import click
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame, write_nhanes_csv
+
+
+def _reset_peak_rss():
+    # Spawned children inherit the parent's high-water mark; "5" resets it (Linux only)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def _batch(train_path, chunksize, epochs):
+    # One fit of the pipeline of 06_model_fitting.py, at a fixed C instead of the tuned one
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from src.make_preprocessor import make_preprocessor, TARGET
+    from src.table_io import read_table
+    _reset_peak_rss()
+    start = time.perf_counter()
+    data = read_table(train_path)
+    pipe = make_pipeline(make_preprocessor(),
+                         LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'))
+    pipe.fit(data.drop(columns=[TARGET]), data[TARGET])
+    return pipe, time.perf_counter() - start, _peak_rss_mb()
+
+
+def _incremental(train_path, chunksize, epochs):
+    from src.incremental_training import fit_incremental
+    _reset_peak_rss()
+    start = time.perf_counter()
+    pipe = fit_incremental(train_path, chunksize=chunksize, epochs=epochs)
+    return pipe, time.perf_counter() - start, _peak_rss_mb()
+
+
+def _fit_and_score(method, train_path, n_test_rows, chunksize, epochs):
+    from sklearn.metrics import accuracy_score, f1_score
+    from src.make_preprocessor import TARGET
+    import src.incremental_training  # noqa: F401 (imports are not part of the fit time)
+    pipe, seconds, peak_mb = (_batch if method == "batch" else _incremental)(train_path, chunksize, epochs)
+    test = make_nhanes_frame(n_test_rows, seed=456)
+    predictions = pipe.predict(test.drop(columns=[TARGET]))
+    return (seconds, peak_mb, accuracy_score(test[TARGET], predictions),
+            f1_score(test[TARGET], predictions, pos_label="Senior"))
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that peak RSS is not shared between methods
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="100000,1000000,5000000", show_default=True,
+              help="Comma-separated numbers of synthetic training rows")
+@click.option('--n-test-rows', type=int, default=100_000, show_default=True, help="Number of synthetic test rows")
+@click.option('--chunksize', type=int, default=100_000, show_default=True, help="Rows per chunk for incremental training")
+@click.option('--epochs', type=int, default=5, show_default=True, help="Passes through the file for incremental training")
+def main(n_rows, n_test_rows, chunksize, epochs):
+    """Report fit seconds, peak RSS, test accuracy and Senior F1 of batch and incremental training."""
+    print(f"{'rows':>10} {'method':>12} {'fit s':>8} {'peak MB':>8} {'accuracy':>9} {'F1':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [int(n) for n in n_rows.split(",")]:
+            train_path = write_nhanes_csv(os.path.join(tmp, f"train_{size}.csv"), size)
+            for method in ["batch", "incremental"]:
+                seconds, peak_mb, accuracy, f1 = _run_isolated(
+                    _fit_and_score, method, train_path, n_test_rows, chunksize, epochs)
+                print(f"{size:>10} {method:>12} {seconds:>8.2f} {peak_mb:>8.0f} {accuracy:>9.3f} {f1:>6.3f}")
+            os.remove(train_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# bench_knn_imputer.py
+# Fit and transform time of the numeric imputer of src/make_preprocessor.py (KD-tree
+# index over the complete rows) at growing numbers of rows, against the brute-force
+# sklearn.impute.KNNImputer where it finishes in reasonable time.
+
+import click
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import NUMERIC_SPEC
+
+
+def make_numeric_frame(n_rows, missing_rate, seed=123):
+    # Only the numeric columns of make_nhanes_frame, cheap enough for 10M rows
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col, (adult_mean, _, std, lower, upper) in NUMERIC_SPEC.items():
+        values = np.clip(rng.normal(adult_mean, std, n_rows), lower, upper).round(2)
+        values[rng.random(n_rows) < missing_rate] = np.nan
+        data[col] = values
+    return pd.DataFrame(data)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="10000,1000000,10000000", show_default=True,
+              help="Comma-separated numbers of rows")
+@click.option('--missing-rate', type=float, default=0.05, show_default=True, help="Fraction of missing values per column")
+@click.option('--max-samples', type=int, default=None,
+              help="Donors kept by the imputer (default: MAX_DONORS of src/make_preprocessor.py; 0 keeps them all)")
+@click.option('--max-brute-rows', type=int, default=20_000, show_default=True,
+              help="Largest number of rows imputed with KNNImputer")
+def main(n_rows, missing_rate, max_samples, max_brute_rows):
+    """Report fit and transform seconds of both imputers for each number of rows."""
+    from sklearn.impute import KNNImputer
+    from src.knn_imputer import IndexedKNNImputer
+    from src.make_preprocessor import MAX_DONORS
+
+    max_samples = MAX_DONORS if max_samples is None else (max_samples or None)
+    print(f"{missing_rate:.0%} missing per column, at most {max_samples or 'all'} donors")
+    print(f"{'rows':>10} {'fit s':>8} {'transform s':>12} {'KNNImputer s':>13}")
+    for n in [int(n) for n in n_rows.split(",")]:
+        data = make_numeric_frame(n, missing_rate)
+        imputer = IndexedKNNImputer(n_neighbors=5, max_samples=max_samples, random_state=123)
+        start = time.perf_counter()
+        imputer.fit(data)
+        fit_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        imputed = imputer.transform(data)
+        transform_seconds = time.perf_counter() - start
+        assert not np.isnan(imputed).any()
+
+        brute = "-"
+        if n <= max_brute_rows:
+            start = time.perf_counter()
+            KNNImputer(n_neighbors=5).fit_transform(data)
+            brute = f"{time.perf_counter() - start:.2f}"
+        print(f"{n:>10} {fit_seconds:>8.2f} {transform_seconds:>12.2f} {brute:>13}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# bench_model_store.py
+# Load time and per-process memory of a large pipeline saved as a pickle versus the model store.
+
+import click
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _memory_mb():
+    # Rss counts shared pages in full in every process; Pss divides them between the sharers
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                fields[parts[0][:-1]] = int(parts[1]) / 1024
+    return fields["Rss"], fields["Pss"]
+
+
+def _save_models(directory, n_features):
+    # Standardised inputs and a linear model: four float64 arrays of n_features values
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from src.model_store import save_model
+    rng = np.random.default_rng(123)
+    X = rng.normal(size=(8, n_features))
+    pipe = make_pipeline(StandardScaler(), LogisticRegression(max_iter=5)).fit(X, [0, 1] * 4)
+    with open(os.path.join(directory, "model.pickle"), 'wb') as f:
+        pickle.dump(pipe, f)
+    save_model(pipe, os.path.join(directory, "model"))
+
+
+def _worker(fmt, directory, n_features, barrier, results):
+    # Import everything up front so that only reading the model is timed
+    import numpy as np
+    import sklearn.linear_model  # noqa: F401
+    import sklearn.pipeline  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+    from src.model_store import load_model
+    row = np.zeros((1, n_features))
+    rss_before, pss_before = _memory_mb()
+    start = time.perf_counter()
+    if fmt == "pickle":
+        with open(os.path.join(directory, "model.pickle"), 'rb') as f:
+            model = pickle.load(f)
+    else:
+        model = load_model(os.path.join(directory, "model"), verify=fmt == "store")
+    load_seconds = time.perf_counter() - start
+    model.predict(row)  # touches every weight
+    # Measure while every worker holds the model, so shared pages are split between them
+    barrier.wait()
+    rss_after, pss_after = _memory_mb()
+    barrier.wait()
+    results.put((load_seconds, rss_after - rss_before, pss_after - pss_before))
+
+
+@click.command()
+@click.option('--n-features', type=int, default=2_000_000, show_default=True,
+              help="Width of the synthetic model; it holds four float64 arrays of this length")
+@click.option('--workers', type=int, default=4, show_default=True,
+              help="Number of processes loading the model at the same time")
+def main(n_features, workers):
+    """Report mean load seconds and extra Rss/Pss MB per worker for each storage format."""
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        with ctx.Pool(1) as pool:
+            pool.apply(_save_models, (directory, n_features))
+        print(f"model weights: {4 * n_features * 8 / 2**20:.0f} MB, {workers} workers")
+        print(f"{'format':>16} {'load s':>8} {'Rss MB':>8} {'Pss MB':>8}")
+        # "store" verifies the checksum on load; "store (no verify)" skips it
+        for fmt in ["pickle", "store", "store (no verify)"]:
+            barrier, results = ctx.Barrier(workers), ctx.Queue()
+            processes = [ctx.Process(target=_worker, args=(fmt, directory, n_features, barrier, results))
+                         for _ in range(workers)]
+            for process in processes:
+                process.start()
+            runs = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+            load_seconds, rss_mb, pss_mb = (sum(values) / workers for values in zip(*runs))
+            print(f"{fmt:>16} {load_seconds:>8.3f} {rss_mb:>8.1f} {pss_mb:>8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# bench_model_tuning.py
+# Wall-clock time of the hyperparameter search in 06_model_fitting.py, before and after
+# parallel folds and preprocessor caching.
+
+import click
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+from src.make_preprocessor import make_preprocessor, TARGET
+from src.tune_model import tune_model
+
+
+@click.command()
+@click.option('--train-data', type=str, default="data/processed/data_train.csv", show_default=True,
+              help="Training data CSV; ignored when --n-rows is given")
+@click.option('--n-rows', type=int, default=None, help="Use this many synthetic rows instead of --train-data")
+@click.option('--n-jobs', type=int, default=-1, show_default=True, help="Processes for the parallel search")
+def main(train_data, n_rows, n_jobs):
+    """Time serial GridSearchCV against tune_model and check that the results are identical."""
+    data = make_nhanes_frame(n_rows) if n_rows else pd.read_csv(train_data)
+    X, y = data.drop(columns=[TARGET]), data[TARGET]
+    pipe = make_pipeline(make_preprocessor(),
+                         LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'))
+    param_grid = {'logisticregression__C': 10.0 ** np.arange(-6, 6)}
+
+    runs = {
+        "serial GridSearchCV": lambda: GridSearchCV(pipe, param_grid, cv=10, return_train_score=True).fit(X, y),
+        f"tune_model(n_jobs={n_jobs}, cached)": lambda: tune_model(pipe, param_grid, X, y, cv=10, n_jobs=n_jobs),
+        "tune_model(successive halving)": lambda: tune_model(pipe, param_grid, X, y, cv=10, n_jobs=n_jobs,
+                                                             strategy="halving", random_state=123),
+    }
+    searches = {}
+    print(f"Tuning on {len(data)} rows")
+    for name, run in runs.items():
+        start = time.perf_counter()
+        searches[name] = run()
+        print(f"{name:>36}: {time.perf_counter() - start:7.2f} s  "
+              f"best_params_={searches[name].best_params_}")
+
+    baseline, tuned = list(searches.values())[:2]
+    same_params = baseline.best_params_ == tuned.best_params_
+    same_scores = all(np.array_equal(np.asarray(baseline.cv_results_[k]), np.asarray(tuned.cv_results_[k]))
+                      for k in baseline.cv_results_ if "time" not in k)
+    print(f"Identical best_params_: {same_params}; identical cv_results_ (excluding timings): {same_scores}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# bench_permutation_importance.py
+# Permutation importance of the fitted pipeline's input columns:
+# sklearn.inspection.permutation_importance (one predict_proba call per column and repeat)
+# versus the stacked batches of src/explain_model.py.
+
+import click
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+
+
+@click.command()
+@click.option('--n-rows', type=int, default=570, show_default=True, help="Size of the test set")
+@click.option('--n-repeats', type=int, default=10, show_default=True, help="Permutations of each column")
+@click.option('--scoring', type=str, default="accuracy", show_default=True, help="Score of both implementations")
+@click.option('--n-jobs', type=int, default=None, help="Worker processes of both implementations")
+def main(n_rows, n_repeats, scoring, n_jobs):
+    """Report the time of both implementations and check that they agree."""
+    from sklearn.inspection import permutation_importance as sklearn_permutation_importance
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from src.explain_model import permutation_importance
+    from src.make_preprocessor import make_preprocessor, TARGET
+
+    train, test = make_nhanes_frame(2000, seed=1), make_nhanes_frame(n_rows, seed=2)
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression(max_iter=2000, class_weight='balanced'))
+    pipe.fit(train.drop(columns=[TARGET]), train[TARGET])
+    X, y = test.drop(columns=[TARGET]), test[TARGET]
+
+    start = time.perf_counter()
+    expected = sklearn_permutation_importance(pipe, X, y, scoring=scoring, n_repeats=n_repeats,
+                                              random_state=123, n_jobs=n_jobs)
+    looped = time.perf_counter() - start
+    start = time.perf_counter()
+    result = permutation_importance(pipe, X, y, scoring=scoring, n_repeats=n_repeats, random_state=123, n_jobs=n_jobs)
+    stacked = time.perf_counter() - start
+
+    print(f"{X.shape[1]} columns x {n_repeats} repeats of {n_rows} rows")
+    print(f"{'scikit-learn':>14}: {looped:8.3f} s")
+    print(f"{'stacked':>14}: {stacked:8.3f} s ({looped / stacked:.1f}x)")
+    print(f"max difference: {np.abs(result.importances - expected.importances).max():.2e}")
+
+if __name__ == '__main__':
+    main()
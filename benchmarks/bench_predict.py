@@ -0,0 +1,74 @@
+# bench_predict.py
+# Throughput and peak memory of streaming prediction versus loading the whole file.
+
+import click
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import write_nhanes_csv
+
+
+def _reset_peak_rss():
+    # Spawned children inherit the parent's high-water mark; "5" resets it (Linux only)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def _load_everything(model_path, input_path, output_path, chunksize):
+    import pandas as pd
+    from src.predict import load_model, predict_frame
+    model = load_model(model_path)
+    _reset_peak_rss()
+    start = time.perf_counter()
+    data = pd.read_csv(input_path)
+    predict_frame(model, data).to_csv(output_path, index=False)
+    return time.perf_counter() - start, _peak_rss_mb()
+
+
+def _streaming(model_path, input_path, output_path, chunksize):
+    from src.predict import load_model, predict_chunks
+    model = load_model(model_path)
+    _reset_peak_rss()
+    start = time.perf_counter()
+    predict_chunks(model, input_path, output_path, chunksize=chunksize)
+    return time.perf_counter() - start, _peak_rss_mb()
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that peak RSS is not shared between paths
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--model-path', type=str, default="results/models/age_prediction_model",
+              show_default=True, help="Path to the saved pipeline")
+@click.option('--n-rows', type=int, default=5_000_000, show_default=True, help="Number of synthetic rows to score")
+@click.option('--chunksize', type=int, default=100_000, show_default=True, help="Rows per chunk for the streaming path")
+def main(model_path, n_rows, chunksize):
+    """Compare rows/sec and peak RSS of `predict_chunks` against a single `read_csv` + `predict`."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = write_nhanes_csv(os.path.join(tmp, "input.csv"), n_rows)
+        results = {
+            "load everything": _run_isolated(_load_everything, model_path, input_path,
+                                             os.path.join(tmp, "full.csv"), chunksize),
+            f"streaming ({chunksize} rows/chunk)": _run_isolated(_streaming, model_path, input_path,
+                                                                  os.path.join(tmp, "stream.csv"), chunksize),
+        }
+
+    print(f"Scored {n_rows} rows")
+    for name, (seconds, peak_rss) in results.items():
+        print(f"{name:>32}: {n_rows / seconds:12,.0f} rows/sec  peak RSS {peak_rss:8.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# bench_render_figures.py
+# Time to produce the three EDA figures: altair_ally charts saved one by one
+# versus pre-aggregated specs rendered with render_figures, then an unchanged rerun.
+
+import click
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+
+
+def _aly(n_rows, output_dir, max_workers):
+    # The code 05_visualize_and_save.py used before render_figures
+    start = time.perf_counter()
+    import altair_ally as aly
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    imported = time.perf_counter()
+    data = make_nhanes_frame(n_rows)
+    built = time.perf_counter()
+    aly.alt.data_transformers.enable('vegafusion')
+    aly.dist(data, color='age_group').save(f"{output_dir}/fig_numeric_feats.png")
+    aly.dist(data, color='age_group', dtype='object').save(f"{output_dir}/fig_categorical_feats.png")
+    correlation = data.select_dtypes(include=['number']).corr()
+    fig, ax = plt.subplots(figsize=(5, 4))
+    ax.imshow(correlation, cmap="Reds", aspect="auto")
+    plt.savefig(f"{output_dir}/fig_feats_heatmap.png")
+    return imported - start, 0.0, time.perf_counter() - built
+
+
+def _render_figures(n_rows, output_dir, max_workers):
+    start = time.perf_counter()
+    from src.render_figures import (numeric_distribution_figure, categorical_distribution_figure,
+                                    correlation_heatmap_figure, render_figures)
+    import altair  # noqa: F401
+    imported = time.perf_counter()
+    data = make_nhanes_frame(n_rows)
+    built = time.perf_counter()
+    figures = [numeric_distribution_figure(data, color='age_group'),
+               categorical_distribution_figure(data, color='age_group'),
+               correlation_heatmap_figure(data)]
+    specs = time.perf_counter()
+    render_figures(figures, output_dir, max_workers=max_workers)
+    return imported - start, specs - built, time.perf_counter() - specs
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that every method pays for its imports and renderer start-up
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="2000,100000", show_default=True,
+              help="Comma-separated numbers of synthetic rows to plot")
+@click.option('--max-workers', type=int, default=None, help="Rendering processes for render_figures")
+def main(n_rows, max_workers):
+    """Report import, spec-building and rendering seconds for each method and size."""
+    print(f"{'rows':>10} {'method':>16} {'import s':>9} {'specs s':>8} {'render s':>9} {'total s':>8}")
+    for size in [int(n) for n in n_rows.split(",")]:
+        with tempfile.TemporaryDirectory() as output_dir:
+            # The second render_figures run finds every figure unchanged
+            for name, func in [("altair_ally", _aly), ("render_figures", _render_figures),
+                               ("unchanged rerun", _render_figures)]:
+                times = _run_isolated(func, size, output_dir, max_workers)
+                print(f"{size:>10} {name:>16} {times[0]:>9.2f} {times[1]:>8.2f} {times[2]:>9.2f} {sum(times):>8.2f}")
+
+if __name__ == '__main__':
+    main()
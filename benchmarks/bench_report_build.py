@@ -0,0 +1,68 @@
+# bench_report_build.py
+# Build time of the Quarto report: executing its Python cells (what Quarto's
+# Jupyter kernel does once per format), and, when Quarto is installed,
+# rendering HTML and PDF one after the other versus concurrently with
+# scripts/render_report.py. Pass an earlier version of the report with
+# --baseline (e.g. `git show REV:reports/age_prediction_report.qmd`) to compare
+# its cells, which loaded the model, with the facts-only cells.
+
+import click
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+REPORT = os.path.join(os.path.dirname(__file__), '..', 'reports', 'age_prediction_report.qmd')
+CELL = re.compile(r"^```\{python\}\n(.*?)^```", re.DOTALL | re.MULTILINE)
+
+
+def _execute_cells(qmd, directory):
+    """Run the report's Python cells in a fresh interpreter from the report's directory; return seconds."""
+    with open(qmd) as f:
+        code = "\n".join(CELL.findall(f.read()))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True)
+    seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"The cells of {qmd} failed:\n{result.stderr[-2000:]}")
+    return seconds
+
+
+def _time(command):
+    start = time.perf_counter()
+    subprocess.run(command, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option('--report', type=str, default=REPORT, show_default=True, help="Path to the Quarto report")
+@click.option('--baseline', type=str, default=None, help="Earlier version of the report whose cells are also timed")
+@click.option('--repeats', type=int, default=5, show_default=True, help="Runs of each; the fastest is reported")
+@click.option('--quarto', type=str, default="quarto", show_default=True, help="Quarto executable")
+def main(report, baseline, repeats, quarto):
+    """Report the seconds spent executing the report's cells, and rendering it when Quarto is installed."""
+    directory = os.path.dirname(os.path.abspath(report))
+    cells = min(_execute_cells(report, directory) for _ in range(repeats))
+    if baseline:
+        before = min(_execute_cells(baseline, directory) for _ in range(repeats))
+        print(f"{'cells (baseline)':>22}: {before:8.3f} s")
+        print(f"{'cells':>22}: {cells:8.3f} s ({before / cells:.1f}x)")
+    else:
+        print(f"{'cells':>22}: {cells:8.3f} s")
+
+    if shutil.which(quarto) is None:
+        print(f"Quarto executable '{quarto}' not found; render times skipped")
+        return
+    script = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'render_report.py')
+    sequential = min(sum(_time([sys.executable, script, f"--report={report}", f"--formats={fmt}",
+                                f"--quarto={quarto}"]) for fmt in ("html", "pdf")) for _ in range(repeats))
+    concurrent = min(_time([sys.executable, script, f"--report={report}", "--formats=html,pdf",
+                            f"--quarto={quarto}"]) for _ in range(repeats))
+    print(f"{'render, one by one':>22}: {sequential:8.3f} s")
+    print(f"{'render, concurrently':>22}: {concurrent:8.3f} s ({sequential / concurrent:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# bench_second_validate_data.py
+# Time of the correlation checks with the NumPy backend versus Deepchecks, including imports.
+
+import click
+import multiprocessing
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+
+
+def _check(backend, n_rows, n_jobs):
+    # Importing is part of the cost of a validation stage, so it is timed too
+    start = time.perf_counter()
+    from src.second_validate_data import second_validate_data
+    if backend == "deepchecks":
+        import deepchecks.tabular  # noqa: F401
+    imported = time.perf_counter()
+    data = make_nhanes_frame(n_rows)
+    checked = time.perf_counter()
+    second_validate_data(data, backend=backend, n_jobs=n_jobs if backend == "numpy" else None)
+    return imported - start, time.perf_counter() - checked
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that no backend finds modules already imported
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="2000,100000,1000000", show_default=True,
+              help="Comma-separated numbers of synthetic rows to check")
+@click.option('--backends', type=str, default="deepchecks,numpy", show_default=True,
+              help="Comma-separated correlation backends to compare")
+@click.option('--n-jobs', type=int, default=None, help="Worker processes for the numpy backend")
+def main(n_rows, backends, n_jobs):
+    """Report import seconds, check seconds and their total for each backend and size."""
+    print(f"{'rows':>10} {'backend':>10} {'import s':>9} {'check s':>8} {'total s':>8}")
+    for size in [int(n) for n in n_rows.split(",")]:
+        for backend in backends.split(","):
+            import_seconds, check_seconds = _run_isolated(_check, backend, size, n_jobs)
+            print(f"{size:>10} {backend:>10} {import_seconds:>9.2f} {check_seconds:>8.2f} "
+                  f"{import_seconds + check_seconds:>8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# bench_serving.py
+# Load generator for scripts/serve.py: closed-loop clients on keep-alive connections
+# POST single records to /predict as fast as the server answers, and the client-side
+# p50/p99 latency and requests per second are reported for each --max-batch-sizes value
+# (1 disables micro-batching). Pass --url to measure a server that is already running.
+
+import asyncio
+import click
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+
+SERVE = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'serve.py')
+
+
+async def _request(reader, writer, method, path, body=b""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _client(host, port, bodies, remaining, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        # Clients share the list of requests still to send
+        while remaining:
+            remaining.pop()
+            body = bodies[len(latencies) % len(bodies)]
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, "POST", "/predict", body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def _load(host, port, bodies, n_requests, concurrency):
+    # Warm up the connections and the model, then measure
+    await asyncio.gather(*[_client(host, port, bodies, [None] * 5, [], {}) for _ in range(concurrency)])
+    latencies, statuses, remaining = [], {}, [None] * n_requests
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, bodies, remaining, latencies, statuses)
+                           for _ in range(concurrency)])
+    seconds = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+    return np.array(latencies) * 1000, seconds, statuses, json.loads(metrics)
+
+
+def _start_server(model_path, max_batch_size, max_wait_ms):
+    process = subprocess.Popen(
+        [sys.executable, SERVE, f"--model-path={model_path}", "--port=0",
+         f"--max-batch-size={max_batch_size}", f"--max-wait-ms={max_wait_ms}"],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise RuntimeError(f"Server did not start: {line!r}")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+@click.command()
+@click.option('--model-path', type=str, default="results/models/age_prediction_model",
+              show_default=True, help="Path to the saved pipeline")
+@click.option('--url', type=str, default=None, help="host:port of a running server (default: start one per batch size)")
+@click.option('--max-batch-sizes', type=str, default="1,64", show_default=True,
+              help="Comma-separated --max-batch-size values of the servers to start")
+@click.option('--max-wait-ms', type=float, default=2.0, show_default=True, help="--max-wait-ms of the servers")
+@click.option('--n-requests', type=int, default=20_000, show_default=True, help="Requests sent per server")
+@click.option('--concurrency', type=int, default=64, show_default=True, help="Concurrent client connections")
+def main(model_path, url, max_batch_sizes, max_wait_ms, n_requests, concurrency):
+    """Report client-side latency percentiles, requests per second and the server's batching metrics."""
+    data = make_nhanes_frame(1000).drop(columns=["age_group"])
+    bodies = [json.dumps(record).encode() for record in data.to_dict(orient="records")]
+
+    print(f"{n_requests} single-record requests over {concurrency} connections")
+    print(f"{'server':>16} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10} {'max queue':>9} {'errors':>6}")
+    for size in [None] if url is not None else max_batch_sizes.split(","):
+        if url is not None:
+            name, process = url, None
+            host, port = url.rsplit(":", 1)
+        else:
+            name, host = f"max batch {size}", "127.0.0.1"
+            process, port = _start_server(model_path, int(size), max_wait_ms)
+        try:
+            latencies, seconds, statuses, metrics = asyncio.run(_load(host, int(port), bodies, n_requests, concurrency))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        p50, p99 = np.percentile(latencies, [50, 99])
+        errors = sum(count for status, count in statuses.items() if status != 200)
+        print(f"{name:>16} {n_requests / seconds:>9.0f} {p50:>8.2f} {p99:>8.2f} "
+              f"{metrics['mean_batch_size'] or 0:>10.1f} {metrics['max_queue_depth']:>9} {errors:>6}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# bench_table_io.py
+# Save/load time and file size of the processed data as CSV, Parquet and Feather.
+
+import click
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame, NHANES_SUBSET_ROWS
+from src.table_io import write_table, read_table, NHANES_DTYPES
+
+
+@click.command()
+@click.option('--scales', type=str, default="1,1000", show_default=True,
+              help="Comma-separated multiples of the NHANES subset size")
+def main(scales):
+    """Time write_table/read_table for each format at each scale and report file sizes."""
+    print(f"{'rows':>10} {'format':>9} {'save s':>8} {'load s':>8} {'size MB':>9}")
+    for scale in [int(s) for s in scales.split(",")]:
+        n_rows = NHANES_SUBSET_ROWS * scale
+        data = make_nhanes_frame(n_rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            for extension in [".csv", ".parquet", ".feather"]:
+                filename = f"data{extension}"
+                start = time.perf_counter()
+                write_table(data, tmp, filename)
+                save_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                # CSV needs its types declared at parse time; the columnar formats store them
+                read_table(os.path.join(tmp, filename), dtypes=NHANES_DTYPES if extension == ".csv" else None)
+                load_seconds = time.perf_counter() - start
+
+                size_mb = os.path.getsize(os.path.join(tmp, filename)) / 1e6
+                print(f"{n_rows:>10} {extension:>9} {save_seconds:>8.3f} {load_seconds:>8.3f} {size_mb:>9.2f}")
+
+if __name__ == '__main__':
+    main()
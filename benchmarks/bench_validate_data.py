@@ -0,0 +1,64 @@
+# bench_validate_data.py
+# Time and extra peak memory of validate_data with the NumPy engine versus pandera.
+
+import click
+import multiprocessing
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import make_nhanes_frame
+
+
+def _reset_peak_rss():
+    # Spawned children inherit the parent's high-water mark; "5" resets it (Linux only)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _rss_mb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+
+
+def _validate(engine, n_rows, categorical):
+    from src.validate_data import validate_data
+    from src.table_io import CATEGORY_LEVELS
+    # Synthetic values are rounded, so a large frame contains some duplicate rows
+    data = make_nhanes_frame(n_rows, missing_rate=0.01).drop_duplicates()
+    if categorical:
+        data = data.astype({col: "category" for col in CATEGORY_LEVELS})
+    _reset_peak_rss()
+    baseline = _rss_mb("VmRSS")
+    start = time.perf_counter()
+    validate_data(data, engine=engine)
+    return len(data), time.perf_counter() - start, _rss_mb("VmHWM") - baseline
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that peak RSS is not shared between engines
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+@click.command()
+@click.option('--n-rows', type=str, default="100000,1000000", show_default=True,
+              help="Comma-separated numbers of synthetic rows to validate")
+@click.option('--engines', type=str, default="pandera,numpy", show_default=True,
+              help="Comma-separated validation engines to compare")
+@click.option('--categorical/--no-categorical', default=False, show_default=True,
+              help="Store the text columns as categoricals, as Parquet/Feather files load them")
+def main(n_rows, engines, categorical):
+    """Report seconds, rows/sec and memory allocated on top of the data for each engine and size."""
+    if categorical and "pandera" in engines.split(","):
+        raise click.BadParameter("the pandera schema requires str columns; use --engines numpy", param_hint="--categorical")
+    print(f"{'rows':>10} {'engine':>8} {'seconds':>8} {'rows/sec':>12} {'extra MB':>9}")
+    for size in [int(n) for n in n_rows.split(",")]:
+        for engine in engines.split(","):
+            rows, seconds, extra_mb = _run_isolated(_validate, engine, size, categorical)
+            print(f"{rows:>10} {engine:>8} {seconds:>8.2f} {rows / seconds:>12,.0f} {extra_mb:>9.1f}")
+
+if __name__ == '__main__':
+    main()
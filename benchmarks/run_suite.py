@@ -0,0 +1,226 @@
+# run_suite.py
+# Time and peak memory of every pipeline stage on synthetic data at multiples of the
+# NHANES subset, saved as JSON and compared with a stored baseline. Exits with an
+# error when a stage is slower or larger than the baseline beyond the tolerance,
+# so it can guard against performance regressions in CI.
+#
+# Each stage runs in a fresh interpreter: its inputs are loaded first (untimed),
+# then the peak RSS is reset and the stage's own work is timed, as in the scripts.
+
+import click
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from synthetic_data import NHANES_SUBSET_ROWS, write_raw_nhanes_csv
+
+STAGES = ["clean_validate", "split", "correlation", "tune", "evaluate", "persist"]
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+RESULTS = os.path.join(os.path.dirname(__file__), "results", "latest.json")
+# Stages shorter or smaller than this against the baseline are never flagged; their noise dominates
+MIN_SECONDS_CHANGE = 0.05
+MIN_MB_CHANGE = 20.0
+# A smaller grid and fewer folds than 06_model_fitting.py, so that the larger scales finish
+TUNE_GRID = [1e-3, 1e-2, 1e-1, 1.0, 1e1, 1e2]
+TUNE_FOLDS = 5
+# Bootstrap resamples of the evaluation stage, as in 07_model_evaluation.py
+BOOTSTRAP_RESAMPLES = 1000
+
+
+def _reset_peak_rss():
+    # Spawned children inherit the parent's high-water mark; "5" resets it (Linux only)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+def _peak_rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+
+
+def _prepare(data_dir, n_rows):
+    # Stage inputs, made once per scale: raw file, cleaned data, split and a fitted pipeline
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import make_pipeline
+    from src.clean_data import clean_data, read_raw
+    from src.make_preprocessor import make_preprocessor, TARGET
+    from src.model_store import save_model
+    from src.table_io import write_table
+    raw_path = write_raw_nhanes_csv(os.path.join(data_dir, "raw.csv"), n_rows)
+    data = clean_data(read_raw(raw_path))
+    write_table(data, data_dir, "cleaned.csv")
+    data_train, data_test = train_test_split(data, train_size=0.75, stratify=data[TARGET], random_state=42)
+    write_table(data_train, data_dir, "data_train.csv")
+    write_table(data_test, data_dir, "data_test.csv")
+    pipe = make_pipeline(make_preprocessor(),
+                         LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'))
+    pipe.fit(data_train.drop(columns=[TARGET]), data_train[TARGET])
+    save_model(pipe, os.path.join(data_dir, "model"))
+    return len(data)
+
+
+def _clean_validate(data_dir):
+    from src.clean_data import clean_data, read_raw
+    from src.validate_data import validate_data
+    return lambda: validate_data(clean_data(read_raw(os.path.join(data_dir, "raw.csv"))))
+
+
+def _split(data_dir):
+    from sklearn.model_selection import train_test_split
+    from src.table_io import read_table, write_table
+    output_dir = tempfile.mkdtemp(dir=data_dir)
+
+    def run():
+        data = read_table(os.path.join(data_dir, "cleaned.csv"))
+        data_train, data_test = train_test_split(data, train_size=0.75, stratify=data["age_group"],
+                                                 random_state=42)
+        write_table(data_train, output_dir, "data_train.csv")
+        write_table(data_test, output_dir, "data_test.csv")
+    return run
+
+
+def _correlation(data_dir):
+    from src.second_validate_data import second_validate_data
+    from src.table_io import read_table
+    data_train = read_table(os.path.join(data_dir, "data_train.csv"))
+    return lambda: second_validate_data(data_train)
+
+
+def _tune(data_dir):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from src.make_preprocessor import make_preprocessor, TARGET
+    from src.table_io import read_table
+    from src.tune_model import tune_model
+    data_train = read_table(os.path.join(data_dir, "data_train.csv"))
+    pipe = make_pipeline(make_preprocessor(),
+                         LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'))
+    return lambda: tune_model(pipe, {'logisticregression__C': TUNE_GRID},
+                              data_train.drop(columns=[TARGET]), data_train[TARGET], cv=TUNE_FOLDS)
+
+
+def _evaluate(data_dir):
+    from src.evaluate_model import evaluate_proba, bootstrap_metrics
+    from src.make_preprocessor import TARGET
+    from src.predict import load_model
+    from src.table_io import read_table
+    model = load_model(os.path.join(data_dir, "model"))
+
+    def run():
+        data_test = read_table(os.path.join(data_dir, "data_test.csv"))
+        proba = model.predict_proba(data_test.drop(columns=[TARGET]))
+        evaluate_proba(data_test[TARGET], proba, model.classes_)
+        bootstrap_metrics(data_test[TARGET], proba, model.classes_, n_resamples=BOOTSTRAP_RESAMPLES)
+    return run
+
+
+def _persist(data_dir):
+    from src.model_store import save_model, load_model
+    from src.persist_object import persist_object
+    model = load_model(os.path.join(data_dir, "model"))
+    output_dir = tempfile.mkdtemp(dir=data_dir)
+
+    def run():
+        persist_object(model[0], output_dir, "age_prediction_preprocessor.pickle")
+        save_model(model, os.path.join(output_dir, "age_prediction_model"))
+        load_model(os.path.join(output_dir, "age_prediction_model"))
+    return run
+
+
+SETUPS = {"clean_validate": _clean_validate, "split": _split, "correlation": _correlation,
+          "tune": _tune, "evaluate": _evaluate, "persist": _persist}
+
+
+def _measure(stage, data_dir):
+    run = SETUPS[stage](data_dir)
+    _reset_peak_rss()
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start, _peak_rss_mb()
+
+
+def _run_isolated(func, *args):
+    # A fresh interpreter per run so that peak RSS and warm caches are not shared between stages
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Return a message for each stage and scale slower or larger than in the baseline beyond the tolerance."""
+    previous = {(entry["stage"], entry["scale"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results["results"]:
+        base = previous.get((entry["stage"], entry["scale"]))
+        if base is None:
+            continue
+        for key, unit, tolerance, floor in [("seconds", "s", time_tolerance, MIN_SECONDS_CHANGE),
+                                            ("peak_mb", "MB", memory_tolerance, MIN_MB_CHANGE)]:
+            if entry[key] > base[key] * (1 + tolerance) and entry[key] - base[key] > floor:
+                regressions.append(f"{entry['stage']} at {entry['scale']}x: {entry[key]:.2f} {unit} "
+                                   f"(baseline {base[key]:.2f} {unit})")
+    return regressions
+
+
+@click.command()
+@click.option('--scales', type=str, default="1,100", show_default=True,
+              help="Comma-separated multiples of the NHANES subset's rows (e.g. 1,100,10000)")
+@click.option('--stages', type=str, default=",".join(STAGES), show_default=True, help="Comma-separated stages to run")
+@click.option('--repeats', type=int, default=3, show_default=True, help="Runs per stage; the fastest is kept")
+@click.option('--output', type=str, default=RESULTS, show_default=True, help="JSON file for the results")
+@click.option('--baseline', type=str, default=BASELINE, show_default=True, help="JSON results to compare with")
+@click.option('--save-baseline', is_flag=True, help="Also write the results to --baseline instead of comparing")
+@click.option('--time-tolerance', type=float, default=0.25, show_default=True,
+              help="Flag stages more than this fraction slower than the baseline")
+@click.option('--memory-tolerance', type=float, default=0.25, show_default=True,
+              help="Flag stages whose peak RSS is more than this fraction above the baseline")
+def main(scales, stages, repeats, output, baseline, save_baseline, time_tolerance, memory_tolerance):
+    """Report seconds and peak RSS of each pipeline stage at each scale, and flag regressions."""
+    stages = stages.split(",")
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        raise click.BadParameter(f"unknown stages {unknown}; choose from {STAGES}", param_hint="--stages")
+    results = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "results": [],
+    }
+    print(f"{'stage':>15} {'scale':>7} {'rows':>10} {'seconds':>9} {'peak MB':>8}")
+    for scale in [int(s) for s in scales.split(",")]:
+        with tempfile.TemporaryDirectory() as data_dir:
+            n_rows = _run_isolated(_prepare, data_dir, scale * NHANES_SUBSET_ROWS)
+            for stage in stages:
+                runs = [_run_isolated(_measure, stage, data_dir) for _ in range(repeats)]
+                seconds, peak_mb = min(runs)
+                results["results"].append({"stage": stage, "scale": scale, "rows": n_rows,
+                                           "seconds": round(seconds, 4), "peak_mb": round(peak_mb, 1)})
+                print(f"{stage:>15} {scale:>7} {n_rows:>10} {seconds:>9.3f} {peak_mb:>8.0f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"Results saved to {output}")
+    if save_baseline:
+        with open(baseline, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Baseline saved to {baseline}")
+        return
+    if not os.path.exists(baseline):
+        print(f"No baseline at {baseline}; run with --save-baseline to create one")
+        return
+    with open(baseline) as f:
+        regressions = compare(results, json.load(f), time_tolerance, memory_tolerance)
+    if regressions:
+        raise click.ClickException("regressions against the baseline: " + "; ".join(regressions))
+    print("No regressions against the baseline")
+
+if __name__ == '__main__':
+    main()
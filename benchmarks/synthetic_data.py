@@ -0,0 +1,147 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Category frequencies and per-age-group means taken from data/processed/cleaned.csv
+AGE_GROUP_P = {"Adult": 0.84, "Senior": 0.16}
+GENDER_P = {"Female": 0.512, "Male": 0.488}
+ACTIVITY_P = {"No": 0.82, "Yes": 0.18}
+DIABETIC_P = {"No": 0.965, "Borderline": 0.025, "Yes": 0.01}
+
+# (mean for Adult, mean for Senior, std, lower bound, upper bound)
+NUMERIC_SPEC = {
+    "bmi": (27.97, 27.89, 7.2, 14.5, 70.1),
+    "blood_glucose_fasting": (98.6, 104.3, 17.9, 63.0, 405.0),
+    "oral": (110.0, 141.2, 47.0, 40.0, 604.0),
+    "insulin_level": (12.1, 10.4, 9.7, 0.14, 102.29),
+}
+
+NHANES_SUBSET_ROWS = 2277
+
+
+def _choice(rng, probabilities, n_rows):
+    labels = np.array(list(probabilities))
+    p = np.array(list(probabilities.values()))
+    return labels[rng.choice(len(labels), size=n_rows, p=p / p.sum())]
+
+
+def make_nhanes_frame(n_rows: int, seed: int = 123, missing_rate: float = 0.0):
+    """
+    Generate a synthetic DataFrame shaped like `data/processed/cleaned.csv`.
+
+    Values respect the ranges and categories enforced by `src.validate_data`,
+    and the numeric means differ between age groups so that a classifier has
+    some signal to learn.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows to generate.
+    seed : int, optional
+        Seed for the random number generator. Default is 123.
+    missing_rate : float, optional
+        Fraction of values set to NaN in each nullable column. Default is 0.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The synthetic data, with the same column order as `cleaned.csv`.
+    """
+    rng = np.random.default_rng(seed)
+    age_group = _choice(rng, AGE_GROUP_P, n_rows)
+    senior = age_group == "Senior"
+
+    data = {
+        "age_group": age_group,
+        "gender": _choice(rng, GENDER_P, n_rows),
+        "weekly_physical_activity": _choice(rng, ACTIVITY_P, n_rows),
+    }
+    for col, (adult_mean, senior_mean, std, lower, upper) in NUMERIC_SPEC.items():
+        mean = np.where(senior, senior_mean, adult_mean)
+        data[col] = np.clip(rng.normal(mean, std), lower, upper).round(2)
+    data["diabetic"] = _choice(rng, DIABETIC_P, n_rows)
+
+    frame = pd.DataFrame(data)[[
+        "age_group", "gender", "weekly_physical_activity", "bmi",
+        "blood_glucose_fasting", "diabetic", "oral", "insulin_level"
+    ]]
+    if missing_rate > 0:
+        for col in frame.columns.drop("age_group"):
+            frame.loc[rng.random(n_rows) < missing_rate, col] = np.nan
+    return frame
+
+
+def write_nhanes_csv(path: str, n_rows: int, seed: int = 123, chunksize: int = 1_000_000):
+    """
+    Write `n_rows` synthetic rows to a CSV file without holding them all in memory.
+
+    Parameters
+    ----------
+    path : str
+        Destination CSV file.
+    n_rows : int
+        Number of rows to write.
+    seed : int, optional
+        Base seed; each chunk uses `seed + chunk number`. Default is 123.
+    chunksize : int, optional
+        Number of rows generated at a time. Default is 1,000,000.
+
+    Returns
+    -------
+    str
+        The path written to.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    written = 0
+    chunk_number = 0
+    while written < n_rows or chunk_number == 0:
+        size = min(chunksize, n_rows - written)
+        chunk = make_nhanes_frame(size, seed=seed + chunk_number)
+        chunk.to_csv(path, mode='w' if chunk_number == 0 else 'a',
+                     header=chunk_number == 0, index=False)
+        written += size
+        chunk_number += 1
+    return path
+
+
+# Codes used by the raw NHANES file for the decoded categorical columns
+RAW_CODES = {
+    "gender": {"Male": 1.0, "Female": 2.0},
+    "weekly_physical_activity": {"Yes": 1.0, "No": 2.0},
+    "diabetic": {"Yes": 1.0, "No": 2.0, "Borderline": 3.0},
+}
+RAW_HEADER = ["SEQN", "age_group", "RIDAGEYR", "RIAGENDR", "PAQ605", "BMXBMI", "LBXGLU", "DIQ010", "LBXGLT", "LBXIN"]
+
+
+def write_raw_nhanes_csv(path: str, n_rows: int, seed: int = 123):
+    """
+    Write synthetic rows in the layout of `data/raw/NHANES_age_prediction.csv`.
+
+    Rows are generated with `make_nhanes_frame`, with duplicates removed so
+    that the file passes validation, then encoded back to the raw codes with
+    a sequence number and an age. The whole frame is generated in memory.
+
+    Parameters
+    ----------
+    path : str
+        Destination CSV file.
+    n_rows : int
+        Number of rows to generate before duplicates are removed.
+    seed : int, optional
+        Seed for the random number generator. Default is 123.
+
+    Returns
+    -------
+    str
+        The path written to.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    frame = make_nhanes_frame(n_rows, seed=seed).drop_duplicates()
+    for col, codes in RAW_CODES.items():
+        frame[col] = frame[col].map(codes)
+    rng = np.random.default_rng(seed)
+    senior = (frame["age_group"] == "Senior").to_numpy()
+    frame.insert(0, "id", np.arange(len(frame), dtype=float) + 73557)
+    frame.insert(2, "age", np.where(senior, rng.integers(65, 81, len(frame)), rng.integers(12, 65, len(frame))).astype(float))
+    frame.to_csv(path, header=RAW_HEADER, index=False)
+    return path
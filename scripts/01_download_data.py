@@ -1,25 +1,40 @@
-import requests
-import zipfile
 import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 import click
+from src.instrumentation import instrumented, step
 
 @click.command()
 @click.option('--url', type=str, required=True, help='URL of the dataset to download.')
 @click.option('--output_dir', type=str, required=True, help='Directory to save the extracted data.')
-def download_data(url, output_dir):
+@click.option('--manifest', type=str, default="data/download_manifest.json", show_default=True,
+              help='JSON manifest with the SHA-256 digest of the archive and the members to extract.')
+@click.option('--timeout', type=float, default=30, show_default=True,
+              help='Seconds to wait for the server before retrying.')
+@instrumented("download")
+def download_data(url, output_dir, manifest, timeout):
     """
     Downloads and extracts the dataset from the given URL.
+
+    The archive is streamed to disk, resumed if interrupted and checked
+    against its SHA-256 digest in the manifest; a verified archive already
+    in output_dir is not downloaded again.
     """
+    from src.download_data import load_manifest, download_file, extract_members
+
     zip_path = os.path.join(output_dir, "data.zip")
     os.makedirs(output_dir, exist_ok=True)
+    entry = load_manifest(manifest, os.path.basename(zip_path))
 
-    response = requests.get(url)
-    with open(zip_path, 'wb') as f:
-        f.write(response.content)
-    print(f"Downloaded dataset to {zip_path}")
+    with step("download"):
+        downloaded = download_file(url, zip_path, entry["sha256"], timeout=timeout)
+    if downloaded:
+        print(f"Downloaded dataset to {zip_path}")
+    else:
+        print(f"Verified dataset already at {zip_path}")
 
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(output_dir)
+    with step("extract"):
+        extract_members(zip_path, entry["members"], output_dir)
     print(f"Extracted data to {output_dir}")
 
 if __name__ == "__main__":
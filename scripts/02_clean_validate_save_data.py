@@ -2,37 +2,49 @@ import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 import click
-import pandas as pd
-from src.validate_data import validate_data
+from src.choices import DUPLICATE_MODES
+from src.instrumentation import instrumented, step
 
 
 @click.command()
 @click.option('--input_path', type=str, required=True, help='Path to the raw data file.')
-@click.option('--output_path', type=str, required=True, help='Path to save the cleaned data.')
-def clean_and_save_data(input_path, output_path):
+@click.option('--output_path', type=str, required=True, help='Path to save the cleaned data (.csv, .parquet or .feather).')
+@click.option('--chunksize', type=int, default=None,
+              help='Clean, validate and write the data this many rows at a time instead of loading it all (.csv or .parquet output).')
+@click.option('--duplicates', type=click.Choice(DUPLICATE_MODES), default="hash", show_default=True,
+              help='With --chunksize, remember earlier rows as exact hashes or in an approximate Bloom filter.')
+@instrumented("clean_validate")
+def clean_and_save_data(input_path, output_path, chunksize, duplicates):
     """
     Cleans the raw data, validates it, and then saves it as a processed file.
     """
-    col_names = [
-        "id", "age_group", "age", "gender", "weekly_physical_activity",
-        "bmi", "blood_glucose_fasting", "diabetic", "oral", "insulin_level"
-    ]
-    
-    # Load the data
-    data = pd.read_csv(input_path, names=col_names, skiprows=1).drop(columns=["id", "age"])
-    data["gender"] = data["gender"].replace({1: "Male", 2: "Female"})
-    data["weekly_physical_activity"] = data["weekly_physical_activity"].replace({1: "Yes", 2: "No"})
-    data["diabetic"] = data["diabetic"].replace({1: "Yes", 2: "No", 3: "Borderline"})
-    data = data[data["weekly_physical_activity"] != 7.0]
+    from src.clean_data import clean_data, read_raw
+    from src.validate_data import validate_data, validate_chunks
+    from src.table_io import write_table, TableWriter
 
-    # Validate the cleaned data using the validation function from validate_data
-    validated_data = validate_data(data)
-    
     # Ensure the output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if chunksize is not None:
+        # One streaming pass; the output only replaces output_path if every chunk validates
+        with step("stream"), TableWriter(output_path) as writer:
+            reader = read_raw(input_path, chunksize=chunksize)
+            for chunk in validate_chunks((clean_data(raw) for raw in reader), duplicates=duplicates):
+                writer.write(chunk)
+        print(f"Cleaned data saved to {output_path}")
+        return
+
+    # Load the data
+    with step("read_clean"):
+        data = clean_data(read_raw(input_path))
+
+    # Validate the cleaned data using the validation function from validate_data
+    with step("validate"):
+        validated_data = validate_data(data)
     
-    # Save the validated data
-    validated_data.to_csv(output_path, index=False)
+    # Save the validated data in the format given by the file extension
+    with step("write"):
+        write_table(validated_data, os.path.dirname(output_path), os.path.basename(output_path))
     print(f"Cleaned data saved to {output_path}")
 
 if __name__ == "__main__":
@@ -1,36 +1,70 @@
 import os
+import sys
 import click
-import pandas as pd
-from sklearn.model_selection import train_test_split
-import numpy as np
-from sklearn import set_config
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.choices import SPLIT_ENGINES
+from src.instrumentation import instrumented, step
 
 @click.command()
-@click.option('--input_path', type=str, required=True, help='Path to the cleaned data file.')
+@click.option('--input_path', type=str, required=True, help='Path to the cleaned data file (.csv, .parquet or .feather).')
 @click.option('--output_dir', type=str, required=True, help='Directory to save the split datasets.')
 @click.option('--seed', type=int, required=True, help='Random seed for reproducibility.')
-def split_preprocess_data(input_path, output_dir, seed):
+@click.option('--engine', type=click.Choice(SPLIT_ENGINES), default="sklearn", show_default=True,
+              help='Split in memory with train_test_split, or stream the file and assign rows by hash.')
+@click.option('--n-folds', type=int, default=0, show_default=True,
+              help='With --engine hash, also write the cross-validation fold of each training row.')
+@click.option('--chunksize', type=int, default=100_000, show_default=True,
+              help='With --engine hash, number of rows read at a time.')
+@instrumented("split")
+def split_preprocess_data(input_path, output_dir, seed, engine, n_folds, chunksize):
     """
-    Splits the cleaned data into training and testing datasets and saves them.
+    Splits the cleaned data into training and testing datasets and saves them
+    in the same format as the input file.
+
+    With --engine hash, the file is streamed (CSV or Parquet only) and each
+    row is assigned by a hash of its values and the seed, stratified by
+    age_group; --n-folds also writes data_train_folds with the fold of each
+    training row, for 06_model_fitting.py --folds.
     """
+    if engine == "hash":
+        from src.hash_split import hash_split
+        os.makedirs(output_dir, exist_ok=True)
+        with step("hash_split"):
+            summary = hash_split(input_path, output_dir, test_size=0.25, n_folds=n_folds, seed=seed,
+                                 chunksize=chunksize)
+        print(summary.to_string())
+        print(f"Split data saved to {output_dir}")
+        return
+    if n_folds:
+        raise click.UsageError("--n-folds requires --engine hash")
+
+    import numpy as np
+    from sklearn import set_config
+    from sklearn.model_selection import train_test_split
+    from src.table_io import read_table, write_table, table_format
+
     np.random.seed(seed)
     set_config(transform_output="pandas")
     
     # Load data
-    data = pd.read_csv(input_path)
+    with step("read"):
+        data = read_table(input_path)
 
     # Split the data
-    data_train, data_test = train_test_split(
-        data, train_size=0.75, stratify=data["age_group"], random_state=42
-    )
+    with step("split"):
+        data_train, data_test = train_test_split(
+            data, train_size=0.75, stratify=data["age_group"], random_state=42
+        )
 
     # Save datasets
-    train_path = os.path.join(output_dir, "data_train.csv")
-    test_path = os.path.join(output_dir, "data_test.csv")
+    extension = table_format(input_path)
+    train_path = os.path.join(output_dir, f"data_train{extension}")
+    test_path = os.path.join(output_dir, f"data_test{extension}")
     os.makedirs(output_dir, exist_ok=True)
 
-    data_train.to_csv(train_path, index=False)
-    data_test.to_csv(test_path, index=False)
+    with step("write"):
+        write_table(data_train, output_dir, f"data_train{extension}")
+        write_table(data_test, output_dir, f"data_test{extension}")
 
     print(f"Training data saved to {train_path}")
     print(f"Testing data saved to {test_path}")
@@ -1,33 +1,53 @@
 import os
 import sys
-import pandas as pd
 import click
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.second_validate_data import second_validate_data 
+from src.choices import CORRELATION_BACKENDS
+from src.instrumentation import instrumented, step
 
 @click.command()
-@click.option('--data_train_path', type=str, required=True, help='Path to the training data CSV file.')
-def simple_eda_with_validation(data_train_path):
+@click.option('--data_train_path', type=str, required=True, help='Path to the training data file (.csv, .parquet or .feather).')
+@click.option('--backend', type=click.Choice(CORRELATION_BACKENDS), default="numpy", show_default=True,
+              help='Implementation of the correlation checks.')
+@click.option('--summary-to', type=str, default=None,
+              help='Directory to save the summary to (eda_summary.json and eda_summary.parquet).')
+@click.option('--chunksize', type=int, default=100_000, show_default=True,
+              help='Number of rows summarised at a time.')
+@click.option('--max-workers', type=int, default=None,
+              help='Number of processes summarising chunks. Defaults to the number of CPUs.')
+@instrumented("eda")
+def simple_eda_with_validation(data_train_path, backend, summary_to, chunksize, max_workers):
     """
     Performs simple EDA and validation checks.
+
+    The counts, missing rates, moments, quantiles, value frequencies and
+    correlations of every column are computed in one streaming pass over the
+    file (see `src.eda_summary`), and saved for the figures and the report
+    when `summary_to` is given.
     """
-    # Load data
-    data_train = pd.read_csv(data_train_path)
+    from src.eda_summary import summarize_table, save_summary, format_summary
+    from src.second_validate_data import second_validate_data
+    from src.table_io import read_table
 
-    # Basic dataset overview
-    print("\nDataset Info:")
-    print(data_train.info())
-    print("\nDataset Description:")
-    print(data_train.describe())
+    with step("summary"):
+        summary = summarize_table(data_train_path, chunksize=chunksize, max_workers=max_workers)
+        content = summary.to_dict()
+        print("\nDataset Summary:")
+        print(format_summary(content))
+    if summary_to is not None:
+        with step("save_summary"):
+            os.makedirs(summary_to, exist_ok=True)
+            save_summary(summary, summary_to)
+        print(f"\nSaved summary to {summary_to}")
 
-    # Value counts for categorical columns
-    for col in ["age_group", "gender", "diabetic", "weekly_physical_activity"]:
-        print(f"\nValue Counts for {col}:")
-        print(data_train[col].value_counts())
+    # Load data
+    with step("read"):
+        data_train = read_table(data_train_path)
 
     # Validation checks
     print("\nRunning correlation validation checks...")
-    second_validate_data(data_train)
+    with step("correlation_checks"):
+        second_validate_data(data_train, backend=backend)
 
     print("\nSimple EDA and validation completed successfully.")
 
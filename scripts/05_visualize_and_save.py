@@ -1,51 +1,46 @@
-import pandas as pd
 import click
-import matplotlib.pyplot as plt
-import altair as alt
-import altair_ally as aly
 import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.instrumentation import instrumented, step
 
 @click.command()
-@click.option('--data_train_path', type=str, required=True, help='Path to the training data CSV file.')
+@click.option('--data_train_path', type=str, required=True, help='Path to the training data file (.csv, .parquet or .feather).')
 @click.option('--output_dir', type=str, required=True, help='Directory to save the visualizations.')
-def visualize_data(data_train_path, output_dir):
+@click.option('--max-workers', type=int, default=None, help='Number of processes rendering figures. Defaults to the number of CPUs.')
+@click.option('--summary', 'summary_path', type=str, default=None,
+              help='EDA summary (eda_summary.json) to draw the correlation heatmap from, instead of the data.')
+@click.option('--force', is_flag=True, help='Render every figure, even those whose data has not changed.')
+@instrumented("visualize")
+def visualize_data(data_train_path, output_dir, max_workers, summary_path, force):
     """
     Creates visualizations and saves figures as PNG files.
     """
-    # Load data
-    data_train = pd.read_csv(data_train_path)
-
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Enable VegaFusion for Altair
-    aly.alt.data_transformers.enable('vegafusion')
-
-    # Distribution plot for numerical features
-    aly.dist(data_train, color='age_group').save(f"{output_dir}/fig_numeric_feats.png")
-    aly.dist(data_train, color='age_group', dtype='object').save(f"{output_dir}/fig_categorical_feats.png")
-
-    print(f"Saved distribution plots to {output_dir}")
+    from src.table_io import read_table
+    from src.eda_summary import load_summary
+    from src.render_figures import (numeric_distribution_figure, categorical_distribution_figure,
+                                    correlation_heatmap_figure, summary_heatmap_figure,
+                                    render_figures, format_render_report)
 
-    # Correlation heatmap
-    numerical_features = data_train.select_dtypes(include=['float64']).columns
-    correlation_matrix = data_train[numerical_features].corr()
-
-    fig, ax = plt.subplots(figsize=(5, 4))
-    im = ax.imshow(correlation_matrix, cmap="Reds", aspect="auto")
-
-    ax.set_xticks(range(len(numerical_features)))
-    ax.set_yticks(range(len(numerical_features)))
-    ax.set_xticklabels(numerical_features, rotation=45, ha="right")
-    ax.set_yticklabels(numerical_features)
-    plt.colorbar(im, ax=ax)
-    plt.title("Feature-Feature Correlation Heatmap", fontsize=14)
-    plt.tight_layout()
-
-    # Save the heatmap
-    heatmap_path = f"{output_dir}/fig_feats_heatmap.png"
-    plt.savefig(heatmap_path)
-    print(f"Saved heatmap to {heatmap_path}")
+    # Load data
+    with step("read"):
+        data_train = read_table(data_train_path)
+        # Parquet/Feather files store categoricals; plot them like the strings read from CSV
+        data_train = data_train.astype({col: object for col in data_train.select_dtypes('category').columns})
+
+    # Build every figure first, then render those whose data changed
+    with step("build_figures"):
+        figures = [
+            numeric_distribution_figure(data_train, color='age_group'),
+            categorical_distribution_figure(data_train, color='age_group'),
+            correlation_heatmap_figure(data_train) if summary_path is None
+            else summary_heatmap_figure(load_summary(summary_path)),
+        ]
+    with step("render"):
+        report = render_figures(figures, output_dir, max_workers=max_workers, force=force)
+
+    print(format_render_report(report))
+    print(f"Saved figures to {output_dir}")
 
 if __name__ == "__main__":
     visualize_data()
@@ -1,26 +1,38 @@
 import click
 import os
-import numpy as np
-import pandas as pd
-import altair as alt
-from sklearn.preprocessing import StandardScaler, OrdinalEncoder, OneHotEncoder
-from sklearn.pipeline import make_pipeline
-from sklearn.compose import make_column_transformer
-from sklearn.linear_model import LogisticRegression
-from sklearn.impute import SimpleImputer
-from sklearn.model_selection import GridSearchCV, train_test_split
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.persist_object import persist_object
+from src.choices import SEARCH_STRATEGIES, TRAINING_MODES
+from src.instrumentation import instrumented, step
 
 @click.command()
-@click.option('--train-data', type=str, help="Path to training data")
+@click.option('--train-data', type=str, help="Path to training data (.csv, .parquet or .feather)")
 @click.option('--preprocessor-to', type=str, help="Path to save the preprocessor object")
-@click.option('--pipeline-to', type=str, help="Path to save the trained pipeline object")
+@click.option('--pipeline-to', type=str, help="Directory in which to save the trained pipeline")
 @click.option('--plot-to', type=str, help="Path to save the training plot")
 @click.option('--seed', type=int, default=123, help="Random seed")
-
-def main(train_data, preprocessor_to, pipeline_to, plot_to, seed):
+@click.option('--n-jobs', type=int, default=None, help="Number of processes for cross-validation (-1 for all cores)")
+@click.option('--search', type=click.Choice(SEARCH_STRATEGIES), default="grid", show_default=True,
+              help="Exhaustive grid search or successive halving")
+@click.option('--cache-preprocessor/--no-cache-preprocessor', default=True, show_default=True,
+              help="Fit the preprocessor once per fold instead of once per fold and value of C")
+@click.option('--training', type=click.Choice(TRAINING_MODES), default="batch", show_default=True,
+              help="Tune a logistic regression in memory, or stream the file through an SGD classifier")
+@click.option('--chunksize', type=int, default=100_000, show_default=True,
+              help="Rows read at a time with --training incremental")
+@click.option('--epochs', type=int, default=5, show_default=True,
+              help="Passes through the file with --training incremental")
+@click.option('--folds', type=str, default=None,
+              help="Fold file written by 03_split_preprocess_data.py --n-folds, used instead of 10 random folds")
+@click.option('--features', type=str, default=None,
+              help="Directory written by materialize_features.py; tune on its matrices instead of --train-data")
+@click.option('--fit-cache', type=str, default=None,
+              help="Directory of fitted pipelines keyed by the training data and configuration; reused instead of refitting")
+@click.option('--fit-cache-size', type=int, default=8, show_default=True,
+              help="Fitted pipelines kept in --fit-cache before the least recently used are removed")
+@instrumented("fit")
+def main(train_data, preprocessor_to, pipeline_to, plot_to, seed, n_jobs, search, cache_preprocessor,
+         training, chunksize, epochs, folds, features, fit_cache, fit_cache_size):
     """
     Train and Evaluate a Logistic Regression Model.
 
@@ -33,17 +45,44 @@ def main(train_data, preprocessor_to, pipeline_to, plot_to, seed):
             along with the target column `age_group`. Example: "data/train.csv".
         preprocessor_to (str): File path to save the preprocessing pipeline object 
             (`preprocessor`) in pickle format. Example: "models/preprocessor.pkl".
-        pipeline_to (str): File path to save the trained pipeline (preprocessor + 
-            logistic regression model) in pickle format. Example: "models/model_pipeline.pkl".
+        pipeline_to (str): Directory in which to save the trained pipeline (preprocessor + 
+            logistic regression model) as an `age_prediction_model` model store
+            (see `src.model_store`). Example: "models".
         plot_to (str): File path to save the Altair plot comparing training and cross-validation 
             scores as an HTML file. Example: "results/train_vs_cv_plot.html".
         seed (int, optional): Random seed for reproducibility. Defaults to 123.
+        n_jobs (int, optional): Number of processes used to fit the cross-validation 
+            folds in parallel; -1 uses all cores. Defaults to None (serial).
+        search (str, optional): "grid" for an exhaustive `GridSearchCV` or "halving" for 
+            successive halving. Defaults to "grid".
+        cache_preprocessor (bool, optional): Cache the fitted preprocessor per fold so it 
+            is not refitted for every value of C. Defaults to True.
+        training (str, optional): "batch" loads the training data and tunes C with 
+            cross-validation; "incremental" streams it in chunks through 
+            `src.incremental_training.fit_incremental`, with no tuning and no plot. 
+            Defaults to "batch".
+        chunksize (int, optional): Rows read at a time in incremental training. Defaults to 100000.
+        epochs (int, optional): Passes through the training data in incremental training. 
+            Defaults to 5.
+        folds (str, optional): Path to the `data_train_folds` file written with the training 
+            data by `03_split_preprocess_data.py --engine hash --n-folds K`; its folds are 
+            used for cross-validation. Defaults to None (10 stratified folds).
+        features (str, optional): Directory written by `materialize_features.py`. The grid 
+            search then reads its precomputed fold matrices (with its folds) instead of 
+            preprocessing `train_data` for every candidate. Defaults to None.
+        fit_cache (str, optional): Directory of a `src.fit_cache.FitCache`. The tuned pipeline 
+            and its cross-validation results are stored there under a fingerprint of the 
+            training data, folds, pipeline configuration, grid, search and seed; a later run 
+            with the same fingerprint loads them instead of tuning again. Only used in batch 
+            training without `features`. Defaults to None (always tune).
+        fit_cache_size (int, optional): Number of fitted pipelines kept in `fit_cache`; the 
+            least recently used are removed. Defaults to 8.
 
     Returns:
         None: This function performs the following side effects:
             - Saves the preprocessing pipeline to `preprocessor_to`.
-            - Saves the trained pipeline (preprocessor + model) to `pipeline_to`.
-            - Exports an interactive Altair plot to `plot_to`.
+            - Saves the trained pipeline (preprocessor + model) to `pipeline_to/age_prediction_model`.
+            - Exports an interactive Altair plot to `plot_to` (batch training only).
 
     Example:
         main(
@@ -54,33 +93,34 @@ def main(train_data, preprocessor_to, pipeline_to, plot_to, seed):
             seed=42
         )
     """
+    if training == "incremental":
+        from src.persist_object import persist_object
+        from src.model_store import save_model
+        from src.incremental_training import fit_incremental
+
+        # Stream the training file; only one chunk is in memory at a time
+        with step("fit_incremental"):
+            pipe = fit_incremental(train_data, chunksize=chunksize, epochs=epochs, random_state=seed)
+        with step("save"):
+            persist_object(pipe[0], preprocessor_to, "age_prediction_preprocessor.pickle")
+            save_model(pipe, os.path.join(pipeline_to, "age_prediction_model"))
+        return
+
+    import numpy as np
+    import pandas as pd
+    import altair as alt
+    from sklearn.pipeline import make_pipeline
+    from sklearn.linear_model import LogisticRegression
+    from src.persist_object import persist_object
+    from src.model_store import save_model
+    from src.table_io import read_table
+    from src.make_preprocessor import make_preprocessor, TARGET
+    from src.tune_model import tune_model
+
     np.random.seed(seed)
-    
-    # Load data
-    data_train = pd.read_csv(train_data)
-    target = 'age_group'
-    X_train, y_train = data_train.drop(columns=[target]), data_train[target]
 
-    # Feature categorization
-    numeric_features = ['bmi', 'blood_glucose_fasting', 'oral', 'insulin_level']
-    categorical_features = ['weekly_physical_activity', 'gender']
-    ordinal_features = ['diabetic']
-    drop_features = []
-    
     # Preprocessing pipelines
-    numeric_transformer = StandardScaler()
-    ordinal_transformer = OrdinalEncoder(categories=[['No', 'Borderline', 'Yes']], dtype=int)
-    categorical_transformer = make_pipeline(
-        SimpleImputer(strategy='constant', fill_value='missing'),
-        OneHotEncoder(handle_unknown='ignore', sparse_output=False)
-    )
-    
-    preprocessor = make_column_transformer(
-        (numeric_transformer, numeric_features),
-        (ordinal_transformer, ordinal_features),
-        (categorical_transformer, categorical_features),
-        ("drop", drop_features),
-    )
+    preprocessor = make_preprocessor(random_state=seed)
     
     # Save preprocessor
     #with open(os.path.join(preprocessor_to, "age_prediction_preprocessor.pickle"), 'wb') as f:
@@ -89,27 +129,79 @@ def main(train_data, preprocessor_to, pipeline_to, plot_to, seed):
     
     # Logistic Regression Pipeline
     lgr_classifier = LogisticRegression(max_iter=2000, random_state=seed, class_weight='balanced')
-    pipe = make_pipeline(preprocessor, lgr_classifier)
-    
-    # Hyperparameter tuning
     param_grid = {'logisticregression__C': 10.0 ** np.arange(-6, 6)}
-    gs_optimize = GridSearchCV(pipe, param_grid, cv=10, return_train_score=True)
-    gs_optimize.fit(X_train, y_train)
+
+    if features is not None:
+        # Tune on the matrices written by materialize_features.py, which also fixed the folds
+        from src.feature_store import FeatureStore
+        from src.tune_model import tune_on_features
+        store = FeatureStore(features)
+        with step("tune"):
+            gs_optimize = tune_on_features(lgr_classifier, {'C': param_grid['logisticregression__C']}, store,
+                                           n_jobs=n_jobs)
+        best_pipeline = make_pipeline(store.preprocessor(), gs_optimize.best_estimator_)
+        cv_results = pd.DataFrame(gs_optimize.cv_results_).rename(columns={"param_C": "param_logisticregression__C"})
+    else:
+        # Load data
+        with step("read"):
+            data_train = read_table(train_data)
+        X_train, y_train = data_train.drop(columns=[TARGET]), data_train[TARGET]
+        pipe = make_pipeline(preprocessor, lgr_classifier)
+
+        # Cross-validation folds: fixed by the split, or 10 stratified folds
+        cv = 10
+        if folds is not None:
+            from sklearn.model_selection import PredefinedSplit
+            fold = read_table(folds)["fold"]
+            if len(fold) != len(data_train):
+                raise ValueError(f"Fold file {folds} has {len(fold)} rows but the training data has {len(data_train)}")
+            cv = PredefinedSplit(fold.to_numpy())
+
+        # Reuse the pipeline tuned by an earlier run on the same data with the same configuration
+        cached = None
+        if fit_cache is not None:
+            from src.fit_cache import FitCache, fit_key
+            cache = FitCache(fit_cache, max_entries=fit_cache_size)
+            with step("fingerprint"):
+                key = fit_key(data_train, pipe, param_grid=param_grid, search=search, seed=seed,
+                              folds=cv if folds is None else fold.to_numpy())
+                cached = cache.get(key)
+
+        if cached is not None:
+            best_pipeline, cv_results = cached
+            print(f"Reusing the pipeline fitted on the same data from {fit_cache}")
+        else:
+            # Hyperparameter tuning
+            with step("tune"):
+                gs_optimize = tune_model(pipe, param_grid, X_train, y_train, cv=cv, n_jobs=n_jobs,
+                                         cache_preprocessor=cache_preprocessor, strategy=search,
+                                         random_state=seed)
+            best_pipeline = gs_optimize.best_estimator_
+            cv_results = pd.DataFrame(gs_optimize.cv_results_)
+            if fit_cache is not None:
+                with step("cache"):
+                    cache.put(key, best_pipeline, cv_results)
     
     # Save the pipeline
     #with open(os.path.join(pipeline_to, "age_prediction_model.pickle"), 'wb') as f:
     #save the best estimator
     #pickle.dump(gs_optimize.best_estimator_, f)   
-    persist_object(gs_optimize.best_estimator_, preprocessor_to, "age_prediction_model.pickle")
+    with step("save"):
+        save_model(best_pipeline, os.path.join(pipeline_to, "age_prediction_model"))
     
     # Plot training vs. CV scores
-    train_scores = gs_optimize.cv_results_["mean_train_score"]
-    cv_scores = gs_optimize.cv_results_["mean_test_score"]
+    # (successive halving scores a candidate once per iteration; keep its last one)
+    if "iter" in cv_results:
+        cv_results = cv_results.sort_values("iter").drop_duplicates("param_logisticregression__C", keep="last")
+    cv_results = cv_results.sort_values("param_logisticregression__C")
+    C_values = np.log10(cv_results["param_logisticregression__C"].astype(float))
+    train_scores = cv_results["mean_train_score"]
+    cv_scores = cv_results["mean_test_score"]
     train_cv_df = pd.concat([
-        pd.DataFrame({'C': np.log10(param_grid["logisticregression__C"]),
+        pd.DataFrame({'C': C_values,
                       'score': train_scores,
                       'score_type': ['Training'] * len(train_scores)}),
-        pd.DataFrame({'C': np.log10(param_grid["logisticregression__C"]),
+        pd.DataFrame({'C': C_values,
                       'score': cv_scores,
                       'score_type': ['Cross Validation'] * len(cv_scores)}),
     ])
@@ -118,8 +210,9 @@ def main(train_data, preprocessor_to, pipeline_to, plot_to, seed):
         y=alt.Y('score', title='Model Score').scale(zero=False),
         color=alt.Color('score_type')
     )
-    plot.save(os.path.join(plot_to, "fig_hyperparameter_c.png"),
-              scale_factor=2.0)
+    with step("plot"):
+        plot.save(os.path.join(plot_to, "fig_hyperparameter_c.png"),
+                  scale_factor=2.0)
 
 if __name__ == '__main__':
     main()
@@ -5,54 +5,95 @@
 import click
 import os
 import sys
-import pandas as pd
-from sklearn.metrics import classification_report, confusion_matrix
-import pickle
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.write_csv import write_csv
+from src.instrumentation import instrumented, step
 
 @click.command()
-@click.option('--model-path', type=str, help="Path to the saved GridSearchCV pipeline (pickle file)")
-@click.option('--test-data', type=str, help="Path to test data")
+@click.option('--model-path', type=str, help="Path to the saved pipeline (model directory, or a pickle file)")
+@click.option('--test-data', type=str, help="Path to test data (.csv, .parquet or .feather)")
 @click.option('--results-to', type=str, help="Path to directory where results will be saved")
-def main(model_path, test_data, results_to):
+@click.option('--features', type=str, default=None,
+              help="Directory written by materialize_features.py; score its test matrix instead of preprocessing --test-data")
+@click.option('--n-bootstrap', type=int, default=1000, show_default=True,
+              help="Bootstrap resamples of the test set for the metric confidence intervals (0 to skip)")
+@click.option('--n-jobs', type=int, default=None, help="Worker processes for the bootstrap; -1 uses all cores")
+@click.option('--seed', type=int, default=123, show_default=True, help="Seed of the bootstrap resampling")
+@instrumented("evaluate")
+def main(model_path, test_data, results_to, features, n_bootstrap, n_jobs, seed):
     """
     Evaluate a pre-trained GridSearchCV pipeline.
 
     Args:
-        model_path (str): Path to the saved GridSearchCV object (pickle file).
+        model_path (str): Path to the saved pipeline: a directory written by
+            `src.model_store.save_model`, or a pickle file from an earlier run.
         test_data (str): Path to the CSV file containing the test dataset. 
             The dataset must include numeric, categorical, and ordinal features, 
             along with the target column `age_group`.
         results_to (str): Directory path where the evaluation results will be saved 
             as CSV files.
+        features (str, optional): Directory written by `materialize_features.py` from the 
+            same training and test data. The model's classifier then scores the stored 
+            test matrix; the first rows are checked against the model's own preprocessor.
+            Defaults to None.
+        n_bootstrap (int): Number of bootstrap resamples of the test set used for the 
+            95% confidence intervals of the metrics; 0 skips the bootstrap. Defaults to 1000.
+        n_jobs (int, optional): Number of worker processes the resamples are spread over. 
+            Defaults to None (serial).
+        seed (int): Seed of the bootstrap resampling. Defaults to 123.
 
     Returns:
-        None: Saves evaluation results (confusion matrix and classification report) as CSV files.
+        None: Saves evaluation results (confusion matrix, classification report, calibration 
+            table and bootstrap confidence intervals) as CSV files, and every number the 
+            report quotes as `report_facts.json`.
     """
-    # Load the GridSearchCV object
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
+    from src.evaluate_model import evaluate_proba, bootstrap_metrics
+    from src.report_facts import report_facts, write_report_facts
+    from src.write_csv import write_csv
+    from src.table_io import read_table
+    from src.predict import load_model
+
+    # Load the fitted pipeline
+    with step("load_model"):
+        model = load_model(model_path)
 
     # Get the best pipeline
     pipe = model
 
     # Load test data
-    data_test = pd.read_csv(test_data)
+    with step("read"):
+        data_test = read_table(test_data)
     target = 'age_group'
     X_test, y_test = data_test.drop(columns=[target]), data_test[target]
 
-    # Predict on test data
-    y_pred_test = pipe.predict(X_test)
+    # Predict the class probabilities of the test data in one pass; every metric is computed from them
+    with step("predict"):
+        if features is not None:
+            from src.feature_store import FeatureStore
+            store = FeatureStore(features)
+            store.check_preprocessor(pipe[:-1], data_test)
+            X_matrix, y_test = store.test()
+            proba = pipe[-1].predict_proba(X_matrix)
+        else:
+            proba = pipe.predict_proba(X_test)
 
     # Evaluate and save results
-    cm = confusion_matrix(y_test, y_pred_test)
-    cm_df = pd.DataFrame(cm, index=pipe.classes_, columns=pipe.classes_)
-    write_csv(cm_df, results_to, "confusion_matrix.csv", index=True)
+    with step("metrics"):
+        scores = evaluate_proba(y_test, proba, pipe.classes_)
+        write_csv(scores.confusion_matrix, results_to, "confusion_matrix.csv", index=True)
+        write_csv(scores.report, results_to, "age_model_report.csv", index=True)
+        write_csv(scores.calibration, results_to, "age_model_calibration.csv")
+    print(f"ROC-AUC: {scores.roc_auc:.3f}, Brier score: {scores.brier:.3f}")
+
+    intervals = None
+    if n_bootstrap > 0:
+        with step("bootstrap"):
+            intervals = bootstrap_metrics(y_test, proba, pipe.classes_, n_resamples=n_bootstrap,
+                                          random_state=seed, n_jobs=n_jobs)
+            write_csv(intervals, results_to, "age_model_bootstrap.csv", index=True)
 
-    report = classification_report(y_test, y_pred_test, output_dict=True)
-    report_df = pd.DataFrame(report).transpose()
-    write_csv(report_df, results_to, "age_model_report.csv", index=True)
+    # The report reads its numbers from here, without loading the model
+    with step("report_facts"):
+        write_report_facts(report_facts(pipe, scores, intervals), results_to)
 
 
 if __name__ == '__main__':
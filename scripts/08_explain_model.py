@@ -0,0 +1,69 @@
+# 08_explain_model.py
+# Explain the fitted pipeline: permutation importance of each input column on
+# the test set, and each column's contribution to every test prediction.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.instrumentation import instrumented, step
+
+@click.command()
+@click.option('--model-path', type=str, required=True, help="Path to the saved pipeline (model directory, or a pickle file)")
+@click.option('--test-data', type=str, required=True, help="Path to test data (.csv, .parquet or .feather)")
+@click.option('--results-to', type=str, required=True, help="Path to directory where results will be saved")
+@click.option('--scoring', type=click.Choice(["accuracy", "balanced_accuracy", "roc_auc", "neg_log_loss"]),
+              default="accuracy", show_default=True, help="Score whose decrease measures importance")
+@click.option('--n-repeats', type=int, default=10, show_default=True, help="Permutations of each column")
+@click.option('--n-jobs', type=int, default=None, help="Worker processes scoring the permutations; -1 uses all cores")
+@click.option('--seed', type=int, default=123, show_default=True, help="Seed of the permutations")
+@instrumented("explain")
+def main(model_path, test_data, results_to, scoring, n_repeats, n_jobs, seed):
+    """
+    Explain which features drive the predictions of a fitted pipeline.
+
+    Args:
+        model_path (str): Path to the saved pipeline: a directory written by
+            `src.model_store.save_model`, or a pickle file from an earlier run.
+        test_data (str): Path to the test dataset, including the target column `age_group`.
+        results_to (str): Directory path where the results will be saved as CSV files.
+        scoring (str): Score whose decrease when a column is permuted measures its 
+            importance. Defaults to "accuracy".
+        n_repeats (int): Number of permutations of each column. Defaults to 10.
+        n_jobs (int, optional): Number of worker processes the permutations are spread 
+            over. Defaults to None (serial).
+        seed (int): Seed of the permutations. Defaults to 123.
+
+    Returns:
+        None: Saves the permutation importances (`age_model_permutation_importance.csv`) 
+            and the contribution of each column to the log-odds of every test 
+            prediction (`age_model_contributions.csv`).
+    """
+    from src.explain_model import permutation_importance, importance_table, linear_contributions
+    from src.write_csv import write_csv
+    from src.table_io import read_table
+    from src.predict import load_model
+
+    with step("load_model"):
+        pipe = load_model(model_path)
+    with step("read"):
+        data_test = read_table(test_data)
+    target = 'age_group'
+    X_test, y_test = data_test.drop(columns=[target]), data_test[target]
+
+    # Every permuted copy of the test set is scored in stacked batches
+    with step("permutation_importance"):
+        result = permutation_importance(pipe, X_test, y_test, scoring=scoring, n_repeats=n_repeats,
+                                        random_state=seed, n_jobs=n_jobs)
+        importances = importance_table(result, X_test.columns.tolist())
+        write_csv(importances, results_to, "age_model_permutation_importance.csv", index=True)
+    print(f"Baseline {scoring}: {result.baseline_score:.3f}")
+    print(importances[["importance_mean", "importance_std"]].round(4).to_string())
+
+    with step("contributions"):
+        contributions = linear_contributions(pipe, X_test)
+        write_csv(contributions, results_to, "age_model_contributions.csv")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# age_predict.py
+# One command-line entry point for every stage of the analysis, e.g.
+#   python scripts/age_predict.py fit --train-data=data/processed/data_train.csv ...
+# Each subcommand loads only its own script, and the scripts import their
+# heavy libraries inside the command, so `--help` returns immediately.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.lazy_cli import LazyGroup
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COMMANDS = {
+    "download": ("01_download_data.py", "download_data", "Download and extract the raw dataset."),
+    "clean": ("02_clean_validate_save_data.py", "clean_and_save_data", "Clean and validate the raw data."),
+    "split": ("03_split_preprocess_data.py", "split_preprocess_data", "Split the cleaned data into train and test sets."),
+    "eda": ("04_eda_with_validation.py", "simple_eda_with_validation", "Summarise the training data and check correlations."),
+    "visualize": ("05_visualize_and_save.py", "visualize_data", "Plot the feature distributions and correlations."),
+    "features": ("materialize_features.py", "main", "Preprocess each fold once into feature matrices."),
+    "fit": ("06_model_fitting.py", "main", "Tune and fit the logistic regression pipeline."),
+    "evaluate": ("07_model_evaluation.py", "main", "Evaluate the fitted pipeline on the test set."),
+    "explain": ("08_explain_model.py", "main", "Explain which features drive the predictions."),
+    "report": ("render_report.py", "main", "Render the report to HTML and PDF concurrently."),
+    "predict": ("predict.py", "main", "Score a CSV or Parquet file with the fitted pipeline."),
+    "serve": ("serve.py", "main", "Serve the fitted pipeline over HTTP with micro-batching."),
+    "pipeline": ("run_pipeline.py", "main", "Run every stage with the content-addressed cache."),
+    "metrics": ("summarize_metrics.py", "main", "Summarise the stage metrics recorded in a run."),
+}
+
+@click.group(cls=LazyGroup,
+             lazy_commands={name: (os.path.join(SCRIPTS_DIR, script), attribute, short_help)
+                            for name, (script, attribute, short_help) in COMMANDS.items()})
+def main():
+    """
+    Predict the age group of NHANES respondents.
+
+    Each subcommand runs one stage of the analysis; see `COMMAND --help` for its options.
+    """
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# materialize_features.py
+# Preprocess the training data once per cross-validation fold, and the test
+# data once, into memory-mapped float32 matrices for 06_model_fitting.py
+# --features and 07_model_evaluation.py --features.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@click.command()
+@click.option('--train-data', type=str, required=True, help="Path to training data (.csv, .parquet or .feather)")
+@click.option('--test-data', type=str, required=True, help="Path to test data (.csv, .parquet or .feather)")
+@click.option('--features-to', type=str, required=True, help="Directory in which to write the matrices")
+@click.option('--n-folds', type=int, default=10, show_default=True, help="Number of stratified cross-validation folds")
+@click.option('--folds', type=str, default=None,
+              help="Fold file written by 03_split_preprocess_data.py --n-folds, used instead of --n-folds")
+@click.option('--seed', type=int, default=123, show_default=True, help="Seed of the preprocessor, as in 06_model_fitting.py")
+def main(train_data, test_data, features_to, n_folds, folds, seed):
+    """
+    Transform the training data per fold, and the test data, into saved feature matrices.
+
+    The folds are those `GridSearchCV(cv=n_folds)` uses in 06_model_fitting.py,
+    so tuning on the matrices scores the candidates as tuning the pipeline
+    does, up to float32 rounding: a classifier fitted on the matrices gives
+    predicted probabilities within a relative 1e-5 of the pipeline's.
+    """
+    from src.feature_store import materialize_features
+    from src.make_preprocessor import make_preprocessor
+    from src.table_io import read_table
+
+    data_train = read_table(train_data)
+    data_test = read_table(test_data)
+    fold_of_row = read_table(folds)["fold"].to_numpy() if folds is not None else n_folds
+    store = materialize_features(data_train, data_test, features_to, folds=fold_of_row,
+                                 preprocessor=make_preprocessor(random_state=seed))
+    print(f"Saved {store.n_folds} folds of {len(store.feature_names)} features to {features_to}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# predict.py
+# Score new data with the fitted age group pipeline.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@click.command()
+@click.option('--model-path', type=str, required=True, help="Path to the saved pipeline (model directory, or a pickle file)")
+@click.option('--input-path', type=str, required=True, help="Path to the CSV or Parquet file to score")
+@click.option('--output-path', type=str, required=True, help="Path to the CSV or Parquet file to write predictions to")
+@click.option('--chunksize', type=int, default=100_000, show_default=True, help="Number of rows scored at a time")
+def main(model_path, input_path, output_path, chunksize):
+    """
+    Score a CSV or Parquet file with a fitted pipeline.
+
+    The model is loaded once and the input is streamed through it in chunks of
+    `chunksize` rows; the predicted `age_group` and the class probabilities are
+    appended to `output_path` as each chunk is scored.
+
+    Args:
+        model_path (str): Path to the saved pipeline, e.g.
+            "results/models/age_prediction_model".
+        input_path (str): Path to the `.csv` or `.parquet` file with the feature columns.
+        output_path (str): Path to the `.csv` or `.parquet` file for the predictions.
+        chunksize (int): Number of rows held in memory at a time.
+
+    Returns:
+        None: Writes predictions to `output_path`.
+    """
+    from src.predict import load_model, predict_chunks
+
+    model = load_model(model_path)
+    n_rows = predict_chunks(model, input_path, output_path, chunksize=chunksize)
+    print(f"Scored {n_rows} rows; predictions saved to {output_path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# render_report.py
+# Render the Quarto report to HTML and PDF at the same time, each format in
+# its own `quarto render` process.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.instrumentation import instrumented, step
+
+@click.command()
+@click.option('--report', type=str, default="reports/age_prediction_report.qmd", show_default=True,
+              help="Path to the Quarto report")
+@click.option('--formats', type=str, default="html,pdf", show_default=True,
+              help="Comma-separated output formats (html, pdf, docx)")
+@click.option('--quarto', type=str, default="quarto", show_default=True, help="Quarto executable")
+@instrumented("report")
+def main(report, formats, quarto):
+    """
+    Render the report to every format concurrently.
+
+    The report's code cells only read `results/tables/report_facts.json` and
+    the EDA summary saved by earlier stages, so executing them is quick and
+    every format is rendered from the same facts.
+
+    Args:
+        report (str): Path to the `.qmd` file. Defaults to "reports/age_prediction_report.qmd".
+        formats (str): Comma-separated formats to render. Defaults to "html,pdf".
+        quarto (str): Name or path of the Quarto executable. Defaults to "quarto".
+
+    Returns:
+        None: Saves the rendered files next to the report.
+    """
+    from src.render_report import render_report
+
+    with step("render"):
+        try:
+            outputs = render_report(report, [fmt.strip() for fmt in formats.split(",") if fmt.strip()],
+                                    quarto=quarto)
+        except (FileNotFoundError, ValueError, RuntimeError) as error:
+            raise click.ClickException(str(error))
+    for output in outputs:
+        print(f"Rendered {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# run_pipeline.py
+# Run the analysis stages with a content-addressed cache, as an alternative to `make all`.
+
+import click
+import json
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipeline_runner import Stage, python_sources, run_pipeline, format_report
+
+PYTHON = sys.executable
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# Estimators a saved model may contain, loaded by src.model_store without being imported by name
+MODEL_CODE = ["src/knn_imputer.py"]
+DATA_URL = ("https://archive.ics.uci.edu/static/public/887/national+health+and+nutrition+health+survey"
+            "+2013-2014+(nhanes)+age+prediction+subset.zip")
+
+STAGES = [
+    Stage("download",
+          [[PYTHON, "scripts/01_download_data.py"]],
+          inputs=["data/download_manifest.json"],
+          outputs=["data/raw/data.zip", "data/raw/NHANES_age_prediction.csv"],
+          params={"url": DATA_URL, "output_dir": "data/raw", "manifest": "data/download_manifest.json"},
+          code=python_sources("scripts/01_download_data.py", root=ROOT)),
+    Stage("clean_validate",
+          [[PYTHON, "scripts/02_clean_validate_save_data.py"]],
+          inputs=["data/raw/NHANES_age_prediction.csv"],
+          outputs=["data/processed/cleaned.csv"],
+          params={"input_path": "data/raw/NHANES_age_prediction.csv",
+                  "output_path": "data/processed/cleaned.csv"},
+          code=python_sources("scripts/02_clean_validate_save_data.py", root=ROOT)),
+    Stage("split",
+          [[PYTHON, "scripts/03_split_preprocess_data.py"]],
+          inputs=["data/processed/cleaned.csv"],
+          outputs=["data/processed/data_train.csv", "data/processed/data_test.csv"],
+          params={"input_path": "data/processed/cleaned.csv", "output_dir": "data/processed", "seed": 123},
+          code=python_sources("scripts/03_split_preprocess_data.py", root=ROOT)),
+    Stage("eda",
+          [[PYTHON, "scripts/04_eda_with_validation.py"]],
+          inputs=["data/processed/data_train.csv"],
+          outputs=["results/tables/eda_summary.json", "results/tables/eda_summary.parquet"],
+          params={"data_train_path": "data/processed/data_train.csv", "summary-to": "results/tables"},
+          code=python_sources("scripts/04_eda_with_validation.py", root=ROOT)),
+    Stage("visualize",
+          [[PYTHON, "scripts/05_visualize_and_save.py"]],
+          inputs=["data/processed/data_train.csv", "results/tables/eda_summary.json"],
+          outputs=["results/figures/fig_numeric_feats.png", "results/figures/fig_categorical_feats.png",
+                   "results/figures/fig_feats_heatmap.png"],
+          params={"data_train_path": "data/processed/data_train.csv", "output_dir": "results/figures",
+                  "summary": "results/tables/eda_summary.json"},
+          code=python_sources("scripts/05_visualize_and_save.py", root=ROOT)),
+    Stage("fit",
+          [[PYTHON, "scripts/06_model_fitting.py"]],
+          inputs=["data/processed/data_train.csv"],
+          outputs=["results/models/age_prediction_preprocessor.pickle",
+                   "results/models/age_prediction_model/manifest.json",
+                   "results/models/age_prediction_model/arrays.bin",
+                   "results/figures/fig_hyperparameter_c.png"],
+          params={"train-data": "data/processed/data_train.csv", "preprocessor-to": "results/models",
+                  "pipeline-to": "results/models", "plot-to": "results/figures", "seed": 123, "n-jobs": -1},
+          code=python_sources("scripts/06_model_fitting.py", root=ROOT)),
+    Stage("evaluate",
+          [[PYTHON, "scripts/07_model_evaluation.py"]],
+          inputs=["results/models/age_prediction_model/manifest.json",
+                  "results/models/age_prediction_model/arrays.bin", "data/processed/data_test.csv"],
+          outputs=["results/tables/age_model_report.csv", "results/tables/confusion_matrix.csv",
+                   "results/tables/age_model_calibration.csv", "results/tables/age_model_bootstrap.csv",
+                   "results/tables/report_facts.json"],
+          params={"model-path": "results/models/age_prediction_model",
+                  "test-data": "data/processed/data_test.csv", "results-to": "results/tables",
+                  "n-bootstrap": 1000, "seed": 123, "n-jobs": -1},
+          code=python_sources("scripts/07_model_evaluation.py", root=ROOT)),
+    Stage("explain",
+          [[PYTHON, "scripts/08_explain_model.py"]],
+          inputs=["results/models/age_prediction_model/manifest.json",
+                  "results/models/age_prediction_model/arrays.bin", "data/processed/data_test.csv"],
+          outputs=["results/tables/age_model_permutation_importance.csv",
+                   "results/tables/age_model_contributions.csv"],
+          params={"model-path": "results/models/age_prediction_model",
+                  "test-data": "data/processed/data_test.csv", "results-to": "results/tables",
+                  "n-repeats": 10, "seed": 123, "n-jobs": -1},
+          code=python_sources("scripts/08_explain_model.py", root=ROOT) + MODEL_CODE),
+    Stage("report",
+          [[PYTHON, "scripts/render_report.py"]],
+          inputs=["results/figures/fig_numeric_feats.png", "results/figures/fig_feats_heatmap.png",
+                  "results/figures/fig_hyperparameter_c.png", "results/tables/report_facts.json",
+                  "results/tables/eda_summary.json", "reports/metadata.csv", "reports/references.bib"],
+          outputs=["reports/age_prediction_report.html", "reports/age_prediction_report.pdf"],
+          params={"report": "reports/age_prediction_report.qmd", "formats": "html,pdf"},
+          code=python_sources("scripts/render_report.py", root=ROOT) + ["reports/age_prediction_report.qmd"]),
+]
+
+@click.command()
+@click.option('--cache-dir', type=str, default=".pipeline_cache", show_default=True,
+              help="Directory of the content-addressed stage cache")
+@click.option('--max-workers', type=int, default=3, show_default=True,
+              help="Maximum number of independent stages run at the same time")
+@click.option('--only', type=str, multiple=True,
+              help="Run only these stages (repeatable); their inputs must already exist")
+@click.option('--report-to', type=str, default=None, help="Path to save the per-stage timing report as JSON")
+def main(cache_dir, max_workers, only, report_to):
+    """
+    Run the analysis pipeline, skipping stages whose inputs, parameters and code are unchanged.
+
+    Each stage is keyed by a SHA-256 over its commands, parameters, the content
+    of its input files and the content of its code. When a key was seen before,
+    the stage is not run and its outputs are restored from `cache_dir`.
+    Independent stages (EDA, visualisation and model fitting) run concurrently.
+
+    Args:
+        cache_dir (str): Directory where stage outputs are cached.
+        max_workers (int): Maximum number of stages running at the same time.
+        only (tuple of str): Names of the stages to run; all stages when empty.
+        report_to (str, optional): Path of a JSON file for the timing report.
+
+    Returns:
+        None: Prints the per-stage timing report.
+    """
+    stages = [stage for stage in STAGES if not only or stage.name in only]
+    report = run_pipeline(stages, cache_dir, max_workers=max_workers)
+    print(format_report(report))
+
+    if report_to:
+        os.makedirs(os.path.dirname(report_to) or ".", exist_ok=True)
+        with open(report_to, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
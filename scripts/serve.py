@@ -0,0 +1,65 @@
+# serve.py
+# Serve the fitted age group pipeline over HTTP, e.g.
+#   python scripts/serve.py --model-path=results/models/age_prediction_model --port=8000
+#   curl -X POST localhost:8000/predict -d '{"gender": "Female", "weekly_physical_activity": "Yes", ...}'
+# Measure it with benchmarks/bench_serving.py.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@click.command()
+@click.option('--model-path', type=str, required=True, help="Path to the saved pipeline (model directory, or a pickle file)")
+@click.option('--host', type=str, default="127.0.0.1", show_default=True, help="Address to listen on")
+@click.option('--port', type=int, default=8000, show_default=True, help="Port to listen on")
+@click.option('--max-batch-size', type=int, default=64, show_default=True,
+              help="Maximum number of records scored in one predict_proba call")
+@click.option('--max-wait-ms', type=float, default=2.0, show_default=True,
+              help="Longest time a request waits for others to share its batch")
+@click.option('--compiled/--no-compiled', default=True, show_default=True,
+              help="Score with the compiled NumPy scorer when the pipeline supports it")
+def main(model_path, host, port, max_batch_size, max_wait_ms, compiled):
+    """
+    Serve the fitted pipeline over HTTP with micro-batching.
+
+    The model is loaded once. Records POSTed to /predict by concurrent clients
+    are coalesced into batches of up to `max_batch_size` records, each scored
+    with a single vectorized `predict_proba` call; GET /metrics reports the
+    latency percentiles, throughput, batch sizes and queue depth.
+
+    Args:
+        model_path (str): Path to the saved pipeline, e.g.
+            "results/models/age_prediction_model".
+        host (str): Address to listen on. Defaults to "127.0.0.1".
+        port (int): Port to listen on. Defaults to 8000.
+        max_batch_size (int): Maximum number of records per batch. Defaults to 64.
+        max_wait_ms (float): Longest time, in milliseconds, the first request of a
+            batch waits for others. Defaults to 2.
+        compiled (bool): Score with `src.compiled_scorer` instead of the sklearn
+            pipeline when possible. Defaults to True.
+
+    Returns:
+        None: Serves until interrupted.
+    """
+    import asyncio
+    from src.serving import ScoringServer, load_scorer
+
+    score, classes = load_scorer(model_path, compiled=compiled)
+
+    async def serve():
+        server = ScoringServer(score, classes, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        bound_port = await server.start(host, port)
+        print(f"Serving {model_path} on http://{host}:{bound_port}", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
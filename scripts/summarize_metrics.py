@@ -0,0 +1,50 @@
+# summarize_metrics.py
+# Aggregate the stage metrics recorded with AGE_PREDICTION_METRICS set, e.g.
+#   AGE_PREDICTION_METRICS=results/metrics.jsonl make all
+#   python scripts/summarize_metrics.py --metrics results/metrics.jsonl --folded-to results/metrics.folded
+# The folded stacks can be drawn with flamegraph.pl, speedscope or inferno.
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+@click.command()
+@click.option('--metrics', type=str, required=True, help="JSON-lines metrics file written by the stages")
+@click.option('--run', type=str, default=None, help="Only summarise this AGE_PREDICTION_RUN_ID (default: every record)")
+@click.option('--folded-to', type=str, default=None, help="Write the self time of each step as folded stacks to this file")
+def main(metrics, run, folded_to):
+    """
+    Print the time and peak memory of every stage and step, slowest stage first.
+
+    "max RSS" is the peak resident memory of the stage's process up to the end
+    of the step; "traced MB" is the peak memory traced during the step, only
+    recorded with AGE_PREDICTION_TRACEMALLOC=1.
+    """
+    from src.instrumentation import read_metrics, summarize_metrics, folded_stacks
+
+    summary = summarize_metrics(read_metrics(metrics, run=run))
+    if not summary:
+        raise click.ClickException(f"No metrics recorded in {metrics}" + (f" for run {run}" if run else ""))
+
+    # Stages by total time, each followed by its steps (and theirs) in the order they ran
+    totals = {entry["path"][0]: entry["seconds"] for entry in summary if len(entry["path"]) == 1}
+    position = {entry["path"]: i for i, entry in enumerate(summary)}
+    ordered = sorted(summary, key=lambda entry: (
+        -totals.get(entry["path"][0], 0.0),
+        [position.get(entry["path"][:depth], -1) for depth in range(1, len(entry["path"]) + 1)]))
+    print(f"{'step':<40} {'calls':>5} {'seconds':>9} {'self s':>8} {'cpu s':>8} {'max RSS':>8} {'traced MB':>9}")
+    for entry in ordered:
+        name = "  " * (len(entry["path"]) - 1) + entry["path"][-1]
+        traced = "-" if entry["peak_mb"] is None else f"{entry['peak_mb']:.1f}"
+        print(f"{name:<40} {entry['calls']:>5} {entry['seconds']:>9.2f} {entry['self_seconds']:>8.2f} "
+              f"{entry['cpu_seconds']:>8.2f} {entry['max_rss_mb']:>8.1f} {traced:>9}")
+    print(f"{'total':<40} {'':>5} {sum(totals.values()):>9.2f}")
+
+    if folded_to is not None:
+        with open(folded_to, 'w') as f:
+            f.write(folded_stacks(summary))
+        print(f"Folded stacks saved to {folded_to}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+# Allowed values of options shared by the src modules and the command-line scripts.
+# This module must not import anything heavy: the scripts read it to build
+# their --help and validate arguments before pandas or sklearn are loaded.
+
+SEARCH_STRATEGIES = ("grid", "halving")
+VALIDATION_ENGINES = ("numpy", "pandera")
+DUPLICATE_MODES = ("hash", "bloom")
+CORRELATION_BACKENDS = ("numpy", "deepchecks")
+TRAINING_MODES = ("batch", "incremental")
+SPLIT_ENGINES = ("sklearn", "hash")
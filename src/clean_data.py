@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from src.table_io import CATEGORY_LEVELS, MEASUREMENT_COLUMNS
+
+RAW_COLUMNS = [
+    "id", "age_group", "age", "gender", "weekly_physical_activity",
+    "bmi", "blood_glucose_fasting", "diabetic", "oral", "insulin_level"
+]
+# Raw columns kept by the cleaner, in their file order; `id` and `age` are dropped
+CLEAN_COLUMNS = [col for col in RAW_COLUMNS if col not in ("id", "age")]
+
+# Raw value of each category, decoded to the levels of `src.table_io.CATEGORY_LEVELS`
+CATEGORY_CODES = {
+    "age_group": {"Adult": "Adult", "Senior": "Senior"},
+    "gender": {1.0: "Male", 2.0: "Female"},
+    "weekly_physical_activity": {1.0: "Yes", 2.0: "No"},
+    "diabetic": {1.0: "Yes", 2.0: "No", 3.0: "Borderline"},
+}
+# Rows with these raw values are removed ("don't know" answers)
+DROP_CODES = {"weekly_physical_activity": [7.0]}
+
+# Types the raw columns are parsed into by `read_raw`
+RAW_DTYPES = {
+    "age_group": "category",
+    **{col: "float64" for col in CATEGORY_CODES if col != "age_group"},
+    **{col: "float64" for col in MEASUREMENT_COLUMNS},
+}
+
+
+def read_raw(path: str, chunksize: int = None):
+    """
+    Read the raw NHANES file, parsing only the columns `clean_data` keeps.
+
+    The `id` and `age` columns are skipped by the parser, the codes and
+    measurements are parsed straight into float64 and `age_group` into a
+    categorical, so no column is re-inferred or converted after reading.
+
+    Parameters
+    ----------
+    path : str
+        Path of the raw CSV file, with a header row and the columns of `RAW_COLUMNS`.
+    chunksize : int, optional
+        Return an iterator of DataFrames of this many rows instead of one DataFrame.
+
+    Returns
+    -------
+    pandas.DataFrame or pandas.io.parsers.TextFileReader
+        The raw data with the columns in `CLEAN_COLUMNS`, or an iterator of chunks of it.
+    """
+    return pd.read_csv(path, names=RAW_COLUMNS, skiprows=1, usecols=CLEAN_COLUMNS,
+                       dtype=RAW_DTYPES, chunksize=chunksize)
+
+
+def _decode(values: pd.Series, codes: dict, levels: list, dropped: list, keep):
+    """
+    Decode the raw values of one column into a categorical with the given levels.
+
+    The column is factorized once and its few distinct values are looked up
+    in `codes`; the rows are then decoded with a single take from the lookup
+    array. Values missing from `codes` are kept as extra categories, so that
+    validation reports them instead of them silently becoming missing;
+    `dropped` values belong to removed rows and are not kept.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        row_codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        row_codes, uniques = pd.factorize(values.to_numpy())
+    unknown = [value for value in uniques if value not in codes and value not in dropped]
+    categories = list(levels) + unknown
+    lookup = np.array([-1 if value in dropped else categories.index(codes.get(value, value))
+                       for value in uniques] + [-1], dtype=np.min_scalar_type(-len(categories)))
+    if keep is not None:
+        row_codes = row_codes[keep]
+    # Missing values have code -1, which picks the trailing -1 of the lookup array
+    return pd.Categorical.from_codes(lookup[row_codes], categories=categories)
+
+
+def clean_data(raw: pd.DataFrame):
+    """
+    Clean raw NHANES rows: drop identifiers, decode the categorical codes and
+    remove rows with an unknown physical activity answer.
+
+    The categorical columns are decoded as described by `CATEGORY_CODES`
+    into categoricals with the levels of `src.table_io.CATEGORY_LEVELS`,
+    through their integer codes rather than by replacing values row by row.
+    Every row is cleaned on its own, so the raw file can be cleaned in chunks.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Raw data with the columns in `CLEAN_COLUMNS`, e.g. read with
+        `read_raw`; other columns, such as `id` and `age`, are dropped.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The cleaned data, with the columns in `CLEAN_COLUMNS`.
+
+    Raises
+    ------
+    TypeError
+        If the input is not a pandas DataFrame.
+    """
+    if not isinstance(raw, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+
+    dropped = np.zeros(len(raw), dtype=bool)
+    for col, values in DROP_CODES.items():
+        dropped |= raw[col].isin(values).to_numpy()
+    keep = np.flatnonzero(~dropped) if dropped.any() else None
+
+    columns = {}
+    for col in CLEAN_COLUMNS:
+        if col in CATEGORY_CODES:
+            columns[col] = _decode(raw[col], CATEGORY_CODES[col], CATEGORY_LEVELS[col],
+                                   DROP_CODES.get(col, []), keep)
+        else:
+            values = raw[col].to_numpy()
+            columns[col] = values if keep is None else values[keep]
+    index = raw.index if keep is None else raw.index[keep]
+    return pd.DataFrame(columns, index=index, copy=False)
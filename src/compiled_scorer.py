@@ -0,0 +1,297 @@
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler, OrdinalEncoder, OneHotEncoder
+from src.knn_imputer import IndexedKNNImputer
+
+
+class CompiledScorer:
+    """
+    NumPy scorer for a fitted binary (ColumnTransformer + linear classifier) pipeline.
+
+    The preprocessing is folded into the classifier: scaled numeric columns
+    become one weight per raw column plus a shift of the intercept, and every
+    categorical column becomes a lookup table from category to its summed
+    contribution to the decision function. Scoring is then a dot product and a
+    handful of table lookups, with no DataFrame construction.
+
+    Instances are created with `compile_pipeline`.
+
+    Attributes
+    ----------
+    classes_ : numpy.ndarray
+        The two class labels, in the order of the `predict_proba` columns.
+    numeric_features : list of str
+        Names of the numeric input columns.
+    numeric_weights : numpy.ndarray
+        One weight per numeric column, applied to the raw (unscaled) value.
+    intercept : float
+        Intercept of the decision function, including the scaler offsets.
+    categorical_tables : dict
+        Maps each categorical column to a dict with the `categories` array, the
+        matching `weights` array, and the `missing` and `unknown` contributions
+        (None when such a value is an error, as in the fitted pipeline).
+    numeric_imputers : list of tuple
+        The fitted imputers of the numeric columns, as (columns, imputer)
+        pairs. Only records with a missing numeric value go through them.
+    """
+
+    def __init__(self, classes, numeric_features, numeric_weights, intercept, categorical_tables,
+                 numeric_imputers=()):
+        self.classes_ = np.asarray(classes)
+        self.numeric_features = list(numeric_features)
+        self.numeric_weights = np.asarray(numeric_weights, dtype=float)
+        self.intercept = float(intercept)
+        self.categorical_tables = categorical_tables
+        self.numeric_imputers = list(numeric_imputers)
+        self.feature_names_in_ = np.array(self.numeric_features + list(categorical_tables), dtype=object)
+
+        # Plain Python lookups for the single-record path
+        self._numeric_pairs = list(zip(self.numeric_features, self.numeric_weights.tolist()))
+        self._lookups = {
+            col: dict(zip(table["categories"].tolist(), table["weights"].tolist()))
+            for col, table in categorical_tables.items()
+        }
+        # Sorted categories for vectorised lookups with searchsorted
+        self._sorted_tables = {}
+        for col, table in categorical_tables.items():
+            order = np.argsort(table["categories"])
+            self._sorted_tables[col] = (table["categories"][order], table["weights"][order])
+
+    def decision_function(self, records):
+        """
+        Compute the decision function for one record or a batch of records.
+
+        Parameters
+        ----------
+        records : dict, list of dict, numpy structured array or pandas.DataFrame
+            A single record as a dict of column to value, or a batch of records.
+
+        Returns
+        -------
+        numpy.ndarray
+            The decision function value for each record.
+
+        Raises
+        ------
+        ValueError
+            If a numeric value is missing and the pipeline has no imputer for
+            it, or a categorical value is missing or unknown where the fitted
+            pipeline would not accept it.
+        KeyError
+            If a required column is absent.
+        """
+        if isinstance(records, dict):
+            return np.array([self._decision_one(records)])
+        if isinstance(records, list):
+            records = pd.DataFrame.from_records(records)
+        return self._decision_batch(records)
+
+    def predict_proba(self, records):
+        """
+        Estimate class probabilities, matching the pipeline's `predict_proba`.
+
+        Parameters
+        ----------
+        records : dict, list of dict, numpy structured array or pandas.DataFrame
+            A single record as a dict of column to value, or a batch of records.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (n_records, 2) with the probability of each class in `classes_`.
+        """
+        positive = _expit(self.decision_function(records))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, records):
+        """
+        Predict the class label for one record or a batch of records.
+
+        Parameters
+        ----------
+        records : dict, list of dict, numpy structured array or pandas.DataFrame
+            A single record as a dict of column to value, or a batch of records.
+
+        Returns
+        -------
+        numpy.ndarray
+            The predicted label for each record.
+        """
+        return self.classes_[(self.decision_function(records) > 0).astype(int)]
+
+    def _decision_one(self, record):
+        z = self.intercept
+        for col, weight in self._numeric_pairs:
+            value = record[col]
+            if value is None or value != value:
+                if self.numeric_imputers:
+                    return self._decision_batch(pd.DataFrame.from_records([record]))[0]
+                raise ValueError(f"Missing value in numeric feature '{col}'")
+            z += weight * value
+        for col, lookup in self._lookups.items():
+            value = record[col]
+            if value is None or value != value:
+                contribution = self.categorical_tables[col]["missing"]
+            else:
+                contribution = lookup.get(value, self.categorical_tables[col]["unknown"])
+            if contribution is None:
+                raise ValueError(f"Value {value!r} in feature '{col}' was not seen during fit")
+            z += contribution
+        return z
+
+    def _decision_batch(self, records):
+        numeric = np.column_stack([np.asarray(records[col], dtype=float) for col in self.numeric_features])
+        if self.numeric_imputers and np.isnan(numeric).any():
+            numeric = self._impute(numeric)
+        if np.isnan(numeric).any():
+            bad = [c for c, has_nan in zip(self.numeric_features, np.isnan(numeric).any(axis=0)) if has_nan]
+            raise ValueError(f"Missing value in numeric feature '{bad[0]}'")
+        z = numeric @ self.numeric_weights + self.intercept
+
+        for col, (categories, weights) in self._sorted_tables.items():
+            table = self.categorical_tables[col]
+            values = np.asarray(records[col], dtype=object)
+            missing = pd.isna(values)
+            values = np.where(missing, "", values).astype(str)
+            position = np.searchsorted(categories, values).clip(max=len(categories) - 1)
+            found = (categories[position] == values) & ~missing
+            contribution = np.where(found, weights[position], 0.0)
+            for mask, fallback in ((missing, table["missing"]), (~found & ~missing, table["unknown"])):
+                if mask.any():
+                    if fallback is None:
+                        raise ValueError(f"Value {values[mask][0]!r} in feature '{col}' was not seen during fit")
+                    contribution[mask] = fallback
+            z += contribution
+        return z
+
+    def _impute(self, numeric):
+        # Only the rows with a missing value go through the (slower) imputers
+        for columns, imputer in self.numeric_imputers:
+            index = [self.numeric_features.index(col) for col in columns]
+            rows = np.isnan(numeric[:, index]).any(axis=1)
+            if rows.any():
+                block = pd.DataFrame(numeric[np.ix_(rows, index)], columns=columns)
+                numeric[np.ix_(rows, index)] = imputer.transform(block)
+        return numeric
+
+
+def _expit(z):
+    z = np.asarray(z, dtype=float)
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+def _check_supported(condition, message):
+    if not condition:
+        raise ValueError(f"Cannot compile pipeline: {message}")
+
+
+def _imputed_value(imputer, column_index):
+    _check_supported(isinstance(imputer, SimpleImputer), f"unsupported imputer {type(imputer).__name__}")
+    value = imputer.statistics_[column_index]
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _compile_categorical(encoder, coef, columns, imputer):
+    tables = {}
+    offset = 0
+    for i, col in enumerate(columns):
+        categories = np.asarray(encoder.categories_[i]).astype(str)
+        if isinstance(encoder, OrdinalEncoder):
+            weights = coef[0] * np.arange(len(categories), dtype=float)
+            if encoder.handle_unknown == "use_encoded_value" and not np.isnan(encoder.unknown_value):
+                unknown = coef[0] * encoder.unknown_value
+            else:
+                unknown = None
+            coef = coef[1:]
+        else:
+            _check_supported(encoder.drop_idx_ is None, "OneHotEncoder with drop is not supported")
+            _check_supported(not getattr(encoder, "_infrequent_enabled", False),
+                             "OneHotEncoder infrequent categories are not supported")
+            weights = np.asarray(coef[offset:offset + len(categories)], dtype=float)
+            unknown = 0.0 if encoder.handle_unknown == "ignore" else None
+            offset += len(categories)
+
+        missing = None
+        if imputer is not None:
+            fill_value = str(_imputed_value(imputer, i))
+            match = np.flatnonzero(categories == fill_value)
+            missing = float(weights[match[0]]) if len(match) else unknown
+        tables[col] = {
+            "categories": categories,
+            "weights": weights,
+            "missing": None if missing is None else float(missing),
+            "unknown": None if unknown is None else float(unknown),
+        }
+    return tables
+
+
+def compile_pipeline(pipe):
+    """
+    Compile a fitted preprocessing + logistic regression pipeline into a `CompiledScorer`.
+
+    Supports the structure built in `06_model_fitting.py`: a `ColumnTransformer`
+    of `StandardScaler`, `OrdinalEncoder` and `OneHotEncoder` transformers
+    (optionally preceded by a `SimpleImputer`, or an `IndexedKNNImputer` for
+    the scaled columns, in a `Pipeline`), followed by a binary linear
+    classifier exposing `coef_` and `intercept_`. Numeric imputers are kept
+    as they are, and only used for records with a missing numeric value.
+
+    Parameters
+    ----------
+    pipe : sklearn.pipeline.Pipeline
+        The fitted pipeline, e.g. `GridSearchCV.best_estimator_`.
+
+    Returns
+    -------
+    CompiledScorer
+        A scorer reproducing `pipe.predict_proba` to floating-point tolerance.
+
+    Raises
+    ------
+    ValueError
+        If the pipeline contains a step or setting that cannot be compiled.
+    """
+    _check_supported(isinstance(pipe, Pipeline) and len(pipe.steps) == 2,
+                     "expected a (ColumnTransformer, classifier) pipeline")
+    preprocessor, classifier = pipe.steps[0][1], pipe.steps[-1][1]
+    _check_supported(isinstance(preprocessor, ColumnTransformer), "first step must be a ColumnTransformer")
+    _check_supported(hasattr(classifier, "coef_") and len(classifier.classes_) == 2,
+                     "final step must be a fitted binary linear classifier")
+
+    coef = classifier.coef_.ravel()
+    intercept = float(classifier.intercept_[0])
+    numeric_features, numeric_weights, categorical_tables, numeric_imputers = [], [], {}, []
+
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        _check_supported(transformer != "passthrough", "passthrough columns are not supported")
+        block = coef[preprocessor.output_indices_[name]]
+
+        imputer = None
+        if isinstance(transformer, Pipeline):
+            _check_supported(len(transformer.steps) <= 2, f"unsupported transformer pipeline '{name}'")
+            if len(transformer.steps) == 2:
+                imputer = transformer.steps[0][1]
+            transformer = transformer.steps[-1][1]
+
+        if isinstance(transformer, StandardScaler):
+            if imputer is not None:
+                _check_supported(isinstance(imputer, (SimpleImputer, IndexedKNNImputer)),
+                                 f"unsupported imputer {type(imputer).__name__}")
+                numeric_imputers.append((list(columns), imputer))
+            scale = transformer.scale_ if transformer.with_std else np.ones(len(columns))
+            mean = transformer.mean_ if transformer.with_mean else np.zeros(len(columns))
+            numeric_features.extend(columns)
+            numeric_weights.extend(block / scale)
+            intercept -= float(np.sum(block * mean / scale))
+        elif isinstance(transformer, (OrdinalEncoder, OneHotEncoder)):
+            categorical_tables.update(_compile_categorical(transformer, block, columns, imputer))
+        else:
+            raise ValueError(f"Cannot compile pipeline: unsupported transformer {type(transformer).__name__}")
+
+    return CompiledScorer(classifier.classes_, numeric_features, numeric_weights, intercept, categorical_tables,
+                          numeric_imputers)
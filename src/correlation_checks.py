@@ -0,0 +1,298 @@
+from itertools import combinations
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+PPS_THRESHOLD = 0.9
+PAIR_THRESHOLD = 0.92
+CORRELATION_METHODS = ("spearman", "pearson")
+
+
+def _is_categorical(values: pd.Series):
+    return not pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype)
+
+
+def _weighted_f1(y_true, y_pred, n_classes):
+    """Support-weighted F1 score, as `sklearn.metrics.f1_score(..., average="weighted")`."""
+    confusion = np.bincount(y_true * n_classes + y_pred, minlength=n_classes ** 2).reshape(n_classes, n_classes)
+    true_positives = np.diag(confusion)
+    support = confusion.sum(axis=1)
+    denominator = support + confusion.sum(axis=0)
+    f1 = np.divide(2 * true_positives, denominator, out=np.zeros(n_classes), where=denominator > 0)
+    return float(f1 @ support / support.sum())
+
+
+def _stratified_folds(y, n_classes, cv):
+    """Fold number of each row, assigned like `sklearn.model_selection.StratifiedKFold` without shuffling."""
+    allocation = np.array([np.bincount(np.sort(y)[i::cv], minlength=n_classes) for i in range(cv)])
+    folds = np.empty(len(y), dtype=int)
+    for label in range(n_classes):
+        folds[y == label] = np.arange(cv).repeat(allocation[:, label])
+    return folds
+
+
+def _fit_predict(x_train, y_train, x_test, n_classes, categorical):
+    """
+    Predict like a fully grown decision tree on a single feature.
+
+    Such a tree keeps splitting until its leaves are pure or hold a single
+    value, so it predicts the majority label of each training value. An
+    unseen numeric value falls on one side of the midpoint threshold between
+    its two neighbouring training values; an unseen category gets the overall
+    majority label.
+    """
+    values, inverse = np.unique(x_train, return_inverse=True)
+    counts = np.bincount(inverse * n_classes + y_train, minlength=len(values) * n_classes)
+    majority = counts.reshape(len(values), n_classes).argmax(axis=1)
+    position = np.searchsorted(values, x_test)
+    clipped = np.minimum(position, len(values) - 1)
+    seen = values[clipped] == x_test
+    if categorical:
+        return np.where(seen, majority[clipped], np.bincount(y_train, minlength=n_classes).argmax())
+    left = np.maximum(position - 1, 0)
+    goes_left = (position == len(values)) | (x_test <= (values[left] + values[clipped]) / 2)
+    return np.where(seen, majority[clipped], np.where(goes_left & (position > 0), majority[left], majority[clipped]))
+
+
+def predictive_power_score(x: pd.Series, y: pd.Series, cv: int = 4, random_state=None, confidence: float = 0.95):
+    """
+    Predictive power score (PPS) of feature `x` for the class label `y`.
+
+    Follows the definition used by Deepchecks and `ppscore`: the weighted F1
+    score of a decision tree trained on `x` alone, from `cv`-fold stratified
+    cross-validation, rescaled so that the better of a majority-class and a
+    random baseline scores 0 and a perfect prediction scores 1. The tree is
+    not trained; its predictions are computed directly from the per-value
+    label counts of each training fold (see `_fit_predict`).
+
+    Parameters
+    ----------
+    x : pandas.Series
+        Feature values. Non-numeric and boolean features are treated as categories.
+    y : pandas.Series
+        Class labels.
+    cv : int, optional
+        Number of cross-validation folds. Default is 4.
+    random_state : int, optional
+        Seed for shuffling the rows and for the random baseline.
+    confidence : float, optional
+        Level of the bounds, computed from the spread of the fold scores. Default is 0.95.
+
+    Returns
+    -------
+    tuple of float
+        The score, and the lower and upper confidence bounds, all in [0, 1].
+        All three are 0 if the label is constant, if a categorical feature
+        has a distinct value in every row, or if some class has fewer than
+        `cv` rows.
+    """
+    complete = x.notna().to_numpy() & y.notna().to_numpy()
+    categorical = _is_categorical(x)
+    x_values = pd.factorize(x[complete])[0] if categorical else x[complete].to_numpy(dtype=float)
+    y_values, classes = pd.factorize(y[complete])
+    n_classes = len(classes)
+    if n_classes < 2 or (categorical and len(np.unique(x_values)) == len(x_values)):
+        # A constant label, or a feature that is an identifier, has no predictive power
+        return 0.0, 0.0, 0.0
+    if np.bincount(y_values).min() < cv:
+        # Too few rows of some class to stratify; ppscore reports an invalid score of 0
+        return 0.0, 0.0, 0.0
+
+    rng = np.random.default_rng(random_state)
+    order = rng.permutation(len(y_values))
+    x_values, y_values = x_values[order], y_values[order]
+    folds = _stratified_folds(y_values, n_classes, cv)
+    fold_scores = []
+    for fold in range(cv):
+        test = folds == fold
+        predictions = _fit_predict(x_values[~test], y_values[~test], x_values[test], n_classes, categorical)
+        fold_scores.append(_weighted_f1(y_values[test], predictions, n_classes))
+
+    most_common = np.full(len(y_values), np.bincount(y_values).argmax())
+    baseline = max(_weighted_f1(y_values, most_common, n_classes),
+                   _weighted_f1(y_values, rng.permutation(y_values), n_classes))
+
+    def normalise(f1):
+        return float(np.clip((f1 - baseline) / (1 - baseline), 0, 1)) if baseline < 1 else 0.0
+
+    mean = float(np.mean(fold_scores))
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * np.std(fold_scores, ddof=1) / np.sqrt(cv)
+    return normalise(mean), normalise(mean - margin), normalise(mean + margin)
+
+
+def feature_label_pps(data: pd.DataFrame, label: str, n_samples: int = 5000, cv: int = 4,
+                      n_jobs: int = None, random_state: int = 123, confidence: float = 0.95):
+    """
+    Predictive power score of every feature for the label.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Features and label.
+    label : str
+        Name of the label column.
+    n_samples : int, optional
+        Score a random sample of this many rows instead of all of them; None
+        uses every row. Default is 5000, as in Deepchecks.
+    cv : int, optional
+        Number of cross-validation folds. Default is 4.
+    n_jobs : int, optional
+        Number of worker processes scoring features in parallel; -1 uses all cores.
+        Default is None (serial).
+    random_state : int, optional
+        Seed for sampling, shuffling and the random baseline. Default is 123.
+    confidence : float, optional
+        Level of the confidence bounds. Default is 0.95.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per feature, highest score first, with columns `pps`, `lower` and `upper`.
+
+    Raises
+    ------
+    ValueError
+        If the label column is missing.
+    """
+    if label not in data.columns:
+        raise ValueError(f"Label column '{label}' is not in the data.")
+    if n_samples is not None and len(data) > n_samples:
+        data = data.sample(n_samples, random_state=random_state)
+    features = [col for col in data.columns if col != label]
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(predictive_power_score)(data[col], data[label], cv, random_state, confidence) for col in features)
+    return (pd.DataFrame(scores, index=pd.Index(features, name="feature"), columns=["pps", "lower", "upper"])
+            .sort_values("pps", ascending=False))
+
+
+def _fisher_bounds(r, n, confidence, variance_factor=1.0):
+    """Confidence bounds of a correlation coefficient from the Fisher z-transform."""
+    if n <= 3 or not np.isfinite(r):
+        return np.nan, np.nan
+    margin = NormalDist().inv_cdf((1 + confidence) / 2) * np.sqrt(variance_factor / (n - 3))
+    z = np.arctanh(np.clip(r, -1 + 1e-15, 1 - 1e-15))
+    return float(np.tanh(z - margin)), float(np.tanh(z + margin))
+
+
+def _correlation_matrix(numeric: pd.DataFrame, method):
+    """Pairwise correlation of numeric columns, on the rows where both are present."""
+    if not numeric.isna().any().any():
+        values = numeric.rank().to_numpy() if method == "spearman" else numeric.to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrix = np.corrcoef(values, rowvar=False)
+        counts = np.full(matrix.shape, len(numeric))
+        return matrix, counts
+    present = numeric.notna().to_numpy()
+    counts = present.T.astype(int) @ present.astype(int)
+    return numeric.corr(method=method).to_numpy(), counts
+
+
+def correlation_ratio(categories: pd.Series, values: pd.Series):
+    """
+    Correlation ratio (eta) of a numeric variable across the groups of a categorical one.
+
+    Returns 0 when the numeric variable is constant.
+    """
+    complete = categories.notna().to_numpy() & values.notna().to_numpy()
+    codes = pd.factorize(categories[complete])[0]
+    numbers = values[complete].to_numpy(dtype=float)
+    if len(numbers) == 0:
+        return np.nan
+    counts = np.bincount(codes)
+    group_means = np.bincount(codes, weights=numbers) / counts
+    total = numbers - numbers.mean()
+    denominator = total @ total
+    if denominator == 0:
+        return 0.0
+    return float(np.sqrt(counts @ (group_means - numbers.mean()) ** 2 / denominator))
+
+
+def cramers_v(x: pd.Series, y: pd.Series):
+    """
+    Cramér's V association between two categorical variables, in [0, 1].
+
+    Returns 0 when either variable has a single category.
+    """
+    complete = x.notna().to_numpy() & y.notna().to_numpy()
+    x_codes, x_levels = pd.factorize(x[complete])
+    y_codes, y_levels = pd.factorize(y[complete])
+    n, n_x, n_y = len(x_codes), len(x_levels), len(y_levels)
+    if min(n_x, n_y) < 2:
+        return 0.0
+    observed = np.bincount(x_codes * n_y + y_codes, minlength=n_x * n_y).reshape(n_x, n_y)
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    chi2 = ((observed - expected) ** 2 / expected).sum()
+    return float(np.sqrt(chi2 / n / (min(n_x, n_y) - 1)))
+
+
+def feature_feature_correlation(data: pd.DataFrame, cat_features=(), method: str = "spearman",
+                                n_samples: int = 10_000, n_jobs: int = None, random_state: int = 42,
+                                confidence: float = 0.95):
+    """
+    Association between every pair of numeric and categorical features.
+
+    Numeric pairs use the Spearman (or Pearson) correlation, computed for all
+    pairs at once; numeric-categorical pairs use the correlation ratio and
+    categorical pairs Cramér's V. Columns that are neither numeric nor listed in
+    `cat_features` are skipped, as Deepchecks does.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The features.
+    cat_features : sequence of str, optional
+        Columns to treat as categorical. Default is none.
+    method : {"spearman", "pearson"}, optional
+        Correlation coefficient for numeric pairs. Default is "spearman".
+    n_samples : int, optional
+        Use a random sample of this many rows instead of all of them; None
+        uses every row. Default is 10000, as in Deepchecks.
+    n_jobs : int, optional
+        Number of worker processes for the pairs involving categorical features;
+        -1 uses all cores. Default is None (serial).
+    random_state : int, optional
+        Seed for sampling. Default is 42.
+    confidence : float, optional
+        Level of the Fisher z bounds of the numeric correlations; the bounds of
+        the other measures are NaN. Default is 0.95.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per pair, with columns `feature_1`, `feature_2`, `measure`,
+        `correlation`, `lower`, `upper` and `n` (rows used).
+
+    Raises
+    ------
+    ValueError
+        If `method` is not a supported correlation method.
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"method must be one of {CORRELATION_METHODS}")
+    if n_samples is not None and len(data) > n_samples:
+        data = data.sample(n_samples, random_state=random_state)
+    cat_features = [col for col in data.columns if col in cat_features]
+    num_features = [col for col in data.columns
+                    if col not in cat_features and pd.api.types.is_numeric_dtype(data[col].dtype)]
+
+    rows = []
+    matrix, counts = _correlation_matrix(data[num_features], method)
+    variance_factor = 1.06 if method == "spearman" else 1.0
+    for i, j in combinations(range(len(num_features)), 2):
+        lower, upper = _fisher_bounds(matrix[i, j], counts[i, j], confidence, variance_factor)
+        rows.append((num_features[i], num_features[j], method, matrix[i, j], lower, upper, counts[i, j]))
+
+    mixed = ([(num, cat, "correlation_ratio") for num in num_features for cat in cat_features]
+             + [(a, b, "cramers_v") for a, b in combinations(cat_features, 2)])
+
+    def associate(first, second, measure):
+        if measure == "correlation_ratio":
+            return correlation_ratio(data[second], data[first])
+        return cramers_v(data[first], data[second])
+
+    values = Parallel(n_jobs=n_jobs)(delayed(associate)(*pair) for pair in mixed)
+    for (first, second, measure), value in zip(mixed, values):
+        n = int((data[first].notna() & data[second].notna()).sum())
+        rows.append((first, second, measure, value, np.nan, np.nan, n))
+    return pd.DataFrame(rows, columns=["feature_1", "feature_2", "measure", "correlation", "lower", "upper", "n"])
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import time
+import zipfile
+import requests
+
+# Bytes read from the response and hashed at a time; an interrupted transfer loses at most one chunk
+CHUNK_SIZE = 1 << 16
+# Attempts after a failed connection, each resuming where the last one stopped
+RETRIES = 3
+
+
+def file_sha256(path: str):
+    """
+    Return the SHA-256 hex digest of a file, read in chunks.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to hash.
+
+    Returns
+    -------
+    str
+        The lower-case hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(path: str, archive: str):
+    """
+    Return the manifest entry of an archive.
+
+    The manifest is a JSON object mapping each archive file name to its
+    `sha256` digest and the `members` to extract from it.
+
+    Parameters
+    ----------
+    path : str
+        Path of the JSON manifest.
+    archive : str
+        File name of the archive, e.g. "data.zip".
+
+    Returns
+    -------
+    dict
+        The archive's entry, with the keys `sha256` and `members`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the manifest does not exist.
+    ValueError
+        If the archive is not in the manifest, or its entry has no SHA-256 digest.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Manifest {path} does not exist.")
+    with open(path) as f:
+        manifest = json.load(f)
+    if archive not in manifest:
+        raise ValueError(f"{archive} is not in the manifest {path}")
+    entry = manifest[archive]
+    if not entry.get("sha256"):
+        raise ValueError(f"The manifest entry of {archive} has no sha256 digest")
+    return {"sha256": entry["sha256"].lower(), "members": list(entry.get("members", []))}
+
+
+def _fetch(url: str, part_path: str, timeout: float):
+    """Append the missing bytes of `url` to `part_path`, resuming from its current size."""
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 416:
+            # The partial file already holds every byte; the checksum decides whether it is right
+            return
+        response.raise_for_status()
+        # A server that ignores the range sends the whole file again
+        mode = 'ab' if offset and response.status_code == 206 else 'wb'
+        with open(part_path, mode) as f:
+            for block in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(block)
+
+
+def download_file(url: str, path: str, sha256: str, timeout: float = 30, retries: int = RETRIES):
+    """
+    Download a file to disk in chunks, resuming interrupted transfers, and check its SHA-256.
+
+    The file is written to `path + ".part"`, which only replaces `path` once
+    its digest matches. If the connection fails, the transfer is retried
+    with an HTTP range request for the missing bytes, after a 1, 2, 4, ...
+    second pause; a partial file left by an earlier run is resumed the same
+    way. If `path` already exists with the expected digest, nothing is
+    downloaded.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    path : str
+        Destination file.
+    sha256 : str
+        Expected SHA-256 hex digest of the file.
+    timeout : float, optional
+        Seconds to wait for the server to connect or send data. Default is 30.
+    retries : int, optional
+        Number of further attempts after a failed connection. Default is 3.
+
+    Returns
+    -------
+    bool
+        True if the file was downloaded, False if a verified copy was already there.
+
+    Raises
+    ------
+    ValueError
+        If the downloaded file does not have the expected digest; the partial
+        file is removed so that the next run starts over.
+    requests.HTTPError
+        If the server answers with an error status.
+    requests.RequestException
+        If the connection still fails after `retries` retries.
+    """
+    sha256 = sha256.lower()
+    if os.path.exists(path) and file_sha256(path) == sha256:
+        return False
+
+    part_path = f"{path}.part"
+    for attempt in range(retries + 1):
+        try:
+            _fetch(url, part_path, timeout)
+            break
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            if attempt == retries:
+                raise
+            time.sleep(2 ** attempt)
+
+    digest = file_sha256(part_path)
+    if digest != sha256:
+        os.remove(part_path)
+        raise ValueError(f"SHA-256 of {url} is {digest}, expected {sha256}")
+    os.replace(part_path, path)
+    return True
+
+
+def extract_members(zip_path: str, members, output_dir: str):
+    """
+    Extract only the given members of a zip archive.
+
+    Parameters
+    ----------
+    zip_path : str
+        Path of the archive.
+    members : list of str
+        Names of the members to extract.
+    output_dir : str
+        Directory to extract them into.
+
+    Returns
+    -------
+    list of str
+        Paths of the extracted files.
+
+    Raises
+    ------
+    ValueError
+        If a member is not in the archive.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        names = set(zip_ref.namelist())
+        missing = [member for member in members if member not in names]
+        if missing:
+            raise ValueError(f"{zip_path} has no members {missing}")
+        return [zip_ref.extract(member, output_dir) for member in members]
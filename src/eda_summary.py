@@ -0,0 +1,470 @@
+import collections
+import json
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.table_io import table_format, read_table, write_table
+
+# Quantiles reported for each numeric column
+SUMMARY_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# Size parameter of the quantile sketches: rank error is about 1.7 / KLL_K
+KLL_K = 200
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Values are kept in levels of sorted compactors: an item at level `h`
+    stands for `2**h` values. When a level holds more than its capacity it
+    is sorted and every other item (from a random offset) moves up a level,
+    so the sketch keeps about `3 * k` items however many values it has seen.
+    Two sketches merge by concatenating their levels and compacting again.
+
+    Parameters
+    ----------
+    k : int, optional
+        Capacity of the top level. Default is `KLL_K`.
+    seed : int, optional
+        Seed of the compaction offsets. Default is 0.
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int = 0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        return max(int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - level))), 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind
+                kept, items = items[:len(items) % 2], items[len(items) % 2:]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1],
+                                                         items[self._rng.integers(2)::2]])
+                self.levels[level] = kept
+            level += 1
+
+    def update(self, values):
+        """Add an array of values; missing values are ignored."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Add the values seen by another sketch."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q):
+        """
+        Estimate quantiles of the values seen.
+
+        Until the first compaction every value is kept, and the quantiles are
+        exact, interpolated as in `numpy.quantile`.
+
+        Parameters
+        ----------
+        q : array-like of float
+            Probabilities between 0 and 1.
+
+        Returns
+        -------
+        numpy.ndarray
+            The estimated quantiles; NaN if no value has been seen.
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], q)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left').clip(max=len(items) - 1)
+        return items[order][position]
+
+
+class EDASummary:
+    """
+    Mergeable one-pass summary of a table.
+
+    For each numeric column: the count of non-missing values, their mean and
+    sum of squared deviations (combined across chunks with Chan's update,
+    the batch form of Welford's algorithm), minimum, maximum and a
+    `KLLSketch` of its quantiles. For each categorical column: the frequency
+    of every value. For every pair of numeric columns: the co-moments of the
+    rows where both are present, from which Pearson correlations are
+    computed as `pandas.DataFrame.corr` does.
+
+    Summaries are built from chunks with `summarize_frame` and combined with
+    `merge`, so shards of a table can be summarised in parallel.
+    """
+
+    def __init__(self, numeric, categorical, k: int = KLL_K, seed: int = 0):
+        self.numeric_columns = list(numeric)
+        self.categorical_columns = list(categorical)
+        self.n_rows = 0
+        n = len(self.numeric_columns)
+        self.counts = np.zeros(n)
+        self.means = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.minimum = np.full(n, np.nan)
+        self.maximum = np.full(n, np.nan)
+        self.sketches = [KLLSketch(k, seed=seed * n + i) for i in range(n)]
+        self.frequencies = {col: collections.Counter() for col in self.categorical_columns}
+        self.nulls = {col: 0 for col in self.categorical_columns}
+        # Pairwise statistics: [i, j] is over the rows where columns i and j are both present
+        self.pair_counts = np.zeros((n, n))
+        self.pair_means = np.zeros((n, n))
+        self.pair_m2 = np.zeros((n, n))
+        self.comoments = np.zeros((n, n))
+
+    def merge(self, other: "EDASummary"):
+        """
+        Add the rows summarised by another summary of the same columns.
+
+        Raises
+        ------
+        ValueError
+            If the summaries have different columns.
+        """
+        if (self.numeric_columns, self.categorical_columns) != (other.numeric_columns, other.categorical_columns):
+            raise ValueError("Only summaries of the same numeric and categorical columns can be merged")
+        self.n_rows += other.n_rows
+        self.counts, self.means, self.m2 = _combine(self.counts, self.means, self.m2,
+                                                    other.counts, other.means, other.m2)
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        for col in self.categorical_columns:
+            self.frequencies[col].update(other.frequencies[col])
+            self.nulls[col] += other.nulls[col]
+
+        n1, n2 = self.pair_counts, other.pair_counts
+        total = n1 + n2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(total > 0, other.pair_means - self.pair_means, 0.0)
+            weight = np.where(total > 0, n1 * n2 / total, 0.0)
+            self.pair_means = self.pair_means + np.where(total > 0, delta * n2 / total, 0.0)
+        self.pair_m2 = self.pair_m2 + other.pair_m2 + delta ** 2 * weight
+        self.comoments = self.comoments + other.comoments + delta * delta.T * weight
+        self.pair_counts = total
+        return self
+
+    def correlation(self):
+        """Return the Pearson correlation matrix of the numeric columns as a DataFrame."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = self.comoments / np.sqrt(self.pair_m2 * self.pair_m2.T)
+        values[self.pair_counts < 2] = np.nan
+        return pd.DataFrame(values, index=self.numeric_columns, columns=self.numeric_columns)
+
+    def to_dict(self, quantiles=SUMMARY_QUANTILES):
+        """
+        Return the summary as a JSON-compatible dict.
+
+        Parameters
+        ----------
+        quantiles : sequence of float, optional
+            Quantiles reported for each numeric column. Default is `SUMMARY_QUANTILES`.
+
+        Returns
+        -------
+        dict
+            `n_rows`; `columns`, mapping each column to its `type` ("numeric" or
+            "categorical"), `count` of non-missing values and `null_rate`, with
+            `mean`, `std` (with one degree of freedom, as in `describe`), `min`,
+            `max` and `quantiles` (labelled like `describe`, e.g. "25%") for
+            numeric columns, or the `frequencies` of each value, most frequent
+            first, for categorical ones; and `correlation`, the `columns` and
+            `values` of the correlation matrix of the numeric columns.
+        """
+        columns = {}
+        for i, col in enumerate(self.numeric_columns):
+            count = int(self.counts[i])
+            columns[col] = {
+                "type": "numeric", "count": count, "null_rate": _rate(self.n_rows - count, self.n_rows),
+                "mean": _float(self.means[i]) if count else None,
+                "std": _float(np.sqrt(self.m2[i] / (count - 1))) if count > 1 else None,
+                "min": _float(self.minimum[i]), "max": _float(self.maximum[i]),
+                "quantiles": {f"{q * 100:g}%": _float(value)
+                              for q, value in zip(quantiles, self.sketches[i].quantile(quantiles))},
+            }
+        for col in self.categorical_columns:
+            frequencies = sorted(self.frequencies[col].items(), key=lambda item: (-item[1], str(item[0])))
+            columns[col] = {
+                "type": "categorical", "count": self.n_rows - self.nulls[col],
+                "null_rate": _rate(self.nulls[col], self.n_rows),
+                "frequencies": {str(value): count for value, count in frequencies},
+            }
+        correlation = self.correlation()
+        return {
+            "n_rows": self.n_rows,
+            "columns": columns,
+            "correlation": {"columns": self.numeric_columns,
+                            "values": [[_float(v) for v in row] for row in correlation.to_numpy()]},
+        }
+
+
+def _float(value):
+    # JSON has no NaN
+    return None if value is None or np.isnan(value) else float(value)
+
+
+def _rate(part, whole):
+    return part / whole if whole else None
+
+
+def _combine(n1, mean1, m2_1, n2, mean2, m2_2):
+    # Chan et al.'s pairwise update of counts, means and sums of squared deviations
+    n = n1 + n2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = np.where(n > 0, mean2 - mean1, 0.0)
+        mean = mean1 + np.where(n > 0, delta * n2 / n, 0.0)
+        m2 = m2_1 + m2_2 + np.where(n > 0, delta ** 2 * n1 * n2 / n, 0.0)
+    return n, mean, m2
+
+
+def summarize_frame(data: pd.DataFrame, categorical=None, k: int = KLL_K, seed: int = 0):
+    """
+    Summarise one chunk of a table.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The chunk.
+    categorical : list of str, optional
+        Columns summarised by their value frequencies. Default is every
+        non-numeric column; the others must be numeric.
+    k : int, optional
+        Size parameter of the quantile sketches. Default is `KLL_K`.
+    seed : int, optional
+        Seed of the quantile sketches; give each chunk its own. Default is 0.
+
+    Returns
+    -------
+    EDASummary
+        The summary of the chunk.
+    """
+    if categorical is None:
+        categorical = [col for col in data.columns if not pd.api.types.is_numeric_dtype(data[col])]
+    numeric = [col for col in data.columns if col not in categorical]
+    summary = EDASummary(numeric, categorical, k=k, seed=seed)
+    summary.n_rows = len(data)
+
+    values = data[numeric].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    summary.counts = present.sum(axis=0).astype(float)
+    with np.errstate(invalid='ignore'):
+        summary.means = np.where(summary.counts > 0, np.nansum(values, axis=0) / np.maximum(summary.counts, 1), 0.0)
+    centred = np.where(present, values - summary.means, 0.0)
+    summary.m2 = (centred ** 2).sum(axis=0)
+    if len(values):
+        with warnings.catch_warnings():
+            # All-missing columns have no minimum or maximum
+            warnings.simplefilter('ignore', RuntimeWarning)
+            summary.minimum, summary.maximum = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+    for i, sketch in enumerate(summary.sketches):
+        sketch.update(values[:, i])
+
+    # Co-moments over the rows where both columns are present, from chunk-centred values
+    mask = present.astype(float)
+    pair_counts = mask.T @ mask
+    sums = centred.T @ mask
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pair_centred_means = np.where(pair_counts > 0, sums / pair_counts, 0.0)
+    summary.pair_counts = pair_counts
+    summary.pair_means = pair_centred_means + summary.means[:, None]
+    summary.pair_m2 = (centred ** 2).T @ mask - pair_centred_means * sums
+    summary.comoments = centred.T @ centred - pair_centred_means * sums.T
+
+    for col in categorical:
+        column = data[col].astype(object)
+        summary.nulls[col] = int(column.isna().sum())
+        summary.frequencies[col] = collections.Counter(column.value_counts(dropna=True).to_dict())
+    return summary
+
+
+def _iter_table(path, chunksize):
+    if table_format(path) == ".feather":
+        data = read_table(path)
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+        return
+    from src.predict import iter_chunks
+    yield from iter_chunks(path, chunksize)
+
+
+def summarize_table(path: str, chunksize: int = 100_000, max_workers: int = None, k: int = KLL_K):
+    """
+    Summarise a CSV, Parquet or Feather file in one streaming pass.
+
+    The file is read one chunk at a time; each chunk is summarised with
+    `summarize_frame`, on a pool of worker processes when there is more than
+    one chunk, and the summaries are merged in file order. Every chunk has
+    its own sketch seed, so the result does not depend on `max_workers`.
+    Columns are typed by the first chunk: a column that is non-numeric there
+    is summarised as categorical throughout.
+
+    Parameters
+    ----------
+    path : str
+        Path of the table.
+    chunksize : int, optional
+        Number of rows read at a time. Default is 100,000.
+    max_workers : int, optional
+        Number of worker processes. Default is the number of CPUs; with 1,
+        chunks are summarised in this process.
+    k : int, optional
+        Size parameter of the quantile sketches. Default is `KLL_K`.
+
+    Returns
+    -------
+    EDASummary
+        The summary of the whole table.
+
+    Raises
+    ------
+    ValueError
+        If the table has no rows, or the file extension or chunk size is not valid.
+    FileNotFoundError
+        If the file does not exist.
+    """
+    chunks = _iter_table(path, chunksize)
+    first = next(chunks, None)
+    if first is None or first.empty:
+        raise ValueError("Input file must contain observations.")
+    categorical = [col for col in first.columns if not pd.api.types.is_numeric_dtype(first[col])]
+    summary = summarize_frame(first, categorical, k=k, seed=0)
+
+    def typed(chunk):
+        # A chunk whose values of a categorical column are all missing reads it as numeric
+        return chunk.astype({col: object for col in categorical})
+
+    workers = max_workers or os.cpu_count() or 1
+    second = next(chunks, None)
+    if second is None:
+        return summary
+    if workers == 1:
+        summary.merge(summarize_frame(typed(second), categorical, k=k, seed=1))
+        for seed, chunk in enumerate(chunks, start=2):
+            summary.merge(summarize_frame(typed(chunk), categorical, k=k, seed=seed))
+        return summary
+
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = collections.deque([pool.submit(summarize_frame, typed(second), categorical, k, 1)])
+        for seed, chunk in enumerate(chunks, start=2):
+            pending.append(pool.submit(summarize_frame, typed(chunk), categorical, k, seed))
+            # Bound the chunks held in memory
+            while len(pending) > 2 * workers:
+                summary.merge(pending.popleft().result())
+        while pending:
+            summary.merge(pending.popleft().result())
+    return summary
+
+
+def save_summary(summary: EDASummary, directory: str, name: str = "eda_summary"):
+    """
+    Save a summary as `<name>.json` (see `EDASummary.to_dict`) and as a
+    `<name>.parquet` table with one row per column.
+
+    Parameters
+    ----------
+    summary : EDASummary
+        The summary to save.
+    directory : str
+        Existing directory to write to.
+    name : str, optional
+        File name, without extension. Default is "eda_summary".
+
+    Returns
+    -------
+    dict
+        The saved summary, as returned by `EDASummary.to_dict`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory does not exist.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory {directory} does not exist.")
+    content = summary.to_dict()
+    with open(os.path.join(directory, f"{name}.json"), 'w') as f:
+        json.dump(content, f, indent=2)
+
+    rows = []
+    for col, stats in content["columns"].items():
+        row = {"column": col, "type": stats["type"], "count": stats["count"], "null_rate": stats["null_rate"]}
+        if stats["type"] == "numeric":
+            row.update({key: stats[key] for key in ["mean", "std", "min", "max"]}, **stats["quantiles"])
+        else:
+            row["n_values"] = len(stats["frequencies"])
+            row["top"] = next(iter(stats["frequencies"]), None)
+        rows.append(row)
+    write_table(pd.DataFrame(rows), directory, f"{name}.parquet")
+    return content
+
+
+def load_summary(path: str):
+    """
+    Read a summary saved by `save_summary`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the `.json` file.
+
+    Returns
+    -------
+    dict
+        The summary, as returned by `EDASummary.to_dict`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Summary file {path} does not exist.")
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_summary(content):
+    """Format a summary dict as the tables printed by `04_eda_with_validation.py`."""
+    lines = [f"Rows: {content['n_rows']}", ""]
+    numeric = {col: stats for col, stats in content["columns"].items() if stats["type"] == "numeric"}
+    if numeric:
+        labels = list(next(iter(numeric.values()))["quantiles"])
+        header = ["count", "null %", "mean", "std", "min"] + labels + ["max"]
+        lines.append(f"{'':<24}" + "".join(f"{label:>10}" for label in header))
+        for col, stats in numeric.items():
+            values = [stats["count"], 100 * (stats["null_rate"] or 0), stats["mean"], stats["std"], stats["min"],
+                      *stats["quantiles"].values(), stats["max"]]
+            lines.append(f"{col:<24}" + "".join(f"{'-' if v is None else format(v, '.2f'):>10}" for v in values))
+    for col, stats in content["columns"].items():
+        if stats["type"] == "categorical":
+            lines.append("")
+            lines.append(f"Value counts for {col} ({100 * (stats['null_rate'] or 0):.1f}% missing):")
+            lines.extend(f"  {value:<22}{count:>8}" for value, count in stats["frequencies"].items())
+    return "\n".join(lines)
@@ -0,0 +1,255 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.utils import Bunch
+
+# Resamples drawn and scored at once by one worker, as one index matrix
+BOOTSTRAP_BATCH = 100
+
+
+def _encode(y, classes):
+    """Return the index of each label in `classes`."""
+    y = np.asarray(y, dtype=object)
+    codes = pd.Index(classes).get_indexer(y)
+    if (codes < 0).any():
+        raise ValueError(f"Labels {sorted(set(y[codes < 0].tolist()))} are not among the classes {list(classes)}")
+    return codes
+
+
+def _divide(numerator, denominator):
+    # 0/0 scores 0, as scikit-learn does by default
+    return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), 0.0)
+
+
+def _cells(true, proba, positive):
+    """
+    Assign each test observation the cells it is counted in by every metric.
+
+    These depend on the predictions only, so they are computed once and
+    shared by all resamples: the (true, predicted) pair of the confusion
+    matrix, and for each class the rank of its tied probability group
+    together with whether the observation belongs to the class, for its
+    one-vs-rest ROC-AUC.
+    """
+    n_classes = proba.shape[1]
+    groups = []
+    for k in range(n_classes):
+        unique, rank = np.unique(proba[:, k], return_inverse=True)
+        groups.append((rank * 2 + (true == k), len(unique)))
+    return Bunch(
+        n_classes=n_classes,
+        pairs=true * n_classes + proba.argmax(axis=1),
+        groups=groups,
+        errors=(proba[:, positive] - (true == positive)) ** 2,
+    )
+
+
+def _resample_scores(indices, cells):
+    """
+    Score every row of a matrix of resampled observation indices at once.
+
+    Each metric only needs the number of times each cell occurs in a
+    resample, so all the rows are counted with a single `np.bincount` per
+    metric, each row offset into its own block of bins.
+    """
+    n_resamples, n = indices.shape
+    offsets = np.arange(n_resamples)[:, None]
+
+    def counts(codes, n_codes):
+        binned = np.bincount((codes[indices] + offsets * n_codes).ravel(), minlength=n_resamples * n_codes)
+        return binned.reshape(n_resamples, n_codes)
+
+    n_classes = cells.n_classes
+    confusion = counts(cells.pairs, n_classes * n_classes).reshape(n_resamples, n_classes, n_classes)
+    tp = np.diagonal(confusion, axis1=1, axis2=2)
+    support, predicted_count = confusion.sum(axis=2), confusion.sum(axis=1)
+    precision, recall = _divide(tp, predicted_count), _divide(tp, support)
+    f1 = _divide(2 * precision * recall, precision + recall)
+    scores = {"accuracy": tp.sum(axis=1) / n}
+    for name, values in [("precision", precision), ("recall", recall), ("f1-score", f1)]:
+        scores[f"macro avg {name}"] = values.mean(axis=1)
+        scores[f"weighted avg {name}"] = (values * support).sum(axis=1) / n
+        for k in range(n_classes):
+            scores[f"{k} {name}"] = values[:, k]
+
+    # One-vs-rest ROC-AUC: each positive beats the negatives of lower groups and ties half of its own
+    aucs = []
+    for codes, n_groups in cells.groups:
+        grouped = counts(codes, 2 * n_groups).reshape(n_resamples, n_groups, 2)
+        negative, positive = grouped[:, :, 0], grouped[:, :, 1]
+        below = np.cumsum(negative, axis=1) - negative
+        with np.errstate(invalid='ignore', divide='ignore'):
+            aucs.append((positive * (below + 0.5 * negative)).sum(axis=1)
+                        / (positive.sum(axis=1) * negative.sum(axis=1)))
+    scores["roc_auc"] = np.mean(aucs, axis=0)
+
+    scores["brier"] = cells.errors[indices].sum(axis=1) / n
+    return scores
+
+
+def _rename(scores, classes):
+    """Replace the class indices in metric names with the class labels."""
+    renamed = {}
+    for name, values in scores.items():
+        first, _, rest = name.partition(" ")
+        renamed[f"{classes[int(first)]} {rest}" if first.isdigit() else name] = values
+    return renamed
+
+
+def evaluate_proba(y_true, proba, classes, pos_label=None, n_bins: int = 10):
+    """
+    Compute every test-set metric from one matrix of predicted probabilities.
+
+    The predicted class is the most probable one, as in the classifier's own
+    `predict`. Counts are aggregated with array operations rather than one
+    scikit-learn metric call per table.
+
+    Parameters
+    ----------
+    y_true : array-like
+        True labels.
+    proba : numpy.ndarray
+        Predicted probabilities, one column per class, from `predict_proba`.
+    classes : array-like
+        Class labels in the column order of `proba` (the classifier's `classes_`).
+    pos_label : str, optional
+        Class whose probability is scored by the Brier score and calibration
+        table. Default is the last class.
+    n_bins : int, optional
+        Number of equal-width probability bins of the calibration table. Default is 10.
+
+    Returns
+    -------
+    sklearn.utils.Bunch
+        With `confusion_matrix` (a DataFrame with true classes as rows and
+        predicted classes as columns), `report` (the DataFrame of
+        `classification_report(output_dict=True)`, transposed), `roc_auc` (the
+        mean one-vs-rest ROC-AUC), `brier` and `calibration` (the mean
+        predicted probability and observed frequency of `pos_label` in each
+        non-empty bin, with its count, as `calibration_curve` computes them).
+
+    Raises
+    ------
+    ValueError
+        If a label is not one of the classes, or `proba` does not have one
+        column per class.
+    """
+    classes = np.asarray(classes, dtype=object)
+    proba = np.asarray(proba, dtype=np.float64)
+    if proba.ndim != 2 or proba.shape[1] != len(classes):
+        raise ValueError(f"proba must have one column per class ({len(classes)})")
+    true = _encode(y_true, classes)
+    positive = len(classes) - 1 if pos_label is None else int(_encode([pos_label], classes)[0])
+    n_classes = len(classes)
+
+    cells = _cells(true, proba, positive)
+    counts = np.bincount(cells.pairs, minlength=n_classes ** 2).reshape(n_classes, n_classes)
+    scores = _resample_scores(np.arange(len(true))[None, :], cells)
+
+    report = {}
+    for k, label in enumerate(classes):
+        report[label] = {name: float(scores[f"{k} {name}"][0]) for name in ["precision", "recall", "f1-score"]}
+        report[label]["support"] = int(counts[k].sum())
+    report["accuracy"] = float(scores["accuracy"][0])
+    for average in ["macro avg", "weighted avg"]:
+        report[average] = {name: float(scores[f"{average} {name}"][0]) for name in ["precision", "recall", "f1-score"]}
+        report[average]["support"] = len(true)
+
+    # Bins include their upper edge, as in `sklearn.calibration.calibration_curve`
+    bins = np.searchsorted(np.linspace(0, 1, n_bins + 1)[1:-1], proba[:, positive])
+    bin_counts = np.bincount(bins, minlength=n_bins)
+    observed = np.bincount(bins, weights=(true == positive), minlength=n_bins)
+    predicted_mean = np.bincount(bins, weights=proba[:, positive], minlength=n_bins)
+    filled = bin_counts > 0
+    calibration = pd.DataFrame({
+        "bin_lower": np.arange(n_bins)[filled] / n_bins,
+        "bin_upper": (np.arange(n_bins)[filled] + 1) / n_bins,
+        "mean_predicted": predicted_mean[filled] / bin_counts[filled],
+        "fraction_positive": observed[filled] / bin_counts[filled],
+        "count": bin_counts[filled],
+    })
+
+    return Bunch(
+        confusion_matrix=pd.DataFrame(counts, index=classes, columns=classes),
+        report=pd.DataFrame(report).transpose(),
+        roc_auc=float(scores["roc_auc"][0]),
+        brier=float(scores["brier"][0]),
+        calibration=calibration,
+    )
+
+
+def _bootstrap_batch(seed, n_resamples, cells):
+    # All resamples of the batch as one index matrix
+    n = len(cells.pairs)
+    indices = np.random.default_rng(seed).integers(0, n, size=(n_resamples, n))
+    return _resample_scores(indices, cells)
+
+
+def bootstrap_metrics(y_true, proba, classes, pos_label=None, n_resamples: int = 1000,
+                      confidence: float = 0.95, random_state: int = 123, n_jobs: int = None):
+    """
+    Bootstrap confidence intervals of the test-set metrics.
+
+    Resamples are drawn in batches of `BOOTSTRAP_BATCH`: each batch is one
+    matrix of row indices, from which every metric of every resample is
+    counted with array operations rather than a Python loop over resamples. Batches are spread over `n_jobs` worker
+    processes; each has its own seed derived from `random_state`, so the
+    intervals do not depend on `n_jobs`.
+
+    Parameters
+    ----------
+    y_true : array-like
+        True labels.
+    proba : numpy.ndarray
+        Predicted probabilities, one column per class.
+    classes : array-like
+        Class labels in the column order of `proba`.
+    pos_label : str, optional
+        Class scored by the Brier score. Default is the last class.
+    n_resamples : int, optional
+        Number of bootstrap resamples. Default is 1000.
+    confidence : float, optional
+        Level of the percentile intervals. Default is 0.95.
+    random_state : int, optional
+        Seed of the resampling. Default is 123.
+    n_jobs : int, optional
+        Number of worker processes; -1 uses all cores. Default is None (serial).
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per metric (accuracy, precision, recall and F1 of each class
+        and their macro and weighted averages, ROC-AUC and Brier score) with
+        columns `estimate` (on the test set itself), `lower` and `upper`.
+        Metrics undefined in a resample (e.g. ROC-AUC without positives) are
+        left out of its interval.
+
+    Raises
+    ------
+    ValueError
+        If `n_resamples` is not positive or `confidence` is not between 0 and 1.
+    """
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be a positive integer")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+    classes = np.asarray(classes, dtype=object)
+    proba = np.asarray(proba, dtype=np.float64)
+    true = _encode(y_true, classes)
+    positive = len(classes) - 1 if pos_label is None else int(_encode([pos_label], classes)[0])
+
+    cells = _cells(true, proba, positive)
+    sizes = [min(BOOTSTRAP_BATCH, n_resamples - start) for start in range(0, n_resamples, BOOTSTRAP_BATCH)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    batches = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_bootstrap_batch)(seed, size, cells) for seed, size in zip(seeds, sizes))
+    estimate = _rename(_resample_scores(np.arange(len(true))[None, :], cells), classes)
+    batches = [_rename(batch, classes) for batch in batches]
+
+    tail = (1 - confidence) / 2 * 100
+    rows = {}
+    for name, point in estimate.items():
+        values = np.concatenate([batch[name] for batch in batches])
+        lower, upper = np.nanpercentile(values, [tail, 100 - tail])
+        rows[name] = {"estimate": float(point[0]), "lower": lower, "upper": upper}
+    return pd.DataFrame(rows).transpose().rename_axis("metric")
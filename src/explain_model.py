@@ -0,0 +1,230 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, balanced_accuracy_score, roc_auc_score, log_loss
+from sklearn.pipeline import Pipeline
+from sklearn.utils import Bunch, check_random_state
+
+# Most rows of permuted copies scored in one predict_proba call
+MAX_STACKED_ROWS = 1_000_000
+
+
+def _accuracy(y, proba, classes):
+    return accuracy_score(y, classes[proba.argmax(axis=1)])
+
+
+def _balanced_accuracy(y, proba, classes):
+    return balanced_accuracy_score(y, classes[proba.argmax(axis=1)])
+
+
+def _roc_auc(y, proba, classes):
+    return roc_auc_score(y == classes[-1], proba[:, -1])
+
+
+def _neg_log_loss(y, proba, classes):
+    return -log_loss(y, proba, labels=classes)
+
+
+# Scores computed from predicted probabilities, named as the scikit-learn scorers they reproduce
+PERMUTATION_SCORERS = {
+    "accuracy": _accuracy,
+    "balanced_accuracy": _balanced_accuracy,
+    "roc_auc": _roc_auc,
+    "neg_log_loss": _neg_log_loss,
+}
+
+
+def _shuffled_rows(n_rows, n_repeats, random_state):
+    """
+    Row order of the permuted column in each repeat.
+
+    Reproduces `sklearn.inspection.permutation_importance`: one seed is drawn
+    for all features, and each repeat shuffles the column as permuted by the
+    previous repeat.
+    """
+    seed = check_random_state(random_state).randint(np.iinfo(np.int32).max + 1)
+    shuffler = np.random.RandomState(seed)
+    shuffling, current = np.arange(n_rows), np.arange(n_rows)
+    rows = np.empty((n_repeats, n_rows), dtype=np.intp)
+    for r in range(n_repeats):
+        shuffler.shuffle(shuffling)
+        current = current[shuffling]
+        rows[r] = current
+    return rows
+
+
+def _permuted_scores(estimator, X, y, rows, scorer):
+    """
+    Score every (feature, repeat) permuted copy of `X` with one `predict_proba` call.
+
+    The copies are stacked into one frame whose columns are gathered from the
+    original ones by row index: the identity everywhere but in the block of
+    each copy's permuted column.
+    """
+    n_repeats, n_rows = rows.shape
+    n_blocks = X.shape[1] * n_repeats
+    columns = {}
+    for j, col in enumerate(X.columns):
+        index = np.tile(np.arange(n_rows), n_blocks)
+        start = j * n_repeats * n_rows
+        index[start:start + n_repeats * n_rows] = rows.ravel()
+        columns[col] = X[col].to_numpy()[index]
+    proba = estimator.predict_proba(pd.DataFrame(columns))
+    classes = np.asarray(estimator.classes_)
+    scores = [scorer(y, block, classes) for block in np.split(proba, n_blocks)]
+    return np.array(scores).reshape(X.shape[1], n_repeats)
+
+
+def permutation_importance(estimator, X: pd.DataFrame, y, scoring: str = "accuracy", n_repeats: int = 5,
+                           random_state=None, n_jobs: int = None):
+    """
+    Permutation importance of each column of `X`, scoring all permuted copies in stacked batches.
+
+    Gives the same importances as `sklearn.inspection.permutation_importance`
+    with the same arguments, but instead of one `predict_proba` call per
+    (feature, repeat), the copies of `X` with one column permuted are stacked
+    and scored together: one call per batch of repeats, and the batches are
+    spread over `n_jobs` worker processes.
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        Fitted classifier with `predict_proba`, taking `X` as it is.
+    X : pandas.DataFrame
+        Data to permute, e.g. the test set.
+    y : array-like
+        True labels of `X`.
+    scoring : {"accuracy", "balanced_accuracy", "roc_auc", "neg_log_loss"}, optional
+        Score whose decrease measures importance. Default is "accuracy",
+        the default `score` of classifiers.
+    n_repeats : int, optional
+        Number of times each column is permuted. Default is 5.
+    random_state : int, numpy.random.RandomState or None, optional
+        Seed of the permutations, as in scikit-learn. Default is None.
+    n_jobs : int, optional
+        Number of worker processes; -1 uses all cores. Default is None (serial).
+
+    Returns
+    -------
+    sklearn.utils.Bunch
+        `importances` (one row per column, one column per repeat),
+        `importances_mean`, `importances_std` and `baseline_score`.
+
+    Raises
+    ------
+    ValueError
+        If the scoring is not supported or `n_repeats` is not positive.
+    """
+    if scoring not in PERMUTATION_SCORERS:
+        raise ValueError(f"scoring must be one of {list(PERMUTATION_SCORERS)}")
+    if n_repeats < 1:
+        raise ValueError("n_repeats must be a positive integer")
+    scorer = PERMUTATION_SCORERS[scoring]
+    y = np.asarray(y, dtype=object)
+    baseline = scorer(y, estimator.predict_proba(X), np.asarray(estimator.classes_))
+
+    rows = _shuffled_rows(len(X), n_repeats, random_state)
+    # At least one batch per worker, and none larger than MAX_STACKED_ROWS rows
+    per_batch = max(MAX_STACKED_ROWS // max(len(X) * X.shape[1], 1), 1)
+    n_batches = max(joblib.effective_n_jobs(n_jobs), -(-n_repeats // per_batch))
+    batches = [batch for batch in np.array_split(rows, min(n_batches, n_repeats)) if len(batch)]
+    scores = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_permuted_scores)(estimator, X, y, batch, scorer) for batch in batches)
+    importances = baseline - np.concatenate(scores, axis=1)
+    return Bunch(importances=importances, importances_mean=importances.mean(axis=1),
+                 importances_std=importances.std(axis=1), baseline_score=baseline)
+
+
+def importance_table(result, features):
+    """
+    Tabulate the result of `permutation_importance`, most important column first.
+
+    Parameters
+    ----------
+    result : sklearn.utils.Bunch
+        The result of `permutation_importance`.
+    features : list of str
+        Names of the permuted columns, in order.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by `feature`, with columns `importance_mean`, `importance_std`
+        and the importance in each repeat (`repeat_0`, `repeat_1`, ...).
+    """
+    table = pd.DataFrame(result.importances, index=pd.Index(features, name="feature"),
+                         columns=[f"repeat_{r}" for r in range(result.importances.shape[1])])
+    table.insert(0, "importance_std", result.importances_std)
+    table.insert(0, "importance_mean", result.importances_mean)
+    return table.sort_values("importance_mean", ascending=False, kind="stable")
+
+
+def _input_columns(preprocessor):
+    """
+    Map each output column of a fitted ColumnTransformer to the input column it encodes.
+
+    Transformers with one output per input column (scalers, ordinal encoders,
+    imputers) map them in order; one-hot encoders map each category of a
+    column to it.
+    """
+    sources = np.empty(max(block.stop for block in preprocessor.output_indices_.values()), dtype=object)
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        block = preprocessor.output_indices_[name]
+        width = block.stop - block.start
+        if width == len(columns):
+            sources[block] = list(columns)
+            continue
+        encoder = transformer.steps[-1][1] if isinstance(transformer, Pipeline) else transformer
+        widths = [len(categories) for categories in getattr(encoder, "categories_", [])]
+        if getattr(encoder, "drop_idx_", None) is not None or sum(widths) != width:
+            raise ValueError(f"Cannot map the outputs of transformer '{name}' back to its input columns")
+        sources[block] = np.repeat(np.asarray(columns, dtype=object), widths)
+    return sources
+
+
+def linear_contributions(pipe, X: pd.DataFrame):
+    """
+    Contribution of each input column to the decision function of a fitted linear pipeline.
+
+    Each transformed feature contributes its value times its coefficient;
+    the contributions of the features derived from one input column (e.g.
+    its one-hot categories) are summed. For every row, the contributions plus
+    the intercept add up to `pipe.decision_function(X)`, the log-odds of the
+    second class.
+
+    Parameters
+    ----------
+    pipe : sklearn.pipeline.Pipeline
+        Fitted (ColumnTransformer, binary linear classifier) pipeline.
+    X : pandas.DataFrame
+        Rows to explain.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per row of `X` (same index), one column per input column of
+        the preprocessor, in order, and an `intercept` column.
+
+    Raises
+    ------
+    ValueError
+        If the pipeline is not a ColumnTransformer followed by a binary
+        linear classifier, or a transformer's outputs cannot be mapped back.
+    """
+    preprocessor, classifier = pipe[:-1], pipe[-1]
+    if not hasattr(classifier, "coef_") or len(classifier.classes_) != 2:
+        raise ValueError("linear_contributions needs a pipeline ending in a fitted binary linear classifier")
+    if len(preprocessor) != 1 or not hasattr(preprocessor[0], "output_indices_"):
+        raise ValueError("linear_contributions needs a pipeline starting with a fitted ColumnTransformer")
+    sources = _input_columns(preprocessor[0])
+    terms = np.asarray(preprocessor.transform(X), dtype=float) * classifier.coef_.ravel()
+
+    columns = list(dict.fromkeys(sources))
+    # Sum the terms of each input column with a 0/1 (transformed feature, input column) matrix
+    mapping = np.zeros((len(sources), len(columns)))
+    mapping[np.arange(len(sources)), pd.Index(columns).get_indexer(sources)] = 1
+    result = pd.DataFrame(terms @ mapping, index=X.index, columns=columns)
+    result["intercept"] = float(classifier.intercept_[0])
+    return result
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.model_store import save_model, load_model
+from src.table_io import write_table, read_table
+
+ENTRY_FILENAME = "entry.json"
+MODEL_DIRNAME = "model"
+CV_RESULTS_FILENAME = "cv_results.csv"
+
+
+def fingerprint_frame(data: pd.DataFrame):
+    """
+    Return a SHA-256 hex digest of a DataFrame's column names and values.
+
+    Each column is hashed with `pandas.util.hash_pandas_object`, a vectorised
+    64-bit hash per value, and the digest is taken over the column names and
+    these hashes, so no value is converted to text. The index is ignored, and
+    a categorical column hashes like the same values stored as strings, so a
+    table read back from CSV, Parquet or Feather has the same fingerprint.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data to fingerprint.
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in data.columns]).encode())
+    for col in data.columns:
+        digest.update(pd.util.hash_pandas_object(data[col], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _describe(value):
+    # JSON-compatible description of an (unfitted) estimator and its parameters, nested ones included
+    if hasattr(value, "get_params") and not isinstance(value, type):
+        cls = type(value)
+        return {"estimator": f"{cls.__module__}.{cls.__qualname__}",
+                "params": {key: _describe(param) for key, param in value.get_params(deep=False).items()}}
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _describe(item) for key, item in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, np.ndarray):
+        return {"array": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def _source_hashes(value, hashes=None):
+    # SHA-256 of the source file of every estimator class defined outside scikit-learn, nested ones included
+    hashes = {} if hashes is None else hashes
+    if hasattr(value, "get_params") and not isinstance(value, type):
+        module = type(value).__module__
+        path = getattr(sys.modules.get(module), "__file__", None)
+        if not module.startswith("sklearn.") and path and module not in hashes:
+            with open(path, 'rb') as f:
+                hashes[module] = hashlib.sha256(f.read()).hexdigest()
+        for param in value.get_params(deep=False).values():
+            _source_hashes(param, hashes)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _source_hashes(item, hashes)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _source_hashes(item, hashes)
+    return hashes
+
+
+def fit_key(data: pd.DataFrame, estimator, **config):
+    """
+    Compute the cache key of fitting `estimator` to `data`.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Training data, target included.
+    estimator : object
+        The unfitted estimator or pipeline; all its parameters, including those
+        of the preprocessor's transformers, are part of the key, and so is the
+        source of every estimator defined outside scikit-learn (e.g.
+        `src.knn_imputer`), so changing its code invalidates the cached fits.
+    **config
+        Anything else the fitted result depends on, e.g. the parameter grid,
+        the folds and the random seed.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest identifying this fit, for the installed versions of
+        scikit-learn and NumPy.
+    """
+    import sklearn
+    description = {
+        "data": fingerprint_frame(data),
+        "estimator": _describe(estimator),
+        "config": _describe(config),
+        "code": _source_hashes(estimator),
+        "versions": {"scikit-learn": sklearn.__version__, "numpy": np.__version__},
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class FitCache:
+    """
+    Disk cache of fitted pipelines and their cross-validation results, keyed by `fit_key`.
+
+    Each entry is a directory `<key>/` holding the fitted pipeline as a model
+    store (see `src.model_store`), its `cv_results_` as a CSV file and an
+    `entry.json` file whose modification time records the last use. Once more
+    than `max_entries` are stored, the least recently used are removed.
+
+    Parameters
+    ----------
+    directory : str
+        Root directory of the cache; created if it does not exist.
+    max_entries : int, optional
+        Number of fitted pipelines kept. Default is 8.
+
+    Raises
+    ------
+    ValueError
+        If `max_entries` is not positive.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 8):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def keys(self):
+        """Return the keys of the complete entries, least recently used first."""
+        entries = []
+        for key in os.listdir(self.directory):
+            entry_file = os.path.join(self._entry_path(key), ENTRY_FILENAME)
+            if os.path.exists(entry_file):
+                entries.append((os.path.getmtime(entry_file), key))
+        return [key for _, key in sorted(entries)]
+
+    def get(self, key: str):
+        """
+        Load the fitted pipeline and cross-validation results stored under `key`.
+
+        Parameters
+        ----------
+        key : str
+            Key from `fit_key`.
+
+        Returns
+        -------
+        tuple of (object, pandas.DataFrame) or None
+            The fitted pipeline and its `cv_results_`, or None on a cache miss.
+        """
+        entry_file = os.path.join(self._entry_path(key), ENTRY_FILENAME)
+        if not os.path.exists(entry_file):
+            return None
+        os.utime(entry_file)
+        model = load_model(os.path.join(self._entry_path(key), MODEL_DIRNAME))
+        cv_results = read_table(os.path.join(self._entry_path(key), CV_RESULTS_FILENAME))
+        return model, cv_results
+
+    def put(self, key: str, model, cv_results: pd.DataFrame):
+        """
+        Store a fitted pipeline and its cross-validation results under `key`.
+
+        The entry is written to a temporary directory and renamed into place, so
+        an interrupted run never leaves a partial entry behind. The least
+        recently used entries are then evicted.
+
+        Parameters
+        ----------
+        key : str
+            Key from `fit_key`.
+        model : object
+            The fitted pipeline.
+        cv_results : pandas.DataFrame
+            The search's `cv_results_`.
+        """
+        tmp_path = f"{self._entry_path(key)}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        save_model(model, os.path.join(tmp_path, MODEL_DIRNAME))
+        write_table(cv_results, tmp_path, CV_RESULTS_FILENAME)
+        with open(os.path.join(tmp_path, ENTRY_FILENAME), 'w') as f:
+            json.dump({"key": key, "created": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, indent=2)
+        shutil.rmtree(self._entry_path(key), ignore_errors=True)
+        os.replace(tmp_path, self._entry_path(key))
+        self._evict()
+
+    def _evict(self):
+        keys = self.keys()
+        for key in keys[:max(len(keys) - self.max_entries, 0)]:
+            shutil.rmtree(self._entry_path(key), ignore_errors=True)
@@ -0,0 +1,199 @@
+import os
+from contextlib import ExitStack
+import numpy as np
+import pandas as pd
+from src.predict import iter_chunks
+from src.table_io import CATEGORY_LEVELS, TableWriter, table_format
+
+# Rows are counted by the top 16 bits of their hash in the first pass
+BUCKET_BITS = 16
+N_BUCKETS = 1 << BUCKET_BITS
+
+
+def _mix(values):
+    # splitmix64 finalizer: spreads every input bit over the whole 64-bit output
+    with np.errstate(over='ignore'):
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+        return values ^ (values >> np.uint64(31))
+
+
+def row_hashes(data: pd.DataFrame, seed: int, key_columns=None):
+    """
+    Hash each row of a DataFrame to a 64-bit integer that depends only on its values and the seed.
+
+    Values are normalised before hashing, so that a row gets the same hash
+    whichever chunk of a file it was read in and whatever types pandas
+    inferred for that chunk: the categorical NHANES columns and non-numeric
+    columns are hashed as Python objects, numeric columns as float64.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The rows to hash.
+    seed : int
+        Seed mixed into every hash; each seed orders the rows differently.
+    key_columns : list of str, optional
+        Columns that identify a row. Default is all columns.
+
+    Returns
+    -------
+    numpy.ndarray
+        One uint64 hash per row.
+    """
+    columns = list(data.columns) if key_columns is None else list(key_columns)
+    keys = pd.DataFrame({
+        col: data[col].astype(float)
+        if col not in CATEGORY_LEVELS and pd.api.types.is_numeric_dtype(data[col])
+        else data[col].astype(object)
+        for col in columns
+    }, index=data.index)
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return _mix(hashes ^ _mix(np.array([seed], dtype=np.uint64)))
+
+
+def _labels(chunk, stratify):
+    if stratify not in chunk.columns:
+        raise ValueError(f"Column '{stratify}' to stratify on is not in the data")
+    labels = chunk[stratify].astype(object)
+    if labels.isna().any():
+        raise ValueError(f"Column '{stratify}' has missing values; rows cannot be stratified")
+    return labels
+
+
+def _partition_names(n_folds):
+    return ["test"] + ([f"fold_{j}" for j in range(n_folds)] if n_folds else ["train"])
+
+
+def hash_split(input_path: str, output_dir: str, test_size: float = 0.25, n_folds: int = 0,
+               seed: int = 123, stratify: str = "age_group", key_columns=None, chunksize: int = 100_000):
+    """
+    Split a CSV or Parquet file into train and test files, and optionally train folds, without loading it.
+
+    Within each class of `stratify`, rows are ordered by `row_hashes`; the
+    first `round(test_size * n_class)` go to the test set and the rest to
+    the training set, which is cut into `n_folds` folds of equal size in the
+    same order. Each class is therefore split in exactly the requested
+    proportions, and a row's partition depends only on its values, the seed
+    and the class sizes, not on the order or chunking of the file.
+
+    The file is read twice. The first pass counts the rows of each class by
+    the top 16 bits of their hash; the second writes every row straight to
+    its output file, except rows sharing a hash bucket with a cut between two
+    partitions, which are kept in memory and written at the end once their
+    exact rank is known (a fraction of about `(n_folds + 1) / 65536` of the
+    rows).
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the data, a `.csv` or `.parquet` file.
+    output_dir : str
+        Directory for `data_train`, `data_test` and, with folds,
+        `data_train_folds`, written in the format of `input_path`. The folds
+        file has one `fold` column, aligned with the rows of `data_train`.
+    test_size : float, optional
+        Fraction of each class in the test set. Default is 0.25.
+    n_folds : int, optional
+        Number of cross-validation folds of the training set; 0 for none.
+        Default is 0.
+    seed : int, optional
+        Seed of the row hashes. Default is 123.
+    stratify : str, optional
+        Column whose classes are split in the same proportions. Default is "age_group".
+    key_columns : list of str, optional
+        Columns that identify a row, passed to `row_hashes`. Default is all columns.
+    chunksize : int, optional
+        Number of rows read at a time. Default is 100,000.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The number of rows of each class (rows) in each partition (columns:
+        `test`, then `train` or `fold_0`, `fold_1`, ...).
+
+    Raises
+    ------
+    ValueError
+        If `test_size` or `n_folds` is out of range, the file format is not
+        supported, the data is empty, or the stratification column is missing
+        or has missing values.
+    FileNotFoundError
+        If the input file or the output directory does not exist.
+    """
+    if not 0 < test_size < 1:
+        raise ValueError("test_size must be between 0 and 1")
+    if n_folds < 0 or n_folds == 1:
+        raise ValueError("n_folds must be 0 or at least 2")
+    extension = table_format(input_path)
+    if not os.path.exists(output_dir):
+        raise FileNotFoundError(f"Directory {output_dir} does not exist.")
+
+    # First pass: rows of each class per hash bucket
+    counts = {}
+    for chunk in iter_chunks(input_path, chunksize):
+        labels = _labels(chunk, stratify)
+        buckets = (row_hashes(chunk, seed, key_columns) >> np.uint64(64 - BUCKET_BITS)).astype(np.int64)
+        for label, positions in labels.groupby(labels).indices.items():
+            counts.setdefault(label, np.zeros(N_BUCKETS, dtype=np.int64))
+            counts[label] += np.bincount(buckets[positions], minlength=N_BUCKETS)
+    if not counts:
+        raise ValueError("DataFrame must contain observations.")
+
+    # Ranks at which each class moves to the next partition, and the buckets they fall in
+    cuts = {}
+    for label, bucket_counts in counts.items():
+        n_rows = int(bucket_counts.sum())
+        n_test = round(test_size * n_rows)
+        ranks = [n_test] + [n_test + round(j * (n_rows - n_test) / n_folds) for j in range(1, n_folds)]
+        ranks = np.array(ranks, dtype=np.int64)
+        ends = np.cumsum(bucket_counts)
+        cut_buckets = np.searchsorted(ends, ranks, side='right')
+        # Partition of a row from its bucket, or -1 when a cut falls in the bucket
+        partition = np.searchsorted(cut_buckets, np.arange(N_BUCKETS), side='right')
+        partition[cut_buckets[cut_buckets < N_BUCKETS]] = -1
+        cuts[label] = (ranks, ends - bucket_counts, partition)
+
+    names = _partition_names(n_folds)
+    summary = pd.DataFrame(0, index=sorted(counts), columns=names)
+    paths = {name: os.path.join(output_dir, f"data_{name}{extension}")
+             for name in ["train", "test"] + (["train_folds"] if n_folds else [])}
+    with ExitStack() as stack:
+        writers = {name: stack.enter_context(TableWriter(path)) for name, path in paths.items()}
+
+        def write(rows, partitions):
+            for label, positions in rows[stratify].astype(object).groupby(rows[stratify].astype(object)).indices.items():
+                summary.loc[label] += np.bincount(partitions[positions], minlength=len(names))
+            writers["test"].write(rows[partitions == 0])
+            writers["train"].write(rows[partitions > 0])
+            if n_folds:
+                writers["train_folds"].write(pd.DataFrame({"fold": partitions[partitions > 0] - 1}))
+
+        # Second pass: every row whose partition is known from its bucket alone
+        held, held_hashes = [], []
+        for chunk in iter_chunks(input_path, chunksize):
+            labels = _labels(chunk, stratify)
+            hashes = row_hashes(chunk, seed, key_columns)
+            buckets = (hashes >> np.uint64(64 - BUCKET_BITS)).astype(np.int64)
+            partitions = np.empty(len(chunk), dtype=np.int64)
+            for label, positions in labels.groupby(labels).indices.items():
+                partitions[positions] = cuts[label][2][buckets[positions]]
+            write(chunk[partitions >= 0], partitions[partitions >= 0])
+            held.append(chunk[partitions < 0])
+            held_hashes.append(hashes[partitions < 0])
+
+        # Rows next to a cut: rank them within their bucket by the full hash
+        held = pd.concat(held)
+        held_hashes = np.concatenate(held_hashes)
+        partitions = np.empty(len(held), dtype=np.int64)
+        labels = held[stratify].astype(object)
+        for label, positions in labels.groupby(labels).indices.items():
+            ranks, starts, _ = cuts[label]
+            hashes = held_hashes[positions]
+            order = np.argsort(hashes, kind='stable')
+            buckets = (hashes[order] >> np.uint64(64 - BUCKET_BITS)).astype(np.int64)
+            first = np.searchsorted(buckets, buckets, side='left')
+            rank = starts[buckets] + np.arange(len(order)) - first
+            partitions[positions[order]] = np.searchsorted(ranks, rank, side='right')
+        write(held, partitions)
+    return summary
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import StandardScaler
+from src.make_preprocessor import (make_preprocessor, TARGET, NUMERIC_FEATURES, CATEGORICAL_FEATURES, ORDINAL_FEATURES,
+                                   MAX_DONORS)
+from src.predict import iter_chunks
+from src.table_io import CATEGORY_LEVELS
+
+
+def _vocabulary_frame(columns):
+    # Every level of every categorical column in at least one row; the numeric values are never used
+    n_rows = max(len(CATEGORY_LEVELS[col]) for col in CATEGORICAL_FEATURES + ORDINAL_FEATURES)
+    frame = pd.DataFrame({col: [0.0] * n_rows for col in columns})
+    for col in CATEGORICAL_FEATURES + ORDINAL_FEATURES:
+        levels = CATEGORY_LEVELS[col]
+        frame[col] = [levels[i % len(levels)] for i in range(n_rows)]
+    return frame
+
+
+def make_incremental_preprocessor(data_path: str, chunksize: int = 100_000, max_donors: int = MAX_DONORS,
+                                  random_state: int = 123):
+    """
+    Fit the preprocessor of `make_preprocessor` in one pass over a file, chunk by chunk.
+
+    The numeric scaler is fitted with `StandardScaler.partial_fit`, so its
+    mean and variance are those of the whole file (ignoring missing values,
+    where the batch preprocessor scales the imputed ones). The numeric
+    imputer is fitted on a uniform random sample of at most `max_donors`
+    complete rows, kept as the rows with the smallest random keys seen so
+    far. The categorical encoders
+    use the fixed levels of `src.table_io.CATEGORY_LEVELS` instead of the
+    levels found in the data, so they need no pass at all; a missing
+    categorical value is encoded as all zeros rather than as its own level.
+
+    Parameters
+    ----------
+    data_path : str
+        Path to the training data, a `.csv` or `.parquet` file with the
+        `age_group` target and the feature columns.
+    chunksize : int, optional
+        Number of rows read at a time. Default is 100,000.
+    max_donors : int, optional
+        Largest number of complete rows the numeric imputer searches. Default is `MAX_DONORS`.
+    random_state : int, optional
+        Seed of the donor sample. Default is 123.
+
+    Returns
+    -------
+    tuple
+        The fitted `ColumnTransformer`, the feature column names in file order,
+        and a `pandas.Series` of the number of rows of each target class.
+
+    Raises
+    ------
+    ValueError
+        If the file has no rows, lacks the target column, or the chunk size
+        or file extension is invalid.
+    FileNotFoundError
+        If the file does not exist.
+    """
+    scaler = StandardScaler()
+    rng = np.random.default_rng(random_state)
+    donors, keys = np.empty((0, len(NUMERIC_FEATURES))), np.empty(0)
+    class_counts = pd.Series(dtype=int)
+    columns = None
+    for chunk in iter_chunks(data_path, chunksize):
+        if columns is None:
+            if TARGET not in chunk.columns:
+                raise ValueError(f"Training data must have a '{TARGET}' column")
+            columns = [col for col in chunk.columns if col != TARGET]
+        if chunk.empty:
+            continue
+        # The imputer passes the scaler arrays without column names
+        numeric = chunk[NUMERIC_FEATURES].to_numpy(dtype=float)
+        scaler.partial_fit(numeric)
+        complete = numeric[~np.isnan(numeric).any(axis=1)]
+        donors, keys = np.concatenate([donors, complete]), np.concatenate([keys, rng.random(len(complete))])
+        if len(keys) > max_donors:
+            keep = np.sort(np.argpartition(keys, max_donors)[:max_donors])
+            donors, keys = donors[keep], keys[keep]
+        class_counts = class_counts.add(chunk[TARGET].astype(object).value_counts(), fill_value=0)
+    if class_counts.sum() == 0:
+        raise ValueError("DataFrame must contain observations.")
+
+    preprocessor = make_preprocessor(random_state=random_state)
+    for name, transformer, features in preprocessor.transformers:
+        if features == CATEGORICAL_FEATURES:
+            transformer.set_params(onehotencoder__categories=[CATEGORY_LEVELS[col] for col in CATEGORICAL_FEATURES])
+    preprocessor.fit(_vocabulary_frame(columns))
+    # Put the scaler fitted on the whole file and the imputer fitted on the donors
+    # in place of those fitted on the vocabulary
+    for name, transformer, features in preprocessor.transformers_:
+        if isinstance(transformer, Pipeline) and isinstance(transformer.steps[-1][1], StandardScaler):
+            transformer.steps[-1] = (transformer.steps[-1][0], scaler)
+            transformer.steps[0][1].fit(pd.DataFrame(donors, columns=NUMERIC_FEATURES))
+    return preprocessor, columns, class_counts.astype(int).sort_index()
+
+
+def fit_incremental(data_path: str, chunksize: int = 100_000, epochs: int = 5, alpha: float = 1e-4,
+                    random_state: int = 123):
+    """
+    Fit a logistic regression pipeline on a file too large to load, one chunk at a time.
+
+    The preprocessor is fitted with `make_incremental_preprocessor`. The
+    classifier is an `SGDClassifier` with the logistic loss, trained with
+    `partial_fit` over `epochs` passes through the file, shuffling the rows
+    within each chunk; its weights are the average of those seen during
+    training, which are much less noisy than the last ones. Classes are weighted by the inverse of their
+    frequency, like `class_weight='balanced'` in the batch model. At most
+    one chunk is held in memory at a time.
+
+    Parameters
+    ----------
+    data_path : str
+        Path to the training data, a `.csv` or `.parquet` file.
+    chunksize : int, optional
+        Number of rows read and fitted at a time. Default is 100,000.
+    epochs : int, optional
+        Number of passes through the file. Default is 5.
+    alpha : float, optional
+        L2 regularisation strength of the classifier. Default is 1e-4.
+    random_state : int, optional
+        Seed for the row shuffling and the classifier. Default is 123.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        The fitted preprocessor and classifier, usable wherever the batch
+        pipeline is (`src.model_store`, `src.predict`, `src.compiled_scorer`).
+
+    Raises
+    ------
+    ValueError
+        If `epochs` is not positive, the data has fewer than two classes, or
+        the file cannot be read in chunks (see `make_incremental_preprocessor`).
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if epochs <= 0:
+        raise ValueError("epochs must be a positive integer")
+    preprocessor, columns, class_counts = make_incremental_preprocessor(data_path, chunksize,
+                                                                        random_state=random_state)
+    if len(class_counts) < 2:
+        raise ValueError(f"Training data must have at least two classes of '{TARGET}'")
+    classes = class_counts.index.to_numpy()
+    class_weight = (class_counts.sum() / (len(classes) * class_counts)).to_dict()
+
+    classifier = SGDClassifier(loss="log_loss", alpha=alpha, class_weight=class_weight, average=True,
+                               random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    for _ in range(epochs):
+        for chunk in iter_chunks(data_path, chunksize):
+            order = rng.permutation(len(chunk))
+            X = preprocessor.transform(chunk[columns])[order]
+            y = chunk[TARGET].astype(object).to_numpy()[order]
+            classifier.partial_fit(X, y, classes=classes)
+    return make_pipeline(preprocessor, classifier)
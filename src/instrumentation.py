@@ -0,0 +1,235 @@
+import contextlib
+import functools
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+# Environment variables that switch instrumentation on; it costs nothing when they are unset
+METRICS_ENV = "AGE_PREDICTION_METRICS"
+PROFILE_ENV = "AGE_PREDICTION_PROFILE"
+RUN_ENV = "AGE_PREDICTION_RUN_ID"
+TRACEMALLOC_ENV = "AGE_PREDICTION_TRACEMALLOC"
+PROFILERS = ("cprofile", "pyinstrument")
+
+# Names of the enclosing stage and steps of the running code, outermost first
+_STACK = []
+
+
+def metrics_path():
+    """Return the JSON-lines file metrics are appended to, or None when instrumentation is off."""
+    return os.environ.get(METRICS_ENV) or None
+
+
+def _max_rss_mb():
+    # Peak resident set size of the process so far; Linux reports kilobytes, macOS bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+
+
+def _emit(record):
+    with open(metrics_path(), 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+class _Frame:
+    def __init__(self, name):
+        self.name = name
+        self.peak = 0
+
+
+@contextlib.contextmanager
+def step(name: str):
+    """
+    Time a step of the running stage and record its memory use.
+
+    Steps nest: a step inside another is recorded with the path of all the
+    names above it, e.g. `["fit", "tune"]`. When `AGE_PREDICTION_METRICS` is
+    unset this does nothing.
+
+    Each step appends one JSON line to the metrics file with its `path`,
+    wall `seconds`, `cpu_seconds`, the peak resident set size of the process
+    so far (`max_rss_mb`), the process id and the run id taken from
+    `AGE_PREDICTION_RUN_ID`. With `AGE_PREDICTION_TRACEMALLOC=1`, memory is
+    also traced with `tracemalloc`, which records the peak traced memory
+    during the step (`peak_mb`) and the part of it allocated by the step
+    itself (`allocated_mb`); tracing makes allocation-heavy code, such as
+    imports, several times slower, so it is off by default and these fields
+    are None.
+
+    Parameters
+    ----------
+    name : str
+        Name of the step, unique among the steps of its parent.
+    """
+    if metrics_path() is None:
+        yield
+        return
+    tracing = os.environ.get(TRACEMALLOC_ENV, "0") not in ("", "0")
+    started_tracing = tracing and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if _STACK:
+            _STACK[-1].peak = max(_STACK[-1].peak, peak)
+        tracemalloc.reset_peak()
+    frame = _Frame(name)
+    _STACK.append(frame)
+    start, cpu_start, timestamp = time.perf_counter(), time.process_time(), time.time()
+    try:
+        yield
+    finally:
+        seconds, cpu_seconds = time.perf_counter() - start, time.process_time() - cpu_start
+        path = [f.name for f in _STACK]
+        _STACK.pop()
+        record = {
+            "run": os.environ.get(RUN_ENV), "pid": os.getpid(), "path": path, "start": timestamp,
+            "seconds": seconds, "cpu_seconds": cpu_seconds, "max_rss_mb": _max_rss_mb(),
+            "peak_mb": None, "allocated_mb": None,
+        }
+        if tracing:
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            if _STACK:
+                _STACK[-1].peak = max(_STACK[-1].peak, frame.peak)
+            if started_tracing:
+                tracemalloc.stop()
+            record.update(peak_mb=frame.peak / 2**20, allocated_mb=max(frame.peak - current, 0) / 2**20)
+        _emit(record)
+
+
+@contextlib.contextmanager
+def _profiled(name):
+    profiler = os.environ.get(PROFILE_ENV)
+    if not profiler:
+        yield
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"{PROFILE_ENV} must be one of {PROFILERS}")
+    directory = os.path.splitext(metrics_path())[0] + "_profiles"
+    os.makedirs(directory, exist_ok=True)
+    if profiler == "cprofile":
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(os.path.join(directory, f"{name}.prof"))
+        return
+    try:
+        from pyinstrument import Profiler
+    except ImportError as e:
+        raise ImportError(f"{PROFILE_ENV}=pyinstrument requires the pyinstrument package") from e
+    profile = Profiler()
+    profile.start()
+    try:
+        yield
+    finally:
+        profile.stop()
+        with open(os.path.join(directory, f"{name}.html"), 'w') as f:
+            f.write(profile.output_html())
+
+
+def instrumented(name: str):
+    """
+    Decorate the function of a pipeline stage so that it is recorded as the outermost step.
+
+    With `AGE_PREDICTION_PROFILE` set to "cprofile" or "pyinstrument", the
+    whole stage is also profiled, and the profile saved as `<name>.prof` or
+    `<name>.html` in a `_profiles` directory next to the metrics file.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage, e.g. "clean_validate".
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if metrics_path() is None:
+                return func(*args, **kwargs)
+            with step(name), _profiled(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_metrics(path: str, run: str = None):
+    """
+    Read the records of a metrics file.
+
+    Parameters
+    ----------
+    path : str
+        JSON-lines file written by `step`.
+    run : str, optional
+        Only keep the records of this run id. Default is every record.
+
+    Returns
+    -------
+    list of dict
+        The records, in the order they were written.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Metrics file {path} does not exist.")
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [record for record in records if run is None or record.get("run") == run]
+
+
+def summarize_metrics(records):
+    """
+    Aggregate step records by path.
+
+    A step's self time is its total time minus the total time of the steps
+    directly inside it, so the self times of all the paths add up to the
+    time of the outermost steps.
+
+    Parameters
+    ----------
+    records : list of dict
+        Records from `read_metrics`.
+
+    Returns
+    -------
+    list of dict
+        One entry per path, in the order the paths first finished, with the
+        keys `path` (a tuple), `calls`, `seconds`, `self_seconds`,
+        `cpu_seconds`, `max_rss_mb` and `peak_mb` (the largest of its calls;
+        `peak_mb` is None unless memory was traced).
+    """
+    summary = {}
+    for record in records:
+        path = tuple(record["path"])
+        entry = summary.setdefault(path, {"path": path, "calls": 0, "seconds": 0.0, "cpu_seconds": 0.0,
+                                          "max_rss_mb": 0.0, "peak_mb": None})
+        entry["calls"] += 1
+        entry["seconds"] += record["seconds"]
+        entry["cpu_seconds"] += record["cpu_seconds"]
+        entry["max_rss_mb"] = max(entry["max_rss_mb"], record["max_rss_mb"])
+        if record.get("peak_mb") is not None:
+            entry["peak_mb"] = max(entry["peak_mb"] or 0.0, record["peak_mb"])
+    for path, entry in summary.items():
+        children = sum(child["seconds"] for child_path, child in summary.items()
+                       if len(child_path) == len(path) + 1 and child_path[:-1] == path)
+        entry["self_seconds"] = max(entry["seconds"] - children, 0.0)
+    return list(summary.values())
+
+
+def folded_stacks(summary):
+    """
+    Return the self time of each path as folded stacks, one `a;b;c microseconds` line per path.
+
+    This is the input format of `flamegraph.pl`, speedscope and inferno.
+    """
+    return "".join(f"{';'.join(entry['path'])} {round(entry['self_seconds'] * 1e6)}\n"
+                   for entry in summary if round(entry["self_seconds"] * 1e6) > 0)
@@ -0,0 +1,156 @@
+import numpy as np
+from sklearn.base import BaseEstimator, OneToOneFeatureMixin, TransformerMixin
+from sklearn.neighbors import BallTree, KDTree
+from sklearn.utils import check_random_state
+from sklearn.utils.validation import check_is_fitted
+
+TREES = {"kd_tree": KDTree, "ball_tree": BallTree}
+
+
+def _patterns(missing):
+    """
+    Code each row's missing columns as the bits of an integer.
+
+    Returns the codes, 0 for complete rows and rows missing every column,
+    and a function from a code back to its boolean missing pattern.
+    """
+    n_columns = missing.shape[1]
+    if n_columns > 62:
+        raise ValueError("IndexedKNNImputer supports at most 62 columns")
+    bits = np.int64(1) << np.arange(n_columns, dtype=np.int64)
+    codes = missing.astype(np.int64) @ bits
+    codes[missing.all(axis=1)] = 0
+    return codes, lambda code: (code & bits) != 0
+
+
+class IndexedKNNImputer(OneToOneFeatureMixin, TransformerMixin, BaseEstimator):
+    """
+    Fill missing numeric values with the mean of the nearest complete rows, found with a tree index.
+
+    The complete rows of the training data (no missing value) are the donors.
+    A row missing some values is matched on the columns it has: for each
+    pattern of missing columns, a KD-tree (or ball tree) is built over the
+    donors restricted to the present columns, once, and queried in batches.
+    Building costs O(n log n) and each query about O(log n), where
+    `sklearn.impute.KNNImputer` computes the distance from every row to
+    every donor. Rows with no value at all are filled with the column means.
+
+    Distances are Euclidean on the raw values, so the neighbours are those
+    `KNNImputer` finds among the same donors. Unlike `KNNImputer`, rows that
+    are themselves incomplete are never donors.
+
+    The trees are built at `fit` for every missing pattern in the training
+    data, and for other patterns on first use. They are not part of the
+    stored state (`src.model_store` keeps `fit_X_`, the donors), and are
+    rebuilt on first use after loading.
+
+    Parameters
+    ----------
+    n_neighbors : int, optional
+        Number of donors averaged for each missing value. Default is 5.
+    algorithm : {"kd_tree", "ball_tree"}, optional
+        Index built over the donors. Default is "kd_tree".
+    leaf_size : int, optional
+        Leaf size of the trees. Default is 40.
+    batch_size : int, optional
+        Number of rows queried at a time. Default is 10,000.
+    max_samples : int, optional
+        Largest number of donors kept, drawn at random from the complete
+        rows. Default is None (all of them).
+    random_state : int, optional
+        Seed of the donor sample. Default is None.
+
+    Attributes
+    ----------
+    fit_X_ : numpy.ndarray
+        The donors.
+    statistics_ : numpy.ndarray
+        Mean of each column in the training data, ignoring missing values.
+    """
+
+    def __init__(self, n_neighbors: int = 5, algorithm: str = "kd_tree", leaf_size: int = 40,
+                 batch_size: int = 10_000, max_samples: int = None, random_state: int = None):
+        self.n_neighbors = n_neighbors
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.batch_size = batch_size
+        self.max_samples = max_samples
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        """
+        Keep the complete rows of `X` as donors and index them for each missing pattern in `X`.
+
+        Raises
+        ------
+        ValueError
+            If a parameter is not valid, or `X` has an infinite value.
+        """
+        if self.algorithm not in TREES:
+            raise ValueError(f"algorithm must be one of {list(TREES)}")
+        if self.n_neighbors < 1 or self.batch_size < 1:
+            raise ValueError("n_neighbors and batch_size must be positive integers")
+        X = self._validate_data(X, dtype=np.float64, force_all_finite="allow-nan", reset=True)
+        missing = np.isnan(X)
+        donors = X[~missing.any(axis=1)]
+        if self.max_samples is not None and len(donors) > self.max_samples:
+            rows = check_random_state(self.random_state).choice(len(donors), self.max_samples, replace=False)
+            donors = donors[np.sort(rows)]
+        self.fit_X_ = np.ascontiguousarray(donors)
+        with np.errstate(invalid='ignore'):
+            counts = (~missing).sum(axis=0)
+            self.statistics_ = np.where(counts > 0, np.nansum(X, axis=0) / np.maximum(counts, 1), np.nan)
+
+        self._trees = {}
+        codes, patterns = _patterns(missing)
+        for code in np.unique(codes[codes > 0]):
+            self._tree(~patterns(code))
+        return self
+
+    def _tree(self, present):
+        key = present.tobytes()
+        if key not in self._trees:
+            self._trees[key] = TREES[self.algorithm](self.fit_X_[:, present], leaf_size=self.leaf_size)
+        return self._trees[key]
+
+    def transform(self, X):
+        """
+        Return a copy of `X` with its missing values filled.
+
+        Returns
+        -------
+        numpy.ndarray
+            The imputed values, as floats.
+        """
+        check_is_fitted(self, "fit_X_")
+        X = self._validate_data(X, dtype=np.float64, force_all_finite="allow-nan", reset=False, copy=True)
+        missing = np.isnan(X)
+        if len(self.fit_X_) == 0:
+            X[missing] = np.take(self.statistics_, np.nonzero(missing)[1])
+            return X
+        X[missing.all(axis=1)] = self.statistics_
+
+        k = min(self.n_neighbors, len(self.fit_X_))
+        codes, patterns = _patterns(missing)
+        partial = np.flatnonzero(codes)
+        order = np.argsort(codes[partial], kind='stable')
+        unique, starts = np.unique(codes[partial][order], return_index=True)
+        for code, rows in zip(unique, np.split(partial[order], starts[1:])):
+            pattern = patterns(code)
+            present = ~pattern
+            tree = self._tree(present)
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                neighbours = tree.query(X[np.ix_(batch, present)], k=k, return_distance=False)
+                X[np.ix_(batch, pattern)] = self.fit_X_[neighbours][:, :, pattern].mean(axis=1)
+        return X
+
+    def __getstate__(self):
+        # The trees are an index over fit_X_, rebuilt on demand
+        state = dict(super().__getstate__())
+        state.pop("_trees", None)
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._trees = {}
@@ -0,0 +1,58 @@
+import importlib.util
+import os
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    A click group whose subcommands are loaded from their script files only when invoked.
+
+    The scripts import their heavy libraries (pandas, sklearn, altair, ...)
+    inside the command functions, so loading a script is cheap; this group
+    goes one step further and does not load any script to list the
+    subcommands, so `--help` on the group loads none of them and a
+    subcommand loads only its own.
+
+    Parameters
+    ----------
+    lazy_commands : dict
+        Mapping of subcommand name to a tuple `(path, attribute, short_help)`:
+        the script file, the name of the click command in it, and the one-line
+        description shown by `--help`. Commands are listed in this order.
+    **kwargs
+        Passed on to `click.Group`.
+    """
+
+    def __init__(self, *args, lazy_commands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx):
+        return list(self.lazy_commands) + [name for name in super().list_commands(ctx)
+                                           if name not in self.lazy_commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            self.add_command(self._load(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        # Use the stored descriptions; click would otherwise load every command for its help
+        rows = [(name, short_help) for name, (_, _, short_help) in self.lazy_commands.items()]
+        rows += [(name, command.get_short_help_str(formatter.width)) for name, command in self.commands.items()
+                 if name not in self.lazy_commands and not command.hidden]
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+    def _load(self, cmd_name):
+        path, attribute, _ = self.lazy_commands[cmd_name]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File {path} does not exist.")
+        spec = importlib.util.spec_from_file_location(f"_lazy_cli_{cmd_name.replace('-', '_')}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        command = getattr(module, attribute, None)
+        if not isinstance(command, click.Command):
+            raise TypeError(f"{path} has no click command named '{attribute}'")
+        return command
@@ -0,0 +1,53 @@
+from sklearn.preprocessing import StandardScaler, OrdinalEncoder, OneHotEncoder
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from src.knn_imputer import IndexedKNNImputer
+
+TARGET = 'age_group'
+NUMERIC_FEATURES = ['bmi', 'blood_glucose_fasting', 'oral', 'insulin_level']
+CATEGORICAL_FEATURES = ['weekly_physical_activity', 'gender']
+ORDINAL_FEATURES = ['diabetic']
+DIABETIC_LEVELS = ['No', 'Borderline', 'Yes']
+DROP_FEATURES = []
+# Most complete rows searched when imputing a missing numeric value
+MAX_DONORS = 100_000
+
+
+def make_preprocessor(random_state: int = 123):
+    """
+    Build the (unfitted) column transformer used to prepare the features for modelling.
+
+    Missing numeric values are filled from the 5 nearest of (a sample of at
+    most `MAX_DONORS`) complete rows, found with a KD-tree (see
+    `src.knn_imputer.IndexedKNNImputer`), and the numeric features are then
+    standardised, `diabetic` is ordinal encoded as
+    No < Borderline < Yes, and the remaining categorical features are one-hot
+    encoded after filling missing values with the constant 'missing'.
+
+    Parameters
+    ----------
+    random_state : int, optional
+        Seed of the imputer's sample of complete rows. Default is 123.
+
+    Returns
+    -------
+    sklearn.compose.ColumnTransformer
+        The unfitted preprocessor.
+    """
+    numeric_transformer = make_pipeline(
+        IndexedKNNImputer(n_neighbors=5, max_samples=MAX_DONORS, random_state=random_state),
+        StandardScaler()
+    )
+    ordinal_transformer = OrdinalEncoder(categories=[DIABETIC_LEVELS], dtype=int)
+    categorical_transformer = make_pipeline(
+        SimpleImputer(strategy='constant', fill_value='missing'),
+        OneHotEncoder(handle_unknown='ignore', sparse_output=False)
+    )
+
+    return make_column_transformer(
+        (numeric_transformer, NUMERIC_FEATURES),
+        (ordinal_transformer, ORDINAL_FEATURES),
+        (categorical_transformer, CATEGORICAL_FEATURES),
+        ("drop", DROP_FEATURES),
+    )
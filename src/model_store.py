@@ -0,0 +1,303 @@
+import copyreg
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import numpy as np
+
+MODEL_STORE_FORMAT = "age-prediction-model"
+MODEL_STORE_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+ARRAYS_FILENAME = "arrays.bin"
+# Arrays start at multiples of this many bytes in the arrays file, so every view is aligned
+ALIGNMENT = 64
+# Only estimators defined in these packages are rebuilt on load
+ALLOWED_MODULES = ("sklearn.", "src.knn_imputer")
+# Helper objects rebuilt from their constructor arguments or attributes: the losses of SGD models,
+# and the list of remainder columns of a fitted ColumnTransformer (scikit-learn >= 1.5)
+ALLOWED_OBJECTS = frozenset([f"sklearn.linear_model._sgd_fast.{name}" for name in (
+    "Hinge", "Log", "ModifiedHuber", "SquaredHinge", "SquaredLoss", "Huber", "EpsilonInsensitive",
+    "SquaredEpsilonInsensitive")] + ["sklearn.compose._column_transformer._RemainderColsList"])
+_BUILTIN_TYPES = {"int": int, "float": float, "str": str, "bool": bool, "object": object}
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _library_versions():
+    import sklearn
+    return {"scikit-learn": sklearn.__version__, "numpy": np.__version__}
+
+
+class _Encoder:
+    """Turns an estimator into JSON-compatible state, appending numeric arrays to one binary file."""
+
+    def __init__(self, file):
+        self.file = file
+        self.n_bytes = 0
+
+    def encode(self, value):
+        # NumPy scalars first: np.float64 is also a float, and would lose its type
+        if isinstance(value, np.generic):
+            return {"__scalar__": value.dtype.str, "value": value.item()}
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.ndarray):
+            return self._encode_array(value)
+        if isinstance(value, np.dtype):
+            return {"__dtype__": value.str}
+        if isinstance(value, type):
+            return {"__type__": self._type_name(value)}
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, tuple):
+            return {"__tuple__": [self.encode(item) for item in value]}
+        if isinstance(value, dict):
+            return {"__dict__": [[self.encode(k), self.encode(v)] for k, v in value.items()]}
+        if isinstance(value, slice):
+            return {"__slice__": [value.start, value.stop, value.step]}
+        if hasattr(value, "get_params") and hasattr(value, "__getstate__"):
+            cls = type(value)
+            path = f"{cls.__module__}.{cls.__qualname__}"
+            if not cls.__module__.startswith(ALLOWED_MODULES):
+                raise TypeError(f"Cannot store estimator {path}; only {ALLOWED_MODULES} are supported")
+            return {"__estimator__": path, "state": self.encode(value.__getstate__())}
+        if f"{type(value).__module__}.{type(value).__qualname__}" in ALLOWED_OBJECTS:
+            # Helper objects such as the loss of an SGD model, rebuilt from their constructor arguments,
+            # or from their attributes when they pickle as a plain instance
+            cls = type(value)
+            path = f"{cls.__module__}.{cls.__qualname__}"
+            reduced = value.__reduce__()
+            if len(reduced) == 2 and reduced[0] is cls:
+                return {"__object__": path, "args": self.encode(list(reduced[1]))}
+            if (len(reduced) == 3 and reduced[0] is copyreg._reconstructor and reduced[1][0] is cls
+                    and isinstance(reduced[2], dict)):
+                return {"__object__": path, "state": self.encode(reduced[2])}
+        raise TypeError(f"Cannot store object of type {type(value).__name__}")
+
+    def _encode_array(self, array):
+        if array.dtype.hasobject:
+            # Category and feature names: small, kept inline in the manifest
+            return {"__object_array__": [self.encode(item) for item in array.ravel().tolist()],
+                    "shape": list(array.shape)}
+        padding = -self.n_bytes % ALIGNMENT
+        self.file.write(b"\0" * padding)
+        offset = self.n_bytes + padding
+        data = np.ascontiguousarray(array).tobytes()
+        self.file.write(data)
+        self.n_bytes = offset + len(data)
+        return {"__array__": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+
+    @staticmethod
+    def _type_name(value):
+        if value in _BUILTIN_TYPES.values():
+            return value.__name__
+        if issubclass(value, np.generic):
+            return np.dtype(value).str
+        raise TypeError(f"Cannot store type {value.__name__}")
+
+
+class _Decoder:
+    """Rebuilds the estimator from its JSON state, with its numeric arrays as views of the arrays file."""
+
+    def __init__(self, blob):
+        self.blob = blob
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if "__array__" in value:
+            dtype, shape = np.dtype(value["dtype"]), value["shape"]
+            offset, n_bytes = value["__array__"], dtype.itemsize * int(np.prod(shape))
+            if offset + n_bytes > len(self.blob):
+                raise ValueError("Model arrays file is shorter than its manifest describes")
+            return self.blob[offset:offset + n_bytes].view(dtype).reshape(shape)
+        if "__object_array__" in value:
+            items = [self.decode(item) for item in value["__object_array__"]]
+            array = np.empty(len(items), dtype=object)
+            array[:] = items
+            return array.reshape(value["shape"])
+        if "__scalar__" in value:
+            return np.dtype(value["__scalar__"]).type(value["value"])
+        if "__dtype__" in value:
+            return np.dtype(value["__dtype__"])
+        if "__type__" in value:
+            name = value["__type__"]
+            return _BUILTIN_TYPES[name] if name in _BUILTIN_TYPES else np.dtype(name).type
+        if "__tuple__" in value:
+            return tuple(self.decode(item) for item in value["__tuple__"])
+        if "__dict__" in value:
+            return {self.decode(k): self.decode(v) for k, v in value["__dict__"]}
+        if "__slice__" in value:
+            return slice(*value["__slice__"])
+        if "__estimator__" in value:
+            return self._estimator(value["__estimator__"], self.decode(value["state"]))
+        if "__object__" in value:
+            return self._object(value["__object__"], self.decode(value.get("args", [])),
+                                self.decode(value["state"]) if "state" in value else None)
+        raise ValueError(f"Unrecognised entry in model manifest: {sorted(value)}")
+
+    @staticmethod
+    def _import(path):
+        module_name, _, class_name = path.rpartition(".")
+        if not module_name.startswith(ALLOWED_MODULES):
+            raise ValueError(f"Model manifest refers to {path}; only {ALLOWED_MODULES} are allowed")
+        return getattr(importlib.import_module(module_name), class_name, None)
+
+    @classmethod
+    def _estimator(cls, path, state):
+        from sklearn.base import BaseEstimator
+        estimator_class = cls._import(path)
+        if not (isinstance(estimator_class, type) and issubclass(estimator_class, BaseEstimator)):
+            raise ValueError(f"Model manifest refers to {path}, which is not a scikit-learn estimator")
+        estimator = estimator_class.__new__(estimator_class)
+        estimator.__setstate__(state)
+        return estimator
+
+    @classmethod
+    def _object(cls, path, args, state=None):
+        if path not in ALLOWED_OBJECTS:
+            raise ValueError(f"Model manifest refers to {path}, which is not an allowed helper object")
+        object_class = cls._import(path)
+        if not isinstance(object_class, type):
+            raise ValueError(f"Model manifest refers to {path}, which is not a class")
+        if state is None:
+            return object_class(*args)
+        obj = object_class.__new__(object_class)
+        obj.__dict__.update(state)
+        return obj
+
+
+def save_model(model, path: str):
+    """
+    Save a fitted scikit-learn model as a JSON manifest and a binary file of arrays.
+
+    Unlike a pickle, the saved model can be loaded without running arbitrary
+    code: the manifest names only scikit-learn classes and plain values, and
+    the arrays file holds raw numbers. Numeric arrays (scaler statistics,
+    coefficients, ...) are stored back to back in `arrays.bin`, aligned so
+    that `load_model` can memory-map the file and hand out views of it;
+    processes loading the same model then share one copy of the weights.
+    Small object arrays, such as category names, are kept in the manifest.
+    The manifest also records the SHA-256 of the arrays file and the
+    library versions.
+
+    Parameters
+    ----------
+    model : sklearn.base.BaseEstimator
+        The fitted model, e.g. `GridSearchCV.best_estimator_`.
+    path : str
+        Directory to write; it is replaced if it already exists.
+
+    Raises
+    ------
+    TypeError
+        If the model holds an object that cannot be stored, such as a custom
+        class or a function.
+    FileNotFoundError
+        If the parent directory of `path` does not exist.
+    """
+    if model is None:
+        raise TypeError("Input must be an object instance")
+    parent = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(parent):
+        raise FileNotFoundError(f"Directory {parent} does not exist.")
+
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    try:
+        arrays_path = os.path.join(tmp_path, ARRAYS_FILENAME)
+        with open(arrays_path, 'wb') as f:
+            state = _Encoder(f).encode(model)
+        manifest = {
+            "format": MODEL_STORE_FORMAT,
+            "format_version": MODEL_STORE_VERSION,
+            "versions": _library_versions(),
+            "arrays_sha256": _sha256(arrays_path),
+            "model": state,
+        }
+        with open(os.path.join(tmp_path, MANIFEST_FILENAME), 'w') as f:
+            json.dump(manifest, f, indent=1)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+
+def load_model(path: str, mmap: bool = True, verify: bool = True, check_versions: bool = True):
+    """
+    Load a model saved with `save_model`.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by `save_model`.
+    mmap : bool, optional
+        Memory-map the arrays file read-only instead of reading it into
+        memory. Pages are loaded on first use and shared between all processes
+        that map the same file. Default is True.
+    verify : bool, optional
+        Check the SHA-256 of the arrays file against the manifest. Default is True.
+    check_versions : bool, optional
+        Refuse to load a model saved with a different scikit-learn version,
+        whose estimators may not behave the same. Default is True.
+
+    Returns
+    -------
+    sklearn.base.BaseEstimator
+        The fitted model.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory or its manifest does not exist.
+    ValueError
+        If the manifest is not a supported model store, the arrays file does
+        not match its checksum, or the library versions differ.
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Model manifest {manifest_path} does not exist.")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get("format") != MODEL_STORE_FORMAT:
+        raise ValueError(f"{path} is not a saved model")
+    if manifest.get("format_version") != MODEL_STORE_VERSION:
+        raise ValueError(f"Model store version {manifest.get('format_version')} is not supported; "
+                         f"expected {MODEL_STORE_VERSION}")
+    if check_versions:
+        saved, installed = manifest["versions"]["scikit-learn"], _library_versions()["scikit-learn"]
+        if saved != installed:
+            raise ValueError(f"Model was saved with scikit-learn {saved} but {installed} is installed")
+    arrays_path = os.path.join(path, ARRAYS_FILENAME)
+    if not os.path.exists(arrays_path):
+        raise FileNotFoundError(f"Model arrays file {arrays_path} does not exist.")
+    if verify and _sha256(arrays_path) != manifest["arrays_sha256"]:
+        raise ValueError(f"Model arrays file {arrays_path} does not match its checksum")
+
+    if os.path.getsize(arrays_path) == 0:
+        blob = np.empty(0, dtype=np.uint8)
+    elif mmap:
+        blob = np.memmap(arrays_path, dtype=np.uint8, mode='r')
+    else:
+        blob = np.fromfile(arrays_path, dtype=np.uint8)
+        blob.flags.writeable = False
+    return _Decoder(blob).decode(manifest["model"])
+
+
+def is_model_store(path: str):
+    """Return whether `path` is a directory written by `save_model`."""
+    return os.path.isfile(os.path.join(path, MANIFEST_FILENAME))
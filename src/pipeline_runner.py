@@ -0,0 +1,348 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class Stage:
+    """
+    One step of the analysis pipeline, run as one or more shell-free commands.
+
+    Parameters
+    ----------
+    name : str
+        Unique name of the stage, used in the timing report.
+    commands : list of list of str
+        Commands to run in order, each given as an argument list.
+    inputs : list of str, optional
+        Files read by the stage. A stage depends on every stage that outputs one of them.
+    outputs : list of str, optional
+        Files written by the stage. These are stored in and restored from the cache.
+    params : dict, optional
+        Parameters (seed, URL, thresholds, ...) passed to the last command as
+        `--key=value` options.
+    code : list of str, optional
+        Source files the stage runs or imports, e.g. its script and `src/` modules.
+    """
+
+    def __init__(self, name, commands, inputs=(), outputs=(), params=None, code=()):
+        self.name = name
+        self.commands = [list(command) for command in commands]
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = dict(params or {})
+        self.code = list(code)
+
+    def argv(self):
+        """Return the commands with `params` appended to the last one."""
+        options = [f"--{key}={value}" for key, value in self.params.items()]
+        return self.commands[:-1] + [self.commands[-1] + options]
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20):
+    """
+    Return the SHA-256 hex digest of a file's content.
+
+    Parameters
+    ----------
+    path : str
+        File to hash.
+    chunk_size : int, optional
+        Number of bytes read at a time. Default is 1 MiB.
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def python_sources(script: str, package: str = "src", root: str = "."):
+    """
+    Return a script and the source files of every module of `package` it imports, directly or not.
+
+    Imports are read from the source, including those inside functions, and
+    followed through the modules of `package` only, which are looked up as
+    `<package>/<module>.py`. Paths are relative to `root`, like the other
+    paths of a `Stage` are to the working directory.
+
+    Parameters
+    ----------
+    script : str
+        Path to the Python script.
+    package : str, optional
+        Name of the local package whose modules are followed. Default is "src".
+    root : str, optional
+        Directory the paths are relative to. Default is the working directory.
+
+    Returns
+    -------
+    list of str
+        `script` first, then the module files in sorted order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the script or an imported module of `package` does not exist.
+    """
+    found, pending = {}, [script]
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        if not os.path.exists(os.path.join(root, path)):
+            raise FileNotFoundError(f"{path} does not exist.")
+        with open(os.path.join(root, path)) as f:
+            tree = ast.parse(f.read(), filename=path)
+        found[path] = None
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                # `from src import x` imports the module src.x
+                names = ([f"{node.module}.{alias.name}" for alias in node.names] if node.module == package
+                         else [node.module])
+            else:
+                continue
+            for name in names:
+                parts = name.split(".")
+                if parts[0] == package and len(parts) > 1:
+                    pending.append(os.path.join(package, *parts[1:]) + ".py")
+    return [script] + sorted(path for path in found if path != script)
+
+
+def stage_key(stage: Stage):
+    """
+    Compute the content address of a stage from its commands, parameters, code and inputs.
+
+    Parameters
+    ----------
+    stage : Stage
+        The stage; its input and code files must exist.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest identifying this exact stage invocation.
+
+    Raises
+    ------
+    FileNotFoundError
+        If an input or code file does not exist.
+    """
+    for path in stage.inputs + stage.code:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Stage '{stage.name}' needs {path}, which does not exist.")
+    description = {
+        "commands": stage.argv(),
+        "outputs": stage.outputs,
+        "inputs": {path: hash_file(path) for path in stage.inputs},
+        "code": {path: hash_file(path) for path in stage.code},
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class StageCache:
+    """
+    Content-addressed store of stage outputs.
+
+    Output files are stored once under `objects/<sha256 of content>`, and each
+    stage key maps to a manifest under `stages/<key>.json` listing the object
+    for each of its output paths.
+
+    Parameters
+    ----------
+    directory : str
+        Root directory of the cache; created if it does not exist.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "stages"), exist_ok=True)
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest)
+
+    def _manifest_path(self, key):
+        return os.path.join(self.directory, "stages", f"{key}.json")
+
+    def restore(self, key: str):
+        """
+        Restore the outputs recorded for `key`, if the cache has all of them.
+
+        Outputs whose current content already matches are left untouched.
+
+        Parameters
+        ----------
+        key : str
+            Stage key from `stage_key`.
+
+        Returns
+        -------
+        bool
+            True if the outputs were restored (a cache hit), False otherwise.
+        """
+        manifest_path = self._manifest_path(key)
+        if not os.path.exists(manifest_path):
+            return False
+        with open(manifest_path) as f:
+            outputs = json.load(f)
+        if not all(os.path.exists(self._object_path(digest)) for digest in outputs.values()):
+            return False
+
+        for path, digest in outputs.items():
+            if os.path.exists(path) and hash_file(path) == digest:
+                continue
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            shutil.copyfile(self._object_path(digest), path)
+        return True
+
+    def store(self, key: str, outputs):
+        """
+        Add the given output files to the cache under `key`.
+
+        Parameters
+        ----------
+        key : str
+            Stage key from `stage_key`.
+        outputs : list of str
+            Output files written by the stage.
+
+        Raises
+        ------
+        FileNotFoundError
+            If an output file was not created.
+        """
+        recorded = {}
+        for path in outputs:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Expected output {path} was not created.")
+            digest = hash_file(path)
+            if not os.path.exists(self._object_path(digest)):
+                tmp_path = self._object_path(digest) + ".tmp"
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, self._object_path(digest))
+            recorded[path] = digest
+        with open(self._manifest_path(key), 'w') as f:
+            json.dump(recorded, f, indent=2)
+
+
+def _dependencies(stages):
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            producers[path] = stage.name
+    return {
+        stage.name: {producers[path] for path in stage.inputs if path in producers} - {stage.name}
+        for stage in stages
+    }
+
+
+def _run_stage(stage: Stage, cache: StageCache):
+    start = time.perf_counter()
+    key = stage_key(stage)
+    if cache.restore(key):
+        return {"stage": stage.name, "status": "cached", "seconds": time.perf_counter() - start, "key": key}
+
+    for command in stage.argv():
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Stage '{stage.name}' failed running {' '.join(command)}:\n{result.stderr}")
+    cache.store(key, stage.outputs)
+    return {"stage": stage.name, "status": "ran", "seconds": time.perf_counter() - start, "key": key}
+
+
+def run_pipeline(stages, cache_dir: str, max_workers: int = 4):
+    """
+    Run pipeline stages in dependency order, skipping those whose key is cached.
+
+    A stage whose commands, parameters, code and input contents are unchanged
+    since a previous run is not executed; its outputs are restored from the
+    cache instead. Stages that do not depend on each other run concurrently.
+
+    Parameters
+    ----------
+    stages : list of Stage
+        The stages of the pipeline.
+    cache_dir : str
+        Directory of the content-addressed cache.
+    max_workers : int, optional
+        Maximum number of stages running at the same time. Default is 4.
+
+    Returns
+    -------
+    list of dict
+        One timing record per stage, in completion order, with the stage name,
+        status ("ran" or "cached"), wall-clock seconds and stage key.
+
+    Raises
+    ------
+    ValueError
+        If stage names are not unique or the stages have a dependency cycle.
+    RuntimeError
+        If a stage command fails; stages already running are allowed to finish.
+    """
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique.")
+
+    cache = StageCache(cache_dir)
+    by_name = {stage.name: stage for stage in stages}
+    pending = _dependencies(stages)
+    done, report, failure = set(), [], None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            if failure is None:
+                ready = [name for name, deps in pending.items() if deps <= done]
+                for name in ready:
+                    del pending[name]
+                    running[pool.submit(_run_stage, by_name[name], cache)] = name
+            if not running:
+                if failure is None:
+                    raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    report.append(future.result())
+                    done.add(name)
+                except Exception as e:
+                    failure = failure or e
+
+    if failure is not None:
+        raise failure
+    return report
+
+
+def format_report(report):
+    """
+    Format a run's timing records as a table, slowest stage first.
+
+    Parameters
+    ----------
+    report : list of dict
+        Timing records returned by `run_pipeline`.
+
+    Returns
+    -------
+    str
+        The formatted table, ending with the total stage time.
+    """
+    lines = [f"{'stage':<24}{'status':<10}{'seconds':>10}"]
+    for record in sorted(report, key=lambda r: r["seconds"], reverse=True):
+        lines.append(f"{record['stage']:<24}{record['status']:<10}{record['seconds']:>10.2f}")
+    lines.append(f"{'total (sum of stages)':<34}{sum(r['seconds'] for r in report):>10.2f}")
+    return "\n".join(lines)
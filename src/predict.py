@@ -0,0 +1,165 @@
+import os
+import pickle
+import pandas as pd
+from src.model_store import is_model_store, load_model as load_stored_model
+from src.table_io import TableWriter
+
+SUPPORTED_EXTENSIONS = (".csv", ".parquet")
+
+
+def load_model(model_path: str):
+    """
+    Load a fitted pipeline saved with `src.model_store.save_model`, or from a pickle file.
+
+    A model store directory is memory-mapped and checked against its
+    checksum and library versions (see `src.model_store.load_model`). Pickle
+    files are still read for models saved before the model store existed;
+    only load pickles you trust, since unpickling can run arbitrary code.
+
+    Parameters
+    ----------
+    model_path : str
+        Path to the model directory (e.g. `age_prediction_model`) or to a
+        pickled pipeline (e.g. `age_prediction_model.pickle`).
+
+    Returns
+    -------
+    object
+        The fitted pipeline, exposing `predict`, `predict_proba` and `classes_`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the model file does not exist.
+    ValueError
+        If a model directory fails its checksum or version checks.
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file {model_path} does not exist.")
+    if is_model_store(model_path):
+        return load_stored_model(model_path)
+
+    with open(model_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def _check_extension(path: str):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file extension '{extension}'; expected one of {SUPPORTED_EXTENSIONS}")
+    return extension
+
+
+def iter_chunks(input_path: str, chunksize: int):
+    """
+    Iterate over a CSV or Parquet file in fixed-size chunks of rows.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to a `.csv` or `.parquet` file.
+    chunksize : int
+        Maximum number of rows per chunk.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The next chunk of rows.
+
+    Raises
+    ------
+    ValueError
+        If the chunk size is not positive or the file extension is not supported.
+    FileNotFoundError
+        If the input file does not exist.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer")
+    extension = _check_extension(input_path)
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file {input_path} does not exist.")
+
+    if extension == ".csv":
+        with pd.read_csv(input_path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+    else:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+def predict_frame(model, data: pd.DataFrame):
+    """
+    Score a DataFrame and return predictions with class probabilities.
+
+    Only the columns the model was fitted on are passed to it, so extra columns
+    such as the `age_group` target are ignored.
+
+    Parameters
+    ----------
+    model : object
+        Fitted pipeline with `feature_names_in_`, `classes_` and `predict_proba`.
+    data : pandas.DataFrame
+        Rows to score.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A `prediction` column followed by one `proba_<class>` column per class,
+        aligned with the index of `data`.
+    """
+    proba = model.predict_proba(data[list(model.feature_names_in_)])
+    predictions = pd.DataFrame(
+        proba, index=data.index, columns=[f"proba_{c}" for c in model.classes_]
+    )
+    predictions.insert(0, "prediction", model.classes_[proba.argmax(axis=1)])
+    return predictions
+
+
+def predict_chunks(model, input_path: str, output_path: str, chunksize: int = 100_000):
+    """
+    Stream a CSV or Parquet file through a fitted pipeline in fixed-size chunks.
+
+    Predictions and class probabilities are written to `output_path` chunk by
+    chunk, so memory use is bounded by `chunksize` rather than by the size of
+    the input file. Row order is preserved. `output_path` is only replaced
+    once every chunk has been scored.
+
+    Parameters
+    ----------
+    model : object
+        Fitted pipeline, e.g. as returned by `load_model`.
+    input_path : str
+        Path to the `.csv` or `.parquet` file to score.
+    output_path : str
+        Path of the `.csv` or `.parquet` file to write predictions to.
+    chunksize : int, optional
+        Number of rows scored at a time. Default is 100,000.
+
+    Returns
+    -------
+    int
+        The total number of rows scored.
+
+    Raises
+    ------
+    ValueError
+        If the input is empty, or a file extension or the chunk size is not valid.
+    FileNotFoundError
+        If the input file or the output directory does not exist.
+    """
+    _check_extension(output_path)
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        raise FileNotFoundError(f"Directory {output_dir} does not exist.")
+
+    with TableWriter(output_path) as writer:
+        for chunk in iter_chunks(input_path, chunksize):
+            if chunk.empty:
+                continue
+            writer.write(predict_frame(model, chunk))
+        if writer.n_rows == 0:
+            raise ValueError("Input file must contain observations.")
+    return writer.n_rows
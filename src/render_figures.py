@@ -0,0 +1,353 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
+import numpy as np
+import pandas as pd
+
+FIGURE_RENDERERS = ("vega-lite", "heatmap")
+HASHES_FILENAME = ".figure_hashes.json"
+# Same layout as altair_ally.dist
+CHART_WIDTH, CHART_HEIGHT = 185, 120
+DENSITY_STEPS = 200
+DENSITY_BINS = 1024
+
+
+class Figure:
+    """
+    A figure ready to render: everything it shows is in its payload, so it can be sent to another process.
+
+    Parameters
+    ----------
+    name : str
+        File name of the PNG, without extension.
+    renderer : {"vega-lite", "heatmap"}
+        "vega-lite" renders a Vega-Lite spec with vl-convert; "heatmap" draws
+        a labelled matrix with matplotlib.
+    payload : dict
+        The Vega-Lite spec (with its data inline), or the `labels`, `values`
+        and `title` of the heatmap.
+    """
+
+    def __init__(self, name, renderer, payload):
+        if renderer not in FIGURE_RENDERERS:
+            raise ValueError(f"renderer must be one of {FIGURE_RENDERERS}")
+        self.name = name
+        self.renderer = renderer
+        self.payload = payload
+
+    def digest(self):
+        """SHA-256 of the renderer, its library version and the payload: equal digests draw equal figures."""
+        library = "vl-convert-python" if self.renderer == "vega-lite" else "matplotlib"
+        content = json.dumps([self.renderer, version(library), self.payload], sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _bandwidth(values):
+    # Scott's rule as estimated by Vega's density transform
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = min(values.std(ddof=1), (q3 - q1) / 1.34) or abs(q1) or 1.0
+    return 1.06 * spread * len(values) ** -0.2
+
+
+def density_curve(values, extent, steps: int = DENSITY_STEPS, bins: int = DENSITY_BINS):
+    """
+    Gaussian kernel density estimate of `values` at `steps` points spanning `extent`.
+
+    The values are first counted into `bins` equal-width bins, so the cost is
+    one pass over the values plus `steps` x `bins` kernel evaluations, however
+    many values there are. The bandwidth follows Vega's density transform.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Observations, without missing values.
+    extent : tuple of float
+        Lowest and highest point at which to evaluate the density.
+    steps : int, optional
+        Number of evaluation points. Default is 200.
+    bins : int, optional
+        Number of bins the values are counted into. Default is 1024.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The evaluation points and the density at each of them.
+    """
+    grid = np.linspace(extent[0], extent[1], steps)
+    if len(values) < 2:
+        return grid, np.zeros(steps)
+    counts, edges = np.histogram(values, bins=bins, range=extent)
+    centres = (edges[:-1] + edges[1:]) / 2
+    h = _bandwidth(values)
+    kernel = np.exp(-0.5 * ((grid[:, None] - centres[None, :]) / h) ** 2) / (h * np.sqrt(2 * np.pi))
+    return grid, kernel @ counts / len(values)
+
+
+def numeric_distribution_figure(data: pd.DataFrame, color: str, name: str = "fig_numeric_feats"):
+    """
+    Density plots of the numeric columns by `color`, laid out like `altair_ally.dist`.
+
+    Only the density curves and the distinct tick positions of the rug plots
+    (to the pixel) go into the spec, not the rows of `data`.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data to plot.
+    color : str
+        Column whose values get one curve each.
+    name : str, optional
+        File name of the figure. Default is "fig_numeric_feats".
+
+    Returns
+    -------
+    Figure
+        The figure, with a Vega-Lite payload.
+    """
+    import altair as alt
+    columns = data.select_dtypes('number').columns.tolist()[::-1]
+    groups = data[color].astype(object)
+    charts = []
+    for col in columns:
+        values = data[col].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        extent = (values[valid].min(), values[valid].max()) if valid.any() else (0.0, 1.0)
+        curves = []
+        for group in sorted(groups[valid].dropna().unique()):
+            grid, density = density_curve(values[valid & (groups == group).to_numpy()], extent)
+            curves.append(pd.DataFrame({col: grid, "density": density, color: group}))
+        curves = pd.concat(curves, ignore_index=True) if curves else pd.DataFrame(columns=[col, "density", color])
+
+        area = alt.Chart(curves, mark=alt.MarkDef("area", opacity=0.1)).encode(
+            alt.X(col, type="quantitative", axis=alt.Axis(grid=False)),
+            alt.Y('density:Q', title=None).stack(False),
+            alt.Color(color, type="nominal", title=None)
+        ).properties(width=CHART_WIDTH, height=CHART_HEIGHT)
+
+        # One tick per pixel column is indistinguishable from one per observation
+        span = (extent[1] - extent[0]) or 1.0
+        ticks = np.unique(np.round((values[valid] - extent[0]) / span * 2 * CHART_WIDTH)) / (2 * CHART_WIDTH)
+        rug = alt.Chart(pd.DataFrame({col: extent[0] + ticks * span})).mark_tick(
+            color='black', opacity=0.3, yOffset=68 - 3, height=5).encode(
+            alt.X(col, type="quantitative").axis(offset=8),
+            tooltip=alt.value('Individual observations')
+        )
+        charts.append(area + area.mark_line() + rug)
+
+    n_columns = len(columns) if len(columns) <= 3 else int(-(-len(columns) ** (1 / 2) // 1))
+    return Figure(name, "vega-lite", alt.concat(*charts, columns=n_columns).to_dict())
+
+
+def categorical_distribution_figure(data: pd.DataFrame, color: str, name: str = "fig_categorical_feats"):
+    """
+    Bar charts of the counts of each categorical column by `color`, laid out like `altair_ally.dist`.
+
+    The counts are computed with pandas; only one row per (value, color)
+    pair of each column goes into the spec.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data to plot.
+    color : str
+        Column whose values get one bar each.
+    name : str, optional
+        File name of the figure. Default is "fig_categorical_feats".
+
+    Returns
+    -------
+    Figure
+        The figure, with a Vega-Lite payload.
+    """
+    import altair as alt
+    selected = data.select_dtypes(['object', 'category'])
+    charts = []
+    for col in selected.nunique().sort_values().index:
+        # The color column is plotted against itself too, so it may be the only key
+        keys = list(dict.fromkeys([col, color]))
+        counts = (data[keys].astype(object)
+                  .groupby(keys, dropna=False).size()
+                  .rename("count").reset_index())
+        counts = counts.astype(object).where(counts.notna(), None)
+        charts.append(alt.vconcat(
+            alt.Chart(counts, width=120).mark_bar().encode(
+                x=alt.X('count', type="quantitative", title='Count of Records'),
+                y=alt.Y(color, type="nominal", title=None,
+                        axis=alt.Axis(domain=True, title='', labels=False, ticks=False)),
+                color=alt.Color(color, type="nominal", title=None),
+                row=alt.Row(col, type="nominal", title=None,
+                            header=alt.Header(labelAngle=0, labelAlign='left', labelPadding=5))),
+            title=alt.TitleParams(col, anchor='middle')))
+
+    n_columns = len(charts) if len(charts) <= 3 else int(-(-len(charts) ** (1 / 2) // 1))
+    chart = (alt.concat(*charts, columns=n_columns)
+             .configure_facet(spacing=0)
+             .configure_view(stroke=None)
+             .configure_scale(bandPaddingInner=0.06, bandPaddingOuter=0.4))
+    return Figure(name, "vega-lite", chart.to_dict())
+
+
+def correlation_heatmap_figure(data: pd.DataFrame, name: str = "fig_feats_heatmap"):
+    """
+    Heatmap of the Pearson correlations between the numeric columns.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The data to plot.
+    name : str, optional
+        File name of the figure. Default is "fig_feats_heatmap".
+
+    Returns
+    -------
+    Figure
+        The figure, with a heatmap payload.
+    """
+    correlation = data.select_dtypes(include=['number']).corr()
+    return _heatmap_figure(correlation.columns.tolist(), correlation.to_numpy().tolist(), name)
+
+
+def summary_heatmap_figure(summary: dict, name: str = "fig_feats_heatmap"):
+    """
+    Heatmap of the Pearson correlations saved in an EDA summary.
+
+    Draws the same figure as `correlation_heatmap_figure` without reading the data again.
+
+    Parameters
+    ----------
+    summary : dict
+        Summary saved by `src.eda_summary.save_summary`.
+    name : str, optional
+        File name of the figure. Default is "fig_feats_heatmap".
+
+    Returns
+    -------
+    Figure
+        The figure, with a heatmap payload.
+    """
+    correlation = summary["correlation"]
+    values = [[np.nan if v is None else v for v in row] for row in correlation["values"]]
+    return _heatmap_figure(list(correlation["columns"]), values, name)
+
+
+def _heatmap_figure(labels, values, name):
+    return Figure(name, "heatmap", {"labels": labels, "values": values,
+                                    "title": "Feature-Feature Correlation Heatmap"})
+
+
+def _draw_heatmap(payload, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    labels = payload["labels"]
+    fig, ax = plt.subplots(figsize=(5, 4))
+    im = ax.imshow(np.array(payload["values"], dtype=float), cmap="Reds", aspect="auto")
+    ax.set_xticks(range(len(labels)))
+    ax.set_yticks(range(len(labels)))
+    ax.set_xticklabels(labels, rotation=45, ha="right")
+    ax.set_yticklabels(labels)
+    plt.colorbar(im, ax=ax)
+    plt.title(payload["title"], fontsize=14)
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close(fig)
+
+
+def _warm_renderer():
+    # vl-convert starts its JavaScript runtime on the first render; pay that once per worker
+    import vl_convert
+    vl_convert.vegalite_to_png({"mark": "point", "data": {"values": [{}]}})
+
+
+def _render(figure, path):
+    start = time.perf_counter()
+    if figure.renderer == "vega-lite":
+        import vl_convert
+        from altair.utils._importers import vl_version_for_vl_convert
+        png = vl_convert.vegalite_to_png(figure.payload, vl_version=vl_version_for_vl_convert(), scale=1, ppi=72)
+        with open(path, 'wb') as f:
+            f.write(png)
+    else:
+        _draw_heatmap(figure.payload, path)
+    return time.perf_counter() - start
+
+
+def render_figures(figures, output_dir: str, max_workers: int = None, force: bool = False):
+    """
+    Render figures to PNG files, concurrently, skipping those that have not changed.
+
+    Each figure's digest is stored in a hidden file in `output_dir`; a figure
+    whose PNG exists and whose digest matches is not rendered again. The
+    others are rendered on a pool of worker processes, each of which starts
+    the Vega renderer once and reuses it for every figure it draws.
+
+    Parameters
+    ----------
+    figures : list of Figure
+        The figures to render.
+    output_dir : str
+        Directory for the PNG files; it is created if it does not exist.
+    max_workers : int, optional
+        Number of worker processes. Default is the number of CPUs, at most one
+        per figure to render; with 1, figures are rendered in this process.
+    force : bool, optional
+        Render every figure even if it has not changed. Default is False.
+
+    Returns
+    -------
+    list of dict
+        One entry per figure, in the order given, with the `figure` name, its
+        `path`, its `status` ("rendered" or "cached") and the `seconds` spent
+        rendering it.
+
+    Raises
+    ------
+    ValueError
+        If two figures have the same name.
+    """
+    names = [figure.name for figure in figures]
+    if len(set(names)) != len(names):
+        raise ValueError("Figure names must be unique")
+    os.makedirs(output_dir, exist_ok=True)
+    hashes_path = os.path.join(output_dir, HASHES_FILENAME)
+    hashes = {}
+    if os.path.exists(hashes_path):
+        with open(hashes_path) as f:
+            hashes = json.load(f)
+
+    paths = {figure.name: os.path.join(output_dir, f"{figure.name}.png") for figure in figures}
+    digests = {figure.name: figure.digest() for figure in figures}
+    stale = [figure for figure in figures
+             if force or hashes.get(figure.name) != digests[figure.name] or not os.path.exists(paths[figure.name])]
+
+    seconds = {}
+    workers = min(max_workers or os.cpu_count() or 1, len(stale))
+    if workers > 1:
+        # Spawned, not forked: a forked copy of a running vl-convert runtime deadlocks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_warm_renderer) as pool:
+            futures = {figure.name: pool.submit(_render, figure, paths[figure.name]) for figure in stale}
+            seconds = {name: future.result() for name, future in futures.items()}
+    elif stale:
+        if any(figure.renderer == "vega-lite" for figure in stale):
+            _warm_renderer()
+        seconds = {figure.name: _render(figure, paths[figure.name]) for figure in stale}
+
+    hashes.update({figure.name: digests[figure.name] for figure in stale})
+    with open(hashes_path, 'w') as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+    return [{"figure": name, "path": paths[name], "status": "rendered" if name in seconds else "cached",
+             "seconds": seconds.get(name, 0.0)} for name in names]
+
+
+def format_render_report(report):
+    """Format the result of `render_figures` as a table, slowest figure first."""
+    lines = [f"{'figure':<24} {'status':<9} {'seconds':>8}"]
+    for entry in sorted(report, key=lambda entry: -entry["seconds"]):
+        lines.append(f"{entry['figure']:<24} {entry['status']:<9} {entry['seconds']:>8.2f}")
+    lines.append(f"{'total':<24} {'':<9} {sum(entry['seconds'] for entry in report):>8.2f}")
+    return "\n".join(lines)
@@ -0,0 +1,84 @@
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+# Extension of the file Quarto writes for each supported format
+OUTPUT_EXTENSIONS = {"html": ".html", "pdf": ".pdf", "docx": ".docx"}
+
+
+def _render(quarto, report, fmt):
+    """
+    Render `report` to one format in a private copy of its directory.
+
+    The copy sits next to the report's directory, so relative paths such as
+    `../results/...` resolve to the same files; Quarto's intermediate files
+    (`*_files`, `.quarto`, the LaTeX sources) stay inside the copy, and
+    concurrent renders never overwrite each other's.
+    """
+    directory, name = os.path.split(os.path.abspath(report))
+    stem = os.path.splitext(name)[0]
+    workdir = os.path.join(os.path.dirname(directory), f".{stem}-{fmt}")
+    shutil.rmtree(workdir, ignore_errors=True)
+    shutil.copytree(directory, workdir,
+                    ignore=shutil.ignore_patterns(".quarto", "*_files", *(f"*{ext}" for ext in OUTPUT_EXTENSIONS.values())))
+    try:
+        result = subprocess.run([quarto, "render", name, "--to", fmt], cwd=workdir, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Rendering {report} to {fmt} failed:\n{result.stderr[-2000:]}")
+        output = os.path.join(directory, stem + OUTPUT_EXTENSIONS[fmt])
+        os.replace(os.path.join(workdir, stem + OUTPUT_EXTENSIONS[fmt]), output)
+        return output
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def render_report(report: str, formats=("html", "pdf"), quarto: str = "quarto", max_workers: int = None):
+    """
+    Render a Quarto report to several formats at the same time.
+
+    Each format is rendered by its own `quarto render` process, in a copy of
+    the report's directory, and the outputs are moved next to the report.
+    Most of a render is spent in Pandoc and LaTeX, outside Python, so the
+    renders overlap well even on few cores.
+
+    Parameters
+    ----------
+    report : str
+        Path to the `.qmd` file.
+    formats : list of str, optional
+        Formats to render, from "html", "pdf" and "docx". Default is ("html", "pdf").
+    quarto : str, optional
+        Name or path of the Quarto executable. Default is "quarto".
+    max_workers : int, optional
+        Most renders run at the same time. Default is None (one per format).
+
+    Returns
+    -------
+    list of str
+        Paths of the rendered files, in the order of `formats`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the report does not exist or Quarto is not installed.
+    ValueError
+        If a format is not supported.
+    RuntimeError
+        If a render fails; the other renders still complete.
+    """
+    if not os.path.isfile(report):
+        raise FileNotFoundError(f"Report {report} does not exist.")
+    unknown = [fmt for fmt in formats if fmt not in OUTPUT_EXTENSIONS]
+    if unknown:
+        raise ValueError(f"Unsupported formats {unknown}; choose from {list(OUTPUT_EXTENSIONS)}")
+    if shutil.which(quarto) is None:
+        raise FileNotFoundError(f"Quarto executable '{quarto}' not found; install Quarto to render the report.")
+
+    formats = list(dict.fromkeys(formats))
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(formats), 1)) as pool:
+        futures = [pool.submit(_render, quarto, report, fmt) for fmt in formats]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        raise RuntimeError("\n".join(str(error) for error in errors))
+    return [future.result() for future in futures]
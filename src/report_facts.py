@@ -0,0 +1,94 @@
+import json
+import os
+import numpy as np
+
+REPORT_FACTS_FILENAME = "report_facts.json"
+
+
+def _plain(value):
+    # NumPy scalars and NaN as JSON values
+    value = value.item() if isinstance(value, np.generic) else value
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+
+def report_facts(model, scores, intervals=None):
+    """
+    Collect every number the report quotes into one JSON-compatible dict.
+
+    The report reads this instead of the evaluation tables and the model, so
+    rendering it needs neither scikit-learn nor the fitted pipeline.
+
+    Parameters
+    ----------
+    model : sklearn.pipeline.Pipeline
+        The fitted (preprocessor, logistic regression) pipeline.
+    scores : sklearn.utils.Bunch
+        The test scores returned by `src.evaluate_model.evaluate_proba`.
+    intervals : pandas.DataFrame, optional
+        The confidence intervals returned by `src.evaluate_model.bootstrap_metrics`.
+        Default is None (no intervals).
+
+    Returns
+    -------
+    dict
+        `classes`; `n_test`; `metrics` (`accuracy`, `macro_f1`, `roc_auc`,
+        `brier`); the `classification_report` table as a dict of rows; the
+        `confusion_matrix` as `labels` and `counts` (rows are the true
+        labels); the number of test cases classified `correct` (in total and
+        per class) and `incorrect`; the classifier's `best_C`; its
+        `coefficients` per transformed feature and `intercept`; and the
+        `intervals` of each metric, or None.
+    """
+    classes = [str(label) for label in model.classes_]
+    confusion = scores.confusion_matrix.loc[classes, classes].to_numpy()
+    classifier = model[-1]
+    report = scores.report
+    return {
+        "classes": classes,
+        "n_test": int(confusion.sum()),
+        "metrics": {
+            "accuracy": float(report.loc["accuracy", "f1-score"]),
+            "macro_f1": float(report.loc["macro avg", "f1-score"]),
+            "roc_auc": _plain(scores.roc_auc),
+            "brier": _plain(scores.brier),
+        },
+        "classification_report": {
+            str(row): {col: _plain(value) for col, value in values.items()}
+            for row, values in report.to_dict(orient="index").items()
+        },
+        "confusion_matrix": {"labels": classes, "counts": confusion.tolist()},
+        "correct": {"total": int(np.trace(confusion)),
+                    **{label: int(confusion[i, i]) for i, label in enumerate(classes)}},
+        "incorrect": int(confusion.sum() - np.trace(confusion)),
+        "best_C": _plain(classifier.get_params().get("C")),
+        "coefficients": dict(zip(model[:-1].get_feature_names_out().tolist(), classifier.coef_.ravel().tolist())),
+        "intercept": float(classifier.intercept_[0]),
+        "intervals": None if intervals is None else {
+            str(metric): {col: _plain(value) for col, value in values.items()}
+            for metric, values in intervals.to_dict(orient="index").items()
+        },
+    }
+
+
+def write_report_facts(facts: dict, directory: str, filename: str = REPORT_FACTS_FILENAME):
+    """
+    Save the report facts as JSON.
+
+    Parameters
+    ----------
+    facts : dict
+        The facts returned by `report_facts`.
+    directory : str
+        Existing directory to write to.
+    filename : str, optional
+        Name of the file. Default is "report_facts.json".
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory does not exist.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory {directory} does not exist.")
+    with open(os.path.join(directory, filename), 'w') as f:
+        json.dump(facts, f, indent=2)
@@ -1,25 +1,27 @@
-from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
-from deepchecks.tabular import Dataset
-from deepchecks.core.errors import DeepchecksValueError
+from src.choices import CORRELATION_BACKENDS
+from src.correlation_checks import PPS_THRESHOLD, PAIR_THRESHOLD, feature_label_pps, feature_feature_correlation
 
-def second_validate_data(data_train):
-    """
-    Validates the input data for correlation issues using predefined checks.
 
-    Parameters
-    ----------
-    data_train : pandas.DataFrame
-        The DataFrame containing the training data to be validated.
+def _validate_numpy(data_train, n_jobs=None):
+    if "age_group" not in data_train.columns:
+        raise ValueError("Dataset creation failed: label column 'age_group' not found in the data.")
 
-    Returns
-    -------
-    None
+    # Feature-Label Correlation
+    scores = feature_label_pps(data_train, label="age_group", n_jobs=n_jobs)
+    if (scores["pps"] >= PPS_THRESHOLD).any():
+        raise ValueError("Feature-Label correlation exceeds the maximum acceptable threshold.")
+
+    # Feature-Feature Correlation
+    pairs = feature_feature_correlation(data_train.drop(columns="age_group"), n_jobs=n_jobs)
+    if (pairs["correlation"] > PAIR_THRESHOLD).any():
+        raise ValueError("Feature-Feature correlation exceeds the maximum acceptable threshold.")
+
+
+def _validate_deepchecks(data_train):
+    from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
+    from deepchecks.tabular import Dataset
+    from deepchecks.core.errors import DeepchecksValueError
 
-    Raises
-    ------
-    ValueError
-        If any validation condition is not met, indicating a failure in the checks.    
-    """
     # Create Deepchecks Dataset object
     try:
         data_train_ds = Dataset(data_train, label="age_group", cat_features=[])
@@ -27,15 +29,52 @@ def second_validate_data(data_train):
         raise ValueError(f"Dataset creation failed: {e}")
 
     # Feature-Label Correlation
-    check_feat_lab_corr = FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.9)
+    check_feat_lab_corr = FeatureLabelCorrelation().add_condition_feature_pps_less_than(PPS_THRESHOLD)
     check_feat_lab_corr_result = check_feat_lab_corr.run(dataset=data_train_ds)
 
     if not check_feat_lab_corr_result.passed_conditions():
         raise ValueError("Feature-Label correlation exceeds the maximum acceptable threshold.")
 
     # Feature-Feature Correlation
-    check_feat_feat_corr = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(threshold=0.92, n_pairs=0)
+    check_feat_feat_corr = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(threshold=PAIR_THRESHOLD, n_pairs=0)
     check_feat_feat_corr_result = check_feat_feat_corr.run(dataset=data_train_ds)
 
     if not check_feat_feat_corr_result.passed_conditions():
         raise ValueError("Feature-Feature correlation exceeds the maximum acceptable threshold.")
+
+
+def second_validate_data(data_train, backend="numpy", n_jobs=None):
+    """
+    Validates the input data for correlation issues using predefined checks.
+
+    No feature may have a predictive power score of 0.9 or more for
+    `age_group`, and no pair of numeric features a Spearman correlation above
+    0.92. The "numpy" backend computes these directly (see
+    `src.correlation_checks`); the "deepchecks" backend runs the equivalent
+    Deepchecks checks, which is much slower to import and run.
+
+    Parameters
+    ----------
+    data_train : pandas.DataFrame
+        The DataFrame containing the training data to be validated.
+    backend : {"numpy", "deepchecks"}, optional
+        Implementation of the checks. Default is "numpy".
+    n_jobs : int, optional
+        Number of worker processes for the "numpy" backend. Default is None (serial).
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If any validation condition is not met, indicating a failure in the checks,
+        or if `backend` is not supported.
+    """
+    if backend not in CORRELATION_BACKENDS:
+        raise ValueError(f"backend must be one of {CORRELATION_BACKENDS}")
+    if backend == "deepchecks":
+        _validate_deepchecks(data_train)
+    else:
+        _validate_numpy(data_train, n_jobs=n_jobs)
@@ -0,0 +1,386 @@
+import asyncio
+import collections
+import http
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 1 << 20
+# Number of most recent request latencies the percentiles are computed from
+LATENCY_WINDOW = 10_000
+
+
+def load_scorer(model_path: str, compiled: bool = True):
+    """
+    Load a fitted pipeline and return a function scoring a list of records with it.
+
+    Parameters
+    ----------
+    model_path : str
+        Path to the saved pipeline (see `src.predict.load_model`).
+    compiled : bool, optional
+        Score with `src.compiled_scorer.compile_pipeline` when the pipeline
+        supports it, falling back to the pipeline itself. Default is True.
+
+    Returns
+    -------
+    tuple of (callable, numpy.ndarray)
+        A function taking a list of records (dicts of column to value) and
+        returning their class probabilities, and the class labels of its
+        columns.
+    """
+    import pandas as pd
+    from src.predict import load_model
+
+    model = load_model(model_path)
+    if compiled:
+        from src.compiled_scorer import compile_pipeline
+        try:
+            scorer = compile_pipeline(model)
+            return scorer.predict_proba, scorer.classes_
+        except ValueError:
+            pass
+    columns = list(model.feature_names_in_)
+    return (lambda records: model.predict_proba(pd.DataFrame.from_records(records, columns=columns))), model.classes_
+
+
+class ServingMetrics:
+    """
+    Counters and latencies of a running `ScoringServer`.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of most recent request latencies kept for the percentiles.
+        Default is `LATENCY_WINDOW`.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.records = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_batch_size = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.latencies = collections.deque(maxlen=window)
+
+    def snapshot(self):
+        """
+        Return the metrics as a JSON-compatible dict.
+
+        Returns
+        -------
+        dict
+            `uptime_seconds`; the `requests`, `records` and `errors` scored so
+            far and the `batches` they were scored in, with the `mean_batch_size`
+            and `max_batch_size` in records; `requests_per_second` and
+            `records_per_second` since the start; the current and maximum
+            `queue_depth` (requests waiting to be batched); and `latency_ms`,
+            the p50, p90, p99 and maximum time from receiving a request to its
+            result, over the most recent requests.
+        """
+        uptime = time.perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1000
+        percentiles = np.percentile(latencies, [50, 90, 99]) if len(latencies) else [None] * 3
+        return {
+            "uptime_seconds": uptime,
+            "requests": self.requests,
+            "records": self.records,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.records / self.batches if self.batches else None,
+            "max_batch_size": self.max_batch_size,
+            "requests_per_second": self.requests / uptime,
+            "records_per_second": self.records / uptime,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "latency_ms": {
+                "p50": None if percentiles[0] is None else float(percentiles[0]),
+                "p90": None if percentiles[1] is None else float(percentiles[1]),
+                "p99": None if percentiles[2] is None else float(percentiles[2]),
+                "max": float(latencies.max()) if len(latencies) else None,
+            },
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent scoring requests into batches scored with one call.
+
+    A batch starts with the oldest waiting request and takes the requests
+    that arrive within `max_wait_ms` of it, until it holds `max_batch_size`
+    records. The batch is scored in a worker thread, so the event loop keeps
+    accepting requests, which form the next batch, meanwhile. If scoring a
+    batch fails, its requests are scored one by one so that only the
+    requests with invalid records fail.
+
+    Parameters
+    ----------
+    score : callable
+        Function taking a list of records and returning an array with one row per record.
+    max_batch_size : int, optional
+        Maximum number of records per batch. A larger request is scored on its own. Default is 64.
+    max_wait_ms : float, optional
+        Longest time the first request of a batch waits for others. Default is 2.
+    metrics : ServingMetrics, optional
+        Metrics to update. Default is a new `ServingMetrics`.
+
+    Raises
+    ------
+    ValueError
+        If `max_batch_size` is not positive or `max_wait_ms` is negative.
+    """
+
+    def __init__(self, score, max_batch_size: int = 64, max_wait_ms: float = 2.0, metrics: ServingMetrics = None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        self.score = score
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics if metrics is not None else ServingMetrics()
+        self._queue = None
+        self._task = None
+        self._executor = None
+
+    def start(self):
+        """Start batching; must be called from the running event loop."""
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop batching; requests still waiting are cancelled."""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            self._queue.get_nowait()[1].cancel()
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, records):
+        """
+        Score a list of records as part of the next batch.
+
+        Parameters
+        ----------
+        records : list of dict
+            The records to score.
+
+        Returns
+        -------
+        numpy.ndarray
+            The rows returned by `score` for these records.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((records, future, time.perf_counter()))
+        self.metrics.queue_depth = self._queue.qsize()
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        carried = None
+        while True:
+            batch = [carried if carried is not None else await self._queue.get()]
+            carried = None
+            n_records = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while n_records < self.max_batch_size:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if n_records + len(item[0]) > self.max_batch_size:
+                    # Too large to fit: it starts the next batch
+                    carried = item
+                    break
+                batch.append(item)
+                n_records += len(item[0])
+            self.metrics.queue_depth = self._queue.qsize()
+            await self._score(loop, batch, n_records)
+
+    async def _score(self, loop, batch, n_records):
+        records = [record for item in batch for record in item[0]]
+        try:
+            scores = await loop.run_in_executor(self._executor, self.score, records)
+        except Exception as e:
+            if len(batch) == 1:
+                self._finish(batch[0], error=e)
+                return
+            for item in batch:
+                await self._score(loop, [item], len(item[0]))
+            return
+        self.metrics.batches += 1
+        self.metrics.max_batch_size = max(self.metrics.max_batch_size, n_records)
+        start = 0
+        for item in batch:
+            self._finish(item, result=scores[start:start + len(item[0])])
+            start += len(item[0])
+
+    def _finish(self, item, result=None, error=None):
+        records, future, received = item
+        self.metrics.requests += 1
+        self.metrics.latencies.append(time.perf_counter() - received)
+        if error is not None:
+            self.metrics.errors += 1
+            if not future.done():
+                future.set_exception(error)
+            return
+        self.metrics.records += len(records)
+        if not future.done():
+            future.set_result(result)
+
+
+def _parse_records(body):
+    # A record, a list of records, or {"records": [...]}
+    payload = json.loads(body)
+    if isinstance(payload, dict) and "records" in payload:
+        payload = payload["records"]
+    records = [payload] if isinstance(payload, dict) else payload
+    if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+        raise ValueError("Body must be a JSON record, a non-empty list of records, or {\"records\": [...]}")
+    return records
+
+
+class ScoringServer:
+    """
+    HTTP/1.1 server scoring JSON records with a `MicroBatcher`.
+
+    Endpoints:
+
+    - `POST /predict` with a JSON record, a list of records, or
+      `{"records": [...]}`, each record mapping feature names to values.
+      Returns `{"predictions": [...]}` with the `prediction` and one
+      `proba_<class>` value per record, as in `src.predict.predict_frame`.
+      Invalid records return status 400 with an `error` message.
+    - `GET /metrics` returns `ServingMetrics.snapshot()`.
+    - `GET /health` returns `{"status": "ok"}`.
+
+    Connections are kept alive between requests unless the client sends
+    `Connection: close`.
+
+    Parameters
+    ----------
+    score : callable
+        Function taking a list of records and returning their class probabilities.
+    classes : array-like
+        Class labels of the probability columns.
+    max_batch_size : int, optional
+        Maximum number of records scored in one call. Default is 64.
+    max_wait_ms : float, optional
+        Longest time a request waits for others to share its batch. Default is 2.
+    """
+
+    def __init__(self, score, classes, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.classes = [c.item() if isinstance(c, np.generic) else c for c in classes]
+        self.metrics = ServingMetrics()
+        self.batcher = MicroBatcher(score, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                    metrics=self.metrics)
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000):
+        """
+        Start listening and batching.
+
+        Parameters
+        ----------
+        host : str, optional
+            Address to bind. Default is "127.0.0.1".
+        port : int, optional
+            Port to bind; 0 picks a free one. Default is 8000.
+
+        Returns
+        -------
+        int
+            The port the server listens on.
+        """
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Serve until cancelled."""
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening and batching."""
+        self._server.close()
+        await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode("latin-1").split()
+                keep_alive = (len(parts) == 3 and parts[2] == "HTTP/1.1"
+                              and headers.get("connection", "").lower() != "close")
+                length = int(headers.get("content-length", 0) or 0)
+                if len(parts) != 3:
+                    status, payload, keep_alive = 400, {"error": "Malformed request line"}, False
+                elif length > MAX_BODY_BYTES:
+                    status, payload, keep_alive = 413, {"error": f"Body larger than {MAX_BODY_BYTES} bytes"}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._route(parts[0], parts[1].split("?")[0], body)
+                content = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(content)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "Use POST"}
+            try:
+                records = _parse_records(body)
+                proba = await self.batcher.submit(records)
+            except (ValueError, KeyError, TypeError) as e:
+                return 400, {"error": str(e)}
+            except Exception as e:
+                # The batcher has counted the error
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+            try:
+                labels = np.asarray(self.classes, dtype=object)[np.asarray(proba).argmax(axis=1)]
+                return 200, {"predictions": [
+                    dict({"prediction": label}, **{f"proba_{c}": float(p) for c, p in zip(self.classes, row)})
+                    for label, row in zip(labels.tolist(), np.asarray(proba).tolist())]}
+            except Exception as e:
+                self.metrics.errors += 1
+                return 500, {"error": f"{type(e).__name__}: {e}"}
+        if path in ("/metrics", "/health"):
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, self.metrics.snapshot() if path == "/metrics" else {"status": "ok"}
+        return 404, {"error": f"No endpoint {path}"}
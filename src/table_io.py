@@ -0,0 +1,259 @@
+import os
+import pandas as pd
+
+TABLE_FORMATS = (".csv", ".parquet", ".feather")
+
+CATEGORY_LEVELS = {
+    "age_group": ["Adult", "Senior"],
+    "gender": ["Female", "Male"],
+    "weekly_physical_activity": ["No", "Yes"],
+    "diabetic": ["No", "Borderline", "Yes"],
+}
+MEASUREMENT_COLUMNS = ["bmi", "blood_glucose_fasting", "oral", "insulin_level"]
+
+NHANES_DTYPES = {
+    **{col: pd.CategoricalDtype(levels) for col, levels in CATEGORY_LEVELS.items()},
+    **{col: "float32" for col in MEASUREMENT_COLUMNS},
+}
+
+
+def table_format(filename: str):
+    """
+    Return the storage format of a table file from its extension.
+
+    Parameters
+    ----------
+    filename : str
+        File name or path ending in '.csv', '.parquet' or '.feather'.
+
+    Returns
+    -------
+    str
+        The lower-case extension, e.g. '.parquet'.
+
+    Raises
+    ------
+    ValueError
+        If the extension is not a supported table format.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in TABLE_FORMATS:
+        raise ValueError(f"Filename must end with one of {TABLE_FORMATS}")
+    return extension
+
+
+def apply_dtypes(dataframe: pd.DataFrame, dtypes: dict = None):
+    """
+    Cast the columns of a DataFrame that appear in `dtypes` to the given types.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The DataFrame to convert.
+    dtypes : dict, optional
+        Mapping of column name to dtype. Default is `NHANES_DTYPES`
+        (categoricals for the categorical columns, float32 for measurements).
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame with the converted columns.
+
+    Raises
+    ------
+    ValueError
+        If a value is not one of the declared categories of its column.
+    """
+    dtypes = NHANES_DTYPES if dtypes is None else dtypes
+    dtypes = {col: dtype for col, dtype in dtypes.items() if col in dataframe.columns}
+    converted = dataframe.astype(dtypes)
+    for col, dtype in dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            lost = converted[col].isna() & dataframe[col].notna()
+            if lost.any():
+                raise ValueError(f"Column '{col}' has values outside its categories: "
+                                 f"{sorted(dataframe.loc[lost, col].astype(str).unique())}")
+    return converted
+
+
+def write_table(dataframe: pd.DataFrame, directory: str, filename: str, index: bool = False,
+                dtypes: dict = None):
+    """
+    Save a Pandas DataFrame as CSV, Parquet or Feather, chosen by the file extension.
+
+    Parquet and Feather files are written with explicit column types (see
+    `apply_dtypes`), so readers get categoricals and float32 measurements back
+    without re-parsing text or re-inferring types. CSV files are written as is.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The DataFrame to save.
+    directory : str
+        The directory where the file will be saved.
+    filename : str
+        The name of the file, ending in '.csv', '.parquet' or '.feather'.
+    index : bool, optional
+        Whether to include the DataFrame's index. Default is False.
+    dtypes : dict, optional
+        Column types for Parquet and Feather files. Default is `NHANES_DTYPES`.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported, or the DataFrame is empty.
+    FileNotFoundError
+        If the specified directory does not exist.
+    TypeError
+        If the input is not a pandas DataFrame.
+    """
+    extension = table_format(filename)
+    if not os.path.exists(directory):
+        raise FileNotFoundError(f"Directory {directory} does not exist.")
+    if not isinstance(dataframe, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if dataframe.empty:
+        raise ValueError("DataFrame must contain observations.")
+
+    filepath = os.path.join(directory, filename)
+    if extension == ".csv":
+        dataframe.to_csv(filepath, index=index)
+        return
+
+    typed = apply_dtypes(dataframe, dtypes)
+    if extension == ".parquet":
+        typed.to_parquet(filepath, index=index)
+    else:
+        # Feather cannot store an index; keep it as a regular column instead
+        typed = typed.reset_index() if index else typed.reset_index(drop=True)
+        typed.to_feather(filepath)
+
+
+def read_table(path: str, dtypes: dict = None, index_col=None):
+    """
+    Load a CSV, Parquet or Feather file into a DataFrame, chosen by the file extension.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to read.
+    dtypes : dict, optional
+        Column types to apply. For CSV they are passed to `read_csv`, so values
+        are parsed straight into the requested types. Parquet and Feather files
+        already store their types, so this is usually left as None for them.
+    index_col : int or str, optional
+        Column to use as the index, as in `pandas.read_csv`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The loaded data.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported.
+    FileNotFoundError
+        If the file does not exist.
+    """
+    extension = table_format(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File {path} does not exist.")
+
+    if extension == ".csv":
+        if dtypes is not None:
+            header = pd.read_csv(path, nrows=0, index_col=index_col).columns
+            dtypes = {col: dtype for col, dtype in dtypes.items() if col in header}
+        return pd.read_csv(path, dtype=dtypes, index_col=index_col)
+
+    data = pd.read_parquet(path) if extension == ".parquet" else pd.read_feather(path)
+    if index_col is not None:
+        data = data.set_index(data.columns[index_col] if isinstance(index_col, int) else index_col)
+    return apply_dtypes(data, dtypes) if dtypes is not None else data
+
+
+class TableWriter:
+    """
+    Write a table to a CSV or Parquet file one chunk at a time.
+
+    Chunks are written to a temporary file next to `path`, which replaces
+    `path` only on `close`; used as a context manager, the writer closes on
+    success and discards the partial file if an exception is raised. Parquet
+    chunks are cast with `apply_dtypes`, so that they all share one schema.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to write, ending in '.csv' or '.parquet'.
+    dtypes : dict, optional
+        Column types for Parquet files. Default is `NHANES_DTYPES`.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported for chunked writing.
+    FileNotFoundError
+        If the directory of `path` does not exist.
+    """
+
+    def __init__(self, path: str, dtypes: dict = None):
+        self.extension = table_format(path)
+        if self.extension == ".feather":
+            raise ValueError("Feather files cannot be written in chunks; use '.csv' or '.parquet'")
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            raise FileNotFoundError(f"Directory {directory} does not exist.")
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.dtypes = dtypes
+        self.n_rows = 0
+        self._parquet_writer = None
+
+    def write(self, dataframe: pd.DataFrame):
+        """Append the rows of `dataframe`; empty chunks are skipped."""
+        if dataframe.empty:
+            return
+        if self.extension == ".csv":
+            dataframe.to_csv(self.tmp_path, mode='a' if self.n_rows else 'w', header=not self.n_rows, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(apply_dtypes(dataframe, self.dtypes), preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            self._parquet_writer.write_table(table)
+        self.n_rows += len(dataframe)
+
+    def close(self):
+        """
+        Finish the file and move it to `path`.
+
+        Raises
+        ------
+        ValueError
+            If no rows were written.
+        """
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self.n_rows == 0:
+            self.discard()
+            raise ValueError("DataFrame must contain observations.")
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        """Remove the partial file; `path` is left as it was."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,204 @@
+import hashlib
+import uuid
+from collections import OrderedDict
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import GridSearchCV, ParameterGrid
+from sklearn.utils import Bunch
+from src.choices import SEARCH_STRATEGIES
+
+
+# Per-process store of fitted transformer steps, keyed by FoldMemory token.
+# Module level so that it survives the cloning/pickling of the estimator
+# that GridSearchCV does for every (candidate, fold) pair.
+_FOLD_CACHES = {}
+
+
+def _fingerprint(value):
+    """Cheap content hash of the data passed to a transformer step."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        digest = hashlib.sha1(pd.util.hash_pandas_object(frame, index=True).values.tobytes())
+        digest.update(repr(list(frame.columns)).encode())
+        digest.update(repr(list(frame.dtypes)).encode())
+        return digest.hexdigest()
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        digest = hashlib.sha1(np.ascontiguousarray(value).tobytes())
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        return digest.hexdigest()
+    return joblib.hash(value)
+
+
+class FoldMemory:
+    """
+    In-memory stand-in for `joblib.Memory` for a Pipeline's transformer steps.
+
+    `Pipeline(memory=...)` calls `memory.cache(func)` on the function that fits
+    and applies each transformer step. This cache keys that call on the
+    transformer's parameters and a fast `hash_pandas_object` fingerprint of the
+    fold's data, and keeps the result in RAM instead of pickling it to disk,
+    which for small, cheap-to-hash folds is much faster than `joblib.Memory`.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of fitted steps kept per process. Default is 32.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.token = uuid.uuid4().hex
+        self.max_entries = max_entries
+
+    def cache(self, func):
+        token, max_entries = self.token, self.max_entries
+
+        def cached(transformer, X, y, *args, **kwargs):
+            kwargs_key = {k: v for k, v in kwargs.items() if k != "message"}
+            key = (joblib.hash((transformer, args, kwargs_key)), _fingerprint(X), _fingerprint(y))
+            if token not in _FOLD_CACHES:
+                # A new search; drop what previous searches left in this worker
+                _FOLD_CACHES.clear()
+                _FOLD_CACHES[token] = OrderedDict()
+            store = _FOLD_CACHES[token]
+            if key not in store:
+                store[key] = func(transformer, X, y, *args, **kwargs)
+                if len(store) > max_entries:
+                    store.popitem(last=False)
+            return store[key]
+
+        return cached
+
+
+def tune_model(pipe, param_grid, X, y, cv=10, n_jobs=None, cache_preprocessor=True,
+               strategy="grid", random_state=None):
+    """
+    Tune the hyperparameters of a pipeline with cross-validation.
+
+    Candidates and folds are spread over `n_jobs` worker processes. With
+    `cache_preprocessor`, the pipeline's transformer steps are memoised (see
+    `FoldMemory`), so the preprocessor is fitted once per fold instead of once
+    per fold and candidate: only the final estimator's parameters vary across
+    the grid, so every candidate on a fold reuses the same transformed data.
+    Caching and parallelism do not change the results.
+
+    Parameters
+    ----------
+    pipe : sklearn.pipeline.Pipeline
+        The unfitted pipeline to tune.
+    param_grid : dict
+        Grid of parameters, as for `GridSearchCV`.
+    X : pandas.DataFrame
+        Training features.
+    y : pandas.Series
+        Training target.
+    cv : int, optional
+        Number of cross-validation folds or a CV splitter. Default is 10.
+    n_jobs : int, optional
+        Number of worker processes; -1 uses all cores. Default is None (serial).
+    cache_preprocessor : bool, optional
+        Whether to reuse fitted transformer steps across candidates. Default is True.
+    strategy : {"grid", "halving"}, optional
+        "grid" evaluates every candidate on every fold (`GridSearchCV`);
+        "halving" uses successive halving (`HalvingGridSearchCV`), discarding
+        poor candidates early on growing subsets of the data. Default is "grid".
+    random_state : int, optional
+        Seed for the subsampling done by the "halving" strategy.
+
+    Returns
+    -------
+    GridSearchCV or HalvingGridSearchCV
+        The fitted search. Its `best_estimator_` has no cache attached, so it
+        can be persisted and reused on its own.
+
+    Raises
+    ------
+    ValueError
+        If `strategy` is not one of the supported search strategies.
+    """
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"strategy must be one of {SEARCH_STRATEGIES}")
+
+    memory = FoldMemory() if cache_preprocessor else None
+    pipe = clone(pipe).set_params(memory=memory)
+
+    if strategy == "grid":
+        search = GridSearchCV(pipe, param_grid, cv=cv, n_jobs=n_jobs, return_train_score=True)
+    else:
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+        search = HalvingGridSearchCV(pipe, param_grid, cv=cv, n_jobs=n_jobs,
+                                     return_train_score=True, random_state=random_state)
+    try:
+        search.fit(X, y)
+    finally:
+        if memory is not None:
+            _FOLD_CACHES.pop(memory.token, None)
+
+    search.estimator.set_params(memory=None)
+    if hasattr(search, "best_estimator_"):
+        search.best_estimator_.set_params(memory=None)
+    return search
+
+
+def _fit_and_score_fold(estimator, params, store, k):
+    X_train, y_train, X_valid, y_valid = store.fold(k)
+    fitted = clone(estimator).set_params(**params).fit(X_train, y_train)
+    return fitted.score(X_train, y_train), fitted.score(X_valid, y_valid)
+
+
+def tune_on_features(estimator, param_grid, store, n_jobs=None):
+    """
+    Tune the hyperparameters of a classifier on the fold matrices of a `FeatureStore`.
+
+    This is the search `tune_model` runs with the grid strategy, except that
+    the preprocessing was done once per fold by
+    `src.feature_store.materialize_features`: every (candidate, fold) fit
+    reads the fold's memory-mapped float32 matrices instead of transforming
+    DataFrames. The best candidate is refitted on the full training matrix.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The unfitted classifier, without a preprocessor.
+    param_grid : dict
+        Grid of parameters of `estimator`, as for `GridSearchCV`.
+    store : src.feature_store.FeatureStore
+        The materialised fold, training and test matrices.
+    n_jobs : int, optional
+        Number of worker processes; -1 uses all cores. Default is None (serial).
+
+    Returns
+    -------
+    sklearn.utils.Bunch
+        With `cv_results_` (`params`, `param_<name>`, `mean_train_score`,
+        `mean_test_score`, `std_test_score` and `rank_test_score`, as from
+        `GridSearchCV`), `best_params_`, `best_score_`, `best_index_` and
+        `best_estimator_`, the refitted classifier.
+    """
+    candidates = list(ParameterGrid(param_grid))
+    scores = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_fit_and_score_fold)(estimator, params, store, k)
+        for params in candidates for k in range(store.n_folds)
+    )
+    scores = np.array(scores).reshape(len(candidates), store.n_folds, 2)
+    train_scores, test_scores = scores[..., 0], scores[..., 1]
+
+    mean_test = test_scores.mean(axis=1)
+    cv_results = {
+        "params": candidates,
+        "mean_train_score": train_scores.mean(axis=1),
+        "mean_test_score": mean_test,
+        "std_test_score": test_scores.std(axis=1),
+        # Ties share the best rank, as in GridSearchCV
+        "rank_test_score": pd.Series(mean_test).rank(method="min", ascending=False).to_numpy(dtype=np.int32),
+    }
+    for name in param_grid:
+        cv_results[f"param_{name}"] = np.array([params[name] for params in candidates], dtype=object)
+
+    best_index = int(np.flatnonzero(cv_results["rank_test_score"] == 1)[0])
+    best_params = candidates[best_index]
+    X, y = store.train()
+    return Bunch(cv_results_=cv_results, best_params_=best_params, best_score_=mean_test[best_index],
+                 best_index_=best_index, best_estimator_=clone(estimator).set_params(**best_params).fit(X, y))
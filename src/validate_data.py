@@ -1,14 +1,243 @@
+import math
+import numpy as np
 import pandas as pd
 import pandera as pa
+from pandera.errors import SchemaError, SchemaErrorReason
+from pandera.backends.pandas.error_formatters import (
+    format_generic_error_message,
+    format_vectorized_error_message,
+    reshape_failure_cases,
+    scalar_failure_case,
+)
+from src.choices import VALIDATION_ENGINES, DUPLICATE_MODES
 
-def validate_data(data):
+MISSINGNESS_THRESHOLD = 0.2
+
+# Built once at import; both engines validate against this schema
+SCHEMA = pa.DataFrameSchema({
+    "age_group": pa.Column(str, pa.Check.isin(["Adult", "Senior"])),
+    "gender": pa.Column(str, pa.Check.isin(["Female", "Male"]), nullable=True),
+    "weekly_physical_activity": pa.Column(str, pa.Check.isin(["No", "Yes"]), nullable=True),
+    "bmi": pa.Column(float, pa.Check.between(14.5, 70.1), nullable=True),
+    "blood_glucose_fasting": pa.Column(float, pa.Check.between(63.0, 405.0), nullable=True),
+    "diabetic": pa.Column(str, pa.Check.isin(["No", "Yes", "Borderline"]), nullable=True),
+    "oral": pa.Column(float, pa.Check.between(40.0, 604.0), nullable=True),
+    "insulin_level": pa.Column(float, pa.Check.between(0.14, 102.29), nullable=True)
+}, strict=True,
+checks=[
+    pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
+    pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found."),
+    pa.Check(lambda df: df.apply(lambda col: col.isnull().mean() <= MISSINGNESS_THRESHOLD).all(),
+        error=f"One or more columns have missing values above {MISSINGNESS_THRESHOLD*100:.1f}% threshold.")
+]
+)
+DUPLICATE_CHECK, EMPTY_ROW_CHECK, MISSINGNESS_CHECK = range(3)
+
+
+def _column_arrays(values: pd.Series):
+    """
+    Return the missing-value mask and a 64-bit key per row of one column.
+
+    Text and categorical columns are reduced to category codes (-1 for
+    missing) with the distinct values alongside, so that membership checks
+    only look at each distinct value once; their key is the hash of the value,
+    so keys agree between chunks of the same file. Float columns keep their
+    values; their key is the bit pattern, with -0.0 and NaN normalised so that
+    equal values get equal keys.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    elif isinstance(values.dtype, np.dtype) and values.dtype.kind == "f":
+        array = values.to_numpy()
+        isna = np.isnan(array)
+        bits = np.where(isna, np.nan, array + 0.0).astype(array.dtype)
+        return isna, bits.view(f"u{array.itemsize}").astype(np.uint64), array, None
+    else:
+        codes, uniques = pd.factorize(values)
+        uniques = pd.Index(uniques)
+    # Missing values have code -1, which picks the trailing 0
+    value_hashes = np.append(pd.util.hash_array(np.asarray(uniques, dtype=object)), np.uint64(0))
+    return codes < 0, value_hashes[codes], codes, uniques
+
+
+def _dtype_error(column: pa.Column, values: pd.Series, isna, codes, uniques):
+    """
+    Return the `SchemaError` for a column of the wrong type, or None.
+
+    As in pandera, text columns are checked element-wise: any non-missing
+    value that is not a string fails, so object, string and categorical
+    columns of strings pass. Only the distinct values are inspected.
+    """
+    name, check = values.name, f"dtype('{column.dtype}')"
+    if pd.api.types.is_float_dtype(column.dtype.type):
+        if pd.api.types.is_float_dtype(values.dtype):
+            return None
+        return SchemaError(
+            column, values, f"expected series '{name}' to have type {column.dtype}, got {values.dtype}",
+            failure_cases=scalar_failure_case(str(values.dtype)), check=check,
+            reason_code=SchemaErrorReason.WRONG_DATATYPE)
+
+    if uniques is None:
+        not_text = ~isna
+    else:
+        not_text = np.append([not isinstance(value, str) for value in uniques], False)[codes]
+    if not not_text.any():
+        return None
+    failure_cases = reshape_failure_cases(values[not_text], ignore_na=False)
+    return SchemaError(
+        column, values, f"expected series '{name}' to have type {column.dtype}:\nfailure cases:\n{failure_cases}",
+        failure_cases=failure_cases, check=check, reason_code=SchemaErrorReason.WRONG_DATATYPE)
+
+
+def _element_failures(check: pa.Check, values: pd.Series, array, uniques):
+    """
+    Boolean mask of the non-missing values that fail an `isin` or `in_range` check.
+
+    Returns None when the check cannot be applied, i.e. a range check on
+    non-numeric values; the column's dtype error already reports those.
+    """
+    if check.name == "isin":
+        if uniques is None:
+            return ~(values.isin(check.statistics["allowed_values"]).to_numpy() | np.isnan(array))
+        # Missing values have code -1, which picks the trailing True
+        allowed = np.append(np.asarray(uniques.isin(check.statistics["allowed_values"])), True)
+        return ~allowed[array]
+    lower, upper = check.statistics["min_value"], check.statistics["max_value"]
+    if uniques is None:
+        # Compare in the column's own precision, so float32 data at a bound is not rejected
+        lower, upper = array.dtype.type(lower), array.dtype.type(upper)
+    elif pd.api.types.is_numeric_dtype(values.dtype):
+        array = values.to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        return None
+    return (array < lower) | (array > upper)
+
+
+def _combine_hash(row_hash, key):
+    """Mix one column's integer keys into the running per-row hash, in place."""
+    mixed = row_hash << np.uint64(6)
+    mixed += row_hash >> np.uint64(2)
+    mixed += key
+    mixed += np.uint64(0x9E3779B97F4A7C15)
+    row_hash ^= mixed
+
+
+def _has_duplicate_rows(data: pd.DataFrame, row_hash):
+    """
+    Check for duplicate rows from a per-row hash of all columns.
+
+    Rows whose hash occurs more than once are compared exactly, so hash
+    collisions cannot produce a false positive.
+    """
+    if len(data) < 2:
+        return False
+    candidates = pd.Series(row_hash).duplicated(keep=False).to_numpy()
+    return bool(candidates.any()) and bool(data[candidates].duplicated().any())
+
+
+def _check_columns(data: pd.DataFrame):
+    """
+    Run the column-level checks of `SCHEMA` in one pass over the columns.
+
+    Returns the errors found, the number of missing values per column, the
+    mask of empty rows and a 64-bit hash of each row, from which the
+    dataframe-wide checks are decided.
+    """
+    errors = []
+    for name in data.columns:
+        if name not in SCHEMA.columns:
+            errors.append(SchemaError(
+                SCHEMA, data, f"column '{name}' not in {SCHEMA.__class__.__name__} {SCHEMA.columns}",
+                failure_cases=scalar_failure_case(name), check="column_in_schema",
+                reason_code=SchemaErrorReason.COLUMN_NOT_IN_SCHEMA))
+    for name in SCHEMA.columns:
+        if name not in data.columns:
+            errors.append(SchemaError(
+                SCHEMA, data, f"column '{name}' not in dataframe. Columns in dataframe: {list(data.columns)}",
+                failure_cases=scalar_failure_case(name), check="column_in_dataframe",
+                reason_code=SchemaErrorReason.COLUMN_NOT_IN_DATAFRAME))
+
+    empty_rows = np.ones(len(data), dtype=bool)
+    missing_counts = {}
+    row_hash = np.zeros(len(data), dtype=np.uint64)
+    for name in data.columns:
+        values = data[name]
+        isna, key, array, uniques = _column_arrays(values)
+        empty_rows &= isna
+        missing_counts[name] = int(isna.sum())
+        _combine_hash(row_hash, key)
+
+        column = SCHEMA.columns.get(name)
+        if column is None:
+            continue
+        if not column.nullable and isna.any():
+            errors.append(SchemaError(
+                column, values, f"non-nullable series '{name}' contains null values:\n{values[isna]}",
+                failure_cases=reshape_failure_cases(values[isna], ignore_na=False), check="not_nullable",
+                reason_code=SchemaErrorReason.SERIES_CONTAINS_NULLS))
+        dtype_error = _dtype_error(column, values, isna, array, uniques)
+        if dtype_error is not None:
+            errors.append(dtype_error)
+        for check_index, check in enumerate(column.checks):
+            failed = _element_failures(check, values, array, uniques)
+            if failed is not None and failed.any():
+                failure_cases = reshape_failure_cases(values[failed], check.ignore_na)
+                errors.append(SchemaError(
+                    column, values, format_vectorized_error_message(column, check, check_index, failure_cases),
+                    failure_cases=failure_cases, check=check, check_index=check_index,
+                    check_output=pd.Series(~failed, index=values.index),
+                    reason_code=SchemaErrorReason.DATAFRAME_CHECK))
+    return errors, missing_counts, empty_rows, row_hash
+
+
+def _too_many_missing(missing_counts, n_rows):
+    if n_rows == 0:
+        # As in pandera, where the missing rate of a column with no rows is NaN and fails the threshold
+        return bool(missing_counts)
+    return any(count / n_rows > MISSINGNESS_THRESHOLD for count in missing_counts.values())
+
+
+def _dataframe_check_error(check_index, data):
+    """The `SchemaError` pandera reports when dataframe-wide check `check_index` of `SCHEMA` fails."""
+    check = SCHEMA.checks[check_index]
+    return SchemaError(
+        SCHEMA, data, format_generic_error_message(SCHEMA, check, check_index),
+        failure_cases=scalar_failure_case(False), check=check, check_index=check_index,
+        check_output=False, reason_code=SchemaErrorReason.DATAFRAME_CHECK)
+
+
+def _validate_numpy(data: pd.DataFrame):
+    """Run the checks of `SCHEMA` in one pass over the columns, collecting every failure."""
+    errors, missing_counts, empty_rows, row_hash = _check_columns(data)
+    failed_checks = [
+        (DUPLICATE_CHECK, _has_duplicate_rows(data, row_hash)),
+        (EMPTY_ROW_CHECK, bool(empty_rows.any())),
+        (MISSINGNESS_CHECK, _too_many_missing(missing_counts, len(data))),
+    ]
+    errors += [_dataframe_check_error(check_index, data) for check_index, failed in failed_checks if failed]
+    if errors:
+        raise pa.errors.SchemaErrors(SCHEMA, errors, data)
+    return data
+
+
+def validate_data(data, engine="numpy"):
     """
     Validates the input data according to a predefined schema.
 
+    The schema (`SCHEMA`) is built once at import. The default "numpy" engine
+    evaluates all of its checks (columns, types, nullability, value ranges and
+    categories, duplicate and empty rows, missingness) in a single vectorized
+    pass over each column, and reports failures exactly like pandera's lazy
+    validation. It also accepts the storage types written by `src.table_io`:
+    categorical columns for text and float32 for measurements.
+
     Parameters
     ----------
     data : pandas.DataFrame
         The DataFrame containing raw data that needs to be validated.
+    engine : {"numpy", "pandera"}, optional
+        "numpy" for the single-pass validator, "pandera" to run `SCHEMA` with
+        `pandera` itself. Default is "numpy".
 
     Returns
     -------
@@ -17,29 +246,204 @@ def validate_data(data):
 
     Raises
     ------
-    pandera.errors.SchemaError
-        If the DataFrame does not conform to the specified schema.
-    """
-    MISSINGNESS_THRESHOLD = 0.2
-
-    schema = pa.DataFrameSchema({
-        "age_group": pa.Column(str, pa.Check.isin(["Adult", "Senior"])),
-        "gender": pa.Column(str, pa.Check.isin(["Female", "Male"]), nullable=True),
-        "weekly_physical_activity": pa.Column(str, pa.Check.isin(["No", "Yes"]), nullable=True),
-        "bmi": pa.Column(float, pa.Check.between(14.5, 70.1), nullable=True),
-        "blood_glucose_fasting": pa.Column(float, pa.Check.between(63.0, 405.0), nullable=True),
-        "diabetic": pa.Column(str, pa.Check.isin(["No", "Yes", "Borderline"]), nullable=True),
-        "oral": pa.Column(float, pa.Check.between(40.0, 604.0), nullable=True),
-        "insulin_level": pa.Column(float, pa.Check.between(0.14, 102.29), nullable=True)
-    }, strict=True,
-    checks=[
-        pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
-        pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found."),
-        pa.Check(lambda df: df.apply(lambda col: col.isnull().mean() <= MISSINGNESS_THRESHOLD).all(),
-            error=f"One or more columns have missing values above {MISSINGNESS_THRESHOLD*100:.1f}% threshold.")
-    ]
-    )
+    pandera.errors.SchemaErrors
+        If the DataFrame does not conform to the specified schema; lists every failed check.
+    ValueError
+        If `engine` is not one of the supported validation engines.
+    TypeError
+        If the input is not a pandas DataFrame.
+    """
+    if engine not in VALIDATION_ENGINES:
+        raise ValueError(f"engine must be one of {VALIDATION_ENGINES}")
+    if engine == "pandera":
+        # Validate data and return validated dataframe
+        return SCHEMA.validate(data, lazy=True)
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    return _validate_numpy(data)
+
+
+class _RowHashSet:
+    """
+    Set of 64-bit row hashes, stored as a few sorted arrays (8 bytes per row).
+
+    Each batch becomes a new sorted run; runs of similar length are merged,
+    so there are O(log n) runs to search.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def add(self, hashes):
+        """Insert `hashes`; return True if any of them was already in the set."""
+        hashes = np.unique(hashes)
+        if len(hashes) == 0:
+            return False
+        seen = False
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            seen = seen or bool((run[positions] == hashes).any())
+        self.runs.append(hashes)
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            # A stable sort merges the two sorted runs in linear time
+            self.runs[-1] = np.sort(np.concatenate((self.runs[-1], last)), kind="stable")
+        return seen
+
+
+class _BloomFilter:
+    """
+    Bloom filter over 64-bit row hashes.
+
+    Never misses a hash that was added, but reports a hash that was not added
+    with probability about `false_positive_rate` while at most
+    `expected_items` hashes have been added.
+    """
+
+    def __init__(self, expected_items: int, false_positive_rate: float):
+        self.n_bits = max(64, math.ceil(-expected_items * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / expected_items * math.log(2)))
+        self.bits = np.zeros((self.n_bits + 7) // 8, dtype=np.uint8)
+
+    def add(self, hashes):
+        """Insert `hashes`; return True if any of them was probably added before."""
+        # Double hashing: position i is (h1 + i * h2) mod n_bits
+        h1 = hashes % np.uint64(self.n_bits)
+        h2 = (hashes * np.uint64(0xBF58476D1CE4E5B9) >> np.uint64(17)) % np.uint64(self.n_bits) | np.uint64(1)
+        present = np.ones(len(hashes), dtype=bool)
+        positions = []
+        for i in range(self.n_hashes):
+            position = (h1 + np.uint64(i) * h2) % np.uint64(self.n_bits)
+            byte, bit = position >> np.uint64(3), (position & np.uint64(7)).astype(np.uint8)
+            present &= (self.bits[byte] >> bit) & 1 == 1
+            positions.append((byte, bit))
+        for byte, bit in positions:
+            np.bitwise_or.at(self.bits, byte, np.left_shift(1, bit, dtype=np.uint8))
+        return bool(present.any())
+
+
+class StreamingValidator:
+    """
+    Validate data that arrives in chunks against `SCHEMA`, e.g. from
+    `pandas.read_csv(..., chunksize=...)`, without holding it all in memory.
+
+    Column, type, nullability, range, category and empty-row checks are
+    decided for each chunk. The missingness threshold is decided by `finish`
+    from running counts of missing values. Duplicate rows are found through a
+    64-bit hash of every row seen so far: exactly within a chunk, and across
+    chunks either from a set of the hashes (8 bytes per row) or from a Bloom
+    filter (about 3.6 bytes per row at the default rate), which may report a
+    duplicate that is not one.
+
+    Parameters
+    ----------
+    duplicates : {"hash", "bloom"}, optional
+        How rows from earlier chunks are remembered. Default is "hash".
+    expected_rows : int, optional
+        Number of rows the Bloom filter is sized for. Default is 10,000,000.
+    false_positive_rate : float, optional
+        Probability that the Bloom filter takes a new row for one already seen,
+        while at most `expected_rows` rows have been seen. Default is 1e-6.
+
+    Raises
+    ------
+    ValueError
+        If `duplicates` is not one of the supported modes.
+    """
 
-    # Validate data and return validated dataframe
-    validated_data = schema.validate(data, lazy=True)
-    return validated_data
\ No newline at end of file
+    def __init__(self, duplicates: str = "hash", expected_rows: int = 10_000_000,
+                 false_positive_rate: float = 1e-6):
+        if duplicates not in DUPLICATE_MODES:
+            raise ValueError(f"duplicates must be one of {DUPLICATE_MODES}")
+        self._seen = _RowHashSet() if duplicates == "hash" else _BloomFilter(expected_rows, false_positive_rate)
+        self.missing_counts = {}
+        self.n_rows = 0
+
+    def validate(self, chunk: pd.DataFrame):
+        """
+        Validate one chunk and update the running state.
+
+        Parameters
+        ----------
+        chunk : pandas.DataFrame
+            The next rows of the data.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The chunk, unchanged.
+
+        Raises
+        ------
+        pandera.errors.SchemaErrors
+            If the chunk fails a check, or repeats a row of this or an earlier chunk.
+        TypeError
+            If the chunk is not a pandas DataFrame.
+        """
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("Input must be a pandas DataFrame")
+        errors, missing_counts, empty_rows, row_hash = _check_columns(chunk)
+        repeated = self._seen.add(row_hash)
+        if repeated or _has_duplicate_rows(chunk, row_hash):
+            errors.append(_dataframe_check_error(DUPLICATE_CHECK, chunk))
+        if empty_rows.any():
+            errors.append(_dataframe_check_error(EMPTY_ROW_CHECK, chunk))
+        if errors:
+            raise pa.errors.SchemaErrors(SCHEMA, errors, chunk)
+
+        for name, count in missing_counts.items():
+            self.missing_counts[name] = self.missing_counts.get(name, 0) + count
+        self.n_rows += len(chunk)
+        return chunk
+
+    def finish(self):
+        """
+        Apply the missingness threshold to all the rows validated so far.
+
+        Returns
+        -------
+        int
+            The number of rows validated.
+
+        Raises
+        ------
+        pandera.errors.SchemaErrors
+            If a column has more than `MISSINGNESS_THRESHOLD` missing values.
+        """
+        if _too_many_missing(self.missing_counts, self.n_rows):
+            data = pd.DataFrame(columns=list(self.missing_counts))
+            raise pa.errors.SchemaErrors(SCHEMA, [_dataframe_check_error(MISSINGNESS_CHECK, data)], data)
+        return self.n_rows
+
+
+def validate_chunks(chunks, duplicates="hash", expected_rows=10_000_000, false_positive_rate=1e-6):
+    """
+    Validate an iterable of DataFrame chunks, yielding each chunk once it passes.
+
+    Checks are those of `validate_data`; see `StreamingValidator`. Because the
+    missingness threshold covers the whole input, it is only decided after the
+    last chunk: output written from the yielded chunks should be kept only if
+    iteration finishes without an error.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.DataFrame
+        The data, in order, e.g. a `pandas.read_csv(..., chunksize=...)` reader.
+    duplicates, expected_rows, false_positive_rate
+        See `StreamingValidator`.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Each validated chunk.
+
+    Raises
+    ------
+    pandera.errors.SchemaErrors
+        At the first chunk that fails a check, or after the last chunk if the
+        data fails the missingness threshold.
+    """
+    validator = StreamingValidator(duplicates, expected_rows, false_positive_rate)
+    for chunk in chunks:
+        yield validator.validate(chunk)
+    validator.finish()
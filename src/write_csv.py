@@ -1,5 +1,5 @@
-import os
 import pandas as pd
+from src.table_io import write_table
 
 def write_csv(dataframe: pd.DataFrame, directory: str, filename: str, index: bool = False):
     """
@@ -27,12 +27,5 @@ def write_csv(dataframe: pd.DataFrame, directory: str, filename: str, index: boo
     """
     if not filename.endswith(".csv"):
         raise ValueError("Filename must end with '.csv'")
-    if not os.path.exists(directory):
-        raise FileNotFoundError(f"Directory {directory} does not exist.")
-    if not isinstance(dataframe, pd.DataFrame):
-        raise TypeError("Input must be a pandas DataFrame")    
-    if dataframe.empty:
-        raise ValueError("DataFrame must contain observations.")
 
-    filepath = os.path.join(directory, filename)
-    dataframe.to_csv(filepath, index=index)
+    write_table(dataframe, directory, filename, index=index)
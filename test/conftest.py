@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_sample_data(n: int = 80, seed: int = 522, senior_share: float = None, senior_oral_shift: float = 0.0):
+    """
+    Generate rows with the columns of data_train.csv.
+
+    Parameters
+    ----------
+    n : int, optional
+        Number of rows. Default is 80.
+    seed : int, optional
+        Seed of the random values. Default is 522.
+    senior_share : float, optional
+        Probability of a Senior row. Default is None (balanced classes).
+    senior_oral_shift : float, optional
+        Added to the oral values of Seniors, so that a classifier has some
+        signal to learn. Default is 0.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The rows, target included.
+    """
+    rng = np.random.default_rng(seed)
+    p = None if senior_share is None else [1 - senior_share, senior_share]
+    age_group = rng.choice(["Adult", "Senior"], n, p=p)
+    return pd.DataFrame({
+        "age_group": age_group,
+        "gender": rng.choice(["Female", "Male"], n),
+        "weekly_physical_activity": rng.choice(["No", "Yes"], n),
+        "bmi": rng.uniform(15, 60, n).round(1),
+        "blood_glucose_fasting": rng.uniform(70, 300, n).round(0),
+        "diabetic": rng.choice(["No", "Borderline", "Yes"], n),
+        "oral": rng.uniform(50, 500, n).round(0) + np.where(age_group == "Senior", senior_oral_shift, 0),
+        "insulin_level": rng.uniform(0.2, 90, n).round(2),
+    })
+
+
+@pytest.fixture
+def sample_data():
+    """Fixture to provide a small data set with the columns of data_train.csv"""
+    return make_sample_data()
+
+
+@pytest.fixture
+def sample_data_factory():
+    """Fixture to build data sets like `sample_data` with another size, seed, class balance or signal."""
+    return make_sample_data
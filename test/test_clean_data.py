@@ -0,0 +1,79 @@
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+import pandera as pa
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.clean_data import clean_data, read_raw, RAW_COLUMNS, CLEAN_COLUMNS
+from src.table_io import CATEGORY_LEVELS
+from src.validate_data import validate_data
+
+@pytest.fixture
+def raw_data():
+    """Fixture to provide rows in the layout of the raw NHANES file."""
+    return pd.DataFrame([
+        [73564.0, "Adult", 61.0, 2.0, 2.0, 35.7, 110.0, 2.0, 150.0, 14.91],
+        [73568.0, "Adult", 26.0, 1.0, 1.0, 20.3, 89.0, 3.0, 80.0, 3.85],
+        [73576.0, "Senior", 66.0, 1.0, 7.0, 23.2, 89.0, 1.0, 68.0, 6.14],
+        [73577.0, "Adult", 32.0, 2.0, 2.0, 28.9, np.nan, 2.0, 84.0, 16.15],
+    ], columns=RAW_COLUMNS)
+
+def test_clean_data_decodes_categories(raw_data):
+    """Test that clean_data decodes the categorical codes and drops identifiers."""
+    cleaned = clean_data(raw_data)
+    assert list(cleaned.columns) == [col for col in RAW_COLUMNS if col not in ("id", "age")]
+    assert cleaned["gender"].tolist() == ["Female", "Male", "Female"]
+    assert cleaned["weekly_physical_activity"].tolist() == ["No", "Yes", "No"]
+    assert cleaned["diabetic"].tolist() == ["No", "Borderline", "No"]
+
+def test_clean_data_drops_unknown_activity(raw_data):
+    """Test that rows with the 'unknown' physical activity code are removed, keeping the index."""
+    cleaned = clean_data(raw_data)
+    assert cleaned.index.tolist() == [0, 1, 3]
+
+def test_clean_data_in_chunks(raw_data):
+    """Test that cleaning chunk by chunk gives the same rows as cleaning the whole frame."""
+    chunks = [clean_data(raw_data.iloc[start:start + 2]) for start in range(0, len(raw_data), 2)]
+    pd.testing.assert_frame_equal(pd.concat(chunks), clean_data(raw_data))
+
+def test_clean_data_does_not_modify_input(raw_data):
+    """Test that the raw DataFrame is left unchanged."""
+    original = raw_data.copy()
+    clean_data(raw_data)
+    pd.testing.assert_frame_equal(raw_data, original)
+
+def test_clean_data_invalid_input():
+    """Test that clean_data raises TypeError for non-DataFrame input."""
+    with pytest.raises(TypeError, match="Input must be a pandas DataFrame"):
+        clean_data("not a dataframe")
+
+def test_clean_data_categorical_output(raw_data):
+    """Test that the decoded columns are categoricals with the storage levels, missing codes staying missing."""
+    raw_data.loc[1, "diabetic"] = np.nan
+    cleaned = clean_data(raw_data)
+    for col, levels in CATEGORY_LEVELS.items():
+        assert cleaned[col].cat.categories.tolist() == levels
+    assert cleaned["diabetic"].isna().tolist() == [False, True, False]
+    assert cleaned["bmi"].dtype == np.float64
+
+def test_clean_data_keeps_unknown_codes(raw_data):
+    """Test that a code outside the mapping is kept as an extra category, so that validation rejects it."""
+    raw_data.loc[0, "gender"] = 3.0
+    cleaned = clean_data(raw_data)
+    assert cleaned["gender"].cat.categories.tolist() == ["Female", "Male", 3.0]
+    assert cleaned["gender"].tolist() == [3.0, "Male", "Female"]
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_data(cleaned)
+
+def test_read_raw_skips_identifiers(raw_data, tmp_path):
+    """Test that read_raw parses only the kept columns, with their final types, whole or in chunks."""
+    path = tmp_path / "raw.csv"
+    raw_data.to_csv(path, index=False, header=[f"COL{i}" for i in range(len(RAW_COLUMNS))])
+    data = read_raw(path)
+    assert list(data.columns) == CLEAN_COLUMNS
+    assert data["age_group"].dtype == "category"
+    assert (data.drop(columns=["age_group"]).dtypes == np.float64).all()
+    pd.testing.assert_frame_equal(clean_data(data), clean_data(raw_data))
+    chunks = [clean_data(chunk) for chunk in read_raw(path, chunksize=3)]
+    pd.testing.assert_frame_equal(pd.concat(chunks), clean_data(raw_data))
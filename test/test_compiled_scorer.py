@@ -0,0 +1,108 @@
+import os
+import sys
+import pytest
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler, OrdinalEncoder, OneHotEncoder
+from sklearn.tree import DecisionTreeClassifier
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.compiled_scorer import CompiledScorer, compile_pipeline
+
+def make_preprocessor():
+    return make_column_transformer(
+        (StandardScaler(), ['bmi', 'blood_glucose_fasting', 'oral', 'insulin_level']),
+        (OrdinalEncoder(categories=[['No', 'Borderline', 'Yes']], dtype=int), ['diabetic']),
+        (make_pipeline(SimpleImputer(strategy='constant', fill_value='missing'),
+                       OneHotEncoder(handle_unknown='ignore', sparse_output=False)),
+         ['weekly_physical_activity', 'gender']),
+        ("drop", []),
+    )
+
+@pytest.fixture
+def fitted_model(sample_data):
+    """Fixture to provide a pipeline with the same structure as 06_model_fitting.py"""
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression(C=10, class_weight='balanced'))
+    return pipe.fit(sample_data.drop(columns=["age_group"]), sample_data["age_group"])
+
+def test_compile_returns_scorer(fitted_model):
+    """Test that compile_pipeline builds a scorer over all input columns."""
+    scorer = compile_pipeline(fitted_model)
+    assert isinstance(scorer, CompiledScorer)
+    assert list(scorer.classes_) == ["Adult", "Senior"]
+    assert set(scorer.feature_names_in_) == set(fitted_model.feature_names_in_)
+
+def test_predict_proba_dataframe(fitted_model, sample_data):
+    """Test that a batch of rows reproduces the pipeline's predict_proba and predict."""
+    scorer = compile_pipeline(fitted_model)
+    X = sample_data.drop(columns=["age_group"])
+    np.testing.assert_allclose(scorer.predict_proba(X), fitted_model.predict_proba(X), rtol=1e-10, atol=1e-12)
+    np.testing.assert_array_equal(scorer.predict(X), fitted_model.predict(X))
+
+def test_predict_proba_single_dict(fitted_model, sample_data):
+    """Test that a single dict record matches the pipeline."""
+    scorer = compile_pipeline(fitted_model)
+    X = sample_data.drop(columns=["age_group"])
+    for i in range(5):
+        record = X.iloc[i].to_dict()
+        np.testing.assert_allclose(scorer.predict_proba(record), fitted_model.predict_proba(X.iloc[[i]]),
+                                   rtol=1e-10, atol=1e-12)
+
+def test_predict_proba_records_and_structured_array(fitted_model, sample_data):
+    """Test that a list of dicts and a NumPy structured array give the same result."""
+    scorer = compile_pipeline(fitted_model)
+    X = sample_data.drop(columns=["age_group"])
+    expected = fitted_model.predict_proba(X)
+    np.testing.assert_allclose(scorer.predict_proba(X.to_dict(orient="records")), expected, rtol=1e-10)
+    structured = X.to_records(index=False)
+    np.testing.assert_allclose(scorer.predict_proba(structured), expected, rtol=1e-10)
+
+def test_missing_and_unknown_one_hot_values(fitted_model, sample_data):
+    """Test that missing and unseen one-hot values behave like the imputer and handle_unknown='ignore'."""
+    scorer = compile_pipeline(fitted_model)
+    X = sample_data.drop(columns=["age_group"]).head(4).copy()
+    X["gender"] = [None, np.nan, "Other", "Male"]
+    np.testing.assert_allclose(scorer.predict_proba(X), fitted_model.predict_proba(X), rtol=1e-10)
+    record = X.iloc[0].to_dict()
+    np.testing.assert_allclose(scorer.predict_proba(record), fitted_model.predict_proba(X.iloc[[0]]), rtol=1e-10)
+
+def test_unknown_ordinal_value(fitted_model, sample_data):
+    """Test that an unseen ordinal category raises ValueError, as the pipeline does."""
+    scorer = compile_pipeline(fitted_model)
+    X = sample_data.drop(columns=["age_group"]).head(3).copy()
+    X.loc[X.index[1], "diabetic"] = "Sometimes"
+    with pytest.raises(ValueError, match="not seen during fit"):
+        scorer.predict_proba(X)
+    with pytest.raises(ValueError, match="not seen during fit"):
+        scorer.predict_proba(X.iloc[1].to_dict())
+
+def test_missing_numeric_value(fitted_model, sample_data):
+    """Test that a missing numeric value raises ValueError."""
+    scorer = compile_pipeline(fitted_model)
+    X = sample_data.drop(columns=["age_group"]).head(3).copy()
+    X.loc[X.index[0], "bmi"] = np.nan
+    with pytest.raises(ValueError, match="Missing value in numeric feature 'bmi'"):
+        scorer.predict_proba(X)
+    with pytest.raises(ValueError, match="Missing value in numeric feature 'bmi'"):
+        scorer.predict_proba(X.iloc[0].to_dict())
+
+def test_unsupported_classifier(sample_data):
+    """Test that compile_pipeline raises ValueError for a non-linear classifier."""
+    pipe = make_pipeline(make_preprocessor(), DecisionTreeClassifier())
+    pipe.fit(sample_data.drop(columns=["age_group"]), sample_data["age_group"])
+    with pytest.raises(ValueError, match="Cannot compile pipeline"):
+        compile_pipeline(pipe)
+
+def test_imputed_numeric_value(sample_data):
+    """Test that a pipeline imputing numeric values is compiled, and imputes records with missing values."""
+    from src.make_preprocessor import make_preprocessor as make_imputing_preprocessor
+    X, y = sample_data.drop(columns=["age_group"]), sample_data["age_group"]
+    pipe = make_pipeline(make_imputing_preprocessor(), LogisticRegression(C=10, class_weight='balanced')).fit(X, y)
+    scorer = compile_pipeline(pipe)
+    X = X.head(20).copy()
+    X.loc[X.index[:5], "bmi"] = np.nan
+    X.loc[X.index[3:8], "oral"] = np.nan
+    np.testing.assert_allclose(scorer.predict_proba(X), pipe.predict_proba(X), rtol=1e-9)
+    np.testing.assert_allclose(scorer.predict_proba(X.iloc[0].to_dict())[0], pipe.predict_proba(X.head(1))[0], rtol=1e-9)
@@ -0,0 +1,131 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.tree import DecisionTreeClassifier
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.correlation_checks import (predictive_power_score, feature_label_pps, feature_feature_correlation,
+                                    correlation_ratio, cramers_v, _weighted_f1, _stratified_folds, _fit_predict)
+
+@pytest.fixture(scope="module")
+def survey():
+    """Fixture to provide NHANES-like data with one informative feature per type."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    age_group = rng.choice(["Adult", "Senior"], n, p=[0.8, 0.2])
+    senior = age_group == "Senior"
+    bmi = np.round(rng.normal(27, 5, n), 1)
+    return pd.DataFrame({
+        "age_group": age_group,
+        "gender": rng.choice(["Female", "Male"], n),
+        "diabetic": np.where(senior & (rng.random(n) < 0.7), "Yes", rng.choice(["No", "Yes"], n, p=[0.9, 0.1])),
+        "bmi": bmi,
+        "blood_glucose_fasting": np.round(90 + 0.8 * bmi + rng.normal(0, 8, n) + 10 * senior),
+        "oral": np.round(np.where(senior, rng.normal(160, 20, n), rng.normal(110, 20, n))),
+        "insulin_level": np.round(np.exp(rng.normal(2, 0.5, n)), 2),
+    })
+
+def test_weighted_f1_matches_sklearn():
+    """Test that _weighted_f1 agrees with sklearn's weighted F1 score."""
+    rng = np.random.default_rng(1)
+    y_true, y_pred = rng.integers(0, 3, 500), rng.integers(0, 3, 500)
+    assert _weighted_f1(y_true, y_pred, 3) == pytest.approx(f1_score(y_true, y_pred, average="weighted"))
+    assert _weighted_f1(y_true, np.zeros(500, dtype=int), 3) == pytest.approx(
+        f1_score(y_true, np.zeros(500, dtype=int), average="weighted", zero_division=0))
+
+def test_stratified_folds_match_sklearn():
+    """Test that _stratified_folds assigns rows to the same folds as StratifiedKFold."""
+    y = np.random.default_rng(2).choice(3, 101, p=[0.6, 0.3, 0.1])
+    folds = _stratified_folds(y, 3, 4)
+    for fold, (_, test) in enumerate(StratifiedKFold(4).split(np.zeros(len(y)), y)):
+        assert np.array_equal(np.flatnonzero(folds == fold), test)
+
+def test_fit_predict_matches_decision_tree():
+    """Test that _fit_predict predicts like a fully grown decision tree on distinct test values."""
+    rng = np.random.default_rng(3)
+    x_train = np.round(rng.normal(0, 1, 300), 1)
+    y_train = (x_train + rng.normal(0, 1, 300) > 0).astype(int)
+    x_test = np.round(rng.normal(0, 1, 200), 2) + 0.001
+    tree = DecisionTreeClassifier(random_state=0).fit(x_train[:, None], y_train)
+    assert np.array_equal(_fit_predict(x_train, y_train, x_test, 2, False), tree.predict(x_test[:, None]))
+
+def test_predictive_power_score_bounds(survey):
+    """Test that the score lies within its confidence bounds and that uninformative features score near 0."""
+    pps, lower, upper = predictive_power_score(survey["oral"], survey["age_group"], random_state=0)
+    assert 0 < lower <= pps <= upper <= 1
+    assert predictive_power_score(survey["gender"], survey["age_group"], random_state=0)[0] < 0.05
+
+def test_predictive_power_score_perfect_and_special_cases(survey):
+    """Test a feature that determines the label, a constant label, an identifier and rare classes."""
+    label = survey["age_group"]
+    assert predictive_power_score(label.map({"Adult": 1.0, "Senior": 2.0}), label)[0] == 1
+    assert predictive_power_score(survey["bmi"], pd.Series("Adult", index=survey.index)) == (0, 0, 0)
+    assert predictive_power_score(survey.index.astype(str).to_series(index=survey.index), label) == (0, 0, 0)
+    rare = pd.Series(["a", "a", "a", "b", "b", "b"])
+    assert predictive_power_score(rare, rare) == (0, 0, 0)
+
+def test_feature_label_pps(survey):
+    """Test that feature_label_pps scores every feature, highest first, and is reproducible in parallel."""
+    scores = feature_label_pps(survey, "age_group", random_state=0)
+    assert set(scores.index) == set(survey.columns) - {"age_group"}
+    assert list(scores.columns) == ["pps", "lower", "upper"]
+    assert scores.index[0] == "oral"
+    assert scores["pps"].is_monotonic_decreasing
+    pd.testing.assert_frame_equal(scores, feature_label_pps(survey, "age_group", random_state=0, n_jobs=2))
+
+def test_feature_label_pps_missing_label(survey):
+    """Test that feature_label_pps raises an error when the label is missing."""
+    with pytest.raises(ValueError, match="Label column 'age' is not in the data"):
+        feature_label_pps(survey, "age")
+
+def test_feature_feature_correlation_numeric(survey):
+    """Test Spearman and Pearson coefficients and their bounds against pandas."""
+    numeric = survey.select_dtypes("number")
+    for method in ["spearman", "pearson"]:
+        pairs = feature_feature_correlation(survey, method=method).set_index(["feature_1", "feature_2"])
+        expected = numeric.corr(method=method)
+        assert len(pairs) == 6
+        for (first, second), row in pairs.iterrows():
+            assert row["correlation"] == pytest.approx(expected.loc[first, second])
+            assert row["lower"] < row["correlation"] < row["upper"]
+
+def test_feature_feature_correlation_with_missing_values(survey):
+    """Test that missing values are dropped pair by pair."""
+    data = survey.copy()
+    data.loc[:99, "bmi"] = np.nan
+    pairs = feature_feature_correlation(data).set_index(["feature_1", "feature_2"])
+    assert pairs.loc[("bmi", "oral"), "n"] == len(data) - 100
+    assert pairs.loc[("oral", "insulin_level"), "n"] == len(data)
+    assert pairs.loc[("bmi", "oral"), "correlation"] == pytest.approx(data[["bmi", "oral"]].corr("spearman").iloc[0, 1])
+
+def test_feature_feature_correlation_categorical(survey):
+    """Test the correlation ratio and Cramér's V for pairs with categorical features."""
+    pairs = feature_feature_correlation(survey, cat_features=["gender", "diabetic"])
+    measures = pairs.groupby("measure").size()
+    assert measures.to_dict() == {"correlation_ratio": 8, "cramers_v": 1, "spearman": 6}
+    assert pairs["correlation"].between(-1, 1).all()
+    assert cramers_v(survey["gender"], survey["gender"]) == pytest.approx(1)
+    assert correlation_ratio(survey["gender"], survey["bmi"]) < 0.1
+    assert correlation_ratio(survey["age_group"], survey["oral"]) > 0.5
+
+def test_feature_feature_correlation_invalid_method(survey):
+    """Test that an unsupported method raises an error."""
+    with pytest.raises(ValueError, match="method must be one of"):
+        feature_feature_correlation(survey, method="kendall")
+
+def test_agreement_with_deepchecks(survey):
+    """Test that the scores agree with Deepchecks: Spearman exactly, PPS within sampling noise."""
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
+    dataset = Dataset(survey, label="age_group", cat_features=[])
+
+    expected = FeatureFeatureCorrelation().run(dataset).value
+    for _, row in feature_feature_correlation(survey.drop(columns="age_group")).iterrows():
+        assert row["correlation"] == pytest.approx(expected.loc[row["feature_1"], row["feature_2"]])
+
+    expected = pd.Series(FeatureLabelCorrelation(random_state=0).run(dataset).value)
+    scores = feature_label_pps(survey, "age_group", random_state=0)["pps"]
+    assert (scores - expected[scores.index]).abs().max() < 0.05
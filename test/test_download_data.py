@@ -0,0 +1,140 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import src.download_data
+from src.download_data import file_sha256, load_manifest, download_file, extract_members
+
+def make_archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_ref:
+        zip_ref.writestr("NHANES_age_prediction.csv", os.urandom(1 << 19))
+        zip_ref.writestr("README.txt", "not needed")
+    return buffer.getvalue()
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    """Serve the archive with range support; the first `drops` responses stop halfway through."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("Range"))
+        start = 0
+        if self.headers.get("Range") and server.ranges:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(server.archive):
+                self.send_response(416)
+                self.end_headers()
+                return
+        body = server.archive[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if server.drops:
+            server.drops -= 1
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    """Fixture to provide a local HTTP server serving a zip archive at /data.zip."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ArchiveHandler)
+    httpd.archive, httpd.requests, httpd.drops, httpd.ranges = make_archive(), [], 0, True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/data.zip"
+    httpd.sha256 = hashlib.sha256(httpd.archive).hexdigest()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Fixture to skip the pause between retries."""
+    monkeypatch.setattr(src.download_data.time, "sleep", lambda seconds: None)
+
+def test_download_file(server, tmp_path):
+    """Test that the archive is downloaded and verified, and not downloaded again once cached."""
+    path = str(tmp_path / "data.zip")
+    assert download_file(server.url, path, server.sha256)
+    assert file_sha256(path) == server.sha256
+    assert not os.path.exists(path + ".part")
+    assert not download_file(server.url, path, server.sha256)
+    assert server.requests == [None]
+
+def test_download_file_resumes_after_drop(server, tmp_path):
+    """Test that an interrupted transfer is resumed with a range request for the missing bytes."""
+    server.drops = 1
+    path = str(tmp_path / "data.zip")
+    assert download_file(server.url, path, server.sha256)
+    assert file_sha256(path) == server.sha256
+    assert server.requests[0] is None
+    # Only the bytes of the chunks read in full before the drop are kept
+    resumed_from = int(server.requests[1].split("=")[1].rstrip("-"))
+    assert 0 < resumed_from <= len(server.archive) // 2
+
+def test_download_file_resumes_partial_file(server, tmp_path):
+    """Test that a partial file left by an earlier run is completed, or restarted if ranges are ignored."""
+    path = str(tmp_path / "data.zip")
+    with open(path + ".part", 'wb') as f:
+        f.write(server.archive[:100])
+    assert download_file(server.url, path, server.sha256)
+    assert server.requests == ["bytes=100-"]
+
+    os.remove(path)
+    with open(path + ".part", 'wb') as f:
+        f.write(server.archive[:100])
+    server.ranges = False
+    assert download_file(server.url, path, server.sha256)
+    assert file_sha256(path) == server.sha256
+
+def test_download_file_checksum_mismatch(server, tmp_path):
+    """Test that a file with the wrong digest is removed and raises ValueError."""
+    path = str(tmp_path / "data.zip")
+    with pytest.raises(ValueError, match="SHA-256 of"):
+        download_file(server.url, path, "0" * 64)
+    assert not os.path.exists(path) and not os.path.exists(path + ".part")
+
+def test_download_file_gives_up(server, tmp_path):
+    """Test that the connection error is raised once the retries are used up."""
+    server.drops = 10
+    with pytest.raises(requests.RequestException):
+        download_file(server.url, str(tmp_path / "data.zip"), server.sha256, retries=2)
+    assert len(server.requests) == 3
+
+def test_extract_members(server, tmp_path):
+    """Test that only the listed members are extracted, and a missing member raises ValueError."""
+    path = tmp_path / "data.zip"
+    path.write_bytes(server.archive)
+    extracted = extract_members(str(path), ["NHANES_age_prediction.csv"], str(tmp_path))
+    assert extracted == [str(tmp_path / "NHANES_age_prediction.csv")]
+    assert not (tmp_path / "README.txt").exists()
+    with pytest.raises(ValueError, match="has no members"):
+        extract_members(str(path), ["missing.csv"], str(tmp_path))
+
+def test_load_manifest(tmp_path):
+    """Test that the archive's entry is returned and a missing entry raises ValueError."""
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"data.zip": {"sha256": "AB" * 32, "members": ["a.csv"]}}))
+    assert load_manifest(str(path), "data.zip") == {"sha256": "ab" * 32, "members": ["a.csv"]}
+    with pytest.raises(ValueError, match="is not in the manifest"):
+        load_manifest(str(path), "other.zip")
+    with pytest.raises(FileNotFoundError):
+        load_manifest(str(tmp_path / "missing.json"), "data.zip")
+
+def test_repository_manifest():
+    """Test that the repository's manifest matches the committed archive."""
+    root = os.path.join(os.path.dirname(__file__), '..')
+    entry = load_manifest(os.path.join(root, "data", "download_manifest.json"), "data.zip")
+    assert file_sha256(os.path.join(root, "data", "raw", "data.zip")) == entry["sha256"]
@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.eda_summary import (KLLSketch, summarize_frame, summarize_table, save_summary, load_summary,
+                             format_summary)
+
+@pytest.fixture
+def data():
+    """Fixture to provide a data set with missing values in numeric and categorical columns."""
+    rng = np.random.default_rng(22)
+    n = 1000
+    data = pd.DataFrame({
+        "age_group": rng.choice(["Adult", "Senior"], n, p=[0.8, 0.2]),
+        "gender": rng.choice(["Female", "Male"], n),
+        "bmi": rng.normal(27, 5, n),
+        "oral": rng.gamma(4, 30, n),
+        "insulin_level": rng.lognormal(2, 0.5, n),
+    })
+    data.loc[rng.choice(n, 50, replace=False), "bmi"] = np.nan
+    data.loc[rng.choice(n, 80, replace=False), "oral"] = np.nan
+    data.loc[rng.choice(n, 20, replace=False), "gender"] = np.nan
+    return data
+
+def test_summary_matches_pandas(data, tmp_path):
+    """Test that the merged chunk summaries match describe, corr and value_counts on the whole table."""
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    content = summarize_table(str(path), chunksize=128, max_workers=1).to_dict()
+    described = data.describe()
+    assert content["n_rows"] == len(data)
+    for col in ["bmi", "oral", "insulin_level"]:
+        stats = content["columns"][col]
+        assert stats["count"] == described.loc["count", col]
+        assert stats["null_rate"] == pytest.approx(data[col].isna().mean())
+        for key in ["mean", "std", "min", "max"]:
+            assert stats[key] == pytest.approx(described.loc[key, col], rel=1e-12)
+    for col in ["age_group", "gender"]:
+        assert content["columns"][col]["frequencies"] == data[col].value_counts().to_dict()
+        assert content["columns"][col]["count"] == data[col].notna().sum()
+    expected = data.select_dtypes('number').corr()
+    assert content["correlation"]["columns"] == expected.columns.tolist()
+    np.testing.assert_allclose(content["correlation"]["values"], expected.to_numpy(), atol=1e-12)
+
+def test_summary_does_not_depend_on_workers(data, tmp_path):
+    """Test that summarising chunks in worker processes gives exactly the serial summary."""
+    path = tmp_path / "data.parquet"
+    data.to_parquet(path, index=False)
+    serial = summarize_table(str(path), chunksize=100, max_workers=1).to_dict()
+    parallel = summarize_table(str(path), chunksize=100, max_workers=2).to_dict()
+    assert json.dumps(serial) == json.dumps(parallel)
+
+def test_merge_requires_same_columns(data):
+    """Test that summaries of different columns cannot be merged."""
+    with pytest.raises(ValueError, match="same numeric and categorical columns"):
+        summarize_frame(data).merge(summarize_frame(data.drop(columns=["oral"])))
+
+def test_all_missing_chunk_stays_categorical(tmp_path):
+    """Test that a chunk in which a categorical column is all missing is still summarised as categorical."""
+    data = pd.DataFrame({"gender": ["Female", "Male"] + [None] * 4, "bmi": np.arange(6.0)})
+    data.to_csv(tmp_path / "data.csv", index=False)
+    content = summarize_table(str(tmp_path / "data.csv"), chunksize=2, max_workers=1).to_dict()
+    assert content["columns"]["gender"] == {"type": "categorical", "count": 2, "null_rate": pytest.approx(4 / 6),
+                                            "frequencies": {"Female": 1, "Male": 1}}
+
+def test_kll_quantiles_within_rank_error():
+    """Test that merged sketches of a large sample stay small and estimate quantiles within their rank error."""
+    values = np.random.default_rng(0).standard_normal(200_000)
+    sketches = [KLLSketch(seed=i) for i in range(4)]
+    for i, chunk in enumerate(np.array_split(values, 40)):
+        sketches[i % 4].update(chunk)
+    for sketch in sketches[1:]:
+        sketches[0].merge(sketch)
+    qs = np.array([0.01, 0.25, 0.5, 0.75, 0.99])
+    ranks = np.searchsorted(np.sort(values), sketches[0].quantile(qs)) / len(values)
+    assert sketches[0].count == len(values)
+    assert sum(len(level) for level in sketches[0].levels) < 1000
+    assert np.abs(ranks - qs).max() < 0.02
+
+def test_kll_exact_before_compaction():
+    """Test that a sketch holding every value gives the quantiles of numpy.quantile."""
+    sketch = KLLSketch()
+    sketch.update([3.0, 1.0, np.nan, 2.0, 10.0])
+    assert sketch.count == 4
+    np.testing.assert_allclose(sketch.quantile([0, 0.5, 0.9]), np.quantile([1.0, 2.0, 3.0, 10.0], [0, 0.5, 0.9]))
+    assert np.isnan(KLLSketch().quantile([0.5])).all()
+
+def test_save_and_load_summary(data, tmp_path):
+    """Test that a saved summary round-trips through JSON and has one table row per column."""
+    summary = summarize_frame(data)
+    content = save_summary(summary, str(tmp_path))
+    assert load_summary(str(tmp_path / "eda_summary.json")) == json.loads(json.dumps(content))
+    table = pd.read_parquet(tmp_path / "eda_summary.parquet")
+    assert table["column"].tolist() == ["bmi", "oral", "insulin_level", "age_group", "gender"]
+    assert table.set_index("column").loc["gender", "top"] == data["gender"].value_counts().index[0]
+    assert "Value counts for age_group" in format_summary(content)
+
+def test_missing_inputs(tmp_path):
+    """Test the errors for an empty table and missing directories and files."""
+    pd.DataFrame({"bmi": []}).to_csv(tmp_path / "empty.csv", index=False)
+    with pytest.raises(ValueError, match="must contain observations"):
+        summarize_table(str(tmp_path / "empty.csv"))
+    with pytest.raises(FileNotFoundError):
+        save_summary(summarize_frame(pd.DataFrame({"bmi": [1.0]})), str(tmp_path / "missing"))
+    with pytest.raises(FileNotFoundError):
+        load_summary(str(tmp_path / "missing.json"))
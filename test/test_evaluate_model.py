@@ -0,0 +1,89 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.calibration import calibration_curve
+from sklearn.metrics import brier_score_loss, classification_report, confusion_matrix, roc_auc_score
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.evaluate_model import evaluate_proba, bootstrap_metrics
+
+CLASSES = np.array(["Adult", "Senior"], dtype=object)
+
+@pytest.fixture
+def predictions():
+    """Fixture for labels and probabilities of an imperfect binary classifier, with tied scores."""
+    rng = np.random.default_rng(0)
+    y = np.where(rng.random(400) < 0.2, "Senior", "Adult")
+    senior = np.clip(0.35 * (y == "Senior") + rng.random(400) * 0.65, 0, 1).round(2)
+    return y, np.column_stack([1 - senior, senior])
+
+def test_evaluate_proba_matches_sklearn(predictions):
+    """Test that the tables and scores agree with scikit-learn's metrics."""
+    y, proba = predictions
+    y_pred = CLASSES[proba.argmax(axis=1)]
+    scores = evaluate_proba(y, proba, CLASSES)
+
+    np.testing.assert_array_equal(scores.confusion_matrix.to_numpy(), confusion_matrix(y, y_pred))
+    assert list(scores.confusion_matrix.index) == list(CLASSES)
+    expected = pd.DataFrame(classification_report(y, y_pred, output_dict=True)).transpose()
+    pd.testing.assert_frame_equal(scores.report, expected, check_exact=False, rtol=1e-12)
+    assert scores.roc_auc == pytest.approx(roc_auc_score(y == "Senior", proba[:, 1]))
+    assert scores.brier == pytest.approx(brier_score_loss(y == "Senior", proba[:, 1]))
+
+    fraction, mean_predicted = calibration_curve(y == "Senior", proba[:, 1], n_bins=10)
+    np.testing.assert_allclose(scores.calibration["fraction_positive"], fraction)
+    np.testing.assert_allclose(scores.calibration["mean_predicted"], mean_predicted)
+    assert scores.calibration["count"].sum() == len(y)
+
+def test_evaluate_proba_undefined_precision():
+    """Test that a class that is never predicted scores 0, as in scikit-learn."""
+    y = np.array(["Adult", "Senior", "Adult", "Senior"])
+    proba = np.array([[0.9, 0.1], [0.6, 0.4], [0.7, 0.3], [0.8, 0.2]])
+    report = evaluate_proba(y, proba, CLASSES).report
+    assert report.loc["Senior", "precision"] == 0.0 and report.loc["Senior", "f1-score"] == 0.0
+    assert report.loc["accuracy", "precision"] == 0.5
+
+def test_evaluate_proba_invalid_input(predictions):
+    """Test that unknown labels and mismatched probability columns raise ValueError."""
+    y, proba = predictions
+    with pytest.raises(ValueError, match="not among the classes"):
+        evaluate_proba(np.where(y == "Adult", "Child", y), proba, CLASSES)
+    with pytest.raises(ValueError, match="one column per class"):
+        evaluate_proba(y, proba[:, :1], CLASSES)
+
+def test_bootstrap_metrics_matches_resampling(predictions):
+    """Test that each resample scores as the metrics of the rows it draws."""
+    y, proba = predictions
+    intervals = bootstrap_metrics(y, proba, CLASSES, n_resamples=300, random_state=1)
+    assert intervals.loc["roc_auc", "estimate"] == pytest.approx(roc_auc_score(y == "Senior", proba[:, 1]))
+    assert (intervals["lower"] <= intervals["estimate"]).all()
+    assert (intervals["estimate"] <= intervals["upper"]).all()
+    assert intervals.loc["Senior recall", "upper"] > intervals.loc["Senior recall", "lower"]
+
+    # A naive bootstrap of scikit-learn's ROC-AUC gives a similar interval
+    rng = np.random.default_rng(1)
+    aucs = []
+    for _ in range(300):
+        rows = rng.integers(0, len(y), len(y))
+        aucs.append(roc_auc_score(y[rows] == "Senior", proba[rows, 1]))
+    lower, upper = np.percentile(aucs, [2.5, 97.5])
+    assert intervals.loc["roc_auc", "lower"] == pytest.approx(lower, abs=0.03)
+    assert intervals.loc["roc_auc", "upper"] == pytest.approx(upper, abs=0.03)
+
+def test_bootstrap_metrics_reproducible(predictions):
+    """Test that the intervals depend on the seed but not on the number of jobs."""
+    y, proba = predictions
+    serial = bootstrap_metrics(y, proba, CLASSES, n_resamples=600, n_jobs=None)
+    parallel = bootstrap_metrics(y, proba, CLASSES, n_resamples=600, n_jobs=2)
+    pd.testing.assert_frame_equal(serial, parallel)
+    other = bootstrap_metrics(y, proba, CLASSES, n_resamples=600, random_state=7)
+    assert not serial.equals(other)
+
+def test_bootstrap_metrics_invalid_arguments(predictions):
+    """Test that invalid resample counts and confidence levels raise ValueError."""
+    y, proba = predictions
+    with pytest.raises(ValueError, match="positive integer"):
+        bootstrap_metrics(y, proba, CLASSES, n_resamples=0)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        bootstrap_metrics(y, proba, CLASSES, confidence=1.5)
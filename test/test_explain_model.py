@@ -0,0 +1,74 @@
+import os
+import sys
+import numpy as np
+import pytest
+from sklearn.inspection import permutation_importance as sklearn_permutation_importance
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.explain_model import permutation_importance, importance_table, linear_contributions
+from src.make_preprocessor import make_preprocessor, TARGET
+
+@pytest.fixture
+def sample_data(sample_data_factory):
+    """Fixture to provide a data set where Seniors have higher oral values"""
+    return sample_data_factory(120, seed=23, senior_oral_shift=150)
+
+@pytest.fixture
+def pipe(sample_data):
+    """Fixture for the pipeline fitted on the sample data."""
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression(max_iter=2000, class_weight='balanced'))
+    return pipe.fit(sample_data.drop(columns=[TARGET]), sample_data[TARGET])
+
+@pytest.mark.parametrize("scoring", ["accuracy", "balanced_accuracy", "roc_auc", "neg_log_loss"])
+def test_matches_sklearn(pipe, sample_data, scoring):
+    """Test that the stacked permutation importances are those of scikit-learn with the same seed."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    expected = sklearn_permutation_importance(pipe, X, y, scoring=scoring, n_repeats=4, random_state=7)
+    result = permutation_importance(pipe, X, y, scoring=scoring, n_repeats=4, random_state=7)
+    np.testing.assert_allclose(result.importances, expected.importances, atol=1e-12)
+    np.testing.assert_allclose(result.importances_mean, expected.importances_mean, atol=1e-12)
+    np.testing.assert_allclose(result.importances_std, expected.importances_std, atol=1e-12)
+
+def test_batches_and_workers_do_not_change_result(pipe, sample_data, monkeypatch):
+    """Test that splitting the repeats into several batches on workers gives the same importances."""
+    import src.explain_model
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    single = permutation_importance(pipe, X, y, n_repeats=5, random_state=0)
+    monkeypatch.setattr(src.explain_model, "MAX_STACKED_ROWS", 2 * X.size)
+    split = permutation_importance(pipe, X, y, n_repeats=5, random_state=0, n_jobs=2)
+    np.testing.assert_array_equal(single.importances, split.importances)
+
+def test_importance_table(pipe, sample_data):
+    """Test that the table lists every column once, most important first, with one column per repeat."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    table = importance_table(permutation_importance(pipe, X, y, n_repeats=3, random_state=0), X.columns.tolist())
+    assert sorted(table.index) == sorted(X.columns)
+    assert table.index[0] == "oral"
+    assert table.columns.tolist() == ["importance_mean", "importance_std", "repeat_0", "repeat_1", "repeat_2"]
+    assert table["importance_mean"].is_monotonic_decreasing
+
+def test_linear_contributions_add_up(pipe, sample_data):
+    """Test that the contributions of the input columns and the intercept add up to the decision function."""
+    X = sample_data.drop(columns=[TARGET]).iloc[10:40]
+    contributions = linear_contributions(pipe, X)
+    assert contributions.columns.tolist() == ["bmi", "blood_glucose_fasting", "oral", "insulin_level", "diabetic",
+                                              "weekly_physical_activity", "gender", "intercept"]
+    assert contributions.index.equals(X.index)
+    np.testing.assert_allclose(contributions.sum(axis=1), pipe.decision_function(X), rtol=1e-12)
+    # A one-hot encoded column contributes the coefficient of its category
+    coef = dict(zip(pipe[0].get_feature_names_out(), pipe[-1].coef_.ravel()))
+    expected = [coef[f"pipeline-2__gender_{value}"] for value in X["gender"]]
+    np.testing.assert_allclose(contributions["gender"], expected)
+
+def test_invalid_arguments(pipe, sample_data):
+    """Test the errors for an unknown scoring, no repeats and a pipeline without a linear classifier."""
+    from sklearn.ensemble import RandomForestClassifier
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    with pytest.raises(ValueError, match="scoring must be one of"):
+        permutation_importance(pipe, X, y, scoring="f1")
+    with pytest.raises(ValueError, match="n_repeats"):
+        permutation_importance(pipe, X, y, n_repeats=0)
+    forest = make_pipeline(make_preprocessor(), RandomForestClassifier(n_estimators=5)).fit(X, y)
+    with pytest.raises(ValueError, match="binary linear classifier"):
+        linear_contributions(forest, X)
@@ -0,0 +1,101 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_store import materialize_features, FeatureStore, MANIFEST_FILENAME
+from src.make_preprocessor import make_preprocessor, TARGET
+
+def make_data(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age_group": rng.choice(["Adult", "Senior"], n, p=[0.7, 0.3]),
+        "gender": rng.choice(["Female", "Male"], n),
+        "weekly_physical_activity": rng.choice(["No", "Yes"], n),
+        "bmi": rng.uniform(15, 60, n).round(1),
+        "blood_glucose_fasting": rng.uniform(70, 300, n).round(0),
+        "diabetic": rng.choice(["No", "Borderline", "Yes"], n),
+        "oral": rng.uniform(50, 500, n).round(0),
+        "insulin_level": rng.uniform(0.2, 90, n).round(2),
+    })
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture to provide training and test data and their materialised features with 4 folds."""
+    data_train, data_test = make_data(120, 1), make_data(40, 2)
+    return data_train, data_test, materialize_features(data_train, data_test, str(tmp_path / "features"), folds=4)
+
+def test_fold_matrices(store):
+    """Test that each fold holds its rows transformed by a preprocessor fitted on the fold's training rows."""
+    data_train, _, features = store
+    X, y = data_train.drop(columns=[TARGET]), data_train[TARGET]
+    assert features.n_folds == 4
+    assert list(features.classes_) == ["Adult", "Senior"]
+    for k, (train, valid) in enumerate(StratifiedKFold(n_splits=4).split(X, y)):
+        X_train, y_train, X_valid, y_valid = features.fold(k)
+        assert isinstance(X_train, np.memmap) and X_train.dtype == np.float32
+        preprocessor = make_preprocessor().fit(X.iloc[train])
+        np.testing.assert_allclose(X_train, preprocessor.transform(X.iloc[train]), rtol=1e-6)
+        np.testing.assert_allclose(X_valid, preprocessor.transform(X.iloc[valid]), rtol=1e-6)
+        assert list(y_train) == list(y.iloc[train]) and list(y_valid) == list(y.iloc[valid])
+    with pytest.raises(ValueError, match="Fold must be between 0 and 3"):
+        features.fold(4)
+
+def test_train_test_matrices(store):
+    """Test that the full matrices use the preprocessor fitted on all the training data, which is saved."""
+    data_train, data_test, features = store
+    preprocessor = make_preprocessor().fit(data_train.drop(columns=[TARGET]))
+    X_test, y_test = features.test()
+    np.testing.assert_allclose(X_test, preprocessor.transform(data_test.drop(columns=[TARGET])), rtol=1e-6)
+    assert list(y_test) == list(data_test[TARGET])
+    X_train, _ = features.train()
+    np.testing.assert_array_equal(features.preprocessor().transform(data_train.drop(columns=[TARGET])).astype(np.float32),
+                                  X_train)
+    assert features.feature_names == list(preprocessor.get_feature_names_out())
+
+def test_float32_scores(store):
+    """Test that a classifier fitted on the float32 matrices predicts like the float64 pipeline, to float32 rounding."""
+    data_train, data_test, features = store
+    classifier = LogisticRegression(max_iter=2000, class_weight='balanced')
+    pipe = make_pipeline(make_preprocessor(), classifier).fit(data_train.drop(columns=[TARGET]), data_train[TARGET])
+    X_train, y_train = features.train()
+    X_test, _ = features.test()
+    on_features = LogisticRegression(max_iter=2000, class_weight='balanced').fit(X_train, y_train)
+    np.testing.assert_allclose(on_features.predict_proba(X_test),
+                               pipe.predict_proba(data_test.drop(columns=[TARGET])), rtol=1e-5)
+
+def test_check_preprocessor(store):
+    """Test that a preprocessor fitted on other data is detected."""
+    data_train, data_test, features = store
+    features.check_preprocessor(features.preprocessor(), data_test)
+    other = make_preprocessor().fit(make_data(50, 3).drop(columns=[TARGET]))
+    with pytest.raises(ValueError, match="were not made with this preprocessor"):
+        features.check_preprocessor(other, data_test)
+
+def test_predefined_folds(tmp_path):
+    """Test that given folds are used as they are, and invalid ones are rejected."""
+    data_train, data_test = make_data(30, 1), make_data(10, 2)
+    folds = np.arange(30) % 3
+    features = materialize_features(data_train, data_test, str(tmp_path / "features"), folds=folds)
+    np.testing.assert_array_equal(features.folds(), folds)
+    assert len(features.fold(1)[2]) == 10
+    with pytest.raises(ValueError, match="folds has 29 entries"):
+        materialize_features(data_train, data_test, str(tmp_path / "bad"), folds=folds[:29])
+    with pytest.raises(ValueError, match="at least two folds"):
+        materialize_features(data_train, data_test, str(tmp_path / "bad"), folds=np.zeros(30))
+    assert not os.path.exists(tmp_path / "bad.tmp")
+
+def test_invalid_store(tmp_path, store):
+    """Test that a missing or foreign directory is rejected."""
+    with pytest.raises(FileNotFoundError):
+        FeatureStore(str(tmp_path / "missing"))
+    path = store[2].path
+    with open(os.path.join(path, MANIFEST_FILENAME), 'w') as f:
+        json.dump({"format": "other"}, f)
+    with pytest.raises(ValueError, match="is not a feature store"):
+        FeatureStore(path)
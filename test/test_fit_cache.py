@@ -0,0 +1,88 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fit_cache import FitCache, fingerprint_frame, fit_key
+from src.make_preprocessor import make_preprocessor, TARGET
+
+@pytest.fixture
+def pipe():
+    """Fixture for the unfitted pipeline of 06_model_fitting.py"""
+    return make_pipeline(make_preprocessor(), LogisticRegression(max_iter=2000, class_weight='balanced'))
+
+def fitted(pipe, data):
+    return pipe.fit(data.drop(columns=[TARGET]), data[TARGET])
+
+def test_fingerprint_frame(sample_data, tmp_path):
+    """Test that the fingerprint follows the values and column names, not the index or storage."""
+    fingerprint = fingerprint_frame(sample_data)
+    assert fingerprint_frame(sample_data.set_axis(range(100, 180))) == fingerprint
+    sample_data.to_parquet(tmp_path / "data.parquet")
+    categorical = pd.read_parquet(tmp_path / "data.parquet").astype({"gender": "category"})
+    assert fingerprint_frame(categorical) == fingerprint
+
+    changed = sample_data.copy()
+    changed.loc[5, "bmi"] += 0.1
+    assert fingerprint_frame(changed) != fingerprint
+    assert fingerprint_frame(sample_data.rename(columns={"oral": "oral_glucose"})) != fingerprint
+
+def test_fit_key(sample_data, pipe):
+    """Test that the key changes with the data, the transformer configuration and the other settings."""
+    key = fit_key(sample_data, pipe, seed=123)
+    assert fit_key(sample_data.copy(), make_pipeline(make_preprocessor(), LogisticRegression(
+        max_iter=2000, class_weight='balanced')), seed=123) == key
+    assert fit_key(sample_data.iloc[1:], pipe, seed=123) != key
+    assert fit_key(sample_data, pipe, seed=124) != key
+    pipe[0].set_params(**{"pipeline-1__standardscaler__with_mean": False})
+    assert fit_key(sample_data, pipe, seed=123) != key
+
+def test_fit_key_follows_estimator_code(sample_data, pipe, tmp_path, monkeypatch):
+    """Test that the key changes with the source of the repository's own estimators, parameters unchanged."""
+    key = fit_key(sample_data, pipe, seed=123)
+    module = sys.modules["src.knn_imputer"]
+    with open(module.__file__) as f:
+        source = f.read()
+    (tmp_path / "knn_imputer.py").write_text(source)
+    monkeypatch.setattr(module, "__file__", str(tmp_path / "knn_imputer.py"))
+    assert fit_key(sample_data, pipe, seed=123) == key
+    (tmp_path / "knn_imputer.py").write_text(source + "\n# changed\n")
+    assert fit_key(sample_data, pipe, seed=123) != key
+
+def test_get_put(sample_data, pipe, tmp_path):
+    """Test that a stored pipeline and its cross-validation results are returned on a hit."""
+    cache = FitCache(str(tmp_path / "cache"))
+    assert cache.get("missing") is None
+    model = fitted(pipe, sample_data)
+    cv_results = pd.DataFrame({"param_logisticregression__C": [0.1, 1.0], "mean_test_score": [0.5, 0.6]})
+    cache.put("key", model, cv_results)
+
+    loaded, loaded_results = cache.get("key")
+    X = sample_data.drop(columns=[TARGET])
+    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+    pd.testing.assert_frame_equal(loaded_results, cv_results)
+    assert not [name for name in os.listdir(tmp_path / "cache") if ".tmp" in name]
+
+def test_lru_eviction(sample_data, pipe, tmp_path):
+    """Test that the least recently used entries are removed beyond the maximum, counting reads as uses."""
+    cache = FitCache(str(tmp_path / "cache"), max_entries=2)
+    model = fitted(pipe, sample_data)
+    cv_results = pd.DataFrame({"mean_test_score": [0.5]})
+    cache.put("a", model, cv_results)
+    cache.put("b", model, cv_results)
+    # Make "a" older than "b", then use it
+    os.utime(os.path.join(tmp_path, "cache", "a", "entry.json"), (0, 0))
+    os.utime(os.path.join(tmp_path, "cache", "b", "entry.json"), (100, 100))
+    assert cache.keys() == ["a", "b"]
+    assert cache.get("a") is not None
+    cache.put("c", model, cv_results)
+    assert sorted(cache.keys()) == ["a", "c"]
+    assert not os.path.exists(tmp_path / "cache" / "b")
+
+def test_invalid_size(tmp_path):
+    """Test that a cache must keep at least one entry."""
+    with pytest.raises(ValueError, match="positive integer"):
+        FitCache(str(tmp_path), max_entries=0)
@@ -0,0 +1,106 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.hash_split import row_hashes, hash_split
+
+@pytest.fixture
+def sample_data(sample_data_factory):
+    """Fixture to provide a data set with the columns of cleaned.csv and unbalanced classes."""
+    return sample_data_factory(997, seed=123, senior_share=0.16)
+
+@pytest.fixture
+def cleaned_csv(tmp_path, sample_data):
+    """Fixture to provide the sample data written to a CSV file."""
+    path = os.path.join(tmp_path, "cleaned.csv")
+    sample_data.to_csv(path, index=False)
+    return path
+
+def rows(data):
+    return sorted(map(tuple, data.astype(str).values.tolist()))
+
+def split(path, output_dir, **kwargs):
+    os.makedirs(output_dir, exist_ok=True)
+    summary = hash_split(path, str(output_dir), **kwargs)
+    extension = os.path.splitext(path)[1]
+    read = pd.read_csv if extension == ".csv" else pd.read_parquet
+    tables = {name: read(os.path.join(output_dir, f"data_{name}{extension}"))
+              for name in ["train", "test", "train_folds"]
+              if os.path.exists(os.path.join(output_dir, f"data_{name}{extension}"))}
+    return summary, tables
+
+def test_row_hashes_depend_on_values_and_seed(sample_data):
+    """Test that hashes ignore the index and inferred types but change with the values and the seed."""
+    hashes = row_hashes(sample_data, seed=1)
+    assert hashes.dtype == np.uint64
+    assert len(np.unique(hashes)) == len(sample_data)
+    np.testing.assert_array_equal(row_hashes(sample_data.set_index(sample_data.index + 50), seed=1), hashes)
+    retyped = sample_data.astype({"blood_glucose_fasting": int, "gender": "category"})
+    np.testing.assert_array_equal(row_hashes(retyped, seed=1), hashes)
+    assert not np.array_equal(row_hashes(sample_data, seed=2), hashes)
+    assert not np.array_equal(row_hashes(sample_data.assign(bmi=sample_data["bmi"] + 1), seed=1), hashes)
+
+def test_stratified_split(cleaned_csv, sample_data, tmp_path):
+    """Test that every class is split in exactly the requested proportion and no row is lost."""
+    summary, tables = split(cleaned_csv, tmp_path / "out", test_size=0.25)
+    assert list(summary.columns) == ["test", "train"]
+    counts = sample_data["age_group"].value_counts()
+    for label, n_rows in counts.items():
+        assert summary.loc[label, "test"] == round(0.25 * n_rows)
+        assert (tables["test"]["age_group"] == label).sum() == round(0.25 * n_rows)
+    assert rows(pd.concat([tables["train"], tables["test"]])) == rows(sample_data)
+    assert "train_folds" not in tables
+
+def test_split_does_not_depend_on_order_or_chunks(cleaned_csv, sample_data, tmp_path):
+    """Test that shuffling the file or reading it in other chunks assigns every row to the same partition."""
+    _, tables = split(cleaned_csv, tmp_path / "a", n_folds=4, chunksize=1000)
+    shuffled = os.path.join(tmp_path, "shuffled.csv")
+    sample_data.sample(frac=1, random_state=0).to_csv(shuffled, index=False)
+    _, other = split(shuffled, tmp_path / "b", n_folds=4, chunksize=37)
+    assert rows(tables["test"]) == rows(other["test"])
+    assert (rows(tables["train"].assign(fold=tables["train_folds"]["fold"]))
+            == rows(other["train"].assign(fold=other["train_folds"]["fold"])))
+
+def test_seed_changes_split(cleaned_csv, tmp_path):
+    """Test that another seed gives another test set."""
+    _, first = split(cleaned_csv, tmp_path / "a", seed=1)
+    _, second = split(cleaned_csv, tmp_path / "b", seed=2)
+    assert rows(first["test"]) != rows(second["test"])
+
+def test_folds(cleaned_csv, sample_data, tmp_path):
+    """Test that the fold file is aligned with the training rows and folds are stratified and balanced."""
+    summary, tables = split(cleaned_csv, tmp_path / "out", n_folds=5)
+    assert list(summary.columns) == ["test"] + [f"fold_{j}" for j in range(5)]
+    folds = tables["train_folds"]["fold"]
+    assert len(folds) == len(tables["train"])
+    assert sorted(folds.unique()) == [0, 1, 2, 3, 4]
+    per_fold = pd.crosstab(folds, tables["train"]["age_group"])
+    assert (per_fold.max() - per_fold.min()).max() <= 1
+    assert per_fold.to_numpy().tolist() == summary.iloc[:, 1:].T.to_numpy().tolist()
+
+def test_parquet(tmp_path, sample_data):
+    """Test that a Parquet file is split into Parquet files."""
+    path = os.path.join(tmp_path, "cleaned.parquet")
+    sample_data.to_parquet(path, index=False)
+    _, tables = split(path, tmp_path / "out", n_folds=3)
+    assert len(tables["train"]) + len(tables["test"]) == len(sample_data)
+    assert len(tables["train_folds"]) == len(tables["train"])
+
+def test_split_errors(cleaned_csv, sample_data, tmp_path):
+    """Test that invalid arguments and data raise errors."""
+    with pytest.raises(ValueError, match="test_size must be between 0 and 1"):
+        hash_split(cleaned_csv, str(tmp_path), test_size=1)
+    with pytest.raises(ValueError, match="n_folds must be 0 or at least 2"):
+        hash_split(cleaned_csv, str(tmp_path), n_folds=1)
+    with pytest.raises(FileNotFoundError):
+        hash_split(cleaned_csv, str(tmp_path / "missing"))
+    with pytest.raises(ValueError, match="not in the data"):
+        hash_split(cleaned_csv, str(tmp_path), stratify="age")
+
+    unlabelled = os.path.join(tmp_path, "unlabelled.csv")
+    sample_data.assign(age_group=sample_data["age_group"].where(sample_data.index > 0)).to_csv(unlabelled, index=False)
+    with pytest.raises(ValueError, match="has missing values"):
+        hash_split(unlabelled, str(tmp_path))
+    assert not os.path.exists(os.path.join(tmp_path, "data_train.csv"))
@@ -0,0 +1,81 @@
+import os
+import sys
+import numpy as np
+import pytest
+from sklearn.linear_model import SGDClassifier
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.incremental_training import make_incremental_preprocessor, fit_incremental
+from src.make_preprocessor import make_preprocessor, TARGET
+
+@pytest.fixture
+def sample_data(sample_data_factory):
+    """Fixture to provide a data set with unbalanced classes, where Seniors have higher oral values"""
+    return sample_data_factory(1000, seed=123, senior_share=0.3, senior_oral_shift=500)
+
+@pytest.fixture
+def train_csv(tmp_path, sample_data):
+    """Fixture to provide the sample data written to a CSV file."""
+    path = os.path.join(tmp_path, "data_train.csv")
+    sample_data.to_csv(path, index=False)
+    return path
+
+def test_preprocessor_matches_batch_fit(train_csv, sample_data):
+    """Test that the preprocessor fitted in chunks transforms like the one fitted on all the data."""
+    preprocessor, columns, class_counts = make_incremental_preprocessor(train_csv, chunksize=64)
+    X = sample_data.drop(columns=[TARGET])
+    assert columns == list(X.columns)
+    assert class_counts.to_dict() == sample_data[TARGET].value_counts().to_dict()
+    np.testing.assert_allclose(preprocessor.transform(X), make_preprocessor().fit_transform(X))
+
+def test_preprocessor_ignores_missing_level(tmp_path, sample_data):
+    """Test that the fixed vocabulary keeps a level that never occurs in the data."""
+    path = os.path.join(tmp_path, "data_train.csv")
+    sample_data.assign(weekly_physical_activity="No").to_csv(path, index=False)
+    preprocessor, _, _ = make_incremental_preprocessor(path, chunksize=100)
+    X = sample_data.drop(columns=[TARGET])
+    assert preprocessor.transform(X).shape == make_preprocessor().fit_transform(X).shape
+
+def test_fit_incremental(train_csv, sample_data):
+    """Test that the streamed pipeline learns the signal and predicts like a pipeline."""
+    pipe = fit_incremental(train_csv, chunksize=128, epochs=5)
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    classifier = pipe.steps[-1][1]
+    assert isinstance(classifier, SGDClassifier)
+    assert list(classifier.classes_) == ["Adult", "Senior"]
+    assert (pipe.predict(X) == y).mean() > 0.9
+    assert list(pipe.feature_names_in_) == list(X.columns)
+    # Balanced class weights, as in the batch model
+    counts = y.value_counts()
+    assert classifier.class_weight["Senior"] == pytest.approx(len(y) / (2 * counts["Senior"]))
+
+def test_fit_incremental_parquet(tmp_path, sample_data, train_csv):
+    """Test that a Parquet file gives the same model as the CSV file."""
+    path = os.path.join(tmp_path, "data_train.parquet")
+    sample_data.to_parquet(path, index=False)
+    X = sample_data.drop(columns=[TARGET])
+    np.testing.assert_allclose(fit_incremental(path, chunksize=128).predict_proba(X),
+                               fit_incremental(train_csv, chunksize=128).predict_proba(X))
+
+def test_fit_incremental_errors(tmp_path, sample_data, train_csv):
+    """Test that invalid arguments and unusable data raise errors."""
+    with pytest.raises(ValueError, match="epochs must be a positive integer"):
+        fit_incremental(train_csv, epochs=0)
+    with pytest.raises(ValueError, match="chunksize must be a positive integer"):
+        fit_incremental(train_csv, chunksize=0)
+    with pytest.raises(FileNotFoundError):
+        fit_incremental(os.path.join(tmp_path, "missing.csv"))
+
+    one_class = os.path.join(tmp_path, "one_class.csv")
+    sample_data.assign(age_group="Adult").to_csv(one_class, index=False)
+    with pytest.raises(ValueError, match="at least two classes"):
+        fit_incremental(one_class)
+
+    no_target = os.path.join(tmp_path, "no_target.csv")
+    sample_data.drop(columns=[TARGET]).to_csv(no_target, index=False)
+    with pytest.raises(ValueError, match="must have a 'age_group' column"):
+        fit_incremental(no_target)
+
+    empty = os.path.join(tmp_path, "empty.csv")
+    sample_data.iloc[:0].to_csv(empty, index=False)
+    with pytest.raises(ValueError, match="must contain observations"):
+        fit_incremental(empty)
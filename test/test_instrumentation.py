@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.instrumentation import (METRICS_ENV, PROFILE_ENV, RUN_ENV, TRACEMALLOC_ENV, step, instrumented,
+                                 read_metrics, summarize_metrics, folded_stacks)
+
+@pytest.fixture
+def metrics(tmp_path, monkeypatch):
+    """Fixture to switch instrumentation on, writing to a temporary metrics file."""
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setenv(METRICS_ENV, str(path))
+    monkeypatch.setenv(RUN_ENV, "run-1")
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    monkeypatch.delenv(TRACEMALLOC_ENV, raising=False)
+    return path
+
+def record(path, seconds, peak_mb=1.0):
+    return {"run": "run-1", "pid": 1, "path": path, "start": 0.0, "seconds": seconds,
+            "cpu_seconds": seconds, "max_rss_mb": 100.0, "peak_mb": peak_mb, "allocated_mb": peak_mb}
+
+def test_step_does_nothing_when_off(tmp_path, monkeypatch):
+    """Test that no file is written and nothing is traced without the environment variable."""
+    monkeypatch.delenv(METRICS_ENV, raising=False)
+    with step("read"):
+        pass
+    assert os.listdir(tmp_path) == []
+
+def test_nested_steps(metrics):
+    """Test that nested steps are recorded with their paths and times, without tracing memory by default."""
+    with step("stage"):
+        with step("sleep"):
+            time.sleep(0.05)
+    sleep, whole = read_metrics(str(metrics))
+    assert sleep["path"] == ["stage", "sleep"] and whole["path"] == ["stage"]
+    assert sleep["seconds"] >= 0.05 and sleep["cpu_seconds"] < sleep["seconds"]
+    assert whole["seconds"] >= sleep["seconds"]
+    assert sleep["max_rss_mb"] > 0 and sleep["peak_mb"] is None
+
+def test_traced_memory(metrics, monkeypatch):
+    """Test that with tracemalloc, the parent's peak covers the children's and allocations are attributed."""
+    monkeypatch.setenv(TRACEMALLOC_ENV, "1")
+
+    @instrumented("stage")
+    def stage():
+        with step("allocate"):
+            array = np.ones(4 * 2**20 // 8)
+            del array
+        with step("sleep"):
+            time.sleep(0.05)
+        return "done"
+
+    assert stage() == "done"
+    records = read_metrics(str(metrics))
+    assert [r["path"] for r in records] == [["stage", "allocate"], ["stage", "sleep"], ["stage"]]
+    assert all(r["run"] == "run-1" and r["pid"] == os.getpid() for r in records)
+    allocate, sleep, whole = records
+    assert allocate["allocated_mb"] >= 4
+    assert sleep["allocated_mb"] < 1
+    assert whole["peak_mb"] >= allocate["peak_mb"]
+    assert whole["seconds"] >= allocate["seconds"] + sleep["seconds"]
+
+def test_step_recorded_on_error(metrics):
+    """Test that a step that raises is still recorded, and the error propagates."""
+    with pytest.raises(ValueError):
+        with step("fails"):
+            raise ValueError("boom")
+    assert [r["path"] for r in read_metrics(str(metrics))] == [["fails"]]
+
+def test_cprofile_capture(metrics, monkeypatch):
+    """Test that the stage profile is saved next to the metrics file."""
+    monkeypatch.setenv(PROFILE_ENV, "cprofile")
+    instrumented("stage")(lambda: sum(range(1000)))()
+    assert os.path.exists(metrics.parent / "metrics_profiles" / "stage.prof")
+
+def test_unknown_profiler(metrics, monkeypatch):
+    """Test that an unknown profiler raises ValueError."""
+    monkeypatch.setenv(PROFILE_ENV, "perf")
+    with pytest.raises(ValueError, match="must be one of"):
+        instrumented("stage")(lambda: None)()
+
+def test_read_metrics_by_run(tmp_path):
+    """Test that records can be filtered by run id."""
+    path = tmp_path / "metrics.jsonl"
+    path.write_text("".join(json.dumps(dict(record(["a"], 1.0), run=run)) + "\n" for run in ["x", "y", "x"]))
+    assert len(read_metrics(str(path))) == 3
+    assert len(read_metrics(str(path), run="x")) == 2
+    with pytest.raises(FileNotFoundError):
+        read_metrics(str(tmp_path / "missing.jsonl"))
+
+def test_summarize_metrics_self_time():
+    """Test that repeated steps are added up and self time excludes direct children."""
+    records = [record(["fit", "read"], 1.0), record(["fit", "tune", "fold"], 2.0),
+               record(["fit", "tune", "fold"], 3.0, peak_mb=5.0), record(["fit", "tune"], 6.0),
+               record(["fit"], 8.0)]
+    summary = {entry["path"]: entry for entry in summarize_metrics(records)}
+    assert summary[("fit", "tune", "fold")]["calls"] == 2
+    assert summary[("fit", "tune", "fold")]["seconds"] == 5.0
+    assert summary[("fit", "tune", "fold")]["peak_mb"] == 5.0
+    assert summary[("fit", "tune")]["self_seconds"] == 1.0
+    assert summary[("fit",)]["self_seconds"] == 1.0
+    assert sum(entry["self_seconds"] for entry in summary.values()) == 8.0
+
+def test_folded_stacks():
+    """Test that each path is written as a folded stack with its self time in microseconds."""
+    summary = summarize_metrics([record(["fit", "tune"], 0.5), record(["fit"], 0.5)])
+    assert folded_stacks(summary) == "fit;tune 500000\n"
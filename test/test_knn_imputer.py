@@ -0,0 +1,98 @@
+import os
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import KNNImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.knn_imputer import IndexedKNNImputer
+from src.make_preprocessor import make_preprocessor, TARGET, NUMERIC_FEATURES
+from src.model_store import save_model, load_model
+
+@pytest.fixture
+def numeric_data():
+    """Fixture to provide complete numeric training rows and rows with missing values to impute."""
+    rng = np.random.default_rng(24)
+    complete = pd.DataFrame(rng.normal([27, 99, 110, 12], [7, 18, 47, 9], size=(2000, 4)), columns=NUMERIC_FEATURES)
+    incomplete = complete.iloc[:300].copy() + rng.normal(size=(300, 4))
+    incomplete[rng.random(incomplete.shape) < 0.3] = np.nan
+    return complete, incomplete
+
+@pytest.mark.parametrize("algorithm", ["kd_tree", "ball_tree"])
+def test_matches_knn_imputer(numeric_data, algorithm):
+    """Test that the values imputed from complete donors are those of KNNImputer."""
+    complete, incomplete = numeric_data
+    expected = KNNImputer(n_neighbors=5).fit(complete).transform(incomplete)
+    imputed = IndexedKNNImputer(n_neighbors=5, algorithm=algorithm, batch_size=16).fit(complete).transform(incomplete)
+    np.testing.assert_allclose(imputed, expected, rtol=1e-12)
+    observed = incomplete.notna().to_numpy()
+    np.testing.assert_array_equal(imputed[observed], incomplete.to_numpy()[observed])
+
+def test_incomplete_training_rows(numeric_data):
+    """Test that only complete rows are donors, one tree per missing pattern is built, and empty rows get the means."""
+    complete, incomplete = numeric_data
+    data = pd.concat([complete.iloc[:500], incomplete], ignore_index=True)
+    imputer = IndexedKNNImputer(n_neighbors=3).fit(data)
+    assert len(imputer.fit_X_) == 500 + incomplete.notna().all(axis=1).sum()
+    partial = incomplete.isna().any(axis=1) & ~incomplete.isna().all(axis=1)
+    assert len(imputer._trees) == len(incomplete.isna()[partial].drop_duplicates())
+    empty = pd.DataFrame([[np.nan] * 4], columns=NUMERIC_FEATURES)
+    np.testing.assert_allclose(imputer.transform(empty)[0], data.mean().to_numpy())
+
+def test_max_samples(numeric_data):
+    """Test that the donors are a sample of at most max_samples complete rows."""
+    complete, incomplete = numeric_data
+    imputer = IndexedKNNImputer(max_samples=100, random_state=0).fit(complete)
+    assert imputer.fit_X_.shape == (100, 4)
+    assert pd.DataFrame(imputer.fit_X_, columns=NUMERIC_FEATURES).merge(complete).shape[0] == 100
+    assert not np.isnan(imputer.transform(incomplete)).any()
+
+def test_persisted_index_is_rebuilt(numeric_data, tmp_path):
+    """Test that a pickled or stored imputer, whose trees are not saved, imputes like the original."""
+    complete, incomplete = numeric_data
+    imputer = IndexedKNNImputer().fit(complete)
+    expected = imputer.transform(incomplete)
+    unpickled = pickle.loads(pickle.dumps(imputer))
+    assert unpickled._trees == {}
+    np.testing.assert_array_equal(unpickled.transform(incomplete), expected)
+    save_model(imputer, str(tmp_path / "imputer"))
+    np.testing.assert_array_equal(load_model(str(tmp_path / "imputer")).transform(incomplete), expected)
+
+def test_preprocessor_imputes_numeric_features(tmp_path):
+    """Test that the pipeline of make_preprocessor fits and predicts with missing numeric values, also once stored."""
+    rng = np.random.default_rng(1)
+    n = 200
+    data = pd.DataFrame({
+        "age_group": rng.choice(["Adult", "Senior"], n),
+        "gender": rng.choice(["Female", "Male"], n),
+        "weekly_physical_activity": rng.choice(["No", "Yes"], n),
+        "bmi": rng.uniform(15, 60, n),
+        "blood_glucose_fasting": rng.uniform(70, 300, n),
+        "diabetic": rng.choice(["No", "Borderline", "Yes"], n),
+        "oral": rng.uniform(50, 500, n),
+        "insulin_level": rng.uniform(0.2, 90, n),
+    })
+    for col in NUMERIC_FEATURES:
+        data.loc[rng.random(n) < 0.1, col] = np.nan
+    X, y = data.drop(columns=[TARGET]), data[TARGET]
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression(max_iter=2000)).fit(X, y)
+    proba = pipe.predict_proba(X)
+    assert not np.isnan(proba).any()
+    save_model(pipe, str(tmp_path / "model"))
+    np.testing.assert_allclose(load_model(str(tmp_path / "model")).predict_proba(X), proba)
+
+def test_preprocessor_seed():
+    """Test that make_preprocessor seeds the imputer's sample of complete rows with its random_state."""
+    assert make_preprocessor(random_state=7).get_params()["pipeline-1__indexedknnimputer__random_state"] == 7
+    assert make_preprocessor().get_params()["pipeline-1__indexedknnimputer__random_state"] == 123
+
+def test_invalid_parameters(numeric_data):
+    """Test that invalid parameters raise ValueError."""
+    complete, _ = numeric_data
+    with pytest.raises(ValueError, match="algorithm must be one of"):
+        IndexedKNNImputer(algorithm="brute").fit(complete)
+    with pytest.raises(ValueError, match="positive integers"):
+        IndexedKNNImputer(n_neighbors=0).fit(complete)
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import click
+import pytest
+from click.testing import CliRunner
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.lazy_cli import LazyGroup
+
+AGE_PREDICT = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'age_predict.py')
+HEAVY_MODULES = {"pandas", "numpy", "sklearn", "pandera", "deepchecks", "altair", "matplotlib"}
+
+# A stand-in script that records in a file each time it is loaded
+SCRIPT = (
+    "import click\n"
+    "open({log!r}, 'a').write('loaded\\n')\n"
+    "@click.command()\n"
+    "@click.option('--name', default='world')\n"
+    "def hello(name):\n"
+    "    click.echo(f'hello {{name}}')\n"
+)
+
+@pytest.fixture
+def group(tmp_path):
+    """Fixture to provide a LazyGroup with one script command and the script's load log."""
+    log = tmp_path / "loads.log"
+    script = tmp_path / "hello.py"
+    script.write_text(SCRIPT.format(log=str(log)))
+
+    @click.group(cls=LazyGroup, lazy_commands={"hello": (str(script), "hello", "Say hello."),
+                                               "broken": (str(script), "missing", "Not a command.")})
+    def cli():
+        pass
+
+    return cli, log
+
+def loads(log):
+    return len(log.read_text().splitlines()) if log.exists() else 0
+
+def test_help_does_not_load_scripts(group):
+    """Test that the group's --help lists the commands without loading any script."""
+    cli, log = group
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    assert "hello   Say hello." in result.output
+    assert loads(log) == 0
+
+def test_command_loaded_on_invocation(group):
+    """Test that invoking a subcommand loads its script once and runs it."""
+    cli, log = group
+    result = CliRunner().invoke(cli, ["hello", "--name", "NHANES"])
+    assert result.exit_code == 0
+    assert result.output == "hello NHANES\n"
+    assert loads(log) == 1
+
+def test_missing_command_attribute(group):
+    """Test that a script without the named click command raises TypeError."""
+    cli, _ = group
+    result = CliRunner().invoke(cli, ["broken"])
+    assert isinstance(result.exception, TypeError)
+    assert "has no click command named 'missing'" in str(result.exception)
+
+def test_missing_script(tmp_path):
+    """Test that a missing script file raises FileNotFoundError."""
+    @click.group(cls=LazyGroup, lazy_commands={"gone": (str(tmp_path / "gone.py"), "main", "Gone.")})
+    def cli():
+        pass
+
+    result = CliRunner().invoke(cli, ["gone"])
+    assert isinstance(result.exception, FileNotFoundError)
+
+@pytest.mark.parametrize("command", [[], ["clean"], ["eda"], ["visualize"], ["fit"], ["evaluate"], ["explain"], ["report"], ["predict"], ["serve"]])
+def test_age_predict_help_skips_heavy_imports(command):
+    """Test that `age_predict.py [COMMAND] --help` imports none of the heavy libraries."""
+    result = subprocess.run([sys.executable, "-X", "importtime", AGE_PREDICT, *command, "--help"],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    imported = {line.split("|")[-1].strip().split(".")[0]
+                for line in result.stderr.splitlines() if line.startswith("import time:")}
+    assert not imported & HEAVY_MODULES
+    assert "Usage:" in result.stdout
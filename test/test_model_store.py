@@ -0,0 +1,169 @@
+import json
+import os
+import re
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+import sklearn
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler, OrdinalEncoder, OneHotEncoder, FunctionTransformer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_store import save_model, load_model, is_model_store, MANIFEST_FILENAME, ARRAYS_FILENAME
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+COMMITTED_MODEL = os.path.join(ROOT, "results", "models", "age_prediction_model")
+
+def committed_versions():
+    """Library versions the committed model was saved with."""
+    with open(os.path.join(COMMITTED_MODEL, MANIFEST_FILENAME)) as f:
+        return json.load(f)["versions"]
+
+@pytest.fixture
+def sample_data(sample_data):
+    """Fixture to provide the shared sample data with some missing genders"""
+    sample_data.loc[::7, "gender"] = None
+    return sample_data
+
+@pytest.fixture
+def fitted_model(sample_data):
+    """Fixture to provide a pipeline with the same structure as 06_model_fitting.py"""
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ['bmi', 'blood_glucose_fasting', 'oral', 'insulin_level']),
+        (OrdinalEncoder(categories=[['No', 'Borderline', 'Yes']], dtype=int), ['diabetic']),
+        (make_pipeline(SimpleImputer(strategy='constant', fill_value='missing'),
+                       OneHotEncoder(handle_unknown='ignore', sparse_output=False)),
+         ['weekly_physical_activity', 'gender']),
+    )
+    pipe = make_pipeline(preprocessor, LogisticRegression(C=np.float64(0.1), class_weight='balanced'))
+    return pipe.fit(sample_data.drop(columns=["age_group"]), sample_data["age_group"])
+
+@pytest.fixture
+def saved_model(tmp_path, fitted_model):
+    """Fixture to provide the path of the fitted pipeline saved with save_model."""
+    path = os.path.join(tmp_path, "model")
+    save_model(fitted_model, path)
+    return path
+
+def edit_manifest(path, edit):
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    edit(manifest)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(saved_model, fitted_model, sample_data, mmap):
+    """Test that the loaded pipeline predicts exactly as the saved one, with read-only weights."""
+    model = load_model(saved_model, mmap=mmap)
+    X = sample_data.drop(columns=["age_group"])
+    np.testing.assert_array_equal(model.predict_proba(X), fitted_model.predict_proba(X))
+    np.testing.assert_array_equal(model.predict(X), fitted_model.predict(X))
+    coef = model.steps[-1][1].coef_
+    assert isinstance(coef, np.memmap) == mmap
+    assert not coef.flags.writeable
+    assert type(model.steps[-1][1].C) is np.float64
+    assert model.get_params()["logisticregression__class_weight"] == "balanced"
+    # The column lists of the fitted transformers (a list subclass for the remainder in scikit-learn >= 1.5)
+    assert [(name, type(columns), list(columns)) for name, _, columns in model.steps[0][1].transformers_] == \
+        [(name, type(columns), list(columns)) for name, _, columns in fitted_model.steps[0][1].transformers_]
+
+def test_round_trip_sgd(tmp_path, sample_data):
+    """Test that an SGD classifier, whose loss is a compiled helper object, is saved and loaded."""
+    X, y = sample_data[["bmi", "oral"]], sample_data["age_group"]
+    model = SGDClassifier(loss="log_loss", random_state=0).partial_fit(X, y, classes=["Adult", "Senior"])
+    save_model(model, os.path.join(tmp_path, "model"))
+    loaded = load_model(os.path.join(tmp_path, "model"))
+    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+    assert type(loaded.loss_function_) is type(model.loss_function_)
+
+def test_saved_files(saved_model):
+    """Test that a model is saved as a JSON manifest and one arrays file, with no pickled data."""
+    assert sorted(os.listdir(saved_model)) == sorted([MANIFEST_FILENAME, ARRAYS_FILENAME])
+    assert is_model_store(saved_model)
+    with open(os.path.join(saved_model, MANIFEST_FILENAME)) as f:
+        manifest = json.load(f)
+    assert manifest["versions"]["scikit-learn"] == sklearn.__version__
+    assert manifest["model"]["__estimator__"] == "sklearn.pipeline.Pipeline"
+
+def test_overwrite(saved_model, fitted_model):
+    """Test that saving to an existing model directory replaces it."""
+    save_model(fitted_model, saved_model)
+    assert sorted(os.listdir(os.path.dirname(saved_model))) == ["model"]
+    load_model(saved_model)
+
+def test_checksum_mismatch(saved_model):
+    """Test that a modified arrays file is rejected unless verification is turned off."""
+    with open(os.path.join(saved_model, ARRAYS_FILENAME), 'r+b') as f:
+        f.write(b"\xff" * 8)
+    with pytest.raises(ValueError, match="does not match its checksum"):
+        load_model(saved_model)
+    load_model(saved_model, verify=False)
+
+def test_version_mismatch(saved_model):
+    """Test that a model saved with another scikit-learn version is rejected unless allowed."""
+    edit_manifest(saved_model, lambda m: m["versions"].update({"scikit-learn": "0.1"}))
+    with pytest.raises(ValueError, match="saved with scikit-learn 0.1"):
+        load_model(saved_model)
+    load_model(saved_model, check_versions=False)
+
+def test_unsupported_format_version(saved_model):
+    """Test that an unknown store version is rejected."""
+    edit_manifest(saved_model, lambda m: m.update({"format_version": 99}))
+    with pytest.raises(ValueError, match="version 99 is not supported"):
+        load_model(saved_model)
+
+def test_disallowed_class(saved_model):
+    """Test that a manifest naming a class outside scikit-learn is rejected before it is imported."""
+    edit_manifest(saved_model, lambda m: m["model"].update({"__estimator__": "os.system"}))
+    with pytest.raises(ValueError, match="only .* are allowed"):
+        load_model(saved_model)
+    edit_manifest(saved_model, lambda m: m["model"].update({"__estimator__": "sklearn.base.clone"}))
+    with pytest.raises(ValueError, match="not a scikit-learn estimator"):
+        load_model(saved_model)
+    # Helper objects must be on the allowlist, even when reachable through a scikit-learn module
+    for path in ["os.system", "sklearn.metrics._scorer.partial"]:
+        edit_manifest(saved_model, lambda m: m.update({"model": {"__object__": path, "args": ["ls"]}}))
+        with pytest.raises(ValueError, match="not an allowed helper object"):
+            load_model(saved_model)
+
+def test_unsupported_object(tmp_path):
+    """Test that a model holding a function raises TypeError and leaves no files behind."""
+    model = make_pipeline(FunctionTransformer(np.log1p), StandardScaler()).fit(np.ones((3, 2)))
+    with pytest.raises(TypeError, match="Cannot store object of type"):
+        save_model(model, os.path.join(tmp_path, "model"))
+    assert os.listdir(tmp_path) == []
+
+def test_missing_paths(tmp_path, fitted_model):
+    """Test FileNotFoundError for a missing parent directory or model directory."""
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        save_model(fitted_model, os.path.join(tmp_path, "nope", "model"))
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        load_model(os.path.join(tmp_path, "model"))
+
+def test_none_model(tmp_path):
+    """Test that save_model raises TypeError for None."""
+    with pytest.raises(TypeError, match="Input must be an object instance"):
+        save_model(None, os.path.join(tmp_path, "model"))
+
+def test_committed_model_versions():
+    """Test that the committed model was saved with the library versions pinned in conda-linux-64.lock."""
+    with open(os.path.join(ROOT, "conda-linux-64.lock")) as f:
+        lock = f.read()
+    pinned = {name: re.search(rf"/{name}-([\d.]+)-", lock).group(1) for name in ("scikit-learn", "numpy")}
+    assert committed_versions() == pinned
+
+@pytest.mark.skipif(sklearn.__version__ != committed_versions()["scikit-learn"],
+                    reason="the committed model loads only with the scikit-learn version it was saved with")
+def test_load_committed_model():
+    """Test that the committed model loads with the default checks and reproduces the reported test accuracy."""
+    model = load_model(COMMITTED_MODEL)
+    data_test = pd.read_csv(os.path.join(ROOT, "data", "processed", "data_test.csv"))
+    with open(os.path.join(ROOT, "results", "tables", "report_facts.json")) as f:
+        facts = json.load(f)
+    accuracy = model.score(data_test.drop(columns=["age_group"]), data_test["age_group"])
+    assert accuracy == pytest.approx(facts["metrics"]["accuracy"])
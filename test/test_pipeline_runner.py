@@ -0,0 +1,205 @@
+import importlib.util
+import os
+import re
+import sys
+import time
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipeline_runner import Stage, hash_file, python_sources, stage_key, run_pipeline, format_report
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Each test stage runs a tiny Python program; it appends its name to a log
+# file outside its outputs so that tests can count how often it actually ran.
+WRITE_UPPER = (
+    "import sys, time\n"
+    "src, dst, log, name = sys.argv[1:5]\n"
+    "open(log, 'a').write(f'{name} {time.time()}\\n')\n"
+    "open(dst, 'w').write(open(src).read().upper())\n"
+)
+
+def python_stage(name, src, dst, log, code=()):
+    return Stage(name, [[sys.executable, "-c", WRITE_UPPER, str(src), str(dst), str(log), name]],
+                 inputs=[str(src)], outputs=[str(dst)], code=code)
+
+def runs(log):
+    if not os.path.exists(log):
+        return []
+    with open(log) as f:
+        return [line.split()[0] for line in f]
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Fixture to provide an input file, a log file and a cache directory."""
+    source = tmp_path / "raw.txt"
+    source.write_text("nhanes")
+    return tmp_path, source, tmp_path / "runs.log", str(tmp_path / "cache")
+
+def test_hash_file(tmp_path):
+    """Test that hash_file returns the SHA-256 of the file content."""
+    path = tmp_path / "a.txt"
+    path.write_text("abc")
+    assert hash_file(str(path)) == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+
+def test_stage_key_changes_with_inputs_and_params(workspace):
+    """Test that the stage key depends on input content and parameters."""
+    tmp_path, source, log, _ = workspace
+    stage = python_stage("upper", source, tmp_path / "out.txt", log)
+    key = stage_key(stage)
+    assert stage_key(stage) == key
+    source.write_text("changed")
+    assert stage_key(stage) != key
+    stage.params = {"seed": 1}
+    assert stage.argv()[-1][-1] == "--seed=1"
+
+def test_stage_key_missing_input(tmp_path):
+    """Test that stage_key raises FileNotFoundError when an input is missing."""
+    stage = Stage("missing", [["true"]], inputs=[str(tmp_path / "nope.csv")])
+    with pytest.raises(FileNotFoundError, match="needs .+ which does not exist"):
+        stage_key(stage)
+
+def test_second_run_is_cached(workspace):
+    """Test that an unchanged stage is skipped on the next run."""
+    tmp_path, source, log, cache_dir = workspace
+    stages = [python_stage("upper", source, tmp_path / "out.txt", log)]
+
+    first = run_pipeline(stages, cache_dir)
+    second = run_pipeline(stages, cache_dir)
+
+    assert [r["status"] for r in first] == ["ran"]
+    assert [r["status"] for r in second] == ["cached"]
+    assert runs(log) == ["upper"]
+    assert (tmp_path / "out.txt").read_text() == "NHANES"
+
+def test_changed_input_reruns_downstream(workspace):
+    """Test that changing an input reruns the stage and the stages depending on it."""
+    tmp_path, source, log, cache_dir = workspace
+    stages = [python_stage("first", source, tmp_path / "mid.txt", log),
+              python_stage("second", tmp_path / "mid.txt", tmp_path / "out.txt", log)]
+    run_pipeline(stages, cache_dir)
+    source.write_text("survey")
+    report = run_pipeline(stages, cache_dir)
+
+    assert {r["stage"]: r["status"] for r in report} == {"first": "ran", "second": "ran"}
+    assert (tmp_path / "out.txt").read_text() == "SURVEY"
+
+def test_changed_code_reruns_stage(workspace):
+    """Test that changing a stage's code file reruns it."""
+    tmp_path, source, log, cache_dir = workspace
+    script = tmp_path / "script.py"
+    script.write_text("# v1")
+    stages = [python_stage("upper", source, tmp_path / "out.txt", log, code=[str(script)])]
+    run_pipeline(stages, cache_dir)
+    script.write_text("# v2")
+    assert [r["status"] for r in run_pipeline(stages, cache_dir)] == ["ran"]
+
+def test_deleted_output_restored_from_cache(workspace):
+    """Test that a deleted output is restored from the cache without rerunning the stage."""
+    tmp_path, source, log, cache_dir = workspace
+    stages = [python_stage("upper", source, tmp_path / "out.txt", log)]
+    run_pipeline(stages, cache_dir)
+    os.remove(tmp_path / "out.txt")
+
+    report = run_pipeline(stages, cache_dir)
+
+    assert [r["status"] for r in report] == ["cached"]
+    assert (tmp_path / "out.txt").read_text() == "NHANES"
+    assert runs(log) == ["upper"]
+
+def test_previous_version_comes_back_from_cache(workspace):
+    """Test that reverting an input to earlier content is a cache hit."""
+    tmp_path, source, log, cache_dir = workspace
+    stages = [python_stage("upper", source, tmp_path / "out.txt", log)]
+    run_pipeline(stages, cache_dir)
+    source.write_text("other")
+    run_pipeline(stages, cache_dir)
+    source.write_text("nhanes")
+
+    assert [r["status"] for r in run_pipeline(stages, cache_dir)] == ["cached"]
+    assert (tmp_path / "out.txt").read_text() == "NHANES"
+
+def test_independent_stages_run_concurrently(workspace):
+    """Test that stages without a dependency between them overlap in time."""
+    tmp_path, source, _, cache_dir = workspace
+    sleeper = "import sys, time; open(sys.argv[1], 'w').write(str(time.time())); time.sleep(1)"
+    stages = [Stage(name, [[sys.executable, "-c", sleeper, str(tmp_path / f"{name}.txt")]],
+                    inputs=[str(source)], outputs=[str(tmp_path / f"{name}.txt")])
+              for name in ["eda", "visualize", "fit"]]
+
+    start = time.perf_counter()
+    run_pipeline(stages, cache_dir, max_workers=3)
+    assert time.perf_counter() - start < 2.5, "Independent stages did not run concurrently"
+
+def test_failing_stage_raises(workspace):
+    """Test that a failing command raises RuntimeError and is not cached."""
+    tmp_path, source, _, cache_dir = workspace
+    stages = [Stage("broken", [[sys.executable, "-c", "import sys; sys.exit('boom')"]], inputs=[str(source)])]
+    with pytest.raises(RuntimeError, match="Stage 'broken' failed"):
+        run_pipeline(stages, cache_dir)
+    with pytest.raises(RuntimeError, match="boom"):
+        run_pipeline(stages, cache_dir)
+
+def test_missing_output_raises(workspace):
+    """Test that a stage that does not write its declared output raises FileNotFoundError."""
+    tmp_path, source, _, cache_dir = workspace
+    stages = [Stage("lazy", [[sys.executable, "-c", "pass"]], inputs=[str(source)],
+                    outputs=[str(tmp_path / "never.txt")])]
+    with pytest.raises(FileNotFoundError, match="was not created"):
+        run_pipeline(stages, cache_dir)
+
+def test_duplicate_stage_names(workspace):
+    """Test that run_pipeline raises ValueError for duplicate stage names."""
+    tmp_path, source, log, cache_dir = workspace
+    stage = python_stage("upper", source, tmp_path / "out.txt", log)
+    with pytest.raises(ValueError, match="Stage names must be unique"):
+        run_pipeline([stage, stage], cache_dir)
+
+def test_dependency_cycle(workspace):
+    """Test that run_pipeline raises ValueError for a dependency cycle."""
+    tmp_path, _, log, cache_dir = workspace
+    stages = [python_stage("a", tmp_path / "b.txt", tmp_path / "a.txt", log),
+              python_stage("b", tmp_path / "a.txt", tmp_path / "b.txt", log)]
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        run_pipeline(stages, cache_dir)
+
+def test_format_report():
+    """Test that the report lists the slowest stage first and the total."""
+    report = [{"stage": "split", "status": "cached", "seconds": 0.5, "key": "a"},
+              {"stage": "fit", "status": "ran", "seconds": 4.0, "key": "b"}]
+    lines = format_report(report).splitlines()
+    assert lines[1].startswith("fit")
+    assert lines[2].startswith("split")
+    assert lines[-1].endswith("4.50")
+
+def test_python_sources(tmp_path):
+    """Test that python_sources follows src imports, including those inside functions, through other modules."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("import numpy\nfrom src.b import f\n")
+    (tmp_path / "src" / "b.py").write_text("import os\n\ndef f():\n    from src import c\n")
+    (tmp_path / "src" / "c.py").write_text("from .a import x\n")
+    (tmp_path / "src" / "unused.py").write_text("")
+    (tmp_path / "run.py").write_text("import sys\n\ndef main():\n    import src.a\n")
+    assert python_sources("run.py", root=str(tmp_path)) == ["run.py", os.path.join("src", "a.py"),
+                                                             os.path.join("src", "b.py"), os.path.join("src", "c.py")]
+    (tmp_path / "broken.py").write_text("from src.missing import g\n")
+    with pytest.raises(FileNotFoundError, match="missing.py"):
+        python_sources("broken.py", root=str(tmp_path))
+
+def test_stages_list_their_code():
+    """Test that every pipeline stage lists each src module its script imports, directly or not."""
+    spec = importlib.util.spec_from_file_location("run_pipeline", os.path.join(ROOT, "scripts", "run_pipeline.py"))
+    run_pipeline_script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(run_pipeline_script)
+    for stage in run_pipeline_script.STAGES:
+        script = stage.commands[-1][1]
+        imported, pending = set(), [script]
+        while pending:
+            with open(os.path.join(ROOT, pending.pop())) as f:
+                modules = re.findall(r"^\s*(?:from|import) src\.(\w+)", f.read(), flags=re.MULTILINE)
+            for module in modules:
+                path = f"src/{module}.py"
+                if path not in imported:
+                    imported.add(path)
+                    pending.append(path)
+        missing = imported - {path.replace(os.sep, "/") for path in stage.code}
+        assert not missing, f"Stage '{stage.name}' does not list {sorted(missing)}"
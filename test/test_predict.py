@@ -0,0 +1,106 @@
+import os
+import sys
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler, OrdinalEncoder, OneHotEncoder
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.predict import load_model, iter_chunks, predict_frame, predict_chunks
+from src.model_store import save_model
+
+@pytest.fixture
+def fitted_model(sample_data):
+    """Fixture to provide a pipeline with the same structure as 06_model_fitting.py"""
+    preprocessor = make_column_transformer(
+        (StandardScaler(), ['bmi', 'blood_glucose_fasting', 'oral', 'insulin_level']),
+        (OrdinalEncoder(categories=[['No', 'Borderline', 'Yes']], dtype=int), ['diabetic']),
+        (make_pipeline(SimpleImputer(strategy='constant', fill_value='missing'),
+                       OneHotEncoder(handle_unknown='ignore', sparse_output=False)),
+         ['weekly_physical_activity', 'gender']),
+    )
+    pipe = make_pipeline(preprocessor, LogisticRegression(class_weight='balanced'))
+    return pipe.fit(sample_data.drop(columns=["age_group"]), sample_data["age_group"])
+
+def test_load_model(tmp_path, fitted_model):
+    """Test that load_model returns the pickled pipeline."""
+    model_path = os.path.join(tmp_path, "model.pickle")
+    with open(model_path, 'wb') as f:
+        pickle.dump(fitted_model, f)
+    model = load_model(model_path)
+    assert list(model.classes_) == list(fitted_model.classes_)
+
+def test_load_model_from_store(tmp_path, fitted_model, sample_data):
+    """Test that load_model reads a model directory written by save_model."""
+    model_path = os.path.join(tmp_path, "model")
+    save_model(fitted_model, model_path)
+    model = load_model(model_path)
+    X = sample_data.drop(columns=["age_group"])
+    np.testing.assert_array_equal(model.predict_proba(X), fitted_model.predict_proba(X))
+
+def test_load_model_missing_file(tmp_path):
+    """Test that load_model raises FileNotFoundError for a missing file."""
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        load_model(os.path.join(tmp_path, "missing.pickle"))
+
+def test_iter_chunks_sizes(tmp_path, sample_data):
+    """Test that iter_chunks yields chunks of at most chunksize rows covering the file."""
+    input_path = os.path.join(tmp_path, "data.csv")
+    sample_data.to_csv(input_path, index=False)
+    sizes = [len(chunk) for chunk in iter_chunks(input_path, 15)]
+    assert sizes == [15, 15, 15, 15, 15, 5]
+
+def test_iter_chunks_invalid_extension(tmp_path):
+    """Test that iter_chunks raises ValueError for unsupported file types."""
+    with pytest.raises(ValueError, match="Unsupported file extension"):
+        list(iter_chunks(os.path.join(tmp_path, "data.txt"), 10))
+
+def test_iter_chunks_invalid_chunksize(tmp_path):
+    """Test that iter_chunks raises ValueError for a non-positive chunk size."""
+    with pytest.raises(ValueError, match="chunksize must be a positive integer"):
+        list(iter_chunks(os.path.join(tmp_path, "data.csv"), 0))
+
+def test_predict_frame_ignores_target(fitted_model, sample_data):
+    """Test that predict_frame matches the pipeline and ignores the target column."""
+    predictions = predict_frame(fitted_model, sample_data)
+    X = sample_data.drop(columns=["age_group"])
+    assert list(predictions.columns) == ["prediction", "proba_Adult", "proba_Senior"]
+    np.testing.assert_array_equal(predictions["prediction"], fitted_model.predict(X))
+    np.testing.assert_allclose(predictions[["proba_Adult", "proba_Senior"]], fitted_model.predict_proba(X))
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_predict_chunks_matches_full_predict(tmp_path, fitted_model, sample_data, extension):
+    """Test that streaming in chunks gives the same output as scoring the whole file at once."""
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    input_path = os.path.join(tmp_path, "data" + extension)
+    output_path = os.path.join(tmp_path, "predictions" + extension)
+    if extension == ".csv":
+        sample_data.to_csv(input_path, index=False)
+    else:
+        sample_data.to_parquet(input_path, index=False)
+
+    n_rows = predict_chunks(fitted_model, input_path, output_path, chunksize=8)
+
+    assert n_rows == len(sample_data)
+    saved = pd.read_csv(output_path) if extension == ".csv" else pd.read_parquet(output_path)
+    expected = predict_frame(fitted_model, sample_data)
+    pd.testing.assert_frame_equal(saved, expected.reset_index(drop=True))
+
+def test_predict_chunks_missing_output_dir(tmp_path, fitted_model, sample_data):
+    """Test that predict_chunks raises FileNotFoundError when the output directory is missing."""
+    input_path = os.path.join(tmp_path, "data.csv")
+    sample_data.to_csv(input_path, index=False)
+    with pytest.raises(FileNotFoundError, match="Directory .+ does not exist"):
+        predict_chunks(fitted_model, input_path, os.path.join(tmp_path, "nope", "out.csv"))
+
+def test_predict_chunks_empty_input(tmp_path, fitted_model, sample_data):
+    """Test that predict_chunks raises ValueError for an input without rows."""
+    input_path = os.path.join(tmp_path, "empty.csv")
+    sample_data.iloc[:0].to_csv(input_path, index=False)
+    with pytest.raises(ValueError, match="must contain observations"):
+        predict_chunks(fitted_model, input_path, os.path.join(tmp_path, "out.csv"))
@@ -0,0 +1,129 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.render_figures import (Figure, density_curve, numeric_distribution_figure,
+                                categorical_distribution_figure, correlation_heatmap_figure,
+                                summary_heatmap_figure, render_figures, format_render_report)
+from src.eda_summary import summarize_frame
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+@pytest.fixture
+def data():
+    """Fixture to provide a small dataset with numeric and categorical features."""
+    rng = np.random.default_rng(123)
+    n = 300
+    return pd.DataFrame({
+        "age_group": rng.choice(["Adult", "Senior"], n, p=[0.8, 0.2]),
+        "gender": rng.choice(["Male", "Female"], n),
+        "bmi": rng.normal(27, 5, n),
+        "oral": rng.gamma(4, 30, n),
+    })
+
+def datasets(spec):
+    return [value for value in spec["datasets"].values()]
+
+def is_png(path):
+    with open(path, 'rb') as f:
+        return f.read(8) == PNG_SIGNATURE
+
+def test_density_curve_matches_exact_kde():
+    """Test that the binned density is close to the exact Gaussian KDE and integrates to one."""
+    values = np.random.default_rng(0).normal(size=2000)
+    grid, density = density_curve(values, (-6, 6))
+    q1, q3 = np.percentile(values, [25, 75])
+    h = 1.06 * min(values.std(ddof=1), (q3 - q1) / 1.34) * len(values) ** -0.2
+    exact = np.exp(-0.5 * ((grid[:, None] - values[None, :]) / h) ** 2).sum(axis=1) / (len(values) * h * np.sqrt(2 * np.pi))
+    assert np.abs(density - exact).max() < 1e-3
+    assert np.trapz(density, grid) == pytest.approx(1, abs=1e-3)
+
+def test_density_curve_too_few_values():
+    """Test that fewer than two values give a flat zero density."""
+    grid, density = density_curve(np.array([1.0]), (0, 2), steps=5)
+    assert grid.tolist() == [0, 0.5, 1, 1.5, 2]
+    assert not density.any()
+
+def test_numeric_figure_holds_summaries_only(data):
+    """Test that the numeric spec holds one curve per column and group, not the rows."""
+    figure = numeric_distribution_figure(data, color="age_group")
+    assert figure.renderer == "vega-lite"
+    assert len(figure.payload["concat"]) == 2
+    curves = [rows for rows in datasets(figure.payload) if rows and "density" in rows[0]]
+    assert len(curves) == 2
+    assert all(len(rows) == 2 * 200 for rows in curves)
+
+def test_categorical_figure_counts(data):
+    """Test that the categorical spec holds counts adding up to the number of rows."""
+    figure = categorical_distribution_figure(data, color="age_group")
+    counts = [rows for rows in datasets(figure.payload)]
+    assert len(counts) == 2
+    assert all(sum(row["count"] for row in rows) == len(data) for rows in counts)
+    gender = next(rows for rows in counts if "gender" in rows[0])
+    expected = data.groupby(["gender", "age_group"]).size()
+    assert {(row["gender"], row["age_group"]): row["count"] for row in gender} == expected.to_dict()
+
+def test_heatmap_figure(data):
+    """Test that the heatmap payload is the correlation matrix of the numeric columns."""
+    figure = correlation_heatmap_figure(data)
+    assert figure.payload["labels"] == ["bmi", "oral"]
+    np.testing.assert_allclose(figure.payload["values"], data[["bmi", "oral"]].corr().to_numpy())
+
+def test_summary_heatmap_figure(data):
+    """Test that the heatmap drawn from an EDA summary matches the one drawn from the data."""
+    figure = summary_heatmap_figure(summarize_frame(data).to_dict())
+    expected = correlation_heatmap_figure(data)
+    assert figure.name == expected.name and figure.payload["labels"] == expected.payload["labels"]
+    np.testing.assert_allclose(figure.payload["values"], expected.payload["values"], atol=1e-12)
+
+def test_invalid_renderer():
+    """Test that an unknown renderer raises ValueError."""
+    with pytest.raises(ValueError, match="renderer must be one of"):
+        Figure("fig", "svg", {})
+
+def test_render_figures_skips_unchanged(data, tmp_path):
+    """Test that only new, changed or missing figures are rendered again."""
+    figures = [categorical_distribution_figure(data, color="age_group"), correlation_heatmap_figure(data)]
+    report = render_figures(figures, str(tmp_path), max_workers=1)
+    assert [entry["status"] for entry in report] == ["rendered", "rendered"]
+    assert all(is_png(entry["path"]) for entry in report)
+
+    report = render_figures(figures, str(tmp_path), max_workers=1)
+    assert [entry["status"] for entry in report] == ["cached", "cached"]
+
+    changed = data.assign(gender="Female")
+    figures = [categorical_distribution_figure(changed, color="age_group"), correlation_heatmap_figure(changed)]
+    report = render_figures(figures, str(tmp_path), max_workers=1)
+    assert [entry["status"] for entry in report] == ["rendered", "cached"]
+
+    os.remove(tmp_path / "fig_feats_heatmap.png")
+    report = render_figures(figures, str(tmp_path), max_workers=1)
+    assert [entry["status"] for entry in report] == ["cached", "rendered"]
+
+    report = render_figures(figures, str(tmp_path), max_workers=1, force=True)
+    assert [entry["status"] for entry in report] == ["rendered", "rendered"]
+
+def test_render_figures_in_worker_processes(data, tmp_path):
+    """Test that figures rendered on a process pool are written and reported in order."""
+    figures = [numeric_distribution_figure(data, color="age_group"), correlation_heatmap_figure(data)]
+    report = render_figures(figures, str(tmp_path / "figures"), max_workers=2)
+    assert [entry["figure"] for entry in report] == ["fig_numeric_feats", "fig_feats_heatmap"]
+    assert all(entry["status"] == "rendered" and entry["seconds"] > 0 for entry in report)
+    assert all(is_png(entry["path"]) for entry in report)
+
+def test_render_figures_duplicate_names(data, tmp_path):
+    """Test that two figures with the same name raise ValueError."""
+    figures = [correlation_heatmap_figure(data), correlation_heatmap_figure(data)]
+    with pytest.raises(ValueError, match="Figure names must be unique"):
+        render_figures(figures, str(tmp_path))
+
+def test_format_render_report():
+    """Test that the report lists the slowest figure first and the total."""
+    report = [{"figure": "a", "path": "a.png", "status": "cached", "seconds": 0.0},
+              {"figure": "b", "path": "b.png", "status": "rendered", "seconds": 1.5}]
+    lines = format_render_report(report).splitlines()
+    assert lines[1].split() == ["b", "rendered", "1.50"]
+    assert lines[2].split() == ["a", "cached", "0.00"]
+    assert lines[-1].split() == ["total", "1.50"]
@@ -0,0 +1,67 @@
+import os
+import stat
+import sys
+import pytest
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.render_report import render_report
+
+# Stands in for `quarto render NAME --to FORMAT`: writes the output from the
+# working directory and a file reached through `../results`, fails for docx
+FAKE_QUARTO = f"""#!{sys.executable}
+import os, sys
+name, fmt = sys.argv[2], sys.argv[4]
+if fmt == "docx":
+    sys.exit("cannot render docx")
+with open(os.path.join("..", "results", "facts.json")) as f:
+    facts = f.read()
+os.makedirs(name[:-4] + "_files", exist_ok=True)
+with open(name[:-4] + "." + fmt, "w") as f:
+    f.write(os.getcwd() + "\\n" + facts)
+"""
+
+@pytest.fixture
+def project(tmp_path):
+    """Fixture for a project with a report, the results it reads and a fake Quarto executable."""
+    (tmp_path / "reports").mkdir()
+    (tmp_path / "reports" / "report.qmd").write_text("---\ntitle: Report\n---\n")
+    (tmp_path / "results").mkdir()
+    (tmp_path / "results" / "facts.json").write_text('{"best_C": 0.0001}')
+    quarto = tmp_path / "quarto"
+    quarto.write_text(FAKE_QUARTO)
+    quarto.chmod(quarto.stat().st_mode | stat.S_IEXEC)
+    return tmp_path
+
+def test_render_report_formats(project):
+    """Test that each format is rendered in its own copy of the report directory and moved next to the report."""
+    report = str(project / "reports" / "report.qmd")
+    outputs = render_report(report, ["html", "pdf"], quarto=str(project / "quarto"))
+
+    assert outputs == [str(project / "reports" / "report.html"), str(project / "reports" / "report.pdf")]
+    workdirs = []
+    for output in outputs:
+        with open(output) as f:
+            workdir, facts = f.read().split("\n")
+        assert facts == '{"best_C": 0.0001}'
+        workdirs.append(workdir)
+    assert len(set(workdirs)) == 2 and all(os.path.dirname(w) == str(project) for w in workdirs)
+    # The copies and Quarto's intermediate files are removed
+    assert sorted(os.listdir(project)) == ["quarto", "reports", "results"]
+    assert sorted(os.listdir(project / "reports")) == ["report.html", "report.pdf", "report.qmd"]
+
+def test_render_report_failure(project):
+    """Test that a failed render raises RuntimeError after the other formats are rendered."""
+    report = str(project / "reports" / "report.qmd")
+    with pytest.raises(RuntimeError, match="cannot render docx"):
+        render_report(report, ["docx", "html"], quarto=str(project / "quarto"))
+    assert os.path.exists(project / "reports" / "report.html")
+    assert sorted(os.listdir(project)) == ["quarto", "reports", "results"]
+
+def test_render_report_invalid_input(project):
+    """Test that a missing report or Quarto and an unknown format are rejected before rendering."""
+    report = str(project / "reports" / "report.qmd")
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        render_report(str(project / "missing.qmd"), quarto=str(project / "quarto"))
+    with pytest.raises(ValueError, match="Unsupported formats"):
+        render_report(report, ["epub"], quarto=str(project / "quarto"))
+    with pytest.raises(FileNotFoundError, match="not found"):
+        render_report(report, quarto=str(project / "no-quarto"))
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.report_facts import report_facts, write_report_facts
+from src.evaluate_model import evaluate_proba, bootstrap_metrics
+from src.make_preprocessor import make_preprocessor, TARGET
+
+@pytest.fixture
+def evaluated(sample_data):
+    """Fixture for a fitted pipeline and its scores on the sample data."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression(C=0.01, max_iter=2000))
+    pipe.fit(X, y)
+    proba = pipe.predict_proba(X)
+    return pipe, evaluate_proba(y, proba, pipe.classes_), bootstrap_metrics(y, proba, pipe.classes_,
+                                                                            n_resamples=50, random_state=0)
+
+def test_report_facts_match_scores(evaluated):
+    """Test that the facts quote the confusion matrix, report, C and coefficients of the model."""
+    pipe, scores, _ = evaluated
+    facts = report_facts(pipe, scores)
+    confusion = scores.confusion_matrix.to_numpy()
+
+    assert facts["classes"] == ["Adult", "Senior"] and facts["n_test"] == 80
+    assert facts["confusion_matrix"]["counts"] == confusion.tolist()
+    assert facts["correct"] == {"total": int(np.trace(confusion)), "Adult": int(confusion[0, 0]),
+                                "Senior": int(confusion[1, 1])}
+    assert facts["correct"]["total"] + facts["incorrect"] == 80
+    assert facts["metrics"]["accuracy"] == pytest.approx(scores.report.loc["accuracy", "f1-score"])
+    assert facts["metrics"]["macro_f1"] == pytest.approx(scores.report.loc["macro avg", "f1-score"])
+    assert facts["metrics"]["roc_auc"] == pytest.approx(scores.roc_auc)
+    pd.testing.assert_frame_equal(pd.DataFrame(facts["classification_report"]).transpose(), scores.report,
+                                  check_dtype=False)
+    assert facts["best_C"] == 0.01
+    assert list(facts["coefficients"]) == pipe[:-1].get_feature_names_out().tolist()
+    np.testing.assert_allclose(list(facts["coefficients"].values()), pipe[-1].coef_.ravel())
+    assert facts["intercept"] == pytest.approx(pipe[-1].intercept_[0])
+    assert facts["intervals"] is None
+
+def test_write_report_facts_round_trip(evaluated, tmp_path):
+    """Test that the facts, with intervals, are saved as plain JSON and read back unchanged."""
+    pipe, scores, intervals = evaluated
+    facts = report_facts(pipe, scores, intervals)
+    write_report_facts(facts, str(tmp_path))
+    with open(tmp_path / "report_facts.json") as f:
+        loaded = json.load(f)
+    assert loaded == facts
+    assert loaded["intervals"]["roc_auc"]["estimate"] == pytest.approx(intervals.loc["roc_auc", "estimate"])
+
+def test_write_report_facts_missing_directory(tmp_path):
+    """Test that writing to a directory that does not exist raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        write_report_facts({}, str(tmp_path / "missing"))
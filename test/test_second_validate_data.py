@@ -1,7 +1,7 @@
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.second_validate_data import second_validate_data 
+from src.second_validate_data import second_validate_data, CORRELATION_BACKENDS
 import pandas as pd
 import pandera as pa
 import pytest
@@ -19,35 +19,40 @@ valid_data = pd.DataFrame({
     "insulin_level": [0.4, 1.3, 2.2, 1.1, 0.5, 1.9]  # Break linear relationships
 })
 
+@pytest.fixture(params=CORRELATION_BACKENDS)
+def backend(request):
+    """Fixture to run each test with every correlation backend."""
+    return request.param
+
 # Case 1: Validate valid data
-def test_validate_valid_data():
+def test_validate_valid_data(backend):
     """
     Test that valid data passes the validation without raising any errors.
     """
     print("\nCorrelation matrix for valid_data:")
     print(valid_data.select_dtypes(include=["number"]).corr())
-    second_validate_data(valid_data)  # No exceptions expected
+    second_validate_data(valid_data, backend=backend)  # No exceptions expected
 
 # 2. Test dataset creation failed
-def test_dataset_creation_failed():
+def test_dataset_creation_failed(backend):
     """
     Test that missing the 'age_group' column raises a dataset creation error.
     """
     invalid_data = valid_data.drop("age_group", axis=1)  # Remove required label column
     with pytest.raises(ValueError, match="Dataset creation failed: .*"):
-        second_validate_data(invalid_data)
+        second_validate_data(invalid_data, backend=backend)
 
 # 3. Test missing required columns
-def test_missing_column():
+def test_missing_column(backend):
     """
     Test that missing required columns raises an error.
     """
     invalid_data = valid_data.drop("age_group", axis=1)  # Remove the required 'age_group' column
     with pytest.raises(ValueError, match="Dataset creation failed: .*"):
-        second_validate_data(invalid_data)
+        second_validate_data(invalid_data, backend=backend)
 
 # 4. Test feature-feature correlation failure
-def test_feature_feature_correlation():
+def test_feature_feature_correlation(backend):
     """
     Test that features with high inter-correlation raise an error.
     """
@@ -56,7 +61,26 @@ def test_feature_feature_correlation():
     invalid_data["duplicate_feature"] = invalid_data["bmi"]  # Fully correlated with 'bmi'
 
     with pytest.raises(ValueError, match="Feature-Feature correlation exceeds the maximum acceptable threshold."):
-        second_validate_data(invalid_data)
+        second_validate_data(invalid_data, backend=backend)
+
+# 5. Test feature-label correlation failure
+def test_feature_label_correlation(backend):
+    """
+    Test that a feature that predicts the label raises an error.
+    """
+    invalid_data = pd.concat([valid_data] * 4, ignore_index=True)
+    invalid_data["age_copy"] = invalid_data["age_group"].map({"Adult": 0.0, "Senior": 1.0})
+
+    with pytest.raises(ValueError, match="Feature-Label correlation exceeds the maximum acceptable threshold."):
+        second_validate_data(invalid_data, backend=backend)
+
+# 6. Test unsupported backend
+def test_invalid_backend():
+    """
+    Test that an unsupported backend raises an error.
+    """
+    with pytest.raises(ValueError, match="backend must be one of"):
+        second_validate_data(valid_data, backend="pandas")
 
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import sys
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.serving import MicroBatcher, ScoringServer, load_scorer
+from src.make_preprocessor import make_preprocessor, TARGET
+from src.model_store import save_model
+
+@pytest.fixture
+def model_path(sample_data, tmp_path):
+    """Fixture for a fitted pipeline saved as a model store."""
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression(max_iter=2000, class_weight='balanced'))
+    pipe.fit(sample_data.drop(columns=[TARGET]), sample_data[TARGET])
+    save_model(pipe, str(tmp_path / "model"))
+    return str(tmp_path / "model")
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    content = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(content)}\r\nConnection: close\r\n\r\n".encode()
+                 + content)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+def serve(score, classes, client, **kwargs):
+    """Run `client(port)` against a server started on a free port."""
+    async def main():
+        server = ScoringServer(score, classes, **kwargs)
+        port = await server.start("127.0.0.1", 0)
+        try:
+            return await client(port)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+@pytest.mark.parametrize("compiled", [True, False])
+def test_predictions_match_model(model_path, sample_data, compiled):
+    """Test that concurrent requests are scored as the pipeline scores them, compiled or not."""
+    from src.predict import load_model
+    records = sample_data.drop(columns=[TARGET]).to_dict(orient="records")
+    expected = load_model(model_path).predict_proba(sample_data.drop(columns=[TARGET]))
+    score, classes = load_scorer(model_path, compiled=compiled)
+
+    async def client(port):
+        return await asyncio.gather(*[request(port, "POST", "/predict", record) for record in records])
+
+    responses = serve(score, classes, client, max_wait_ms=20)
+    assert all(status == 200 for status, _ in responses)
+    proba = np.array([[body["predictions"][0][f"proba_{c}"] for c in classes] for _, body in responses])
+    np.testing.assert_allclose(proba, expected, rtol=1e-9)
+    assert [body["predictions"][0]["prediction"] for _, body in responses] == list(classes[expected.argmax(axis=1)])
+
+def test_requests_are_batched():
+    """Test that concurrent requests share batches no larger than the maximum, and metrics count them."""
+    calls = []
+
+    def score(records):
+        calls.append(len(records))
+        return np.array([[1 - r["x"], r["x"]] for r in records])
+
+    async def client(port):
+        responses = await asyncio.gather(*[request(port, "POST", "/predict", {"x": i / 40}) for i in range(40)])
+        responses.append(await request(port, "POST", "/predict", {"records": [{"x": 0.1}, {"x": 0.9}]}))
+        return responses, await request(port, "GET", "/metrics")
+
+    responses, (status, metrics) = serve(score, ["a", "b"], client, max_batch_size=16, max_wait_ms=50)
+    assert [body["predictions"][0]["proba_b"] for _, body in responses[:40]] == [i / 40 for i in range(40)]
+    assert [p["prediction"] for p in responses[-1][1]["predictions"]] == ["a", "b"]
+    assert max(calls) <= 16 and len(calls) < 40 and sum(calls) == 42
+    assert status == 200
+    assert metrics["requests"] == 41 and metrics["records"] == 42 and metrics["batches"] == len(calls)
+    assert metrics["max_queue_depth"] >= 1 and metrics["latency_ms"]["p99"] >= metrics["latency_ms"]["p50"]
+
+def test_invalid_request_fails_alone(model_path, sample_data):
+    """Test that a request with an invalid record gets status 400 without failing the rest of its batch."""
+    score, classes = load_scorer(model_path)
+    good = sample_data.drop(columns=[TARGET]).iloc[0].to_dict()
+    bad = dict(good, diabetic="Sometimes")
+    # Missing numeric values are imputed
+    imputed = dict(good, bmi=None)
+
+    async def client(port):
+        return await asyncio.gather(request(port, "POST", "/predict", good), request(port, "POST", "/predict", bad),
+                                    request(port, "POST", "/predict", imputed),
+                                    request(port, "POST", "/predict", b"not json"),
+                                    request(port, "POST", "/predict", []))
+
+    (ok, _), (unknown, body), (missing, _), (malformed, _), (empty, _) = serve(score, classes, client, max_wait_ms=50)
+    assert ok == 200 and unknown == 400 and missing == 200 and malformed == 400 and empty == 400
+    assert "diabetic" in body["error"]
+
+def test_scoring_error_returns_500():
+    """Test that an unexpected error while scoring or building the response gets status 500 and is counted."""
+    def score(records):
+        if records[0].get("fail"):
+            raise IndexError("no such column")
+        # One score per record instead of one row of probabilities fails when the response is built
+        return np.full(len(records), 0.5) if records[0].get("flat") else np.full((len(records), 2), 0.5)
+
+    async def client(port):
+        return [await request(port, "POST", "/predict", {"fail": True}),
+                await request(port, "POST", "/predict", {"flat": True}),
+                await request(port, "POST", "/predict", {"x": 1}),
+                await request(port, "GET", "/metrics")]
+
+    (failed, body), (flat, _), (ok, _), (_, metrics) = serve(score, ["a", "b"], client, max_wait_ms=1)
+    assert failed == 500 and "IndexError" in body["error"]
+    assert flat == 500 and ok == 200
+    assert metrics["errors"] == 2
+
+def test_routes():
+    """Test the health check and the responses to unknown paths and methods."""
+    async def client(port):
+        return [await request(port, "GET", "/health"), await request(port, "GET", "/missing"),
+                await request(port, "GET", "/predict")]
+
+    (health, body), (missing, _), (method, _) = serve(lambda records: None, ["a", "b"], client)
+    assert health == 200 and body == {"status": "ok"}
+    assert missing == 404 and method == 405
+
+def test_invalid_batcher_settings():
+    """Test that the batch size must be positive and the wait not negative."""
+    with pytest.raises(ValueError, match="max_batch_size"):
+        MicroBatcher(lambda records: None, max_batch_size=0)
+    with pytest.raises(ValueError, match="max_wait_ms"):
+        MicroBatcher(lambda records: None, max_wait_ms=-1)
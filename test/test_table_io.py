@@ -0,0 +1,129 @@
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.table_io import table_format, apply_dtypes, write_table, read_table, TableWriter, NHANES_DTYPES
+
+@pytest.fixture
+def temp_directory(tmp_path):
+    """Fixture to provide a temporary directory for testing."""
+    return tmp_path
+
+@pytest.fixture
+def sample_dataframe():
+    """Fixture to provide rows with the columns of cleaned.csv."""
+    return pd.DataFrame({
+        "age_group": ["Adult", "Senior", "Adult"],
+        "gender": ["Female", "Male", None],
+        "weekly_physical_activity": ["Yes", "No", "Yes"],
+        "bmi": [18.5, 24.9, np.nan],
+        "blood_glucose_fasting": [90.0, 120.5, 100.0],
+        "diabetic": ["No", "Borderline", "Yes"],
+        "oral": [100.0, 200.0, 150.0],
+        "insulin_level": [0.14, 50.0, 25.0]
+    })
+
+@pytest.mark.parametrize("filename, expected", [
+    ("data.csv", ".csv"), ("data.parquet", ".parquet"), ("dir/DATA.Feather", ".feather")])
+def test_table_format(filename, expected):
+    """Test that table_format returns the normalised extension."""
+    assert table_format(filename) == expected
+
+def test_table_format_invalid():
+    """Test that table_format raises ValueError for unsupported extensions."""
+    with pytest.raises(ValueError, match="Filename must end with one of"):
+        table_format("data.xlsx")
+
+def test_apply_dtypes(sample_dataframe):
+    """Test that apply_dtypes gives categoricals and float32 measurements."""
+    typed = apply_dtypes(sample_dataframe)
+    assert list(typed["diabetic"].cat.categories) == ["No", "Borderline", "Yes"]
+    assert typed["bmi"].dtype == np.float32
+    assert typed["gender"].isna().sum() == 1
+
+def test_apply_dtypes_unknown_category(sample_dataframe):
+    """Test that a value outside the declared categories raises ValueError."""
+    sample_dataframe.loc[0, "age_group"] = "Child"
+    with pytest.raises(ValueError, match="Column 'age_group' has values outside its categories"):
+        apply_dtypes(sample_dataframe)
+
+@pytest.mark.parametrize("filename", ["data.parquet", "data.feather"])
+def test_columnar_round_trip(temp_directory, sample_dataframe, filename):
+    """Test that Parquet and Feather files keep the explicit dtypes."""
+    write_table(sample_dataframe, str(temp_directory), filename)
+    loaded = read_table(os.path.join(temp_directory, filename))
+    pd.testing.assert_frame_equal(loaded, apply_dtypes(sample_dataframe))
+
+def test_csv_round_trip(temp_directory, sample_dataframe):
+    """Test that CSV files are written as is and can be parsed into the explicit dtypes."""
+    write_table(sample_dataframe, str(temp_directory), "data.csv")
+    path = os.path.join(temp_directory, "data.csv")
+    pd.testing.assert_frame_equal(read_table(path), sample_dataframe)
+    pd.testing.assert_frame_equal(read_table(path, dtypes=NHANES_DTYPES), apply_dtypes(sample_dataframe))
+
+def test_parquet_with_index(temp_directory):
+    """Test that an index is kept when requested."""
+    report = pd.DataFrame({"precision": [0.9, 0.3]}, index=["Adult", "Senior"])
+    write_table(report, str(temp_directory), "report.parquet", index=True)
+    pd.testing.assert_frame_equal(read_table(os.path.join(temp_directory, "report.parquet")), report)
+
+def test_write_table_nonexistent_directory(sample_dataframe):
+    """Test that write_table raises FileNotFoundError for a nonexistent directory."""
+    with pytest.raises(FileNotFoundError, match="Directory .+ does not exist"):
+        write_table(sample_dataframe, "nonexistent_directory", "data.parquet")
+
+def test_write_table_empty_dataframe(temp_directory):
+    """Test that write_table raises ValueError for an empty DataFrame."""
+    with pytest.raises(ValueError, match="DataFrame must contain observations"):
+        write_table(pd.DataFrame(), str(temp_directory), "data.feather")
+
+def test_write_table_invalid_dataframe(temp_directory):
+    """Test that write_table raises TypeError for invalid DataFrame input."""
+    with pytest.raises(TypeError, match="Input must be a pandas DataFrame"):
+        write_table("not_a_dataframe", str(temp_directory), "data.parquet")
+
+def test_read_table_missing_file(temp_directory):
+    """Test that read_table raises FileNotFoundError for a missing file."""
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        read_table(os.path.join(temp_directory, "missing.parquet"))
+
+@pytest.mark.parametrize("filename", ["data.csv", "data.parquet"])
+def test_table_writer_chunks(temp_directory, sample_dataframe, filename):
+    """Test that writing in chunks gives the same file content as write_table."""
+    path = os.path.join(temp_directory, filename)
+    with TableWriter(path) as writer:
+        writer.write(sample_dataframe.iloc[:1])
+        writer.write(sample_dataframe.iloc[:0])
+        writer.write(sample_dataframe.iloc[1:])
+    write_table(sample_dataframe, str(temp_directory), f"whole_{filename}")
+
+    assert writer.n_rows == 3
+    assert not os.path.exists(f"{path}.tmp")
+    pd.testing.assert_frame_equal(read_table(path), read_table(os.path.join(temp_directory, f"whole_{filename}")))
+
+def test_table_writer_discards_on_error(temp_directory, sample_dataframe):
+    """Test that an exception leaves the previous file in place and removes the partial one."""
+    path = os.path.join(temp_directory, "data.parquet")
+    write_table(sample_dataframe.iloc[:1], str(temp_directory), "data.parquet")
+    with pytest.raises(RuntimeError):
+        with TableWriter(path) as writer:
+            writer.write(sample_dataframe)
+            raise RuntimeError("validation failed")
+    assert len(read_table(path)) == 1
+    assert os.listdir(temp_directory) == ["data.parquet"]
+
+def test_table_writer_no_rows(temp_directory, sample_dataframe):
+    """Test that closing a writer without rows raises ValueError and creates no file."""
+    with pytest.raises(ValueError, match="DataFrame must contain observations"):
+        with TableWriter(os.path.join(temp_directory, "data.csv")) as writer:
+            writer.write(sample_dataframe.iloc[:0])
+    assert os.listdir(temp_directory) == []
+
+def test_table_writer_invalid_path(temp_directory):
+    """Test that TableWriter rejects Feather files and missing directories."""
+    with pytest.raises(ValueError, match="cannot be written in chunks"):
+        TableWriter(os.path.join(temp_directory, "data.feather"))
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        TableWriter(os.path.join(temp_directory, "nope", "data.csv"))
@@ -0,0 +1,92 @@
+import os
+import sys
+import pytest
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.make_preprocessor import make_preprocessor, TARGET
+from src.tune_model import tune_model, tune_on_features
+from src.feature_store import materialize_features
+
+@pytest.fixture
+def sample_data(sample_data_factory):
+    """Fixture to provide a data set with unbalanced classes, where Seniors have higher oral values"""
+    return sample_data_factory(120, seed=123, senior_share=0.3, senior_oral_shift=60)
+
+@pytest.fixture
+def pipe():
+    """Fixture to provide the unfitted pipeline tuned in 06_model_fitting.py"""
+    return make_pipeline(make_preprocessor(),
+                         LogisticRegression(max_iter=2000, random_state=123, class_weight='balanced'))
+
+PARAM_GRID = {'logisticregression__C': 10.0 ** np.arange(-3, 3)}
+
+def _scores(search):
+    return {k: v for k, v in search.cv_results_.items() if "time" not in k}
+
+def test_cached_parallel_search_matches_serial(sample_data, pipe):
+    """Test that caching and parallel folds give the same results as a plain serial search."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    serial = tune_model(pipe, PARAM_GRID, X, y, cv=5, cache_preprocessor=False)
+    parallel = tune_model(pipe, PARAM_GRID, X, y, cv=5, n_jobs=2, cache_preprocessor=True)
+
+    assert serial.best_params_ == parallel.best_params_
+    serial_scores, parallel_scores = _scores(serial), _scores(parallel)
+    assert serial_scores.keys() == parallel_scores.keys()
+    for key in serial_scores:
+        np.testing.assert_array_equal(np.asarray(serial_scores[key]), np.asarray(parallel_scores[key]))
+
+class CountingScaler(StandardScaler):
+    """StandardScaler that counts how many times it is fitted"""
+    n_fits = 0
+
+    def fit(self, X, y=None, sample_weight=None):
+        CountingScaler.n_fits += 1
+        return super().fit(X, y, sample_weight)
+
+@pytest.mark.parametrize("cache_preprocessor, expected_fits", [(False, 3 * 6 + 1), (True, 3 + 1)])
+def test_preprocessor_fitted_once_per_fold(sample_data, cache_preprocessor, expected_fits):
+    """Test that with caching the preprocessor is fitted once per fold plus once for the refit."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    pipe = make_pipeline(make_column_transformer((CountingScaler(), ['bmi', 'oral'])),
+                         LogisticRegression(class_weight='balanced'))
+    CountingScaler.n_fits = 0
+    tune_model(pipe, PARAM_GRID, X, y, cv=3, cache_preprocessor=cache_preprocessor)
+    assert CountingScaler.n_fits == expected_fits
+
+def test_best_estimator_has_no_cache(sample_data, pipe):
+    """Test that the returned best estimator does not reference the removed cache."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    search = tune_model(pipe, PARAM_GRID, X, y, cv=3)
+    assert search.best_estimator_.memory is None
+    assert search.estimator.memory is None
+    assert search.best_estimator_.predict(X).shape == (len(X),)
+
+def test_halving_search(sample_data, pipe):
+    """Test that successive halving runs and selects one of the grid values."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    search = tune_model(pipe, PARAM_GRID, X, y, cv=3, strategy="halving", random_state=123)
+    assert search.best_params_['logisticregression__C'] in PARAM_GRID['logisticregression__C']
+
+def test_invalid_strategy(sample_data, pipe):
+    """Test that tune_model raises ValueError for an unknown strategy."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    with pytest.raises(ValueError, match="strategy must be one of"):
+        tune_model(pipe, PARAM_GRID, X, y, strategy="random")
+
+def test_tune_on_features_matches_tune_model(sample_data, pipe, tmp_path):
+    """Test that tuning on materialised fold matrices scores and ranks candidates like the pipeline search."""
+    X, y = sample_data.drop(columns=[TARGET]), sample_data[TARGET]
+    search = tune_model(pipe, PARAM_GRID, X, y, cv=5)
+    store = materialize_features(sample_data, sample_data.iloc[:10], str(tmp_path / "features"), folds=5)
+    on_features = tune_on_features(pipe.steps[-1][1], {'C': PARAM_GRID['logisticregression__C']}, store, n_jobs=2)
+
+    np.testing.assert_allclose(on_features.cv_results_["mean_test_score"], search.cv_results_["mean_test_score"])
+    np.testing.assert_allclose(on_features.cv_results_["mean_train_score"], search.cv_results_["mean_train_score"])
+    np.testing.assert_array_equal(on_features.cv_results_["rank_test_score"], search.cv_results_["rank_test_score"])
+    assert on_features.best_params_["C"] == search.best_params_["logisticregression__C"]
+    best = search.best_estimator_.steps[-1][1]
+    np.testing.assert_allclose(on_features.best_estimator_.coef_, best.coef_, rtol=1e-4, atol=1e-6)
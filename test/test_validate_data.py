@@ -1,7 +1,8 @@
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.validate_data import validate_data 
+from src.validate_data import validate_data, validate_chunks, StreamingValidator, VALIDATION_ENGINES, DUPLICATE_MODES
+from src.table_io import apply_dtypes
 import pandas as pd
 import pandera as pa
 import pytest
@@ -19,67 +20,185 @@ valid_data = pd.DataFrame({
     "insulin_level": [0.14, 50.0, 25.0]
 })
 
+@pytest.fixture(params=VALIDATION_ENGINES)
+def engine(request):
+    """Fixture to run each case with every validation engine."""
+    return request.param
+
 # Case 1: Validate valid data
-def test_validate_valid_data():
-    validated_data = validate_data(valid_data)
+def test_validate_valid_data(engine):
+    validated_data = validate_data(valid_data, engine=engine)
     assert not validated_data.empty
     assert validated_data.equals(valid_data)
 
 # Case 2: Duplicate rows
 case_duplicate_rows = pd.concat([valid_data, valid_data.iloc[[0]]], ignore_index=True)
-def test_duplicate_rows():
+def test_duplicate_rows(engine):
     with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found"):
-        validate_data(case_duplicate_rows)
+        validate_data(case_duplicate_rows, engine=engine)
 
 # Case 3: Missing values exceed threshold
 case_high_missingness = valid_data.copy()
 case_high_missingness["bmi"] = np.nan  # Introduce missing values exceeding threshold
-def test_high_missingness():
+def test_high_missingness(engine):
     with pytest.raises(pa.errors.SchemaErrors, match="missing values above"):
-        validate_data(case_high_missingness)
+        validate_data(case_high_missingness, engine=engine)
 
 # Case 4: Empty rows
-def test_empty_rows():
+def test_empty_rows(engine):
     case_empty_rows = pd.concat(
         [valid_data, pd.DataFrame([[None] * len(valid_data.columns)], columns=valid_data.columns).astype(valid_data.dtypes)],
         ignore_index=True
     )
     with pytest.raises(pa.errors.SchemaErrors, match="Empty rows found"):
-        validate_data(case_empty_rows)
+        validate_data(case_empty_rows, engine=engine)
 
 # Case 5: Values out of range
-def test_out_of_range_values():
+def test_out_of_range_values(engine):
     case_out_of_range = valid_data.copy()
     case_out_of_range.loc[0, "bmi"] = 80.0  # Out of range
     with pytest.raises(pa.errors.SchemaErrors, match="bmi"):
-        validate_data(case_out_of_range)
+        validate_data(case_out_of_range, engine=engine)
 
 # Case 6: Invalid category values
-def test_invalid_category():
+def test_invalid_category(engine):
     case_invalid_category = valid_data.copy()
     case_invalid_category.loc[0, "age_group"] = "Child"  # Invalid category
     with pytest.raises(pa.errors.SchemaErrors, match="age_group"):
-        validate_data(case_invalid_category)
+        validate_data(case_invalid_category, engine=engine)
 
 # Case 7: Missing required columns
-def test_missing_column():
+def test_missing_column(engine):
     case_missing_column = valid_data.drop("age_group", axis=1)
     with pytest.raises(pa.errors.SchemaErrors, match="age_group"):
-        validate_data(case_missing_column)
+        validate_data(case_missing_column, engine=engine)
 
 # Case 8: Wrong data type
-def test_wrong_data_type():
+def test_wrong_data_type(engine):
     case_wrong_type = valid_data.copy()
     case_wrong_type["bmi"] = "invalid_type"
     with pytest.raises(pa.errors.SchemaErrors, match="bmi"):
-        validate_data(case_wrong_type)
+        validate_data(case_wrong_type, engine=engine)
 
 # Case 9: All values missing in a column
-def test_all_missing_column():
+def test_all_missing_column(engine):
     case_all_missing = valid_data.copy()
     case_all_missing["gender"] = None
     with pytest.raises(pa.errors.SchemaErrors, match="missing values above"):
-        validate_data(case_all_missing)
+        validate_data(case_all_missing, engine=engine)
+
+# Case 10: Both engines report the same failures
+def test_engines_report_same_errors():
+    case_many_errors = pd.concat([valid_data, valid_data.iloc[[0]]], ignore_index=True)
+    case_many_errors.loc[0, "age_group"] = "Child"
+    case_many_errors.loc[1, "bmi"] = 80.0
+    case_many_errors.loc[2, "gender"] = None
+    case_many_errors["extra"] = 1
+    reports = []
+    for engine in VALIDATION_ENGINES:
+        with pytest.raises(pa.errors.SchemaErrors) as error:
+            validate_data(case_many_errors, engine=engine)
+        reports.append(str(error.value))
+    assert reports[0] == reports[1]
+
+# Case 11: Categorical and float32 columns, as loaded from Parquet/Feather
+def test_numpy_engine_accepts_compact_dtypes():
+    case_compact = valid_data.copy()
+    case_compact.loc[1, "insulin_level"] = 102.29  # upper bound, not exactly representable in float32
+    case_compact = apply_dtypes(case_compact)
+    assert validate_data(case_compact, engine="numpy") is case_compact
+
+def test_numpy_engine_compact_dtypes_invalid():
+    case_compact = apply_dtypes(pd.concat([valid_data, valid_data.iloc[[0]]], ignore_index=True))
+    case_compact.loc[1, "oral"] = 1000.0
+    with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found") as error:
+        validate_data(case_compact, engine="numpy")
+    assert "in_range(40.0, 604.0) failure cases: 1000.0" in str(error.value)
+
+# Case 12: Rows equal up to the sign of zero or with missing values in the same places are duplicates
+def test_duplicates_with_signed_zero_and_missing(engine):
+    case_duplicates = pd.concat([valid_data, valid_data.iloc[[0]]], ignore_index=True)
+    case_duplicates.loc[[0, 3], "gender"] = None
+    case_duplicates.loc[0, "oral"] = 0.0
+    case_duplicates.loc[3, "oral"] = -0.0
+    with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found"):
+        validate_data(case_duplicates, engine=engine)
+
+def test_invalid_engine():
+    with pytest.raises(ValueError, match="engine must be one of"):
+        validate_data(valid_data, engine="spark")
+
+# Case 13: A frame with no rows fails the missingness check, as in pandera
+def test_empty_frame(engine):
+    with pytest.raises(pa.errors.SchemaErrors, match="missing values above"):
+        validate_data(valid_data.iloc[:0], engine=engine)
+
+# Streaming validation
+def chunks_of(data, size):
+    return [data.iloc[start:start + size] for start in range(0, len(data), size)]
+
+@pytest.fixture(params=DUPLICATE_MODES)
+def duplicates(request):
+    """Fixture to run each streaming case with every duplicate detection mode."""
+    return request.param
+
+def test_validate_chunks_valid_data(duplicates):
+    chunks = list(validate_chunks(chunks_of(valid_data, 2), duplicates=duplicates))
+    assert pd.concat(chunks).equals(valid_data)
+
+def test_validate_chunks_duplicates_across_chunks(duplicates):
+    data = pd.concat([valid_data, valid_data.iloc[[0]]], ignore_index=True)
+    with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found"):
+        list(validate_chunks(chunks_of(data, 3), duplicates=duplicates))
+
+def test_validate_chunks_duplicates_within_chunk(duplicates):
+    data = pd.concat([valid_data, valid_data.iloc[[2]]], ignore_index=True)
+    with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found"):
+        list(validate_chunks(chunks_of(data, 2), duplicates=duplicates))
+
+def test_validate_chunks_text_keys_agree_between_chunks():
+    # The second chunk sees its values in a different order, so factorized codes differ
+    data = pd.concat([valid_data.iloc[[1, 0]], valid_data.iloc[[2, 1]]], ignore_index=True)
+    with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found"):
+        list(validate_chunks(chunks_of(data, 2)))
+
+def test_validate_chunks_missingness_decided_at_end():
+    # No single chunk is over the threshold, but the whole column is
+    data = pd.concat([valid_data] * 4, ignore_index=True)
+    data["oral"] = np.arange(len(data)) + 100.0
+    data.loc[[2, 5, 8], "bmi"] = np.nan
+    chunks = validate_chunks(chunks_of(data, 4))
+    assert len(next(chunks)) == 4
+    with pytest.raises(pa.errors.SchemaErrors, match="missing values above"):
+        list(chunks)
+
+def test_validate_chunks_reports_failing_chunk():
+    data = pd.concat([valid_data, valid_data.assign(oral=[1.0, 300.0, 400.0])], ignore_index=True)
+    chunks = validate_chunks(chunks_of(data, 3))
+    next(chunks)
+    with pytest.raises(pa.errors.SchemaErrors, match="failure cases: 1.0"):
+        next(chunks)
+
+def test_streaming_validator_counts_rows():
+    validator = StreamingValidator()
+    for chunk in chunks_of(valid_data, 2):
+        validator.validate(chunk)
+    assert validator.finish() == 3
+    assert validator.missing_counts["bmi"] == 0
+
+def test_bloom_filter_has_no_false_negatives():
+    data = pd.DataFrame({"age_group": "Adult", "gender": "Male", "weekly_physical_activity": "No",
+                         "bmi": 15.0 + np.arange(20_000) * 0.0025, "blood_glucose_fasting": 100.0,
+                         "diabetic": "No", "oral": 150.0, "insulin_level": 10.0})
+    validator = StreamingValidator("bloom", expected_rows=20_000)
+    validator.validate(data)
+    for start in range(0, len(data), 1000):
+        with pytest.raises(pa.errors.SchemaErrors, match="Duplicate rows found"):
+            validator.validate(data.iloc[start:start + 1])
+
+def test_streaming_validator_invalid_mode():
+    with pytest.raises(ValueError, match="duplicates must be one of"):
+        StreamingValidator(duplicates="sort")
 
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file